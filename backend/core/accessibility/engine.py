@@ -6,16 +6,30 @@ Visual-first accessibility analysis based on screenshot pixels.
 from __future__ import annotations
 
 import base64
-import asyncio
 import io
+import math
 import os
 import shutil
-import tempfile
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
 from dataclasses import dataclass
+from functools import lru_cache
 from typing import Dict, List, Optional, Set, Tuple
 
 from PIL import Image, ImageDraw, ImageStat
 
+from core.analysis_cache import AnalysisResultCache
+from core.analysis_context import ImageAnalysisContext
+from core.artifact_store import (
+    ArtifactStore,
+    artifact_session,
+    register_artifact_renderer,
+    render_artifact,
+    source_artifact,
+)
+from core.ocr_pool import ocr_pool
+
 
 @dataclass
 class TileAnalysis:
@@ -57,6 +71,15 @@ SEVERITY_COLORS = {
     "pass": (16, 185, 129, 10),
 }
 
+COMPONENT_WORKING_RESOLUTION = 320
+MAX_TILE_GRID = 8
+TILE_EXTREME_QUANTILE = 0.01
+OCR_MODE_FULL = "full"
+OCR_MODE_ROI = "roi"
+ROI_OCR_PADDING = 6
+ROI_OCR_MAX_PIXEL_COVERAGE = 0.6
+ROI_OCR_MIN_HIT_RATIO = 0.35
+
 DEFAULT_TESSERACT_PATHS = [
     r"C:\Program Files\Tesseract-OCR\tesseract.exe",
     r"C:\Program Files (x86)\Tesseract-OCR\tesseract.exe",
@@ -148,7 +171,7 @@ def _crop_to_base64(image: Image.Image, x: int, y: int, width: int, height: int,
         top = max(0, min(max_top, raw_top))
         bottom = min(image.height, max(top + 1, min(image.height, raw_bottom + 1)))
 
-    return _image_to_base64(image.crop((left, top, right, bottom)))
+    return render_artifact(image, "crop", {"box": [left, top, right, bottom]})
 
 
 def _quantized_extremes(tile: Image.Image) -> Tuple[Tuple[int, int, int], Tuple[int, int, int]]:
@@ -165,6 +188,156 @@ def _quantized_extremes(tile: Image.Image) -> Tuple[Tuple[int, int, int], Tuple[
     return darkest, lightest
 
 
+def _tile_edges(length: int, cells: int) -> List[int]:
+    step = max(1, length // cells)
+    return [index * step for index in range(cells)] + [length]
+
+
+@lru_cache(maxsize=1)
+def _srgb_luminance_luts():
+    import numpy as np
+
+    linear = np.array([_srgb_channel_to_linear(value) for value in range(256)], dtype=np.float32)
+    return tuple(np.float32(weight) * linear for weight in (0.2126, 0.7152, 0.0722))
+
+
+def _linear_luminance(rgb):
+    import numpy as np
+
+    red_lut, green_lut, blue_lut = _srgb_luminance_luts()
+    luminance = np.take(red_lut, rgb[..., 0])
+    luminance += np.take(green_lut, rgb[..., 1])
+    luminance += np.take(blue_lut, rgb[..., 2])
+    return luminance
+
+
+def _tile_grid_extremes_vectorized(
+    image: Image.Image,
+    x_edges: List[int],
+    y_edges: List[int],
+    context: Optional[ImageAnalysisContext] = None,
+) -> Optional[List[Tuple[Tuple[int, int, int], Tuple[int, int, int]]]]:
+    try:
+        import numpy as np
+    except Exception:
+        return None
+
+    if context is not None:
+        pixel_rows = context.pixel_rows
+        row_limit = context.band_height
+    else:
+        full_rgb = np.asarray(image.convert("RGB"), dtype=np.uint8)
+        full_luminance = _linear_luminance(full_rgb)
+        row_limit = None
+
+        def pixel_rows(top: int, bottom: int):
+            return full_rgb[top:bottom], full_luminance[top:bottom]
+
+    grid_x = len(x_edges) - 1
+    grid_y = len(y_edges) - 1
+    extremes: List[Optional[Tuple[Tuple[int, int, int], Tuple[int, int, int]]]] = [None] * (grid_x * grid_y)
+
+    # All tiles are the same size except the last row and column, which absorb the remainder.
+    # Each of those (at most four) uniform blocks is reshaped to (tiles, pixels) and reduced at once.
+    # Banded contexts bound memory by fetching at most one band of pixel rows per block.
+    row_groups = [(0, grid_y - 1), (grid_y - 1, grid_y)] if grid_y > 1 else [(0, 1)]
+    col_groups = [(0, grid_x - 1), (grid_x - 1, grid_x)] if grid_x > 1 else [(0, 1)]
+    for group_start, group_end in row_groups:
+        tile_height = y_edges[group_start + 1] - y_edges[group_start]
+        rows_per_block = max(1, row_limit // max(tile_height, 1)) if row_limit else max(1, group_end - group_start)
+        for row_start in range(group_start, group_end, rows_per_block):
+            row_end = min(group_end, row_start + rows_per_block)
+            top, bottom = y_edges[row_start], y_edges[row_end]
+            rgb, luminance = pixel_rows(top, bottom)
+            _reduce_tile_block(rgb, luminance, extremes, x_edges, col_groups, row_start, row_end - row_start, tile_height)
+
+    return extremes
+
+
+def _reduce_tile_block(rgb, luminance, extremes, x_edges, col_groups, row_start: int, rows: int, tile_height: int) -> None:
+    import numpy as np
+
+    grid_x = len(x_edges) - 1
+    for col_start, col_end in col_groups:
+        tile_width = x_edges[col_start + 1] - x_edges[col_start]
+        left, right = x_edges[col_start], x_edges[col_end]
+        cols = col_end - col_start
+        pixel_count = tile_height * tile_width
+        if pixel_count <= 0:
+            continue
+
+        block_luminance = (
+            luminance[:, left:right]
+            .reshape(rows, tile_height, cols, tile_width)
+            .transpose(0, 2, 1, 3)
+            .reshape(rows * cols, pixel_count)
+        )
+        block_rgb = (
+            rgb[:, left:right]
+            .reshape(rows, tile_height, cols, tile_width, 3)
+            .transpose(0, 2, 1, 3, 4)
+            .reshape(rows * cols, pixel_count, 3)
+        )
+
+        # Robust extremes: ignore the outermost quantile so isolated noisy pixels do not dominate.
+        dark_rank = min(pixel_count - 1, int(pixel_count * TILE_EXTREME_QUANTILE))
+        light_rank = max(0, pixel_count - 1 - dark_rank)
+        order = np.argpartition(block_luminance, (dark_rank, light_rank), axis=1)
+        tile_indices = np.arange(rows * cols)
+        dark_colors = block_rgb[tile_indices, order[:, dark_rank]]
+        light_colors = block_rgb[tile_indices, order[:, light_rank]]
+
+        for offset in range(rows * cols):
+            row = row_start + offset // cols
+            col = col_start + offset % cols
+            extremes[row * grid_x + col] = (
+                tuple(int(channel) for channel in dark_colors[offset]),
+                tuple(int(channel) for channel in light_colors[offset]),
+            )
+
+
+def _analyze_tile_grid(
+    image: Image.Image,
+    grid_x: int,
+    grid_y: int,
+    context: Optional[ImageAnalysisContext] = None,
+) -> List[TileAnalysis]:
+    width, height = image.size
+    x_edges = _tile_edges(width, grid_x)
+    y_edges = _tile_edges(height, grid_y)
+    extremes = _tile_grid_extremes_vectorized(image, x_edges, y_edges, context)
+
+    tiles: List[TileAnalysis] = []
+    for row in range(grid_y):
+        for col in range(grid_x):
+            left, right = x_edges[col], x_edges[col + 1]
+            upper, lower = y_edges[row], y_edges[row + 1]
+
+            if extremes is not None and extremes[row * grid_x + col] is not None:
+                darkest, lightest = extremes[row * grid_x + col]
+            else:
+                darkest, lightest = _quantized_extremes(image.crop((left, upper, right, lower)))
+            ratio = contrast_ratio(darkest, lightest)
+            distance = color_distance(darkest, lightest)
+
+            tiles.append(
+                TileAnalysis(
+                    x=left,
+                    y=upper,
+                    width=right - left,
+                    height=lower - upper,
+                    contrast_ratio=round(ratio, 2),
+                    color_distance=round(distance, 2),
+                    dominant_dark=_rgb_to_hex(darkest),
+                    dominant_light=_rgb_to_hex(lightest),
+                    severity=_severity_for_ratio(ratio),
+                    description=_description_for_ratio(ratio, distance),
+                )
+            )
+
+    return tiles
+
+
 def _severity_for_ratio(ratio: float) -> str:
     if ratio < 3:
         return "high"
@@ -732,23 +905,7 @@ def _group_ocr_word_regions(word_regions: List[Dict]) -> List[Dict]:
     return merged
 
 
-def _try_extract_text_regions_with_tesseract(image: Image.Image) -> List[Dict]:
-    tesseract_command = _resolve_tesseract_command()
-    if not tesseract_command:
-        return []
-
-    try:
-        import pytesseract
-        from pytesseract import Output
-    except Exception:
-        return []
-
-    try:
-        pytesseract.pytesseract.tesseract_cmd = tesseract_command
-        data = pytesseract.image_to_data(image, output_type=Output.DICT, config="--psm 6")
-    except Exception:
-        return []
-
+def _ocr_words_from_data(data: Dict, offset_x: int = 0, offset_y: int = 0, block_offset: int = 0) -> List[Dict]:
     text_regions: List[Dict] = []
     total = len(data.get("text", []))
     for index in range(total):
@@ -764,24 +921,108 @@ def _try_extract_text_regions_with_tesseract(image: Image.Image) -> List[Dict]:
         if not text or confidence < 35 or width < 12 or height < 8:
             continue
 
-        left = int(data.get("left", [0] * total)[index] or 0)
-        top = int(data.get("top", [0] * total)[index] or 0)
+        left = int(data.get("left", [0] * total)[index] or 0) + offset_x
+        top = int(data.get("top", [0] * total)[index] or 0) + offset_y
         text_regions.append(
             {
                 "box": [left, top, left + width, top + height],
                 "text": text,
                 "score": round(confidence / 100.0, 2),
                 "source": "ocr",
-                "block_num": int(data.get("block_num", [0] * total)[index] or 0),
+                "block_num": int(data.get("block_num", [0] * total)[index] or 0) + block_offset,
                 "par_num": int(data.get("par_num", [0] * total)[index] or 0),
                 "line_num": int(data.get("line_num", [0] * total)[index] or 0),
             }
         )
 
-    return _group_ocr_word_regions(text_regions)
+    return text_regions
+
+
+def _try_extract_text_regions_with_tesseract(image: Image.Image) -> List[Dict]:
+    data = ocr_pool.image_to_data(image)
+    if not data:
+        return []
+    return _group_ocr_word_regions(_ocr_words_from_data(data))
+
+
+def _ocr_mode() -> str:
+    mode = os.environ.get("OCR_MODE", OCR_MODE_FULL).strip().lower()
+    return mode if mode in (OCR_MODE_FULL, OCR_MODE_ROI) else OCR_MODE_FULL
+
+
+def _merge_roi_boxes(boxes: List[List[int]], padding: int, width: int, height: int) -> List[List[int]]:
+    """Pad text candidates and merge the ones that touch, so each word is OCR'd exactly once."""
+    merged: List[List[int]] = []
+    pending = [
+        [max(0, left - padding), max(0, top - padding), min(width, right + padding), min(height, bottom + padding)]
+        for left, top, right, bottom in boxes
+    ]
+    while pending:
+        current = pending.pop()
+        absorbed = True
+        while absorbed:
+            absorbed = False
+            for index in range(len(merged) - 1, -1, -1):
+                other = merged[index]
+                if current[0] <= other[2] and other[0] <= current[2] and current[1] <= other[3] and other[1] <= current[3]:
+                    current = [
+                        min(current[0], other[0]),
+                        min(current[1], other[1]),
+                        max(current[2], other[2]),
+                        max(current[3], other[3]),
+                    ]
+                    merged.pop(index)
+                    absorbed = True
+        merged.append(current)
+    merged.sort(key=lambda box: (box[1], box[0]))
+    return merged
+
+
+def _try_extract_text_regions_with_roi_ocr(image: Image.Image, report: Dict) -> Optional[List[Dict]]:
+    """OCR only the text-like regions; return None when full-page OCR should run instead."""
+    width, height = image.size
+    image_pixels = max(width * height, 1)
+    candidates = _detect_text_like_regions(image, limit=None)
+    rois = _merge_roi_boxes([item["box"] for item in candidates], ROI_OCR_PADDING, width, height)
+    roi_pixels = sum((box[2] - box[0]) * (box[3] - box[1]) for box in rois)
+    coverage = roi_pixels / image_pixels
+    report.update({"roi_count": len(rois), "pixel_coverage": round(coverage, 4)})
+
+    if not rois:
+        report["fallback_reason"] = "no-text-candidates"
+        return None
+    if coverage > ROI_OCR_MAX_PIXEL_COVERAGE:
+        report["fallback_reason"] = "roi-area-too-large"
+        return None
+
+    started = time.perf_counter()
+    futures = [ocr_pool.submit(image.crop(tuple(box))) for box in rois]
+    words: List[Dict] = []
+    recognized_rois = 0
+    for index, (box, future) in enumerate(zip(rois, futures), start=1):
+        data = future.result()
+        region_words = _ocr_words_from_data(data, box[0], box[1], block_offset=index * 10000) if data else []
+        recognized_rois += 1 if region_words else 0
+        words.extend(region_words)
+    roi_ms = (time.perf_counter() - started) * 1000
+
+    hit_ratio = recognized_rois / len(rois)
+    report.update(
+        {
+            "roi_hit_ratio": round(hit_ratio, 3),
+            "roi_ocr_ms": round(roi_ms, 1),
+            # Tesseract maliyeti piksel sayisiyla yaklasik dogrusal olceklenir.
+            "estimated_time_saved_ms": round(roi_ms / max(coverage, 1e-6) - roi_ms, 1),
+        }
+    )
+    if hit_ratio < ROI_OCR_MIN_HIT_RATIO:
+        report["fallback_reason"] = "low-roi-coverage"
+        report["estimated_time_saved_ms"] = round(-roi_ms, 1)
+        return None
+    return _group_ocr_word_regions(words)
 
 
-def _detect_text_like_regions(image: Image.Image) -> List[Dict]:
+def _detect_text_like_regions(image: Image.Image, limit: Optional[int] = 24) -> List[Dict]:
     try:
         import cv2
         import numpy as np
@@ -829,11 +1070,29 @@ def _detect_text_like_regions(image: Image.Image) -> List[Dict]:
         key=lambda item: (item["box"][2] - item["box"][0]) * (item["box"][3] - item["box"][1]),
         reverse=True,
     )
-    return regions[:24]
+    return regions[:limit] if limit is not None else regions
 
 
-def _detect_text_regions(image: Image.Image) -> List[Dict]:
-    return _try_extract_text_regions_with_tesseract(image) or _detect_text_like_regions(image)
+def _detect_text_regions(image: Image.Image, report: Optional[Dict] = None) -> List[Dict]:
+    report = report if report is not None else {}
+    if not ocr_pool.available:
+        report.update({"mode": "heuristic", "pixel_coverage": 0.0})
+        return _detect_text_like_regions(image)
+
+    if _ocr_mode() == OCR_MODE_ROI:
+        report["mode"] = OCR_MODE_ROI
+        regions = _try_extract_text_regions_with_roi_ocr(image, report)
+        if regions is not None:
+            return regions or _detect_text_like_regions(image)
+        report["mode"] = "roi-fallback-full"
+
+    started = time.perf_counter()
+    regions = _try_extract_text_regions_with_tesseract(image)
+    report.setdefault("mode", OCR_MODE_FULL)
+    report["full_ocr_ms"] = round((time.perf_counter() - started) * 1000, 1)
+    if report["mode"] == OCR_MODE_FULL:
+        report["pixel_coverage"] = 1.0
+    return regions or _detect_text_like_regions(image)
 
 
 def _infer_label_from_text_hint(
@@ -1037,6 +1296,66 @@ def _build_text_region_candidates(image: Image.Image, text_regions: List[Dict])
     return candidates
 
 
+class _BoxIndex:
+    """Uniform grid over axis-aligned [x1, y1, x2, y2] boxes for neighbour and overlap lookups."""
+
+    def __init__(self, boxes: List[List[float]], cell_size: Optional[float] = None):
+        self.boxes = [[float(value) for value in box] for box in boxes]
+        if cell_size is None:
+            edges = sorted(max(box[2] - box[0], box[3] - box[1]) for box in self.boxes) or [64.0]
+            cell_size = edges[len(edges) // 2] * 2
+        self.cell_size = max(16.0, float(cell_size))
+        self.cells: Dict[Tuple[int, int], List[int]] = {}
+        for index, box in enumerate(self.boxes):
+            for cell in self._cells_for(box[0], box[1], box[2], box[3]):
+                self.cells.setdefault(cell, []).append(index)
+
+    @classmethod
+    def for_candidates(cls, candidates: List[ComponentCandidate]) -> "_BoxIndex":
+        return cls([[item.x, item.y, item.x + item.width, item.y + item.height] for item in candidates])
+
+    def __len__(self) -> int:
+        return len(self.boxes)
+
+    def _cells_for(self, x1: float, y1: float, x2: float, y2: float):
+        size = self.cell_size
+        for cell_y in range(int(y1 // size), int(y2 // size) + 1):
+            for cell_x in range(int(x1 // size), int(x2 // size) + 1):
+                yield cell_x, cell_y
+
+    def query(self, box: List[float], margin_x: float = 0.0, margin_y: float = 0.0) -> List[int]:
+        """Indices of boxes touching `box` grown by the margins, in insertion order."""
+        x1 = box[0] - margin_x
+        y1 = box[1] - margin_y
+        x2 = box[2] + margin_x
+        y2 = box[3] + margin_y
+
+        found: Set[int] = set()
+        for cell in self._cells_for(x1, y1, x2, y2):
+            found.update(self.cells.get(cell, ()))
+
+        return sorted(
+            index
+            for index in found
+            if self.boxes[index][0] <= x2
+            and self.boxes[index][2] >= x1
+            and self.boxes[index][1] <= y2
+            and self.boxes[index][3] >= y1
+        )
+
+
+def _valid_region_boxes(regions: List[Dict]) -> Tuple[List[Dict], List[List[float]]]:
+    items: List[Dict] = []
+    boxes: List[List[float]] = []
+    for region in regions:
+        box = region.get("box") or []
+        if len(box) != 4:
+            continue
+        items.append(region)
+        boxes.append([float(value) for value in box])
+    return items, boxes
+
+
 def _box_intersection_area(candidate: ComponentCandidate, box: List[float]) -> float:
     x1, y1, x2, y2 = box
     inter_x1 = max(candidate.x, x1)
@@ -1052,6 +1371,9 @@ def _apply_text_hints(candidates: List[ComponentCandidate], text_regions: List[D
     if not text_regions:
         return candidates
 
+    indexed_regions, region_boxes = _valid_region_boxes(text_regions)
+    region_index = _BoxIndex(region_boxes)
+
     relabeled: List[ComponentCandidate] = []
     for candidate in candidates:
         candidate_area = max(1, candidate.width * candidate.height)
@@ -1060,10 +1382,10 @@ def _apply_text_hints(candidates: List[ComponentCandidate], text_regions: List[D
         strongest_text = ""
         strongest_score = -1.0
 
-        for region in text_regions:
-            box = region.get("box") or []
-            if len(box) != 4:
-                continue
+        candidate_box = [candidate.x, candidate.y, candidate.x + candidate.width, candidate.y + candidate.height]
+        for region_position in region_index.query(candidate_box):
+            region = indexed_regions[region_position]
+            box = region["box"]
             intersection = _box_intersection_area(candidate, box)
             if intersection <= 0:
                 continue
@@ -1427,6 +1749,12 @@ def _merge_candidate_clusters(image: Image.Image, candidates: List[ComponentCand
     groups: List[List[ComponentCandidate]] = []
     visited: Set[int] = set()
 
+    # _should_merge never accepts pairs further apart than these gaps, so only nearby boxes are compared.
+    candidate_index = _BoxIndex.for_candidates(candidates)
+    max_width = max(item.width for item in candidates)
+    margin_x = max(28.0, max_width * 0.35, image_width * 0.04)
+    margin_y = image_height * 0.08
+
     for index, candidate in enumerate(candidates):
         if index in visited:
             continue
@@ -1438,10 +1766,18 @@ def _merge_candidate_clusters(image: Image.Image, candidates: List[ComponentCand
         while stack:
             current = stack.pop()
             group_indices.append(current)
-            for other_index, other in enumerate(candidates):
+            current_candidate = candidates[current]
+            current_box = [
+                current_candidate.x,
+                current_candidate.y,
+                current_candidate.x + current_candidate.width,
+                current_candidate.y + current_candidate.height,
+            ]
+            for other_index in candidate_index.query(current_box, margin_x, margin_y):
                 if other_index in visited:
                     continue
-                if _should_merge(candidates[current], other, image_width, image_height):
+                other = candidates[other_index]
+                if _should_merge(current_candidate, other, image_width, image_height):
                     visited.add(other_index)
                     stack.append(other_index)
 
@@ -1471,26 +1807,22 @@ def _merge_candidate_clusters(image: Image.Image, candidates: List[ComponentCand
     return merged
 
 
-def _detect_component_candidates(image: Image.Image, text_regions: Optional[List[Dict]] = None) -> List[ComponentCandidate]:
+def _foreground_components_python(
+    image: Image.Image,
+    background: Tuple[int, int, int],
+    threshold: float,
+) -> List[Tuple[int, int, int, int, int]]:
     width, height = image.size
-    scale = min(1.0, 320 / max(width, height))
-    small_width = max(1, int(width * scale))
-    small_height = max(1, int(height * scale))
-    small = image.resize((small_width, small_height)).convert("RGB")
-
-    background = _background_reference(small)
-    threshold = 28
-
     visited: Set[Tuple[int, int]] = set()
-    candidates: List[ComponentCandidate] = []
-    pixels = small.load()
+    components: List[Tuple[int, int, int, int, int]] = []
+    pixels = image.load()
 
     def is_foreground(px: int, py: int) -> bool:
         rgb = pixels[px, py]
         return color_distance(rgb, background) > threshold
 
-    for y in range(small_height):
-        for x in range(small_width):
+    for y in range(height):
+        for x in range(width):
             if (x, y) in visited or not is_foreground(x, y):
                 continue
 
@@ -1509,32 +1841,104 @@ def _detect_component_candidates(image: Image.Image, text_regions: Optional[List
                 max_y = max(max_y, cy)
 
                 for nx, ny in ((cx + 1, cy), (cx - 1, cy), (cx, cy + 1), (cx, cy - 1)):
-                    if 0 <= nx < small_width and 0 <= ny < small_height and (nx, ny) not in visited and is_foreground(nx, ny):
+                    if 0 <= nx < width and 0 <= ny < height and (nx, ny) not in visited and is_foreground(nx, ny):
                         visited.add((nx, ny))
                         stack.append((nx, ny))
 
-            box_width = max_x - min_x + 1
-            box_height = max_y - min_y + 1
-            if area < 18 or box_width < 6 or box_height < 4:
-                continue
+            components.append((min_x, min_y, max_x - min_x + 1, max_y - min_y + 1, area))
 
-            original_x = int(min_x / scale)
-            original_y = int(min_y / scale)
-            original_w = max(1, int(box_width / scale))
-            original_h = max(1, int(box_height / scale))
-
-            candidates.append(
-                _build_candidate(
-                    image=image,
-                    x=original_x,
-                    y=original_y,
-                    width=original_w,
-                    height=original_h,
-                    foreground_pixels=max(1, int(area / max(scale * scale, 0.0001))),
-                )
+    return components
+
+
+def _foreground_components_vectorized(
+    image: Image.Image,
+    background: Tuple[int, int, int],
+    threshold: float,
+) -> Optional[List[Tuple[int, int, int, int, int]]]:
+    try:
+        import cv2
+        import numpy as np
+    except Exception:
+        return None
+
+    rgb = np.asarray(image.convert("RGB"), dtype=np.int32)
+    squared_distance = ((rgb - np.asarray(background, dtype=np.int32)) ** 2).sum(axis=2)
+    mask = (squared_distance > threshold * threshold).astype(np.uint8)
+    count, labels, stats, _ = cv2.connectedComponentsWithStats(mask, connectivity=4)
+    if count <= 1:
+        return []
+
+    # Keep the raster discovery order of the flood fill so downstream merging and sorting stay stable.
+    found_labels, first_index = np.unique(labels.ravel(), return_index=True)
+    ordered = [int(label) for _, label in sorted(zip(first_index.tolist(), found_labels.tolist())) if label != 0]
+    return [
+        (
+            int(stats[label, cv2.CC_STAT_LEFT]),
+            int(stats[label, cv2.CC_STAT_TOP]),
+            int(stats[label, cv2.CC_STAT_WIDTH]),
+            int(stats[label, cv2.CC_STAT_HEIGHT]),
+            int(stats[label, cv2.CC_STAT_AREA]),
+        )
+        for label in ordered
+    ]
+
+
+def _foreground_components(
+    image: Image.Image,
+    background: Tuple[int, int, int],
+    threshold: float,
+) -> List[Tuple[int, int, int, int, int]]:
+    components = _foreground_components_vectorized(image, background, threshold)
+    if components is None:
+        components = _foreground_components_python(image, background, threshold)
+    return components
+
+
+def _raw_component_candidates(
+    image: Image.Image,
+    working_resolution: int = COMPONENT_WORKING_RESOLUTION,
+) -> List[ComponentCandidate]:
+    width, height = image.size
+    scale = min(1.0, working_resolution / max(width, height))
+    small_width = max(1, int(width * scale))
+    small_height = max(1, int(height * scale))
+    small = image.resize((small_width, small_height)).convert("RGB")
+
+    background = _background_reference(small)
+    threshold = 28
+
+    candidates: List[ComponentCandidate] = []
+    for min_x, min_y, box_width, box_height, area in _foreground_components(small, background, threshold):
+        if area < 18 or box_width < 6 or box_height < 4:
+            continue
+
+        original_x = int(min_x / scale)
+        original_y = int(min_y / scale)
+        original_w = max(1, int(box_width / scale))
+        original_h = max(1, int(box_height / scale))
+
+        candidates.append(
+            _build_candidate(
+                image=image,
+                x=original_x,
+                y=original_y,
+                width=original_w,
+                height=original_h,
+                foreground_pixels=max(1, int(area / max(scale * scale, 0.0001))),
             )
+        )
 
     candidates.extend(_merge_candidate_clusters(image, candidates))
+    return candidates
+
+
+def _select_component_candidates(
+    image: Image.Image,
+    raw_candidates: List[ComponentCandidate],
+    text_regions: Optional[List[Dict]] = None,
+) -> List[ComponentCandidate]:
+    width, height = image.size
+    candidates = list(raw_candidates)
     if text_regions:
         candidates.extend(_build_text_region_candidates(image, text_regions))
 
@@ -1582,6 +1986,15 @@ def _detect_component_candidates(image: Image.Image, text_regions: Optional[List
     return deduped
 
 
+def _detect_component_candidates(
+    image: Image.Image,
+    text_regions: Optional[List[Dict]] = None,
+    working_resolution: int = COMPONENT_WORKING_RESOLUTION,
+) -> List[ComponentCandidate]:
+    raw_candidates = _raw_component_candidates(image, working_resolution=working_resolution)
+    return _select_component_candidates(image, raw_candidates, text_regions=text_regions)
+
+
 def _component_summary(candidates: List[ComponentCandidate], image_width: int, image_height: int) -> List[Dict]:
     return [
         {
@@ -1663,19 +2076,22 @@ def _apply_detected_labels(candidates: List[ComponentCandidate], detected_elemen
     if not detected_elements:
         return candidates
 
+    labeled_elements, element_boxes = _valid_region_boxes(
+        [element for element in detected_elements if _map_dino_label(element.get("label", ""))]
+    )
+    element_index = _BoxIndex(element_boxes)
+
     relabeled: List[ComponentCandidate] = []
     for candidate in candidates:
         best_label = None
         best_iou = 0.0
         best_score = 0.0
 
-        for element in detected_elements:
+        candidate_box = [candidate.x, candidate.y, candidate.x + candidate.width, candidate.y + candidate.height]
+        for element_position in element_index.query(candidate_box):
+            element = labeled_elements[element_position]
             mapped_label = _map_dino_label(element.get("label", ""))
-            if not mapped_label:
-                continue
-            box = element.get("box") or []
-            if len(box) != 4:
-                continue
+            box = element["box"]
             iou = _box_iou(candidate, box)
             if iou > best_iou and iou >= 0.2:
                 best_iou = iou
@@ -1719,14 +2135,22 @@ def _apply_detected_labels(candidates: List[ComponentCandidate], detected_elemen
     return relabeled
 
 
-def _combined_text_for_box(text_regions: List[Dict], box: List[int]) -> Tuple[str, int]:
+def _combined_text_for_box(
+    text_regions: List[Dict],
+    box: List[int],
+    text_index: Optional[_BoxIndex] = None,
+    indexed_regions: Optional[List[Dict]] = None,
+) -> Tuple[str, int]:
+    # Callers matching many boxes pass the prebuilt index and its regions (one scan in total).
+    if text_index is None or indexed_regions is None:
+        indexed_regions, region_boxes = _valid_region_boxes(text_regions)
+        text_index = _BoxIndex(region_boxes)
+    region_boxes = text_index.boxes
     matched_regions: List[Dict] = []
 
-    for region in text_regions:
-        region_box = region.get("box") or []
-        if len(region_box) != 4:
-            continue
-        overlap = _box_overlap_ratio([float(v) for v in box], [float(v) for v in region_box])
+    for region_position in text_index.query([float(v) for v in box]):
+        region = indexed_regions[region_position]
+        overlap = _box_overlap_ratio([float(v) for v in box], region_boxes[region_position])
         if overlap < 0.18:
             continue
         matched_regions.append(region)
@@ -1756,6 +2180,8 @@ def _combined_text_for_box(text_regions: List[Dict], box: List[int]) -> Tuple[st
 def _build_dino_candidates(image: Image.Image, detected_elements: List[Dict], text_regions: List[Dict]) -> List[ComponentCandidate]:
     dino_candidates: List[ComponentCandidate] = []
     image_width, image_height = image.size
+    indexed_regions, region_boxes = _valid_region_boxes(text_regions)
+    text_index = _BoxIndex(region_boxes)
 
     for element in detected_elements:
         mapped_label = _map_dino_label(element.get("label", ""))
@@ -1777,7 +2203,9 @@ def _build_dino_candidates(image: Image.Image, detected_elements: List[Dict], te
         if width < 16 or height < 10:
             continue
 
-        text_hint, text_region_count = _combined_text_for_box(text_regions, [x1, y1, x2, y2])
+        text_hint, text_region_count = _combined_text_for_box(
+            text_regions, [x1, y1, x2, y2], text_index, indexed_regions
+        )
         inferred_label = _infer_label_from_text_hint(
             text_hint=text_hint,
             width=width,
@@ -1821,37 +2249,15 @@ def _build_dino_candidates(image: Image.Image, detected_elements: List[Dict], te
 
 def _detect_elements_with_dino(image: Image.Image) -> List[Dict]:
     try:
-        from core.models.dinox_client import DINOXClient
+        from core.models.dino_service import get_dino_client
     except Exception:
         return []
 
-    temp_path = None
     try:
-        temp = tempfile.NamedTemporaryFile(suffix=".png", delete=False)
-        temp_path = temp.name
-        temp.close()
-        image.save(temp_path, format="PNG")
-
-        client = DINOXClient()
-        try:
-            elements = asyncio.run(client.detect_elements(temp_path))
-        except RuntimeError:
-            loop = asyncio.new_event_loop()
-            try:
-                asyncio.set_event_loop(loop)
-                elements = loop.run_until_complete(client.detect_elements(temp_path))
-            finally:
-                loop.close()
-                asyncio.set_event_loop(None)
-        return elements or []
+        # Blocking call: this runs on analysis worker threads, never on the event loop.
+        return get_dino_client().detect_elements_sync(image) or []
     except Exception:
         return []
-    finally:
-        if temp_path and os.path.exists(temp_path):
-            try:
-                os.remove(temp_path)
-            except OSError:
-                pass
 
 
 def _prune_fragment_icon_candidates(
@@ -1885,6 +2291,8 @@ def _prune_fragment_icon_candidates(
                 ]
             )
 
+    semantic_index = _BoxIndex(semantic_boxes)
+
     pruned: List[ComponentCandidate] = []
     for candidate in candidates:
         if candidate.label != "icon-or-badge" or candidate.text_hint:
@@ -1898,8 +2306,8 @@ def _prune_fragment_icon_candidates(
             float(candidate.y + candidate.height),
         ]
         should_drop = False
-        for semantic_box in semantic_boxes:
-            overlap = _box_overlap_ratio(candidate_box, semantic_box)
+        for semantic_position in semantic_index.query(candidate_box):
+            overlap = _box_overlap_ratio(candidate_box, semantic_boxes[semantic_position])
             if overlap >= 0.55:
                 should_drop = True
                 break
@@ -1917,103 +2325,182 @@ def _generate_overlay(
     tiles: List[TileAnalysis],
     findings: List[Dict],
     candidates: List[ComponentCandidate],
+    scale: float = 1.0,
 ) -> str:
+    def box(x: int, y: int, width: int, height: int) -> List[int]:
+        return [int(x), int(y), int(x) + int(width), int(y) + int(height)]
+
+    return render_artifact(
+        image,
+        "accessibility-overlay",
+        {
+            "tiles": [box(tile.x, tile.y, tile.width, tile.height) + [tile.severity] for tile in tiles],
+            "findings": [
+                box(finding["bounding_box"]["x"], finding["bounding_box"]["y"], finding["bounding_box"]["width"], finding["bounding_box"]["height"])
+                for finding in findings[:5]
+            ],
+            "candidates": [box(candidate.x, candidate.y, candidate.width, candidate.height) for candidate in candidates[:8]],
+            "scale": float(scale),
+        },
+    )
+
+
+@register_artifact_renderer("accessibility-overlay")
+def _draw_overlay(image: Image.Image, args: Dict) -> Image.Image:
+    scale = float(args.get("scale", 1.0))
+    if scale < 1.0:
+        image = image.resize((max(1, int(image.width * scale)), max(1, int(image.height * scale))))
     overlay = image.convert("RGBA")
     draw = ImageDraw.Draw(overlay, "RGBA")
 
-    for tile in tiles:
-        fill = SEVERITY_COLORS.get(tile.severity, SEVERITY_COLORS["pass"])
-        box = (tile.x, tile.y, tile.x + tile.width, tile.y + tile.height)
-        draw.rectangle(box, fill=fill, outline=fill[:3] + (90,), width=1)
-
-    for finding in findings[:5]:
-        box = finding["bounding_box"]
-        region = (
-            box["x"],
-            box["y"],
-            box["x"] + box["width"],
-            box["y"] + box["height"],
-        )
-        draw.rectangle(region, outline=(255, 255, 255, 230), width=2)
-
-    for candidate in candidates[:8]:
-        draw.rectangle(
-            (
-                candidate.x,
-                candidate.y,
-                candidate.x + candidate.width,
-                candidate.y + candidate.height,
-            ),
-            outline=(129, 140, 248, 160),
-            width=2,
-        )
+    def scaled(left: int, top: int, right: int, bottom: int) -> Tuple[int, int, int, int]:
+        return (int(left * scale), int(top * scale), int(right * scale), int(bottom * scale))
+
+    for left, top, right, bottom, severity in args.get("tiles", []):
+        fill = SEVERITY_COLORS.get(severity, SEVERITY_COLORS["pass"])
+        draw.rectangle(scaled(left, top, right, bottom), fill=fill, outline=fill[:3] + (90,), width=1)
 
-    return _image_to_base64(overlay)
+    for region in args.get("findings", []):
+        draw.rectangle(scaled(*region), outline=(255, 255, 255, 230), width=2)
+
+    for region in args.get("candidates", []):
+        draw.rectangle(scaled(*region), outline=(129, 140, 248, 160), width=2)
+
+    return overlay
+
+
+def _timed_stage(stage_timings: Dict[str, float], stage: str, func, *args, **kwargs):
+    started = time.perf_counter()
+    try:
+        return func(*args, **kwargs)
+    finally:
+        stage_timings[stage] = round((time.perf_counter() - started) * 1000, 1)
 
 
 class AccessibilityEngine:
-    """Screenshot-based accessibility analyzer."""
+    """Screenshot-based accessibility analyzer.
+
+    OCR, DINO, the contrast tile grid and component labeling do not depend on each other,
+    so they run on a shared thread pool and are joined where candidate fusion needs them.
+    """
+
+    ENGINE_NAME = "accessibility"
+    # Bump whenever the analysis output changes so cached results are invalidated.
+    ENGINE_VERSION = "1.0"
+
+    def __init__(
+        self,
+        max_workers: Optional[int] = None,
+        cache: Optional[AnalysisResultCache] = None,
+        artifacts: Optional[ArtifactStore] = None,
+    ):
+        self.cache = cache
+        self.artifacts = artifacts
+        if max_workers is None:
+            max_workers = int(os.getenv("ACCESSIBILITY_PIPELINE_WORKERS", "4"))
+        self.max_workers = max(1, max_workers)
+        self._stage_pool: Optional[ThreadPoolExecutor] = None
+        self._stage_pool_lock = threading.Lock()
+
+    def _submit_stage(self, stage_timings: Dict[str, float], stage: str, func, *args, **kwargs) -> Future:
+        if self.max_workers <= 1:
+            future: Future = Future()
+            try:
+                future.set_result(_timed_stage(stage_timings, stage, func, *args, **kwargs))
+            except Exception as exc:
+                future.set_exception(exc)
+            return future
+
+        with self._stage_pool_lock:
+            if self._stage_pool is None:
+                self._stage_pool = ThreadPoolExecutor(
+                    max_workers=self.max_workers,
+                    thread_name_prefix="accessibility-stage",
+                )
+        return self._stage_pool.submit(_timed_stage, stage_timings, stage, func, *args, **kwargs)
 
     def analyze_image(
         self,
-        image_base64: str,
+        image_base64: str = "",
         platform: str = "web",
         min_tile_size: int = 96,
         element_metadata: Optional[List[Dict]] = None,
+        max_grid: int = MAX_TILE_GRID,
+        context: Optional[ImageAnalysisContext] = None,
+    ) -> Dict:
+        started = time.perf_counter()
+        stage_timings: Dict[str, float] = {}
+        if context is None:
+            context = _timed_stage(stage_timings, "decode", ImageAnalysisContext.from_base64, image_base64)
+        with artifact_session(self.artifacts, context) as session:
+            result = self._analyze(context, started, stage_timings, platform, min_tile_size, element_metadata, max_grid)
+        return session.finalize(result) if session is not None else result
+
+    def _analyze(
+        self,
+        context: ImageAnalysisContext,
+        started: float,
+        stage_timings: Dict[str, float],
+        platform: str,
+        min_tile_size: int,
+        element_metadata: Optional[List[Dict]],
+        max_grid: int,
     ) -> Dict:
-        image_bytes = _normalize_base64_image(image_base64)
-        image = Image.open(io.BytesIO(image_bytes)).convert("RGB")
+        image = context.image
         width, height = image.size
         element_metadata = element_metadata or []
 
-        grid_x = max(2, min(8, width // min_tile_size or 2))
-        grid_y = max(2, min(8, height // min_tile_size or 2))
-        tile_width = max(1, width // grid_x)
-        tile_height = max(1, height // grid_y)
-
-        tiles: List[TileAnalysis] = []
-        passing_tiles = 0
-
-        for row in range(grid_y):
-            for col in range(grid_x):
-                left = col * tile_width
-                upper = row * tile_height
-                right = width if col == grid_x - 1 else (col + 1) * tile_width
-                lower = height if row == grid_y - 1 else (row + 1) * tile_height
-
-                tile = image.crop((left, upper, right, lower))
-                darkest, lightest = _quantized_extremes(tile)
-                ratio = contrast_ratio(darkest, lightest)
-                distance = color_distance(darkest, lightest)
-                severity = _severity_for_ratio(ratio)
-                description = _description_for_ratio(ratio, distance)
-
-                if severity == "pass":
-                    passing_tiles += 1
-
-                tiles.append(
-                    TileAnalysis(
-                        x=left,
-                        y=upper,
-                        width=right - left,
-                        height=lower - upper,
-                        contrast_ratio=round(ratio, 2),
-                        color_distance=round(distance, 2),
-                        dominant_dark=_rgb_to_hex(darkest),
-                        dominant_light=_rgb_to_hex(lightest),
-                        severity=severity,
-                        description=description,
-                    )
-                )
-
-        text_regions = _detect_text_regions(image)
-        dino_elements = _detect_elements_with_dino(image)
-        candidates = _detect_component_candidates(image, text_regions=text_regions)
+        cache_key = None
+        if self.cache is not None:
+            cache_started = time.perf_counter()
+            cache_key = self.cache.key_for(
+                self.ENGINE_NAME,
+                self.ENGINE_VERSION,
+                image,
+                {
+                    "platform": platform,
+                    "min_tile_size": min_tile_size,
+                    "max_grid": max_grid,
+                    "element_metadata": element_metadata,
+                    "artifact_store": self.artifacts.root_dir if self.artifacts is not None else None,
+                    **context.cache_params,
+                },
+                pixel_digest=context.pixel_digest,
+            )
+            cached = self.cache.get(cache_key)
+            stage_timings["cache_lookup"] = round((time.perf_counter() - cache_started) * 1000, 1)
+            if cached is not None:
+                stage_timings["total"] = round((time.perf_counter() - started) * 1000, 1)
+                cached["stage_timings_ms"] = stage_timings
+                return cached
+
+        grid_x = max(2, min(max_grid, width // min_tile_size or 2))
+        grid_y = max(2, min(max_grid, height // min_tile_size or 2))
+        if context.band_height:
+            # Keep every tile row within one band so banded captures never materialize full-page arrays.
+            grid_y = max(grid_y, math.ceil(height / context.band_height))
+
+        tiles_future = self._submit_stage(stage_timings, "tile_grid", _analyze_tile_grid, image, grid_x, grid_y, context)
+        text_future = self._submit_stage(stage_timings, "ocr", lambda: context.text_regions)
+        dino_future = self._submit_stage(stage_timings, "dino", lambda: context.dino_elements)
+        components_future = self._submit_stage(stage_timings, "components", lambda: context.raw_component_candidates)
+
+        text_regions = text_future.result()
+        raw_candidates = components_future.result()
+        dino_elements = dino_future.result()
+
+        fusion_started = time.perf_counter()
+        candidates = _select_component_candidates(image, raw_candidates, text_regions=text_regions)
         candidates.extend(_build_dino_candidates(image, dino_elements, text_regions))
         candidates = _apply_text_hints(candidates, text_regions)
         candidates = _apply_detected_labels(candidates, dino_elements)
         candidates = _apply_metadata_hints(candidates, element_metadata, image)
         candidates = _prune_fragment_icon_candidates(candidates, text_regions, dino_elements)
+        stage_timings["candidate_fusion"] = round((time.perf_counter() - fusion_started) * 1000, 1)
+
+        tiles = tiles_future.result()
+        passing_tiles = sum(1 for tile in tiles if tile.severity == "pass")
+        report_started = time.perf_counter()
 
         findings = []
         meaningful_candidates = [candidate for candidate in candidates if candidate.severity != "pass"]
@@ -2146,10 +2633,10 @@ class AccessibilityEngine:
             for tile in tiles
         ]
 
-        palette = _palette_summary(image)
+        palette = context.palette
         color_consistency_score = 100 - min(60, max(0, (len(palette) - 3) * 12 + wcag_summary["fail"] * 6))
         components = _component_summary(meaningful_candidates or candidates, width, height)
-        overlay_base64 = _generate_overlay(image, tiles, findings, candidates)
+        overlay_base64 = _generate_overlay(image, tiles, findings, candidates, scale=context.overlay_scale)
 
         recommendations = [
             "Isaretlenen alanlarda on plan ve arka plan ayrimini guclendir.",
@@ -2168,7 +2655,10 @@ class AccessibilityEngine:
         if keyboard_navigation_findings:
             recommendations.append("Etkilesimli bilesenleri klavye ile erisilebilir ve gorunur focus durumuna sahip hale getir.")
 
-        return {
+        stage_timings["report"] = round((time.perf_counter() - report_started) * 1000, 1)
+        stage_timings["total"] = round((time.perf_counter() - started) * 1000, 1)
+
+        result = {
             "platform": platform,
             "image": {"width": width, "height": height},
             "overall_score": score,
@@ -2181,7 +2671,13 @@ class AccessibilityEngine:
             "heatmap": heatmap,
             "artifacts": {
                 "overlay_image_base64": overlay_base64,
-                "source_image_base64": image_base64.split(",", 1)[1] if image_base64.strip().startswith("data:") and "," in image_base64 else image_base64,
+                "source_image_base64": source_artifact(context, lambda: context.source_base64),
             },
             "recommendations": recommendations,
+            "ocr_report": context.ocr_report,
+            "tiling": context.tiling_report,
+            "stage_timings_ms": stage_timings,
         }
+        if cache_key is not None:
+            self.cache.set(cache_key, result)
+        return result
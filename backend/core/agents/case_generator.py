@@ -3,8 +3,7 @@ import os
 import json
 import re
 import base64
-import tempfile
-from typing import List, Dict, Any, Optional
+from typing import List, Dict, Any, AsyncIterator, Optional
 from dotenv import load_dotenv
 import requests
 
@@ -27,17 +26,18 @@ class AICaseGenerator:
         cases = await generator.generate_cases_from_url("https://saucedemo.com")
     """
 
-    def __init__(self):
+    def __init__(self, use_llm_cache: bool = True):
         from core.models.llm_client import LLMClient
-        self.llm = LLMClient()
+        # use_llm_cache=False: değişmemiş sayfa için bile LLM'e yeniden sorulur
+        self.llm = LLMClient(use_cache=use_llm_cache)
         self._dinox = None  # Lazy: sadece use_screenshot=True olduğunda yüklenir
         print("✅ [AICaseGenerator] LLM (Groq) hazır. DINO ekran analizi için bekleniyor.")
 
     def _get_dinox(self):
         """Grounding DINO istemcisini ihtiyaç duyulduğunda başlatır."""
         if self._dinox is None:
-            from core.models.dinox_client import DINOXClient
-            self._dinox = DINOXClient()
+            from core.models.dino_service import get_dino_client
+            self._dinox = get_dino_client()
         return self._dinox
 
 
@@ -110,6 +110,46 @@ class AICaseGenerator:
 
         return cases
 
+    async def stream_cases_from_url(
+        self,
+        url: str,
+        platform: str = "web",
+        use_screenshot: bool = True,
+        strict_visual: bool = False,
+        require_live_show: bool = False
+    ) -> AsyncIterator[Dict[str, Any]]:
+        """
+        ``generate_cases_from_url``'in stream eden hali: analiz ve kimlik adımlarından
+        sonra her senaryo LLM çıktısında tamamlandığı anda standart formatta döner.
+        """
+        print(f"\n{'='*60}")
+        print(f"🧠 [AICaseGenerator] Stream Analiz Başlıyor: {url}")
+        print(f"{'='*60}")
+
+        page_analysis = await self._analyze_page(
+            url=url,
+            use_screenshot=use_screenshot,
+            strict_visual=strict_visual,
+            require_live_show=require_live_show
+        )
+        page_identity = await self.llm.identify_page_purpose(url, page_analysis)
+        print(f"🆔 [Page Identity] Bu sayfa: {page_identity.get('page_type', 'Bilinmiyor')}")
+
+        count = 0
+        async for category_key, scenario in self.llm.stream_test_cases(
+            url=url,
+            page_context=page_analysis,
+            page_identity=page_identity,
+            platform=platform
+        ):
+            for case in self._format_cases({category_key: [scenario]}, url):
+                count += 1
+                if not scenario.get("title"):
+                    case["title"] = f"Test Case {count}"
+                yield case
+
+        print(f"\n✅ [AICaseGenerator] Toplam {count} test senaryosu stream edildi!")
+
     # ─────────────────────────────────────────────
     # ADIM 1: Sayfa Analizi (Grounding DINO + Screenshot)
     # ─────────────────────────────────────────────
@@ -127,11 +167,9 @@ class AICaseGenerator:
         if not use_screenshot:
             return self._infer_context_from_url(url)
 
-        screenshot_path = None
         executor = None
         try:
             from executors.web.web_executor import WebExecutor
-            import tempfile
             import os
             import json
 
@@ -143,16 +181,12 @@ class AICaseGenerator:
             if getattr(executor, "page", None) and executor.page.viewport_size:
                 source_viewport = executor.page.viewport_size
 
-            tmp = tempfile.NamedTemporaryFile(suffix=".png", delete=False)
-            screenshot_path = tmp.name
-            tmp.close()
-
             # DINO için full-page yerine viewport screenshot kullanıyoruz.
             # Bu, canlı şovdaki kutu koordinat kaymalarını ciddi şekilde azaltır.
-            await executor.screenshot(screenshot_path, full_page=False)
+            screenshot_bytes = await executor.screenshot(full_page=False)
             
-            # DINO analiz
-            elements = await self._get_dinox().detect_elements(screenshot_path)
+            # DINO analiz (screenshot bellekte kalır, diske yazılmaz)
+            elements = await self._get_dinox().detect_elements(screenshot_bytes)
 
             # --- CANLI ŞOV: DINO sonuçlarıyla birlikte Bridge'e gönder ---
             try:
@@ -223,11 +257,6 @@ class AICaseGenerator:
                     await executor.stop()
                 except Exception:
                     pass
-            if screenshot_path:
-                try:
-                    os.remove(screenshot_path)
-                except Exception:
-                    pass
 
     def _build_world_view(
         self,
@@ -1,11 +1,10 @@
 
-import os
-import tempfile
 import asyncio
 from typing import Dict, Any, Optional, List
 from executors.web.web_executor import WebExecutor
 from core.models.llm_client import LLMClient
-from core.models.dinox_client import DINOXClient
+from core.models.dino_service import get_dino_client
+from core.models.dinox_client import format_world_view
 from core.agents.intelligence_vault import IntelligenceVault
 
 class SelfHealingExecutor:
@@ -15,8 +14,9 @@ class SelfHealingExecutor:
 
     def __init__(self, web_executor: WebExecutor, vault_data: Optional[Dict[str, Any]] = None):
         self.web = web_executor
-        self.llm = LLMClient()
-        self.dinox = DINOXClient()
+        # Onarım kararları canlı sayfaya bağlı; eski bir yanıt önbellekten dönmemeli
+        self.llm = LLMClient(use_cache=False)
+        self.dinox = get_dino_client()
         self.vault = IntelligenceVault(vault_data)
         self.last_healing_report = None
 
@@ -63,10 +63,13 @@ class SelfHealingExecutor:
     #  İYİLEŞTİRME VE TEMİZLEME MANTIĞI
     # ═══════════════════════════════════════════════════════════════
 
-    async def handle_global_obstacles(self):
+    async def handle_global_obstacles(self, obstacles: Optional[List[Dict[str, Any]]] = None):
         """
         🍪 Global Engel Çözücü (Global Solvers)
         Çerez banner'ları ve 'Kadın/Erkek' seçimi gibi onboarding engellerini temizler.
+
+        ``obstacles`` verilirse (ör. healing'in tek geçişli DINO sonucundan) yeni bir
+        screenshot ve DINO çağrısı yapılmaz; sayfa bu arada değiştiyse yok sayılır.
         """
         print("🧹 [Global Solvers] Sayfa engellerden temizleniyor...")
         
@@ -79,6 +82,7 @@ class SelfHealingExecutor:
                 # 🔴 BUTONU PARLAT (Kullanıcı hangisinin seçildiğini görsün)
                 await self.web.highlight_element(btn)
                 await btn.click()
+                obstacles = None  # Sayfa değişti, önceki tespitler geçersiz
                 await asyncio.sleep(1)
         except:
             pass
@@ -86,15 +90,13 @@ class SelfHealingExecutor:
         # Bekleme ve Fallback (Kapat/Kabul Et gibi)
         await asyncio.sleep(1)
 
-        # 🔵 2. AI TABANLI ÇÖZÜM: DINO-X ile Görsel Tespit
-        with tempfile.NamedTemporaryFile(suffix=".png", delete=False) as tmp:
-            screenshot_path = tmp.name
-        
+        # 🔵 2. AI TABANLI ÇÖZÜM: DINO-X ile Görsel Tespit (screenshot diske yazılmaz)
         try:
-            await self.web.screenshot(screenshot_path)
-            elements = await self.dinox.detect_elements(screenshot_path, prompt=self.dinox.OBSTACLES_PROMPT)
-            
-            for elem in elements:
+            if obstacles is None:
+                screenshot_bytes = await self.web.screenshot()
+                obstacles = await self.dinox.detect_elements(screenshot_bytes, prompt=self.dinox.OBSTACLES_PROMPT)
+
+            for elem in obstacles:
                 if elem.get("score", 0) > 0.40:
                     label = elem["label"].lower()
                     # Sadece kapatma/kabul değil, 'kadın/erkek' gibi seçimleri de engel sayıyoruz
@@ -114,9 +116,6 @@ class SelfHealingExecutor:
                         await asyncio.sleep(1)
         except Exception as e:
             print(f"⚠️ [Global Solver] AI ile engel temizlenirken hata: {e}")
-        finally:
-            if os.path.exists(screenshot_path):
-                os.remove(screenshot_path)
 
     async def heal_and_retry(self, action_type: str, selector: str, error_msg: str, value: str = "") -> bool:
         """
@@ -124,61 +123,54 @@ class SelfHealingExecutor:
         """
         print(f"🚑 [Healing] Analiz ediliyor: {action_type} -> {selector}")
         
-        with tempfile.NamedTemporaryFile(suffix=".png", delete=False) as tmp:
-            screenshot_path = tmp.name
+        screenshot_bytes = await self.web.screenshot()
+        
+        # 1. DINO-X World View + engeller: tek forward pass, iki görünüm
+        views = await self.dinox.detect_elements_and_obstacles(screenshot_bytes)
+        world_view = format_world_view(views["elements"])
+        
+        # 2. LLM Analizi
+        analysis = await self.llm.analyze_error(
+            logs=f"Action: {action_type}\nOriginal Selector: {selector}\nError: {error_msg}",
+            screenshot_desc=world_view
+        )
+        
+        # Kullanıcıya yönelik detaylı açıklama oluşturma
+        root_cause = analysis.get("root_cause", "Bilinmeyen engel")
+        suggestion = analysis.get("suggestion", "Görsel onarım denendi")
+        
+        analysis["human_explanation"] = f"Hata Nedeni: {root_cause}. VisionQA Çözümü: {suggestion}."
+        
+        self.last_healing_report = analysis
+        action = analysis.get("self_healing_action", "none")
+        new_selector = analysis.get("new_selector")
+        
+        print(f"🔍 [Healing Analysis] Neden: {root_cause} | Öneri: {action}")
+        
+        # 3. İyileştirme Aksiyonlarını Uygula
+        if action == "dismiss_overlay":
+            await self.handle_global_obstacles(obstacles=views["obstacles"])
+        elif action == "wait_longer":
+            await asyncio.sleep(3)
+        elif action == "scroll_to_element":
+            try:
+                await self.web.page.locator(selector).first.scroll_into_view_if_needed()
+            except:
+                pass
+
+        # 4. RETRY
+        retry_selector = new_selector if (action == "retry_with_new_selector" and new_selector) else selector
         
         try:
-            await self.web.screenshot(screenshot_path)
-            
-            # 1. DINO-X World View al
-            world_view = await self.dinox.get_world_view(screenshot_path)
-            
-            # 2. LLM Analizi
-            analysis = await self.llm.analyze_error(
-                logs=f"Action: {action_type}\nOriginal Selector: {selector}\nError: {error_msg}",
-                screenshot_desc=world_view
-            )
-            
-            # Kullanıcıya yönelik detaylı açıklama oluşturma
-            root_cause = analysis.get("root_cause", "Bilinmeyen engel")
-            suggestion = analysis.get("suggestion", "Görsel onarım denendi")
-            
-            analysis["human_explanation"] = f"Hata Nedeni: {root_cause}. VisionQA Çözümü: {suggestion}."
+            if action_type == "click":
+                await self.web.click_element(retry_selector)
+            elif action_type == "type":
+                await self.web.type_input(retry_selector, value)
+            elif action_type == "verify":
+                return await self.web.verify_element(retry_selector)
             
-            self.last_healing_report = analysis
-            action = analysis.get("self_healing_action", "none")
-            new_selector = analysis.get("new_selector")
-            
-            print(f"🔍 [Healing Analysis] Neden: {root_cause} | Öneri: {action}")
-            
-            # 3. İyileştirme Aksiyonlarını Uygula
-            if action == "dismiss_overlay":
-                await self.handle_global_obstacles()
-            elif action == "wait_longer":
-                await asyncio.sleep(3)
-            elif action == "scroll_to_element":
-                try:
-                    await self.web.page.locator(selector).first.scroll_into_view_if_needed()
-                except:
-                    pass
-
-            # 4. RETRY
-            retry_selector = new_selector if (action == "retry_with_new_selector" and new_selector) else selector
-            
-            try:
-                if action_type == "click":
-                    await self.web.click_element(retry_selector)
-                elif action_type == "type":
-                    await self.web.type_input(retry_selector, value)
-                elif action_type == "verify":
-                    return await self.web.verify_element(retry_selector)
-                
-                print(f"🎉 [Healing] BAŞARILI! Test '{retry_selector}' kullanılarak kurtarıldı.")
-                return True
-            except Exception as e:
-                print(f"❌ [Healing] İyileştirme denemesi başarısız: {e}")
-                return False
-                
-        finally:
-            if os.path.exists(screenshot_path):
-                os.remove(screenshot_path)
+            print(f"🎉 [Healing] BAŞARILI! Test '{retry_selector}' kullanılarak kurtarıldı.")
+            return True
+        except Exception as e:
+            print(f"❌ [Healing] İyileştirme denemesi başarısız: {e}")
+            return False
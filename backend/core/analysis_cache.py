@@ -0,0 +1,245 @@
+"""
+VisionQA Analysis Result Cache
+Content-addressed cache for screenshot analyzer results.
+
+Keys combine a hash of the decoded pixels with the engine name, the engine version
+and the analysis parameters, so re-submitting a pixel-identical capture returns the
+stored result instead of re-running OCR, DINO and the pixel passes. Bumping an
+engine's ENGINE_VERSION invalidates its entries automatically.
+
+On disk, entries live under ``<dir>/<engine>/<version>/``. Several processes on
+different versions (a rolling deploy, an old worker) may share one directory, so
+writes never touch other versions. Old version directories are removed only by
+``prune_stale_versions`` (opt-in via ANALYSIS_CACHE_STALE_VERSION_DAYS, run at
+startup), and only once nothing has been written to them for that many days.
+
+Results carry base64 images (source, overlay, crops), so the memory tier is bounded by
+their serialized size as well as by entry count; a single result larger than the byte
+budget is kept on disk only.
+"""
+
+from __future__ import annotations
+
+import copy
+import hashlib
+import json
+import os
+import shutil
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Any, Dict, Optional, Tuple
+
+from PIL import Image
+
+
+@dataclass(frozen=True)
+class AnalysisCacheKey:
+    engine_name: str
+    engine_version: str
+    digest: str
+
+
+PIXEL_DIGEST_CHUNK_ROWS = 512
+
+
+def image_pixel_digest(image: Image.Image) -> str:
+    # Hashed in row chunks so tall captures never need a second full-size byte copy;
+    # the digest is identical to hashing image.tobytes() in one go.
+    hasher = hashlib.sha256()
+    hasher.update(f"{image.mode}:{image.width}x{image.height}:".encode("utf-8"))
+    if image.height <= PIXEL_DIGEST_CHUNK_ROWS:
+        hasher.update(image.tobytes())
+        return hasher.hexdigest()
+    for top in range(0, image.height, PIXEL_DIGEST_CHUNK_ROWS):
+        bottom = min(image.height, top + PIXEL_DIGEST_CHUNK_ROWS)
+        hasher.update(image.crop((0, top, image.width, bottom)).tobytes())
+    return hasher.hexdigest()
+
+
+def params_digest(params: Optional[Dict[str, Any]]) -> str:
+    encoded = json.dumps(params or {}, sort_keys=True, default=str, ensure_ascii=False)
+    return hashlib.sha256(encoded.encode("utf-8")).hexdigest()
+
+
+class AnalysisResultCache:
+    """Bounded in-memory LRU tier with an optional on-disk JSON tier."""
+
+    def __init__(
+        self,
+        max_entries: int = 64,
+        disk_dir: Optional[str] = None,
+        max_bytes: int = 64 * 1024 * 1024,
+        stale_version_days: float = 0,
+    ):
+        self.max_entries = max(0, int(max_entries))
+        self.max_bytes = max(0, int(max_bytes))
+        self.disk_dir = disk_dir or None
+        self.stale_version_days = max(0.0, float(stale_version_days))
+        self._entries: "OrderedDict[str, Tuple[Dict, int]]" = OrderedDict()
+        self._bytes = 0
+        self._lock = threading.Lock()
+        self._stats = {
+            "hits": 0,
+            "misses": 0,
+            "memory_hits": 0,
+            "disk_hits": 0,
+            "stores": 0,
+            "evictions": 0,
+            "pruned_versions": 0,
+        }
+
+    @classmethod
+    def from_env(cls) -> "AnalysisResultCache":
+        return cls(
+            max_entries=int(os.getenv("ANALYSIS_CACHE_MAX_ENTRIES", "64")),
+            disk_dir=os.getenv("ANALYSIS_CACHE_DIR", "").strip() or None,
+            max_bytes=int(float(os.getenv("ANALYSIS_CACHE_MAX_MB", "64")) * 1024 * 1024),
+            stale_version_days=float(os.getenv("ANALYSIS_CACHE_STALE_VERSION_DAYS", "0")),
+        )
+
+    @property
+    def enabled(self) -> bool:
+        return self.max_entries > 0 or bool(self.disk_dir)
+
+    def key_for(
+        self,
+        engine_name: str,
+        engine_version: str,
+        image: Image.Image,
+        params: Optional[Dict[str, Any]] = None,
+        pixel_digest: Optional[str] = None,
+    ) -> AnalysisCacheKey:
+        hasher = hashlib.sha256()
+        for part in (engine_name, engine_version, pixel_digest or image_pixel_digest(image), params_digest(params)):
+            hasher.update(part.encode("utf-8"))
+            hasher.update(b"\0")
+        return AnalysisCacheKey(engine_name=engine_name, engine_version=engine_version, digest=hasher.hexdigest())
+
+    def _disk_path(self, key: AnalysisCacheKey) -> str:
+        return os.path.join(self.disk_dir, key.engine_name, key.engine_version, f"{key.digest}.json")
+
+    def _remember(self, key: AnalysisCacheKey, value: Dict, size: int) -> None:
+        previous = self._entries.pop(key.digest, None)
+        if previous is not None:
+            self._bytes -= previous[1]
+        if self.max_entries <= 0 or size > self.max_bytes:
+            return
+        self._entries[key.digest] = (value, size)
+        self._bytes += size
+        while len(self._entries) > self.max_entries or self._bytes > self.max_bytes:
+            _, (_, evicted_size) = self._entries.popitem(last=False)
+            self._bytes -= evicted_size
+            self._stats["evictions"] += 1
+
+    def get(self, key: AnalysisCacheKey) -> Optional[Dict]:
+        if not self.enabled:
+            return None
+
+        with self._lock:
+            entry = self._entries.get(key.digest)
+            if entry is not None:
+                self._entries.move_to_end(key.digest)
+                self._stats["hits"] += 1
+                self._stats["memory_hits"] += 1
+                return copy.deepcopy(entry[0])
+
+        if self.disk_dir:
+            path = self._disk_path(key)
+            try:
+                with open(path, "r", encoding="utf-8") as handle:
+                    raw = handle.read()
+                value = json.loads(raw)
+            except (OSError, ValueError):
+                value = None
+            if value is not None:
+                with self._lock:
+                    self._remember(key, value, len(raw))
+                    self._stats["hits"] += 1
+                    self._stats["disk_hits"] += 1
+                return copy.deepcopy(value)
+
+        with self._lock:
+            self._stats["misses"] += 1
+        return None
+
+    def set(self, key: AnalysisCacheKey, value: Dict) -> None:
+        if not self.enabled:
+            return
+
+        stored = copy.deepcopy(value)
+        try:
+            encoded: Optional[str] = json.dumps(stored, ensure_ascii=False)
+        except (TypeError, ValueError):
+            encoded = None
+        # Non-JSON results fall back to a rough size so they still count against the budget.
+        size = len(encoded) if encoded is not None else len(repr(stored))
+        with self._lock:
+            self._remember(key, stored, size)
+            self._stats["stores"] += 1
+
+        if self.disk_dir:
+            path = self._disk_path(key)
+            temp_path = f"{path}.{threading.get_ident()}.tmp"
+            try:
+                os.makedirs(os.path.dirname(path), exist_ok=True)
+                if encoded is None:
+                    raise TypeError("result is not JSON serializable")
+                with open(temp_path, "w", encoding="utf-8") as handle:
+                    handle.write(encoded)
+                os.replace(temp_path, path)
+            except (OSError, TypeError, ValueError) as exc:
+                print(f"⚠️ Analysis cache disk write failed: {exc}")
+                try:
+                    os.remove(temp_path)
+                except OSError:
+                    pass
+
+    def prune_stale_versions(self, now: Optional[float] = None) -> int:
+        """Remove version directories nothing has written to for ``stale_version_days`` (0 = never)."""
+        if not self.disk_dir or self.stale_version_days <= 0 or not os.path.isdir(self.disk_dir):
+            return 0
+        cutoff = (time.time() if now is None else now) - self.stale_version_days * 86400
+        removed = 0
+        for engine in os.scandir(self.disk_dir):
+            if not engine.is_dir():
+                continue
+            for version in os.scandir(engine.path):
+                if not version.is_dir():
+                    continue
+                try:
+                    newest = max([version.stat().st_mtime] + [entry.stat().st_mtime for entry in os.scandir(version.path)])
+                except OSError:
+                    continue
+                if newest < cutoff:
+                    shutil.rmtree(version.path, ignore_errors=True)
+                    removed += 1
+        with self._lock:
+            self._stats["pruned_versions"] += removed
+        return removed
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self._bytes = 0
+            for name in self._stats:
+                self._stats[name] = 0
+        if self.disk_dir:
+            shutil.rmtree(self.disk_dir, ignore_errors=True)
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            lookups = self._stats["hits"] + self._stats["misses"]
+            return {
+                **self._stats,
+                "entries": len(self._entries),
+                "max_entries": self.max_entries,
+                "bytes": self._bytes,
+                "max_bytes": self.max_bytes,
+                "disk_enabled": bool(self.disk_dir),
+                "hit_rate": round(self._stats["hits"] / lookups, 3) if lookups else 0.0,
+            }
+
+
+analysis_cache = AnalysisResultCache.from_env()
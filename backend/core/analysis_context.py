@@ -0,0 +1,195 @@
+"""
+VisionQA Image Analysis Context
+Decodes a screenshot once and memoizes the artifacts the analyzers share.
+
+The accessibility, UI/UX and security engines all accept a context, so auditing one
+capture with several engines pays for a single decode, a single OCR pass, a single
+DINO pass and a single component labeling pass.
+"""
+
+from __future__ import annotations
+
+import base64
+import io
+import os
+import threading
+from typing import IO, Any, Callable, Dict, List, Optional
+
+from PIL import Image
+
+from core.image_upload import open_checked_image
+
+
+class ImageAnalysisContext:
+    """Lazily computed, thread-safe view over one decoded RGB screenshot."""
+
+    # Set by banded contexts: the tallest slice of pixel rows materialized at once.
+    band_height: Optional[int] = None
+
+    def __init__(
+        self,
+        image: Image.Image,
+        source_base64: Optional[str] = None,
+        source_file: Optional[IO[bytes]] = None,
+    ):
+        self.image = image if image.mode == "RGB" else image.convert("RGB")
+        self.width, self.height = self.image.size
+        self._source_base64 = source_base64
+        self._source_file = source_file
+        self._artifacts: Dict[str, Any] = {}
+        self._locks: Dict[str, threading.Lock] = {}
+        self._locks_guard = threading.Lock()
+
+    @classmethod
+    def from_bytes(cls, image_bytes: bytes, source_base64: Optional[str] = None) -> "ImageAnalysisContext":
+        return cls(open_checked_image(io.BytesIO(image_bytes)).convert("RGB"), source_base64=source_base64)
+
+    @classmethod
+    def from_file(cls, fileobj: IO[bytes], max_pixels: Optional[int] = None) -> "ImageAnalysisContext":
+        """Decode straight from an uploaded (spooled) file; the pixel budget is checked from the header first."""
+        fileobj.seek(0)
+        image = open_checked_image(fileobj, max_pixels)
+        image.load()
+        return cls(image, source_file=fileobj)
+
+    @classmethod
+    def from_base64(cls, image_base64: str) -> "ImageAnalysisContext":
+        from core.accessibility.engine import _normalize_base64_image
+
+        stripped = image_base64.split(",", 1)[1] if image_base64.strip().startswith("data:") and "," in image_base64 else image_base64
+        return cls.from_bytes(_normalize_base64_image(image_base64), source_base64=stripped)
+
+    def _memo(self, name: str, factory: Callable[[], Any]) -> Any:
+        if name in self._artifacts:
+            return self._artifacts[name]
+        with self._locks_guard:
+            lock = self._locks.setdefault(name, threading.Lock())
+        with lock:
+            if name not in self._artifacts:
+                self._artifacts[name] = factory()
+        return self._artifacts[name]
+
+    def computed(self, name: str) -> bool:
+        return name in self._artifacts
+
+    @property
+    def source_bytes(self) -> bytes:
+        """The submitted image bytes, or a PNG encoding when the context was built from pixels."""
+        if self._source_file is not None:
+
+            def read() -> bytes:
+                self._source_file.seek(0)
+                return self._source_file.read()
+
+            return self._memo("source_bytes", read)
+        return base64.b64decode(self._source_base64 or self.png_base64)
+
+    @property
+    def source_base64(self) -> str:
+        """The submitted base64 payload, or a PNG encoding when the context was built from pixels."""
+        if self._source_base64:
+            return self._source_base64
+        if self._source_file is not None:
+            return self._memo("source_base64", lambda: base64.b64encode(self.source_bytes).decode("utf-8"))
+        return self.png_base64
+
+    @property
+    def png_base64(self) -> str:
+        from core.accessibility.engine import _image_to_base64
+
+        return self._memo("png_base64", lambda: _image_to_base64(self.image))
+
+    @property
+    def pixel_digest(self) -> str:
+        from core.analysis_cache import image_pixel_digest
+
+        return self._memo("pixel_digest", lambda: image_pixel_digest(self.image))
+
+    @property
+    def rgb_array(self):
+        import numpy as np
+
+        return self._memo("rgb_array", lambda: np.asarray(self.image, dtype=np.uint8))
+
+    @property
+    def gray_array(self):
+        import cv2
+
+        return self._memo("gray_array", lambda: cv2.cvtColor(self.rgb_array, cv2.COLOR_RGB2GRAY))
+
+    @property
+    def luminance(self):
+        from core.accessibility.engine import _linear_luminance
+
+        return self._memo("luminance", lambda: _linear_luminance(self.rgb_array))
+
+    def pixel_rows(self, top: int, bottom: int):
+        """RGB and linear-luminance arrays for image rows ``[top, bottom)``."""
+        return self.rgb_array[top:bottom], self.luminance[top:bottom]
+
+    @property
+    def cache_params(self) -> Dict[str, Any]:
+        """Context settings that change analyzer output and therefore belong in cache keys."""
+        from core.accessibility.engine import _ocr_mode
+
+        # Read per call like the analyzers do, so a changed OCR_MODE / DINO_BACKEND never
+        # serves findings (or an ocr_report) produced under the previous setting.
+        return {
+            "ocr_mode": _ocr_mode(),
+            "dino_backend": os.getenv("DINO_BACKEND", "torch").strip().lower() or "torch",
+            "dino_model": os.getenv("DINO_MODEL_ID", "IDEA-Research/grounding-dino-base"),
+        }
+
+    @property
+    def overlay_scale(self) -> float:
+        return 1.0
+
+    @property
+    def tiling_report(self) -> Dict[str, Any]:
+        return {}
+
+    @property
+    def text_regions(self) -> List[Dict]:
+        from core.accessibility import engine as accessibility_engine
+
+        def detect() -> List[Dict]:
+            report: Dict[str, Any] = {}
+            regions = accessibility_engine._detect_text_regions(self.image, report=report)
+            self._artifacts["ocr_report"] = report
+            return regions
+
+        return self._memo("text_regions", detect)
+
+    @property
+    def ocr_report(self) -> Dict[str, Any]:
+        """OCR mode, pixel coverage and timing of the memoized text-region pass."""
+        self.text_regions
+        return dict(self._artifacts.get("ocr_report") or {})
+
+    @property
+    def dino_elements(self) -> List[Dict]:
+        from core.accessibility import engine as accessibility_engine
+
+        return self._memo("dino_elements", lambda: accessibility_engine._detect_elements_with_dino(self.image))
+
+    @property
+    def raw_component_candidates(self) -> List[Any]:
+        from core.accessibility import engine as accessibility_engine
+
+        return self._memo("raw_component_candidates", lambda: accessibility_engine._raw_component_candidates(self.image))
+
+    @property
+    def component_candidates(self) -> List[Any]:
+        """Component candidates selected without OCR fusion, as used by the UI/UX engine."""
+        from core.accessibility import engine as accessibility_engine
+
+        return self._memo(
+            "component_candidates",
+            lambda: accessibility_engine._select_component_candidates(self.image, self.raw_component_candidates),
+        )
+
+    @property
+    def palette(self) -> List[Dict]:
+        from core.accessibility import engine as accessibility_engine
+
+        return self._memo("palette", lambda: accessibility_engine._palette_summary(self.image))
@@ -0,0 +1,256 @@
+"""
+VisionQA Artifact Store
+Content-addressed local storage for screenshots, crops and overlays.
+
+With the store enabled (``ARTIFACT_STORE_DIR``), analyzers stop embedding PNG base64 in
+their responses. The source capture is stored once as a blob whose ID is the SHA-256 of
+its bytes. Crops and overlays are stored as small JSON recipes (renderer name, source
+ID, arguments) whose ID is the hash of the recipe, and they are rendered to PNG only on
+the first ``/artifacts/{id}`` fetch. Identical captures, crops and overlays therefore
+share one ID and one file.
+"""
+
+from __future__ import annotations
+
+import base64
+import contextvars
+import hashlib
+import io
+import json
+import os
+import re
+import threading
+from collections import OrderedDict
+from contextlib import contextmanager
+from typing import Any, Callable, Dict, Iterator, Optional, Tuple
+
+from PIL import Image
+
+
+ARTIFACT_REF_PREFIX = "artifact:"
+ARTIFACT_ID_PATTERN = re.compile(r"^[0-9a-f]{64}$")
+SOURCE_DECODE_CACHE_SIZE = 2
+
+ArtifactRenderer = Callable[[Image.Image, Dict[str, Any]], Image.Image]
+_RENDERERS: Dict[str, ArtifactRenderer] = {}
+
+
+def register_artifact_renderer(name: str) -> Callable[[ArtifactRenderer], ArtifactRenderer]:
+    """Register a function that draws a lazy artifact from the decoded source image."""
+
+    def decorator(func: ArtifactRenderer) -> ArtifactRenderer:
+        _RENDERERS[name] = func
+        return func
+
+    return decorator
+
+
+@register_artifact_renderer("crop")
+def _render_crop(image: Image.Image, args: Dict[str, Any]) -> Image.Image:
+    return image.crop(tuple(int(value) for value in args["box"]))
+
+
+def encode_png(image: Image.Image) -> bytes:
+    buffer = io.BytesIO()
+    image.save(buffer, format="PNG")
+    return buffer.getvalue()
+
+
+def _media_type(data: bytes) -> str:
+    if data.startswith(b"\x89PNG"):
+        return "image/png"
+    if data.startswith(b"\xff\xd8"):
+        return "image/jpeg"
+    if data[:4] == b"RIFF" and data[8:12] == b"WEBP":
+        return "image/webp"
+    return "application/octet-stream"
+
+
+class ArtifactStore:
+    """Filesystem blob + recipe store addressed by SHA-256."""
+
+    def __init__(self, root_dir: str):
+        self.root_dir = root_dir
+        self._lock = threading.Lock()
+        self._sources: "OrderedDict[str, Image.Image]" = OrderedDict()
+        self._stats = {"blobs_written": 0, "recipes_written": 0, "dedupe_hits": 0, "lazy_renders": 0, "fetches": 0}
+
+    @classmethod
+    def from_env(cls) -> Optional["ArtifactStore"]:
+        root_dir = os.getenv("ARTIFACT_STORE_DIR", "").strip()
+        return cls(root_dir) if root_dir else None
+
+    def _path(self, kind: str, artifact_id: str, suffix: str) -> str:
+        return os.path.join(self.root_dir, kind, artifact_id[:2], f"{artifact_id}{suffix}")
+
+    def _write_once(self, path: str, data: bytes, stat: str) -> None:
+        if os.path.exists(path):
+            with self._lock:
+                self._stats["dedupe_hits"] += 1
+            return
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        temp_path = f"{path}.{threading.get_ident()}.tmp"
+        with open(temp_path, "wb") as handle:
+            handle.write(data)
+        os.replace(temp_path, path)
+        with self._lock:
+            self._stats[stat] += 1
+
+    def put_bytes(self, data: bytes) -> str:
+        artifact_id = hashlib.sha256(data).hexdigest()
+        self._write_once(self._path("blobs", artifact_id, ".bin"), data, "blobs_written")
+        return artifact_id
+
+    def put_recipe(self, renderer: str, source_id: str, args: Dict[str, Any]) -> str:
+        recipe = {"renderer": renderer, "source": source_id, "args": args}
+        encoded = json.dumps(recipe, sort_keys=True, separators=(",", ":")).encode("utf-8")
+        artifact_id = hashlib.sha256(b"recipe\0" + encoded).hexdigest()
+        self._write_once(self._path("recipes", artifact_id, ".json"), encoded, "recipes_written")
+        return artifact_id
+
+    def _read(self, path: str) -> Optional[bytes]:
+        try:
+            with open(path, "rb") as handle:
+                return handle.read()
+        except OSError:
+            return None
+
+    def _source_image(self, source_id: str) -> Optional[Image.Image]:
+        with self._lock:
+            image = self._sources.get(source_id)
+            if image is not None:
+                self._sources.move_to_end(source_id)
+                return image
+        data = self._read(self._path("blobs", source_id, ".bin"))
+        if data is None:
+            return None
+        image = Image.open(io.BytesIO(data)).convert("RGB")
+        with self._lock:
+            self._sources[source_id] = image
+            while len(self._sources) > SOURCE_DECODE_CACHE_SIZE:
+                self._sources.popitem(last=False)
+        return image
+
+    def get(self, artifact_id: str) -> Optional[Tuple[bytes, str]]:
+        """Return ``(bytes, media_type)``; recipes are rendered and persisted on first fetch."""
+        if not ARTIFACT_ID_PATTERN.match(artifact_id or ""):
+            return None
+        with self._lock:
+            self._stats["fetches"] += 1
+
+        data = self._read(self._path("blobs", artifact_id, ".bin"))
+        if data is not None:
+            return data, _media_type(data)
+
+        recipe_bytes = self._read(self._path("recipes", artifact_id, ".json"))
+        if recipe_bytes is None:
+            return None
+        recipe = json.loads(recipe_bytes)
+        renderer = _RENDERERS.get(recipe.get("renderer"))
+        source = self._source_image(recipe.get("source", ""))
+        if renderer is None or source is None:
+            return None
+
+        data = encode_png(renderer(source, recipe.get("args") or {}))
+        # Rendered output is stored under the recipe ID so later fetches are plain reads.
+        self._write_once(self._path("blobs", artifact_id, ".bin"), data, "blobs_written")
+        with self._lock:
+            self._stats["lazy_renders"] += 1
+        return data, "image/png"
+
+    def get_base64(self, artifact_id: Optional[str]) -> Optional[str]:
+        artifact = self.get(artifact_id) if artifact_id else None
+        return base64.b64encode(artifact[0]).decode("utf-8") if artifact else None
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {**self._stats, "root_dir": self.root_dir}
+
+
+class ArtifactSession:
+    """Per-analysis binding between one decoded capture and the store."""
+
+    def __init__(self, store: ArtifactStore, context):
+        self.store = store
+        self.context = context
+
+    @property
+    def source_id(self) -> str:
+        # Memoized on the context, so engines sharing one capture store the source once.
+        # The submitted bytes are stored as-is; the full capture is not re-encoded.
+        return self.context._memo(
+            f"artifact_source:{self.store.root_dir}",
+            lambda: self.store.put_bytes(self.context.source_bytes),
+        )
+
+    def source_ref(self) -> str:
+        return f"{ARTIFACT_REF_PREFIX}{self.source_id}"
+
+    def render_ref(self, renderer: str, args: Dict[str, Any]) -> str:
+        return f"{ARTIFACT_REF_PREFIX}{self.store.put_recipe(renderer, self.source_id, args)}"
+
+    def finalize(self, value: Any) -> Any:
+        """Move ``artifact:`` references out of ``*_image_base64`` fields into ``*_artifact_id`` fields."""
+        if isinstance(value, list):
+            return [self.finalize(item) for item in value]
+        if not isinstance(value, dict):
+            return value
+
+        finalized: Dict[str, Any] = {}
+        for key, item in value.items():
+            if isinstance(item, str) and item.startswith(ARTIFACT_REF_PREFIX) and key.endswith("_image_base64"):
+                finalized[key] = ""
+                finalized[f"{key[:-len('_image_base64')]}_artifact_id"] = item[len(ARTIFACT_REF_PREFIX):]
+            else:
+                finalized[key] = self.finalize(item)
+        return finalized
+
+
+_active_session: "contextvars.ContextVar[Optional[ArtifactSession]]" = contextvars.ContextVar(
+    "visionqa_artifact_session", default=None
+)
+
+
+@contextmanager
+def artifact_session(store: Optional[ArtifactStore], context) -> Iterator[Optional[ArtifactSession]]:
+    if store is None:
+        yield None
+        return
+    session = ArtifactSession(store, context)
+    token = _active_session.set(session)
+    try:
+        yield session
+    finally:
+        _active_session.reset(token)
+
+
+def _session_for(image: Image.Image) -> Optional[ArtifactSession]:
+    session = _active_session.get()
+    if session is not None and session.context.image is image:
+        return session
+    return None
+
+
+def render_artifact(image: Image.Image, renderer: str, args: Dict[str, Any]) -> str:
+    """Inline PNG base64 without a store; a lazy ``artifact:`` reference inside an artifact session."""
+    session = _session_for(image)
+    if session is not None:
+        return session.render_ref(renderer, args)
+    return base64.b64encode(encode_png(_RENDERERS[renderer](image, args))).decode("utf-8")
+
+
+def source_artifact(context, inline: Callable[[], str]) -> str:
+    session = _session_for(context.image)
+    return session.source_ref() if session is not None else inline()
+
+
+artifact_store = ArtifactStore.from_env()
+
+
+def resolve_artifact_base64(artifacts: Dict[str, Any], name: str) -> Optional[str]:
+    """Inline ``<name>_image_base64`` when present, otherwise the stored ``<name>_artifact_id``."""
+    inline = artifacts.get(f"{name}_image_base64")
+    if inline:
+        return inline
+    artifact_id = artifacts.get(f"{name}_artifact_id")
+    return artifact_store.get_base64(artifact_id) if artifact_store is not None and artifact_id else None
@@ -0,0 +1,145 @@
+"""
+VisionQA Image Upload
+Binary screenshot ingestion for the analyzer endpoints.
+
+The ``/analyze-upload`` endpoints take the screenshot as the raw request body
+(``image/*`` or ``application/octet-stream``, options in the query string) or as the
+``image`` part of a multipart form. Either way the bytes land in a spooled temporary
+file: small captures stay in memory, large ones roll over to disk, and no base64 copy
+is made. The image header is read and the pixel count checked before the full decode.
+"""
+
+from __future__ import annotations
+
+import json
+import os
+import tempfile
+from typing import IO, Any, Dict, Optional
+
+from PIL import Image
+
+
+SPOOL_MEMORY_BYTES = 8 * 1024 * 1024
+
+
+def max_upload_bytes() -> int:
+    return int(os.getenv("ANALYSIS_MAX_UPLOAD_MB", "64")) * 1024 * 1024
+
+
+def max_image_pixels() -> int:
+    return int(os.getenv("ANALYSIS_MAX_IMAGE_PIXELS", "60000000"))
+
+
+class UploadRejected(ValueError):
+    """Upload that cannot be analyzed; ``status_code`` is the HTTP status to answer with."""
+
+    def __init__(self, message: str, status_code: int = 400):
+        super().__init__(message)
+        self.status_code = status_code
+
+
+def open_checked_image(fileobj: IO[bytes], max_pixels: Optional[int] = None) -> Image.Image:
+    """Open an image lazily and reject it from the header alone when it exceeds the pixel budget."""
+    limit = max_image_pixels() if max_pixels is None else max_pixels
+    try:
+        image = Image.open(fileobj)
+    except Exception as exc:
+        raise UploadRejected(f"Unsupported or corrupt image: {exc}") from exc
+    if limit > 0 and image.width * image.height > limit:
+        raise UploadRejected(
+            f"Image is {image.width}x{image.height} ({image.width * image.height} px); the limit is {limit} px.",
+            status_code=413,
+        )
+    return image
+
+
+class ImageUpload:
+    """Spooled image file plus the non-file form/query fields that came with it."""
+
+    def __init__(self, file: IO[bytes], fields: Dict[str, str]):
+        self.file = file
+        self.fields = fields
+
+    def field(self, name: str, default: Optional[str] = None) -> Optional[str]:
+        value = self.fields.get(name)
+        return default if value in (None, "") else value
+
+    def bool_field(self, name: str) -> Optional[bool]:
+        value = self.field(name)
+        return None if value is None else value.strip().lower() in {"1", "true", "yes", "on"}
+
+    def int_field(self, name: str) -> Optional[int]:
+        value = self.field(name)
+        try:
+            return None if value is None else int(value)
+        except ValueError as exc:
+            raise UploadRejected(f"'{name}' must be an integer.") from exc
+
+    def json_field(self, name: str, default: Any) -> Any:
+        value = self.field(name)
+        if value is None:
+            return default
+        try:
+            return json.loads(value)
+        except json.JSONDecodeError as exc:
+            raise UploadRejected(f"'{name}' must be valid JSON.") from exc
+
+    def image_size(self, max_pixels: Optional[int] = None) -> tuple[int, int]:
+        self.file.seek(0)
+        return open_checked_image(self.file, max_pixels).size
+
+    def close(self) -> None:
+        try:
+            self.file.close()
+        except Exception:
+            pass
+
+
+async def read_image_upload(request, max_bytes: Optional[int] = None) -> ImageUpload:
+    """Stream the request body (or its multipart ``image`` part) into a spooled file."""
+    limit = max_upload_bytes() if max_bytes is None else max_bytes
+    content_type = request.headers.get("content-type", "")
+    if content_type.startswith("multipart/form-data"):
+        return await _read_multipart(request, limit)
+
+    declared = request.headers.get("content-length")
+    if declared and declared.isdigit() and int(declared) > limit:
+        raise UploadRejected(f"Upload exceeds {limit} bytes.", status_code=413)
+
+    spool = tempfile.SpooledTemporaryFile(max_size=SPOOL_MEMORY_BYTES)
+    size = 0
+    async for chunk in request.stream():
+        size += len(chunk)
+        if size > limit:
+            spool.close()
+            raise UploadRejected(f"Upload exceeds {limit} bytes.", status_code=413)
+        spool.write(chunk)
+    if size == 0:
+        spool.close()
+        raise UploadRejected("Upload body is empty.")
+    spool.seek(0)
+    return ImageUpload(spool, dict(request.query_params))
+
+
+async def _read_multipart(request, limit: int) -> ImageUpload:
+    try:
+        form = await request.form()
+    except AssertionError as exc:
+        # Starlette asserts when python-multipart is missing.
+        raise UploadRejected(
+            "Multipart uploads need python-multipart; send the image as the raw request body instead.",
+            status_code=415,
+        ) from exc
+
+    image = form.get("image")
+    if image is None or isinstance(image, str):
+        raise UploadRejected("Multipart upload needs an 'image' file field.")
+    image.file.seek(0, os.SEEK_END)
+    if image.file.tell() > limit:
+        image.file.close()
+        raise UploadRejected(f"Upload exceeds {limit} bytes.", status_code=413)
+    image.file.seek(0)
+
+    fields = dict(request.query_params)
+    fields.update({key: value for key, value in form.items() if isinstance(value, str)})
+    return ImageUpload(image.file, fields)
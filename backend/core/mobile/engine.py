@@ -2,7 +2,7 @@ from __future__ import annotations
 
 import base64
 import io
-from typing import Any, Dict, List, Optional
+from typing import Any, Dict, List, Optional, Tuple
 
 from PIL import Image
 
@@ -15,8 +15,12 @@ class MobileAnalysisEngine:
         screen_name: Optional[str],
         image_base64: Optional[str],
         element_metadata: List[Dict[str, Any]],
+        image_size: Optional[Tuple[int, int]] = None,
     ) -> Dict[str, Any]:
-        image_meta = self._image_meta(image_base64)
+        if image_size is not None:
+            image_meta = {"width": int(image_size[0]), "height": int(image_size[1])}
+        else:
+            image_meta = self._image_meta(image_base64)
         width = image_meta.get("width", 0)
         height = image_meta.get("height", 0)
         if not width or not height:
@@ -0,0 +1,214 @@
+"""
+VisionQA DINO Runtime
+Selectable inference backends for Grounding DINO on CPU hosts.
+
+``DINO_BACKEND`` picks how the model runs:
+    torch  fp32 PyTorch model (default, the reference)
+    int8   PyTorch model with dynamic int8 quantization of its Linear layers (CPU only)
+    onnx   ONNX Runtime session over an exported graph (``DINO_ONNX_PATH``, or
+           ``DINO_ONNX_DIR/<model id>.onnx`` when unset); the graph is exported from the
+           fp32 model on first use when the file does not exist yet
+
+Every backend returns outputs with ``logits`` and ``pred_boxes`` tensors, so
+``DINOXClient._post_process`` is shared. ``compare_detections`` scores a backend's
+detections against the fp32 reference; ``scripts/benchmark_dino_backends.py`` uses it
+for the parity report alongside latency and throughput.
+"""
+
+from __future__ import annotations
+
+import os
+import time
+from types import SimpleNamespace
+from typing import Any, Dict, List, Optional, Tuple
+
+
+DINO_BACKENDS = ("torch", "int8", "onnx")
+ONNX_OUTPUT_NAMES = ["logits", "pred_boxes"]
+# GroundingDinoForObjectDetection.forward parametre sirasi (pixel_values, input_ids, ...)
+ONNX_INPUT_NAMES = ["pixel_values", "input_ids", "token_type_ids", "attention_mask", "pixel_mask"]
+
+
+def dino_backend_from_env() -> str:
+    backend = os.getenv("DINO_BACKEND", "torch").strip().lower() or "torch"
+    if backend not in DINO_BACKENDS:
+        raise RuntimeError(f"DINO_BACKEND '{backend}' desteklenmiyor; secenekler: {', '.join(DINO_BACKENDS)}")
+    return backend
+
+
+def default_onnx_path(model_id: str) -> str:
+    cache_dir = os.getenv("DINO_ONNX_DIR", "").strip() or os.path.join(os.path.expanduser("~"), ".cache", "visionqa", "onnx")
+    return os.path.join(cache_dir, f"{model_id.replace('/', '--')}.onnx")
+
+
+def quantize_int8(model):
+    """Linear katmanlarini dinamik int8'e cevirir; agirliklar int8, aktivasyonlar calisma aninda olceklenir."""
+    import torch
+
+    return torch.ao.quantization.quantize_dynamic(model.eval(), {torch.nn.Linear}, dtype=torch.qint8)
+
+
+def export_onnx(model, processor, path: str, opset: int = 17) -> str:
+    """fp32 modeli dinamik batch/token/cozunurluk eksenleriyle ONNX'e aktarir."""
+    import torch
+    from PIL import Image
+
+    sample = processor(
+        images=[Image.new("RGB", (800, 600), "#ffffff")],
+        text=["button. input field."],
+        return_tensors="pt",
+    )
+    # Girdiler isimle baglanir: sonu dict olan args tuple'i export'ta keyword argumanlari olur,
+    # boylece tensorler forward'in pozisyon sirasina bagli kalmadan dogru parametreye gider.
+    inputs = ({name: sample[name] for name in ONNX_INPUT_NAMES},)
+    dynamic_axes = {
+        "input_ids": {0: "batch", 1: "tokens"},
+        "token_type_ids": {0: "batch", 1: "tokens"},
+        "attention_mask": {0: "batch", 1: "tokens"},
+        "pixel_values": {0: "batch", 2: "height", 3: "width"},
+        "pixel_mask": {0: "batch", 1: "height", 2: "width"},
+        "logits": {0: "batch", 2: "tokens"},
+        "pred_boxes": {0: "batch"},
+    }
+
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    temp_path = f"{path}.tmp"
+    with torch.no_grad():
+        torch.onnx.export(
+            model.eval().cpu(),
+            inputs,
+            temp_path,
+            input_names=ONNX_INPUT_NAMES,
+            output_names=ONNX_OUTPUT_NAMES,
+            dynamic_axes=dynamic_axes,
+            opset_version=opset,
+        )
+    os.replace(temp_path, path)
+    return path
+
+
+class OnnxDinoModel:
+    """ONNX Runtime oturumunu ``model(**inputs)`` arayuzuyle saran ince adaptor."""
+
+    def __init__(self, path: str, threads: Optional[int] = None):
+        try:
+            import onnxruntime as ort
+        except ImportError:
+            raise RuntimeError(
+                "DINO_BACKEND=onnx için 'onnxruntime' kütüphanesi gerekli. "
+                "Lütfen `pip install onnxruntime` çalıştırın."
+            )
+
+        options = ort.SessionOptions()
+        options.graph_optimization_level = ort.GraphOptimizationLevel.ORT_ENABLE_ALL
+        if threads:
+            options.intra_op_num_threads = int(threads)
+        self.path = path
+        self.session = ort.InferenceSession(path, options, providers=["CPUExecutionProvider"])
+        self.input_names = [node.name for node in self.session.get_inputs()]
+
+    def to(self, device: str) -> "OnnxDinoModel":
+        return self
+
+    def __call__(self, **inputs):
+        import torch
+
+        feed = {name: inputs[name].cpu().numpy() for name in self.input_names if name in inputs}
+        logits, pred_boxes = self.session.run(ONNX_OUTPUT_NAMES, feed)
+        return SimpleNamespace(logits=torch.from_numpy(logits), pred_boxes=torch.from_numpy(pred_boxes))
+
+
+def load_dino_model(model_id: str, backend: str, device: str) -> Tuple[Any, Any, str]:
+    """``(model, processor, device)`` dondurur; int8 ve onnx her zaman CPU'da calisir."""
+    from transformers import AutoProcessor, AutoModelForZeroShotObjectDetection
+
+    processor = AutoProcessor.from_pretrained(model_id)
+
+    if backend == "onnx":
+        path = os.getenv("DINO_ONNX_PATH", "").strip() or default_onnx_path(model_id)
+        if not os.path.exists(path):
+            print(f"📦 [Grounding DINO] ONNX grafiği dışa aktarılıyor: {path}")
+            start = time.time()
+            export_onnx(AutoModelForZeroShotObjectDetection.from_pretrained(model_id), processor, path)
+            print(f"✅ [Grounding DINO] ONNX export tamam ({time.time() - start:.1f} saniye)")
+        threads = os.getenv("DINO_ONNX_THREADS", "").strip()
+        return OnnxDinoModel(path, threads=int(threads) if threads else None), processor, "cpu"
+
+    model = AutoModelForZeroShotObjectDetection.from_pretrained(model_id)
+    if backend == "int8":
+        return quantize_int8(model), processor, "cpu"
+    return model.to(device), processor, device
+
+
+# ─────────────────────────────────────────────
+# Dogruluk paritesi
+# ─────────────────────────────────────────────
+
+def _iou(first: List[float], second: List[float]) -> float:
+    x1, y1 = max(first[0], second[0]), max(first[1], second[1])
+    x2, y2 = min(first[2], second[2]), min(first[3], second[3])
+    intersection = max(0.0, x2 - x1) * max(0.0, y2 - y1)
+    union = (
+        (first[2] - first[0]) * (first[3] - first[1])
+        + (second[2] - second[0]) * (second[3] - second[1])
+        - intersection
+    )
+    return intersection / union if union > 0 else 0.0
+
+
+def compare_detections(
+    reference: List[Dict[str, Any]],
+    candidate: List[Dict[str, Any]],
+    iou_threshold: float = 0.5,
+) -> Dict[str, Any]:
+    """
+    Aday backend'in tespitlerini fp32 referansina karsi esler (ayni etiket, IoU >= esik,
+    en yuksek IoU once). Recall referansin kacinin bulundugunu, precision adaylarin
+    kacinin referansta karsiligi oldugunu gosterir.
+    """
+    pairs = sorted(
+        (
+            (_iou(ref["box"], cand["box"]), ref_index, cand_index)
+            for ref_index, ref in enumerate(reference)
+            for cand_index, cand in enumerate(candidate)
+            if ref["label"] == cand["label"]
+        ),
+        reverse=True,
+    )
+    matched_refs, matched_cands, matches = set(), set(), []
+    for iou, ref_index, cand_index in pairs:
+        if iou < iou_threshold:
+            break
+        if ref_index in matched_refs or cand_index in matched_cands:
+            continue
+        matched_refs.add(ref_index)
+        matched_cands.add(cand_index)
+        matches.append((iou, abs(reference[ref_index]["score"] - candidate[cand_index]["score"])))
+
+    return {
+        "reference": len(reference),
+        "candidate": len(candidate),
+        "matched": len(matches),
+        "recall": round(len(matches) / len(reference), 4) if reference else 1.0,
+        "precision": round(len(matches) / len(candidate), 4) if candidate else 1.0,
+        "mean_iou": round(sum(iou for iou, _ in matches) / len(matches), 4) if matches else None,
+        "max_score_delta": round(max((delta for _, delta in matches), default=0.0), 4),
+    }
+
+
+def summarize_parity(per_image: List[Dict[str, Any]]) -> Dict[str, Any]:
+    """Goruntu bazli ``compare_detections`` sonuclarini tek bir mikro-ortalama rapora toplar."""
+    reference = sum(item["reference"] for item in per_image)
+    candidate = sum(item["candidate"] for item in per_image)
+    matched = sum(item["matched"] for item in per_image)
+    ious = [item["mean_iou"] * item["matched"] for item in per_image if item["mean_iou"] is not None]
+    return {
+        "images": len(per_image),
+        "reference": reference,
+        "candidate": candidate,
+        "matched": matched,
+        "recall": round(matched / reference, 4) if reference else 1.0,
+        "precision": round(matched / candidate, 4) if candidate else 1.0,
+        "mean_iou": round(sum(ious) / matched, 4) if matched else None,
+        "max_score_delta": max((item["max_score_delta"] for item in per_image), default=0.0),
+    }
@@ -0,0 +1,422 @@
+"""
+VisionQA DINO Inference Service
+Out-of-process Grounding DINO inference shared by every API worker on a node.
+
+One service process owns the model and its micro-batching queue (see
+``DINOXClient``). API workers talk to it through ``DinoServiceClient`` over a local
+TCP or Unix socket, so the model loads once per node and a forward pass never runs on
+a request handler's event loop.
+
+Run the service:
+    python -m core.models.dino_service --address 127.0.0.1:8765
+    python -m core.models.dino_service --backend stub      # model-free stand-in
+
+Point API workers at it with ``DINO_SERVICE_ADDRESS``; when unset, ``get_dino_client``
+keeps returning the in-process ``DINOXClient``.
+
+Wire format (both directions): an 8-byte header ``>II`` with the JSON length and the
+payload length, then the UTF-8 JSON, then the payload bytes. Images travel as their
+encoded bytes (PNG/JPEG) or as raw RGB rows, never through the filesystem.
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import io
+import json
+import os
+import socket
+import struct
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Any, Dict, List, Optional, Tuple
+
+from core.models.dinox_client import DetectionView, DINOXClient, format_world_view
+
+
+FRAME_HEADER = struct.Struct(">II")
+MAX_FRAME_BYTES = 256 * 1024 * 1024
+DEFAULT_ADDRESS = "127.0.0.1:8765"
+
+
+def _parse_address(address: str) -> Tuple[str, Any]:
+    """``host:port`` veya ``unix:/path/to.sock`` adresini (family, target) ciftine cevirir."""
+    if address.startswith("unix:"):
+        return "unix", address[len("unix:"):]
+    host, _, port = address.rpartition(":")
+    return "tcp", (host or "127.0.0.1", int(port))
+
+
+def encode_frame(header: Dict[str, Any], payload: bytes = b"") -> bytes:
+    header_bytes = json.dumps(header, separators=(",", ":")).encode("utf-8")
+    return FRAME_HEADER.pack(len(header_bytes), len(payload)) + header_bytes + payload
+
+
+def _check_frame(header_length: int, payload_length: int) -> None:
+    if header_length + payload_length > MAX_FRAME_BYTES:
+        raise ValueError(f"Frame too large: {header_length + payload_length} bytes")
+
+
+async def read_frame(reader: asyncio.StreamReader) -> Tuple[Dict[str, Any], bytes]:
+    header_length, payload_length = FRAME_HEADER.unpack(await reader.readexactly(FRAME_HEADER.size))
+    _check_frame(header_length, payload_length)
+    header = json.loads(await reader.readexactly(header_length))
+    payload = await reader.readexactly(payload_length) if payload_length else b""
+    return header, payload
+
+
+def _recv_exactly(sock: socket.socket, size: int) -> bytes:
+    chunks = bytearray()
+    while len(chunks) < size:
+        chunk = sock.recv(size - len(chunks))
+        if not chunk:
+            raise ConnectionError("DINO service closed the connection")
+        chunks.extend(chunk)
+    return bytes(chunks)
+
+
+def read_frame_sync(sock: socket.socket) -> Tuple[Dict[str, Any], bytes]:
+    header_length, payload_length = FRAME_HEADER.unpack(_recv_exactly(sock, FRAME_HEADER.size))
+    _check_frame(header_length, payload_length)
+    header = json.loads(_recv_exactly(sock, header_length))
+    payload = _recv_exactly(sock, payload_length) if payload_length else b""
+    return header, payload
+
+
+def encode_image(source: Any) -> Tuple[Dict[str, Any], bytes]:
+    """Gorseli tel formatina cevirir: byte'lar oldugu gibi, PIL/ndarray ham RGB olarak gider."""
+    from PIL import Image
+
+    if isinstance(source, (bytes, bytearray, memoryview)):
+        return {"encoding": "encoded"}, bytes(source)
+    if isinstance(source, (str, os.PathLike)):
+        with open(source, "rb") as handle:
+            return {"encoding": "encoded"}, handle.read()
+    if not isinstance(source, Image.Image):
+        source = Image.fromarray(source)
+    image = source if source.mode == "RGB" else source.convert("RGB")
+    return {"encoding": "raw", "width": image.width, "height": image.height}, image.tobytes()
+
+
+def decode_image(meta: Dict[str, Any], payload: bytes):
+    from PIL import Image
+
+    if meta.get("encoding") == "raw":
+        return Image.frombytes("RGB", (int(meta["width"]), int(meta["height"])), payload)
+    return Image.open(io.BytesIO(payload)).convert("RGB")
+
+
+# ─────────────────────────────────────────────
+# Backend'ler
+# ─────────────────────────────────────────────
+
+class ModelBackend:
+    """Gercek Grounding DINO modeli; istekler DINOXClient'in micro-batching kuyruguna girer."""
+
+    name = "dino"
+
+    def __init__(self):
+        self.client = DINOXClient()
+
+    def submit(self, image: Any, prompt: str, box_threshold: float, text_threshold: float) -> Future:
+        return self.client.batcher.submit(image, prompt, box_threshold, text_threshold)
+
+    async def detect_views(self, image: Any, views: Dict[str, DetectionView]) -> Dict[str, List[Dict[str, Any]]]:
+        return await self.client.detect_views(image, views)
+
+    def stats(self) -> Dict[str, Any]:
+        return {**self.client.batch_stats(), "cache": self.client.cache_stats()}
+
+
+class StubBackend:
+    """
+    Model gerektirmeyen yerel stand-in. Prompt'taki her etiket icin deterministik bir
+    kutu dondurur; ``delay_ms`` ile inference suresi taklit edilir. Testler ve modelsiz
+    gelistirme ortamlari icindir.
+    """
+
+    name = "stub"
+
+    def __init__(self, delay_ms: float = 0.0, max_workers: int = 2):
+        self.delay_seconds = max(0.0, float(delay_ms)) / 1000
+        self._executor = ThreadPoolExecutor(max_workers=max(1, max_workers), thread_name_prefix="dino-stub")
+        self._requests = 0
+
+    def _detect(self, image: Any, prompt: str, box_threshold: float) -> List[Dict[str, Any]]:
+        if self.delay_seconds:
+            time.sleep(self.delay_seconds)
+        labels = [label.strip() for label in prompt.lower().split(".") if label.strip()][:4]
+        width, height = image.size
+        elements = []
+        for index, label in enumerate(labels):
+            score = round(0.9 - index * 0.1, 3)
+            if score <= box_threshold:
+                continue
+            top = round(height * index / max(1, len(labels)), 1)
+            bottom = round(height * (index + 1) / max(1, len(labels)), 1)
+            elements.append({"label": label, "score": score, "box": [0.0, top, float(width), bottom]})
+        return elements
+
+    def submit(self, image: Any, prompt: str, box_threshold: float, text_threshold: float) -> Future:
+        self._requests += 1
+        return self._executor.submit(self._detect, image, prompt, box_threshold)
+
+    async def detect_views(self, image: Any, views: Dict[str, DetectionView]) -> Dict[str, List[Dict[str, Any]]]:
+        results = await asyncio.gather(*(
+            asyncio.wrap_future(self.submit(image, view.prompt, view.box_threshold, view.text_threshold))
+            for view in views.values()
+        ))
+        return dict(zip(views, results))
+
+    def stats(self) -> Dict[str, Any]:
+        return {"requests": self._requests}
+
+
+def create_backend(name: Optional[str] = None):
+    name = (name or os.getenv("DINO_SERVICE_BACKEND", "dino")).strip().lower()
+    if name == "stub":
+        return StubBackend(delay_ms=float(os.getenv("DINO_STUB_DELAY_MS", "0")))
+    return ModelBackend()
+
+
+# ─────────────────────────────────────────────
+# Sunucu
+# ─────────────────────────────────────────────
+
+class DinoInferenceServer:
+    """Tek bir backend'i (model) yerel socket uzerinden birden fazla API worker'ina acar."""
+
+    def __init__(self, backend, address: str = DEFAULT_ADDRESS):
+        self.backend = backend
+        self.address = address
+        self._server: Optional[asyncio.base_events.Server] = None
+
+    async def start(self) -> str:
+        """Dinlemeye baslar ve gercek adresi dondurur (``:0`` ile rastgele port secilebilir)."""
+        family, target = _parse_address(self.address)
+        if family == "unix":
+            if os.path.exists(target):
+                os.remove(target)
+            self._server = await asyncio.start_unix_server(self._handle_connection, path=target)
+            return self.address
+        self._server = await asyncio.start_server(self._handle_connection, host=target[0], port=target[1])
+        host, port = self._server.sockets[0].getsockname()[:2]
+        self.address = f"{host}:{port}"
+        return self.address
+
+    async def serve_forever(self) -> None:
+        if self._server is None:
+            await self.start()
+        async with self._server:
+            await self._server.serve_forever()
+
+    async def close(self) -> None:
+        if self._server is not None:
+            self._server.close()
+            await self._server.wait_closed()
+
+    async def _respond(self, header: Dict[str, Any], payload: bytes) -> Dict[str, Any]:
+        op = header.get("op")
+        if op == "ping":
+            return {"ok": True, "backend": self.backend.name, "stats": self.backend.stats()}
+        if op not in ("detect", "detect_views"):
+            return {"error": f"unknown op: {op}"}
+        image = decode_image(header.get("image") or {}, payload)
+        if op == "detect_views":
+            views = {name: DetectionView(*view) for name, view in (header.get("views") or {}).items()}
+            return {"views": await self.backend.detect_views(image, views)}
+        future = self.backend.submit(
+            image,
+            header.get("prompt") or DINOXClient.DEFAULT_PROMPT,
+            float(header.get("box_threshold", 0.25)),
+            float(header.get("text_threshold", 0.20)),
+        )
+        return {"elements": await asyncio.wrap_future(future)}
+
+    async def _handle_connection(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        try:
+            while True:
+                try:
+                    header, payload = await read_frame(reader)
+                except asyncio.IncompleteReadError:
+                    break
+                try:
+                    response = await self._respond(header, payload)
+                except Exception as exc:
+                    response = {"error": str(exc)}
+                response["id"] = header.get("id")
+                writer.write(encode_frame(response))
+                await writer.drain()
+        except Exception as exc:
+            print(f"⚠️ [DINO Service] Baglanti hatasi: {exc}")
+        finally:
+            writer.close()
+
+
+# ─────────────────────────────────────────────
+# Istemci
+# ─────────────────────────────────────────────
+
+class DinoServiceClient:
+    """
+    DINOXClient ile ayni arayuze sahip, inference'i DINO servis surecine yaptiran istemci.
+
+    Her istek kendi kisa omurlu baglantisini acar; bu yuzden farkli event loop'lardan
+    (ornegin analiz thread'lerindeki ``asyncio.run``) guvenle kullanilabilir.
+    """
+
+    DEFAULT_PROMPT = DINOXClient.DEFAULT_PROMPT
+    OBSTACLES_PROMPT = DINOXClient.OBSTACLES_PROMPT
+
+    def __init__(self, address: str = DEFAULT_ADDRESS, timeout: float = 60.0):
+        self.address = address
+        self.timeout = float(timeout)
+        self._request_id = 0
+
+    @classmethod
+    def from_env(cls) -> "DinoServiceClient":
+        return cls(
+            address=os.getenv("DINO_SERVICE_ADDRESS", DEFAULT_ADDRESS).strip(),
+            timeout=float(os.getenv("DINO_SERVICE_TIMEOUT_S", "60")),
+        )
+
+    def _next_id(self) -> int:
+        self._request_id += 1
+        return self._request_id
+
+    async def _request(self, header: Dict[str, Any], payload: bytes = b"") -> Dict[str, Any]:
+        family, target = _parse_address(self.address)
+        if family == "unix":
+            connect = asyncio.open_unix_connection(target)
+        else:
+            connect = asyncio.open_connection(target[0], target[1])
+        reader, writer = await asyncio.wait_for(connect, self.timeout)
+        try:
+            writer.write(encode_frame({**header, "id": self._next_id()}, payload))
+            await writer.drain()
+            response, _ = await asyncio.wait_for(read_frame(reader), self.timeout)
+        finally:
+            writer.close()
+        if "error" in response:
+            raise RuntimeError(response["error"])
+        return response
+
+    def _request_sync(self, header: Dict[str, Any], payload: bytes = b"") -> Dict[str, Any]:
+        family, target = _parse_address(self.address)
+        sock = socket.socket(socket.AF_UNIX if family == "unix" else socket.AF_INET, socket.SOCK_STREAM)
+        sock.settimeout(self.timeout)
+        try:
+            sock.connect(target)
+            sock.sendall(encode_frame({**header, "id": self._next_id()}, payload))
+            response, _ = read_frame_sync(sock)
+        finally:
+            sock.close()
+        if "error" in response:
+            raise RuntimeError(response["error"])
+        return response
+
+    @staticmethod
+    def _detect_message(image: Any, prompt: Optional[str], box_threshold: float, text_threshold: float):
+        meta, payload = encode_image(image)
+        header = {
+            "op": "detect",
+            "image": meta,
+            "prompt": prompt or DINOXClient.DEFAULT_PROMPT,
+            "box_threshold": box_threshold,
+            "text_threshold": text_threshold,
+        }
+        return header, payload
+
+    async def ping(self) -> Dict[str, Any]:
+        return await self._request({"op": "ping"})
+
+    async def detect_elements(
+        self,
+        image: Any,
+        prompt: str = None,
+        box_threshold: float = 0.25,
+        text_threshold: float = 0.20,
+    ) -> List[Dict[str, Any]]:
+        try:
+            header, payload = self._detect_message(image, prompt, box_threshold, text_threshold)
+            return (await self._request(header, payload))["elements"]
+        except Exception as e:
+            print(f"❌ [DINO Service] Hata: {e}")
+            return []
+
+    def detect_elements_sync(
+        self,
+        image: Any,
+        prompt: str = None,
+        box_threshold: float = 0.25,
+        text_threshold: float = 0.20,
+    ) -> List[Dict[str, Any]]:
+        try:
+            header, payload = self._detect_message(image, prompt, box_threshold, text_threshold)
+            return self._request_sync(header, payload)["elements"]
+        except Exception as e:
+            print(f"❌ [DINO Service] Hata: {e}")
+            return []
+
+    async def detect_elements_batch(
+        self,
+        images: List[Any],
+        prompt: str = None,
+        box_threshold: float = 0.25,
+        text_threshold: float = 0.20,
+    ) -> List[List[Dict[str, Any]]]:
+        """Istekler ayni anda gonderilir; servis bunlari kendi micro-batch'inde birlestirir."""
+        return list(
+            await asyncio.gather(
+                *(self.detect_elements(image, prompt, box_threshold, text_threshold) for image in images)
+            )
+        )
+
+    async def detect_obstacles(self, image: Any) -> List[Dict[str, Any]]:
+        return await self.detect_elements(image, prompt=self.OBSTACLES_PROMPT, box_threshold=0.30, text_threshold=0.25)
+
+    async def detect_views(self, image: Any, views: Dict[str, DetectionView]) -> Dict[str, List[Dict[str, Any]]]:
+        try:
+            meta, payload = encode_image(image)
+            header = {
+                "op": "detect_views",
+                "image": meta,
+                "views": {name: list(DetectionView(*view)) for name, view in views.items()},
+            }
+            return (await self._request(header, payload))["views"]
+        except Exception as e:
+            print(f"❌ [DINO Service] Hata: {e}")
+            return {name: [] for name in views}
+
+    async def detect_elements_and_obstacles(self, image: Any) -> Dict[str, List[Dict[str, Any]]]:
+        return await self.detect_views(image, DINOXClient.ELEMENT_AND_OBSTACLE_VIEWS)
+
+    async def get_world_view(self, image: Any) -> str:
+        return format_world_view(await self.detect_elements(image))
+
+
+def get_dino_client():
+    """``DINO_SERVICE_ADDRESS`` tanimliysa servis istemcisini, degilse surec ici DINOXClient'i dondurur."""
+    if os.getenv("DINO_SERVICE_ADDRESS", "").strip():
+        return DinoServiceClient.from_env()
+    return DINOXClient()
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description="VisionQA DINO inference service")
+    parser.add_argument("--address", default=os.getenv("DINO_SERVICE_ADDRESS", DEFAULT_ADDRESS))
+    parser.add_argument("--backend", default=None, help="dino (default) or stub")
+    args = parser.parse_args(argv)
+
+    async def run() -> None:
+        server = DinoInferenceServer(create_backend(args.backend), args.address)
+        address = await server.start()
+        print(f"👁️ [DINO Service] {server.backend.name} backend dinliyor: {address}", flush=True)
+        await server.serve_forever()
+
+    asyncio.run(run())
+
+
+if __name__ == "__main__":
+    main()
@@ -1,12 +1,155 @@
 
+import asyncio
+import io
 import os
+import threading
 import time
-from typing import List, Dict, Any, Optional
+from collections import OrderedDict
+from concurrent.futures import Future, TimeoutError as FutureTimeoutError
+from dataclasses import dataclass, field
+from typing import Callable, List, Dict, Any, NamedTuple, Optional, Tuple
 from dotenv import load_dotenv
 
+from core.analysis_cache import AnalysisResultCache
+
 load_dotenv()
 
 
+@dataclass
+class DetectionRequest:
+    """Bekleyen tek bir tespit istegi; sonucu ``future`` uzerinden doner."""
+
+    image: Any
+    prompt: str
+    box_threshold: float
+    text_threshold: float
+    future: Future = field(default_factory=Future)
+    # True: sonuç süzülmemiş ham tespitlerdir (label_score dahil); görünümlere bölmek için
+    raw: bool = False
+
+
+class DetectionView(NamedTuple):
+    """Tek forward pass'ten bölünecek bir tespit görünümü: prompt'u ve eşikleri."""
+
+    prompt: str
+    box_threshold: float = 0.25
+    text_threshold: float = 0.20
+
+
+class DetectionBatcher:
+    """
+    Eszamanli gelen tespit isteklerini kisa bir pencere boyunca toplayip tek forward
+    pass'te calistiran micro-batching kuyrugu.
+
+    Ilk istek geldiginde ``window_ms`` kadar beklenir (veya ``max_batch_size`` dolana
+    kadar); toplanan istekler prompt'a gore gruplanip ``run_batch``'e verilir. Kuyruk
+    thread tabanli oldugu icin farkli event loop'lardan (ornegin analiz thread'lerinde
+    ``asyncio.run``) gelen istekler de ayni batch'e girebilir.
+    """
+
+    def __init__(
+        self,
+        run_batch: Callable[[List[DetectionRequest]], List[List[Dict[str, Any]]]],
+        max_batch_size: int = 4,
+        window_ms: float = 10.0,
+    ):
+        self.run_batch = run_batch
+        self.max_batch_size = max(1, int(max_batch_size))
+        self.window_seconds = max(0.0, float(window_ms)) / 1000
+        self._pending: List[DetectionRequest] = []
+        self._condition = threading.Condition()
+        self._worker: Optional[threading.Thread] = None
+        self._stats = {"requests": 0, "batches": 0, "largest_batch": 0}
+
+    def submit(
+        self, image: Any, prompt: str, box_threshold: float, text_threshold: float, raw: bool = False
+    ) -> Future:
+        request = DetectionRequest(image, prompt, box_threshold, text_threshold, raw=raw)
+        with self._condition:
+            self._pending.append(request)
+            self._stats["requests"] += 1
+            if self._worker is None or not self._worker.is_alive():
+                self._worker = threading.Thread(target=self._loop, name="dino-batcher", daemon=True)
+                self._worker.start()
+            self._condition.notify_all()
+        return request.future
+
+    def _next_batch(self) -> List[DetectionRequest]:
+        with self._condition:
+            while not self._pending:
+                self._condition.wait()
+            deadline = time.monotonic() + self.window_seconds
+            while len(self._pending) < self.max_batch_size:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                self._condition.wait(remaining)
+            batch, self._pending = self._pending[: self.max_batch_size], self._pending[self.max_batch_size :]
+            return batch
+
+    def _loop(self) -> None:
+        while True:
+            batch = self._next_batch()
+            try:
+                groups: Dict[str, List[DetectionRequest]] = {}
+                for request in batch:
+                    groups.setdefault(request.prompt, []).append(request)
+                for group in groups.values():
+                    self._run_group(group)
+            except Exception as exc:
+                # Tek bir bozuk batch kuyruk thread'ini oldurmemeli; bekleyenlere hata iletilir.
+                print(f"❌ [DINO Batcher] Batch islenemedi: {exc}")
+                for request in batch:
+                    if not request.future.done():
+                        request.future.set_exception(exc)
+
+    def _run_group(self, group: List[DetectionRequest]) -> None:
+        # Bekleyeni iptal edilmis istekler (istemci koptu, wait_for timeout) calistirilmaz;
+        # kalanlar RUNNING'e gecer ve artik iptal edilemez.
+        group = [request for request in group if request.future.set_running_or_notify_cancel()]
+        if not group:
+            return
+        with self._condition:
+            self._stats["batches"] += 1
+            self._stats["largest_batch"] = max(self._stats["largest_batch"], len(group))
+        try:
+            results = self.run_batch(group)
+        except Exception as exc:
+            for request in group:
+                if not request.future.done():
+                    request.future.set_exception(exc)
+            return
+        for request, elements in zip(group, results):
+            if not request.future.done():
+                request.future.set_result(elements)
+
+    def stats(self) -> Dict[str, Any]:
+        with self._condition:
+            batches = self._stats["batches"]
+            return {
+                **self._stats,
+                "pending": len(self._pending),
+                "average_batch_size": round(self._stats["requests"] / batches, 2) if batches else 0.0,
+                "max_batch_size": self.max_batch_size,
+                "window_ms": self.window_seconds * 1000,
+            }
+
+
+def format_world_view(elements: List[Dict[str, Any]]) -> str:
+    """Tespit edilen elementleri LLM için World View metnine çevirir."""
+    if not elements:
+        return "No UI elements detected via Grounding DINO."
+
+    lines = ["### VISUAL WORLD VIEW (Detected via Grounding DINO)"]
+    for i, elem in enumerate(elements, 1):
+        label = elem.get("label", "element")
+        box = elem.get("box", [])
+        score = elem.get("score", 0)
+        lines.append(f"{i}. [{label}] at {box} (confidence: {score:.2f})")
+
+    return "\n".join(lines)
+
+
 class DINOXClient:
     """
     👁️ VisionQA — Grounding DINO (Lokal) Görsel Element Tespit Motoru
@@ -19,11 +162,17 @@ class DINOXClient:
       - Sonraki çalışmalarda cache'den okunur (internet gerekmez)
       - Model bellekte tutulur, her analiz ~1-2 saniye sürer
       - Proje bittiğinde DINO-X Cloud API'ye geçiş tek satır değişikliğidir
+      - Eşzamanlı detect_elements çağrıları micro-batching kuyruğunda toplanıp
+        tek forward pass'te çalıştırılır (DINO_MAX_BATCH_SIZE, DINO_BATCH_WINDOW_MS)
+      - Aynı görsel + prompt için sonuçlar LRU bellek / disk önbelleğinden süzülerek
+        döner (DINO_CACHE_MAX_ENTRIES, DINO_CACHE_DIR, DINO_CACHE_BOX_FLOOR)
 
     Kullanım:
         client = DINOXClient()
-        elements = await client.detect_elements("screenshot.png")
+        elements = await client.detect_elements(screenshot_bytes)  # PIL / ndarray / PNG bytes / yol
         # [{"label": "button", "score": 0.85, "box": [100, 200, 300, 250]}, ...]
+        batches = await client.detect_elements_batch(["a.png", "b.png"])
+        # [[...a.png elementleri...], [...b.png elementleri...]]
     """
 
     # UI element tespiti için varsayılan prompt
@@ -32,21 +181,72 @@ class DINOXClient:
     # Global engel tespiti için prompt (çerez banner'ları, popup'lar vb.)
     OBSTACLES_PROMPT = "cookie banner. accept button. reject button. close button. popup. modal. overlay. newsletter popup."
 
+    # detect_elements / detect_obstacles ile aynı prompt ve eşikler
+    ELEMENT_AND_OBSTACLE_VIEWS = {
+        "elements": DetectionView(DEFAULT_PROMPT, 0.25, 0.20),
+        "obstacles": DetectionView(OBSTACLES_PROMPT, 0.30, 0.25),
+    }
+
+    # Grounding DINO metin kodlayıcısının token sınırı (max_text_len)
+    MAX_TEXT_TOKENS = 256
+
     _instance: Optional["DINOXClient"] = None
     _model = None
     _processor = None
+    _device = "cpu"
+    _backend = "torch"
+    _batcher: Optional[DetectionBatcher] = None
+    _batcher_lock = threading.Lock()
+    _load_lock = threading.Lock()
+
+    # Prompt'a bağlı ön hesaplar: tokenize edilmiş prompt'lar, label → token pozisyonları
+    # ve label skorlama matrisleri. Prompt'lar sabit olduğu için her biri bir kez hesaplanır.
+    # Tespit sonucu önbelleği (görsel hash'i + prompt + kutu eşiği tabanı). Sonuçlar düşük
+    # bir kutu eşiğinde saklanır; daha sıkı eşikli sorgular saklanan tespitler süzülerek
+    # cevaplanır. Label seçimi (argmax) eşikten bağımsız olduğu için text_threshold da
+    # süzme sırasında birebir uygulanır.
+    _detection_cache = None
+
+    PROMPT_CACHE_SIZE = 64
+    _prompt_cache: "OrderedDict[Any, Any]" = OrderedDict()
+    _prompt_cache_lock = threading.Lock()
 
     def __init__(self):
         self.model_id = os.getenv("DINO_MODEL_ID", "IDEA-Research/grounding-dino-base")
         # torch sadece model kullanılırken import edilecek
         self.device = "cpu"  # Lazy: torch yoksa default cpu
 
-        # Model'i sadece 1 kere yükle (Singleton pattern)
-        if DINOXClient._model is None:
-            self._load_model()
+        # Model'i sadece 1 kere yükle (Singleton pattern); arka plan warm-up'ı ile ilk
+        # istek aynı anda gelirse ikincisi yüklemenin bitmesini bekler.
+        with DINOXClient._load_lock:
+            if DINOXClient._model is None:
+                self._load_model()
         
         self.model = DINOXClient._model
         self.processor = DINOXClient._processor
+        self.device = DINOXClient._device
+        self.backend = DINOXClient._backend
+        self.max_batch_size = max(1, int(os.getenv("DINO_MAX_BATCH_SIZE", "4")))
+        # detect_elements_sync en fazla bu kadar bekler (analiz thread'leri kilitli kalmasin)
+        self.sync_timeout = float(os.getenv("DINO_SYNC_TIMEOUT_S", "300"))
+
+        with DINOXClient._batcher_lock:
+            if DINOXClient._batcher is None:
+                DINOXClient._batcher = DetectionBatcher(
+                    self._run_requests,
+                    max_batch_size=self.max_batch_size,
+                    window_ms=float(os.getenv("DINO_BATCH_WINDOW_MS", "10")),
+                )
+        self.batcher = DINOXClient._batcher
+
+        self.cache_box_floor = float(os.getenv("DINO_CACHE_BOX_FLOOR", "0.15"))
+        with DINOXClient._batcher_lock:
+            if DINOXClient._detection_cache is None:
+                DINOXClient._detection_cache = AnalysisResultCache(
+                    max_entries=int(os.getenv("DINO_CACHE_MAX_ENTRIES", "256")),
+                    disk_dir=os.getenv("DINO_CACHE_DIR", "").strip() or None,
+                )
+        self.detection_cache = DINOXClient._detection_cache
 
     def _load_model(self):
         """Model ağırlıklarını yükler (sadece ilk seferde)."""
@@ -59,23 +259,176 @@ class DINOXClient:
                 "DINO modeli için 'torch' ve 'pillow' kütüphaneleri gerekli. "
                 "Lütfen `pip install torch torchvision pillow` çalıştırın."
             )
-        print(f"👁️ [Grounding DINO] Model yükleniyor: {self.model_id}")
-        print(f"   Cihaz: {self.device}")
-        start = time.time()
+        from core.models.dino_runtime import dino_backend_from_env, load_dino_model
 
-        from transformers import AutoProcessor, AutoModelForZeroShotObjectDetection
+        backend = dino_backend_from_env()
+        print(f"👁️ [Grounding DINO] Model yükleniyor: {self.model_id} ({backend})")
+        start = time.time()
 
-        DINOXClient._processor = AutoProcessor.from_pretrained(self.model_id)
-        DINOXClient._model = AutoModelForZeroShotObjectDetection.from_pretrained(
-            self.model_id
-        ).to(self.device)
+        DINOXClient._model, DINOXClient._processor, DINOXClient._device = load_dino_model(
+            self.model_id, backend, self.device
+        )
+        DINOXClient._backend = backend
+        with DINOXClient._prompt_cache_lock:
+            DINOXClient._prompt_cache.clear()
+        print(f"   Cihaz: {DINOXClient._device}")
 
         elapsed = time.time() - start
         print(f"✅ [Grounding DINO] Model hazır! ({elapsed:.1f} saniye)")
 
+    @staticmethod
+    def _load_image(source: Any):
+        """
+        PIL görseli, NumPy dizisi (HxW veya HxWxC, RGB), ham PNG/JPEG byte'ları veya
+        dosya yolunu RGB PIL görseline çevirir. Bellekteki girdiler diske yazılmaz.
+        """
+        from PIL import Image
+
+        if isinstance(source, Image.Image):
+            return source if source.mode == "RGB" else source.convert("RGB")
+        if isinstance(source, (bytes, bytearray, memoryview)):
+            return Image.open(io.BytesIO(source)).convert("RGB")
+        if hasattr(source, "__array_interface__"):
+            return Image.fromarray(source).convert("RGB")
+        return Image.open(source).convert("RGB")
+
+    @staticmethod
+    def _describe_source(source: Any) -> str:
+        if isinstance(source, (str, os.PathLike)):
+            return str(source)
+        size = getattr(source, "size", None)
+        if isinstance(size, tuple):
+            return f"bellekteki görsel {size[0]}x{size[1]}"
+        shape = getattr(source, "shape", None)
+        if shape is not None:
+            return f"ndarray {tuple(shape)}"
+        return f"{len(source)} byte görsel"
+
+    def _cached(self, key: Any, factory: Callable[[], Any]) -> Any:
+        cache = DINOXClient._prompt_cache
+        with DINOXClient._prompt_cache_lock:
+            if key in cache:
+                cache.move_to_end(key)
+                return cache[key]
+        value = factory()
+        with DINOXClient._prompt_cache_lock:
+            cache[key] = value
+            while len(cache) > self.PROMPT_CACHE_SIZE:
+                cache.popitem(last=False)
+        return value
+
+    def _encode_prompts(self, prompts: Tuple[str, ...]):
+        """Batch'in prompt'larını bir kez tokenize eder; aynı prompt listesi tekrar tokenize edilmez."""
+        return self._cached(
+            ("text", prompts),
+            lambda: self.processor.tokenizer(list(prompts), padding="longest", return_tensors="pt"),
+        )
+
+    def _label_positions(self, prompt: str) -> Tuple[List[str], List[List[int]]]:
+        """Prompt'taki her label'ın tokenize edilmiş prompt içindeki token pozisyonları."""
+
+        def build() -> Tuple[List[str], List[List[int]]]:
+            tokenizer = self.processor.tokenizer
+            input_ids = list(tokenizer(prompt).input_ids)
+            labels: List[str] = []
+            positions: List[List[int]] = []
+            for label in dict.fromkeys(l.strip() for l in prompt.split('.') if l.strip()):
+                label_tokens = tokenizer.encode(label, add_special_tokens=False)
+                if not label_tokens:
+                    continue
+                for j in range(len(input_ids) - len(label_tokens) + 1):
+                    if input_ids[j:j + len(label_tokens)] == label_tokens:
+                        labels.append(label)
+                        positions.append(list(range(j, j + len(label_tokens))))
+                        break
+            return labels, positions
+
+        return self._cached(("labels", prompt), build)
+
+    def _label_matrix(self, prompt: str, num_tokens: int, device: Any):
+        """(label, token) ortalama matrisi: ``logits @ matrix.T`` her label'ın ortalama token skorudur."""
+
+        def build():
+            import torch
+
+            labels, positions = self._label_positions(prompt)
+            kept_labels, rows = [], []
+            for label, label_positions in zip(labels, positions):
+                label_positions = [position for position in label_positions if position < num_tokens]
+                if label_positions:
+                    kept_labels.append(label)
+                    rows.append(label_positions)
+            matrix = torch.zeros((len(rows), num_tokens))
+            for row, label_positions in enumerate(rows):
+                matrix[row, label_positions] = 1.0 / len(label_positions)
+            return kept_labels, matrix.to(device)
+
+        return self._cached(("matrix", prompt, num_tokens, str(device)), build)
+
+    def _infer_batch(self, images: List[Any], prompts: List[str]):
+        """Görselleri processor'da pad'leyip tek forward pass'te çalıştırır."""
+        import torch
+
+        # Processor'ın yaptığının aynısı, ama metin kodlaması prompt başına önbellekten gelir.
+        inputs = self.processor.image_processor(images, return_tensors="pt")
+        inputs.update(self._encode_prompts(tuple(prompts)))
+        inputs = inputs.to(self.device)
+
+        with torch.no_grad():
+            outputs = self.model(**inputs)
+        return outputs, inputs
+
+    def _cache_key(self, request: DetectionRequest, prompt: str):
+        """Önbellek anahtarı ve sonucun saklanacağı kutu eşiği tabanı; önbellek kapalıysa anahtar None."""
+        floor = min(self.cache_box_floor, request.box_threshold)
+        cache = getattr(self, "detection_cache", None)
+        if cache is None or not cache.enabled:
+            return None, floor
+        model_version = f"{self.backend}-{self.model_id.replace('/', '--')}"
+        return cache.key_for(
+            "grounding-dino",
+            model_version,
+            request.image,
+            params={"prompt": prompt, "box_floor": floor},
+        ), floor
+
+    def _run_requests(self, requests: List[DetectionRequest]) -> List[List[Dict[str, Any]]]:
+        """
+        Aynı prompt'lu istek grubunu çalıştırır: önbellekte olanlar süzülerek cevaplanır,
+        kalanlar max_batch_size'lık parçalar halinde modelden geçer ve önbelleğe yazılır.
+        """
+        results: List[Optional[List[Dict[str, Any]]]] = [None] * len(requests)
+        misses = []
+        for position, request in enumerate(requests):
+            # Prompt'u küçük harfe çevir (Grounding DINO gereksinimi)
+            prompt = request.prompt.lower()
+            key, floor = self._cache_key(request, prompt)
+            cached = self.detection_cache.get(key) if key is not None else None
+            if cached is not None:
+                results[position] = self._request_result(request, cached["detections"])
+            else:
+                misses.append((position, request, prompt, key, floor))
+
+        for offset in range(0, len(misses), self.max_batch_size):
+            chunk = misses[offset:offset + self.max_batch_size]
+            images = [request.image for _, request, _, _, _ in chunk]
+            prompts = [prompt for _, _, prompt, _, _ in chunk]
+            outputs, inputs = self._infer_batch(images, prompts)
+            for index, (position, request, prompt, key, floor) in enumerate(chunk):
+                detections = self._raw_detections(outputs, request.image, prompt, floor, index=index)
+                if key is not None:
+                    self.detection_cache.set(key, {"detections": detections})
+                results[position] = self._request_result(request, detections)
+        return results
+
+    def _request_result(self, request: DetectionRequest, detections: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        if request.raw:
+            return [detection for detection in detections if detection["score"] > request.box_threshold]
+        return self._filter_detections(detections, request.box_threshold, request.text_threshold)
+
     async def detect_elements(
         self,
-        screenshot_path: str,
+        image: Any,
         prompt: str = None,
         box_threshold: float = 0.25,
         text_threshold: float = 0.20
@@ -83,8 +436,11 @@ class DINOXClient:
         """
         Screenshot üzerindeki UI elementlerini tespit eder.
 
+        İstek micro-batching kuyruğuna girer; aynı pencerede gelen diğer isteklerle
+        birlikte tek forward pass'te çalıştırılır.
+
         Args:
-            screenshot_path: Analiz edilecek görsel dosya yolu
+            image: PIL görseli, NumPy dizisi, ham PNG byte'ları veya dosya yolu
             prompt: Aranacak element türleri (nokta ile ayrılmış)
             box_threshold: Minimum kutu güven skoru (0-1)
             text_threshold: Minimum metin eşleşme skoru (0-1)
@@ -93,33 +449,11 @@ class DINOXClient:
             [{"label": "button", "score": 0.85, "box": [x1, y1, x2, y2]}, ...]
         """
         prompt = prompt or self.DEFAULT_PROMPT
-        print(f"👁️ [Grounding DINO] Analiz ediliyor: {screenshot_path}")
+        print(f"👁️ [Grounding DINO] Analiz ediliyor: {self._describe_source(image)}")
 
         try:
-            import torch
-            from PIL import Image
-            # Görseli aç
-            image = Image.open(screenshot_path).convert("RGB")
-            w, h = image.size
-
-            # Prompt'u küçük harfe çevir (Grounding DINO gereksinimi)
-            prompt_lower = prompt.lower()
-
-            # Model'e gönder
-            inputs = self.processor(
-                images=image,
-                text=prompt_lower,
-                return_tensors="pt"
-            ).to(self.device)
-
-            with torch.no_grad():
-                outputs = self.model(**inputs)
-
-            # Sonuçları işle
-            elements = self._post_process(
-                outputs, inputs, image, prompt_lower,
-                box_threshold, text_threshold
-            )
+            future = self.batcher.submit(self._load_image(image), prompt, box_threshold, text_threshold)
+            elements = await asyncio.wrap_future(future)
 
             print(f"✅ [Grounding DINO] {len(elements)} element bulundu!")
             return elements
@@ -128,13 +462,138 @@ class DINOXClient:
             print(f"❌ [Grounding DINO] Hata: {str(e)}")
             return []
 
-    async def detect_obstacles(self, screenshot_path: str) -> List[Dict[str, Any]]:
+    def detect_elements_sync(
+        self,
+        image: Any,
+        prompt: str = None,
+        box_threshold: float = 0.25,
+        text_threshold: float = 0.20
+    ) -> List[Dict[str, Any]]:
+        """
+        detect_elements'in event loop gerektirmeyen varyantı; analiz thread'lerinden
+        asyncio.run açmadan çağrılabilir. Aynı micro-batching kuyruğunu kullanır.
+        """
+        future = None
+        try:
+            future = self.batcher.submit(self._load_image(image), prompt or self.DEFAULT_PROMPT, box_threshold, text_threshold)
+            return future.result(timeout=self.sync_timeout)
+        except FutureTimeoutError:
+            # Henuz calismaya baslamadiysa kuyruktan duser; calisiyorsa sonucu yok sayilir.
+            future.cancel()
+            print(f"❌ [Grounding DINO] {self.sync_timeout:.0f} sn icinde sonuc gelmedi, istek birakildi.")
+            return []
+        except Exception as e:
+            print(f"❌ [Grounding DINO] Hata: {str(e)}")
+            return []
+
+    async def detect_elements_batch(
+        self,
+        images: List[Any],
+        prompt: str = None,
+        box_threshold: float = 0.25,
+        text_threshold: float = 0.20
+    ) -> List[List[Dict[str, Any]]]:
+        """
+        Birden fazla görseli (detect_elements ile aynı girdi tipleri) pad'lenmiş
+        batch'ler halinde tek seferde analiz eder.
+
+        Returns:
+            Her görsel için detect_elements ile aynı formatta element listesi
+            (girdi sırasıyla). Hata durumunda her görsel için boş liste döner.
+        """
+        if not images:
+            return []
+        prompt = prompt or self.DEFAULT_PROMPT
+        print(f"👁️ [Grounding DINO] Batch analiz: {len(images)} görsel")
+
+        try:
+            requests = [
+                DetectionRequest(self._load_image(source), prompt, box_threshold, text_threshold)
+                for source in images
+            ]
+            results = await asyncio.to_thread(self._run_requests, requests)
+            print(f"✅ [Grounding DINO] Batch tamamlandı: {sum(len(items) for items in results)} element")
+            return results
+
+        except Exception as e:
+            print(f"❌ [Grounding DINO] Batch hata: {str(e)}")
+            return [[] for _ in images]
+
+    def merged_prompt(self, prompts: List[str]) -> Optional[str]:
+        """
+        Prompt'ların label'larını tekrarsız tek prompt'ta birleştirir. Birleşik prompt
+        modelin metin sınırını (MAX_TEXT_TOKENS) aşarsa None döner.
+        """
+        labels = dict.fromkeys(
+            label.strip().lower() for prompt in prompts for label in prompt.split('.') if label.strip()
+        )
+        merged = ". ".join(labels) + "."
+        token_count = self._cached(
+            ("token_count", merged), lambda: len(self.processor.tokenizer(merged).input_ids)
+        )
+        return merged if token_count <= self.MAX_TEXT_TOKENS else None
+
+    @classmethod
+    def _split_views(
+        cls, detections: List[Dict[str, Any]], views: Dict[str, DetectionView]
+    ) -> Dict[str, List[Dict[str, Any]]]:
+        """Birleşik prompt'un ham tespitlerini label'larına göre görünümlere ayırır."""
+        split = {}
+        for name, view in views.items():
+            labels = {label.strip().lower() for label in view.prompt.split('.') if label.strip()}
+            subset = [detection for detection in detections if detection["label"] in labels or detection["label"] == "unknown"]
+            split[name] = cls._filter_detections(subset, view.box_threshold, view.text_threshold)
+        return split
+
+    async def detect_views(self, image: Any, views: Dict[str, DetectionView]) -> Dict[str, List[Dict[str, Any]]]:
+        """
+        Birden fazla prompt'u (ör. UI elementleri + engeller) tek forward pass'te çalıştırır:
+        label'lar tek prompt'ta birleştirilir, sonuçlar her görünümün kendi label'ları ve
+        eşikleriyle süzülür. Birleşik prompt token sınırını aşarsa görünümler ayrı ayrı
+        çalıştırılır.
+
+        Returns:
+            {"görünüm adı": [{"label", "score", "box"}, ...], ...}
+        """
+        views = {name: DetectionView(*view) for name, view in views.items()}
+        print(f"👁️ [Grounding DINO] Tek geçişte {len(views)} görünüm: {self._describe_source(image)}")
+
+        try:
+            image = self._load_image(image)
+            merged = self.merged_prompt([view.prompt for view in views.values()])
+            if merged is None:
+                results = await asyncio.gather(*(
+                    self.detect_elements(image, view.prompt, view.box_threshold, view.text_threshold)
+                    for view in views.values()
+                ))
+                return dict(zip(views, results))
+
+            future = self.batcher.submit(
+                image,
+                merged,
+                min(view.box_threshold for view in views.values()),
+                min(view.text_threshold for view in views.values()),
+                raw=True,
+            )
+            split = self._split_views(await asyncio.wrap_future(future), views)
+            print("✅ [Grounding DINO] " + ", ".join(f"{name}: {len(items)}" for name, items in split.items()))
+            return split
+
+        except Exception as e:
+            print(f"❌ [Grounding DINO] Hata: {str(e)}")
+            return {name: [] for name in views}
+
+    async def detect_elements_and_obstacles(self, image: Any) -> Dict[str, List[Dict[str, Any]]]:
+        """UI elementleri ve engeller tek forward pass'te: {"elements": [...], "obstacles": [...]}."""
+        return await self.detect_views(image, self.ELEMENT_AND_OBSTACLE_VIEWS)
+
+    async def detect_obstacles(self, image: Any) -> List[Dict[str, Any]]:
         """
         Sayfadaki engelleri (çerez banner, popup vb.) tespit eder.
         SelfHealingExecutor tarafından kullanılır.
         """
         return await self.detect_elements(
-            screenshot_path,
+            image,
             prompt=self.OBSTACLES_PROMPT,
             box_threshold=0.30,
             text_threshold=0.25
@@ -147,14 +606,34 @@ class DINOXClient:
         image: Any,
         prompt: str,
         box_threshold: float,
-        text_threshold: float
+        text_threshold: float,
+        index: int = 0
     ) -> List[Dict[str, Any]]:
         """
         Model çıktısını etiketli element listesine dönüştürür.
+        ``index`` batch içindeki görselin sırasıdır; kutular pad'siz görsele göre normalizedir.
+        """
+        return self._filter_detections(
+            self._raw_detections(outputs, image, prompt, box_threshold, index=index),
+            box_threshold,
+            text_threshold,
+        )
+
+    def _raw_detections(
+        self,
+        outputs,
+        image: Any,
+        prompt: str,
+        box_threshold: float,
+        index: int = 0
+    ) -> List[Dict[str, Any]]:
+        """
+        ``box_threshold`` üstündeki kutular; her biri yuvarlanmamış skoru, en iyi label'ı ve
+        o label'ın ortalama token skoruyla (``label_score``). Önbelleğe bu hali yazılır.
         """
         w, h = image.size
-        logits = outputs.logits.sigmoid()[0]  # (num_queries, num_tokens)
-        boxes = outputs.pred_boxes[0]          # (num_queries, 4)
+        logits = outputs.logits.sigmoid()[index]  # (num_queries, num_tokens)
+        boxes = outputs.pred_boxes[index]          # (num_queries, 4)
 
         # Her kutu için en yüksek skoru bul
         max_scores = logits.max(dim=-1)
@@ -164,68 +643,67 @@ class DINOXClient:
         filtered_logits = logits[mask]
         filtered_scores = max_scores.values[mask]
 
-        # Prompt'taki label'ları çıkart
-        labels = [l.strip() for l in prompt.split('.') if l.strip()]
-
-        # Tokenizer ile her label'ın token pozisyonlarını hesapla
-        input_ids = inputs.input_ids[0].tolist()
-        tokenizer = self.processor.tokenizer
-        
-        label_token_map = {}
-        for label in labels:
-            label_tokens = tokenizer.encode(label, add_special_tokens=False)
-            for j in range(len(input_ids) - len(label_tokens) + 1):
-                if input_ids[j:j + len(label_tokens)] == label_tokens:
-                    label_token_map[label] = list(range(j, j + len(label_tokens)))
-                    break
-
-        # Sonuçları oluştur
-        elements = []
-        for i in range(len(filtered_boxes)):
-            score = filtered_scores[i].item()
-            box_raw = filtered_boxes[i].tolist()
-
+        # Label skorlama: her kutu × label için ortalama token skoru tek matris çarpımıyla,
+        # en iyi label argmax ile. text_threshold _filter_detections'ta uygulanır.
+        labels, label_matrix = self._label_matrix(prompt, logits.shape[-1], logits.device)
+        if labels and len(filtered_logits):
+            label_scores = filtered_logits @ label_matrix.T
+            best_scores, best_indices = label_scores.max(dim=-1)
+            best_labels = [labels[i] for i in best_indices.tolist()]
+            best_label_scores = best_scores.tolist()
+        else:
+            best_labels = ["unknown"] * len(filtered_boxes)
+            best_label_scores = [0.0] * len(filtered_boxes)
+
+        detections = []
+        for box_raw, score, label, label_score in zip(
+            filtered_boxes.tolist(), filtered_scores.tolist(), best_labels, best_label_scores
+        ):
             # Normalize koordinatları piksel değerlerine çevir
             cx, cy, bw, bh = box_raw
-            x1 = round((cx - bw / 2) * w, 1)
-            y1 = round((cy - bh / 2) * h, 1)
-            x2 = round((cx + bw / 2) * w, 1)
-            y2 = round((cy + bh / 2) * h, 1)
-
-            # En iyi eşleşen label'ı bul
-            token_scores = filtered_logits[i]
-            best_label = "unknown"
-            best_label_score = 0
-
-            for label, positions in label_token_map.items():
-                if positions:
-                    avg_score = token_scores[positions].mean().item()
-                    if avg_score > best_label_score and avg_score > text_threshold:
-                        best_label_score = avg_score
-                        best_label = label
-
-            elements.append({
-                "label": best_label,
-                "score": round(score, 3),
-                "box": [x1, y1, x2, y2]
+            detections.append({
+                "label": label,
+                "label_score": label_score,
+                "score": score,
+                "box": [
+                    round((cx - bw / 2) * w, 1),
+                    round((cy - bh / 2) * h, 1),
+                    round((cx + bw / 2) * w, 1),
+                    round((cy + bh / 2) * h, 1),
+                ]
             })
+        return detections
+
+    @staticmethod
+    def _filter_detections(
+        detections: List[Dict[str, Any]],
+        box_threshold: float,
+        text_threshold: float
+    ) -> List[Dict[str, Any]]:
+        """Ham tespitleri istenen eşiklere göre süzüp yanıt formatına çevirir."""
+        elements = [
+            {
+                "label": detection["label"] if detection["label_score"] > text_threshold else "unknown",
+                "score": round(detection["score"], 3),
+                "box": list(detection["box"]),
+            }
+            for detection in detections
+            if detection["score"] > box_threshold
+        ]
 
         # Skora göre sırala (en güvenli önce)
         elements.sort(key=lambda x: -x["score"])
 
         return elements
 
-    async def get_world_view(self, screenshot_path: str) -> str:
+    def batch_stats(self) -> Dict[str, Any]:
+        """Micro-batching kuyruğunun istek/batch istatistikleri."""
+        return self.batcher.stats()
+
+    def cache_stats(self) -> Dict[str, Any]:
+        """Tespit önbelleğinin isabet/yazma istatistikleri."""
+        return {**self.detection_cache.stats(), "box_floor": self.cache_box_floor}
+
+    async def get_world_view(self, image: Any) -> str:
         """LLM için World View metni üretir."""
-        elements = await self.detect_elements(screenshot_path)
-        if not elements:
-            return "No UI elements detected via Grounding DINO."
-
-        lines = ["### VISUAL WORLD VIEW (Detected via Grounding DINO)"]
-        for i, elem in enumerate(elements, 1):
-            label = elem.get("label", "element")
-            box = elem.get("box", [])
-            score = elem.get("score", 0)
-            lines.append(f"{i}. [{label}] at {box} (confidence: {score:.2f})")
-
-        return "\n".join(lines)
+        return format_world_view(await self.detect_elements(image))
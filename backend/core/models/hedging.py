@@ -0,0 +1,161 @@
+"""
+VisionQA LLM Hedging
+Latency histograms per provider and the hedge delay derived from them.
+
+``LLMClient`` sends a query to the primary provider (Groq). If no answer has arrived
+once the hedge delay has passed, it starts the secondary provider (Hugging Face) in
+parallel and keeps whichever valid JSON answer arrives first; the loser is cancelled.
+The delay is the primary's observed latency quantile (p95 by default), so hedges
+fire only for the slow tail and follow the provider as it speeds up or slows down.
+Until enough samples exist, a fixed default delay is used.
+
+Both the hedge delay and the latency samples count from the moment the rate limiter
+admits the request (``HedgeClock``), not from when the call was made: time spent
+queued for RPM/TPM budget or paused for a 429 ``Retry-After`` says nothing about the
+provider's speed and would otherwise fire hedges for every throttled call.
+
+Histograms use log-spaced buckets (50 ms to ~150 s, x1.2 per bucket). Counts are halved
+whenever they pass ``max_samples`` so old traffic fades out. A cancelled loser is
+recorded with the time it had already taken. That is a lower bound, but it keeps
+the slow tail visible.
+
+    LLM_HEDGE=true               LLM_HEDGE_QUANTILE=0.95
+    LLM_HEDGE_MIN_SAMPLES=20     LLM_HEDGE_DEFAULT_S=10
+    LLM_HEDGE_MIN_S=1            LLM_HEDGE_MAX_S=30
+"""
+
+from __future__ import annotations
+
+import asyncio
+import bisect
+import os
+import threading
+import time
+from typing import Any, Dict, List, Optional
+
+
+HISTOGRAM_BOUNDS: List[float] = [0.05 * 1.2 ** index for index in range(45)]
+
+
+class LatencyHistogram:
+    """Log-bucketed latency histogram with decay."""
+
+    def __init__(self, max_samples: int = 500):
+        self.max_samples = max(2, int(max_samples))
+        self.counts = [0.0] * (len(HISTOGRAM_BOUNDS) + 1)
+        self.total = 0.0
+        self.observed = 0
+
+    def observe(self, seconds: float) -> None:
+        self.counts[bisect.bisect_left(HISTOGRAM_BOUNDS, max(0.0, seconds))] += 1
+        self.total += 1
+        self.observed += 1
+        if self.total > self.max_samples:
+            self.counts = [count / 2 for count in self.counts]
+            self.total /= 2
+
+    def quantile(self, q: float) -> Optional[float]:
+        """Upper bound of the bucket holding the ``q`` quantile (None when empty)."""
+        if self.total <= 0:
+            return None
+        target, cumulative = q * self.total, 0.0
+        for index, count in enumerate(self.counts):
+            cumulative += count
+            if count and cumulative >= target:
+                return HISTOGRAM_BOUNDS[min(index, len(HISTOGRAM_BOUNDS) - 1)]
+        return HISTOGRAM_BOUNDS[-1]
+
+
+class HedgeClock:
+    """Per-call clock started when the limiter admits the request (restarted on each retry)."""
+
+    def __init__(self):
+        self.admitted = asyncio.Event()
+        self.started_at: Optional[float] = None
+
+    def start(self) -> None:
+        self.started_at = time.perf_counter()
+        self.admitted.set()
+
+    def reset(self) -> None:
+        """Back to queued (e.g. a 429 is waiting out its ``Retry-After``)."""
+        self.started_at = None
+        self.admitted.clear()
+
+    def elapsed(self) -> Optional[float]:
+        """Seconds since admission, or None while the request is still queued."""
+        return None if self.started_at is None else time.perf_counter() - self.started_at
+
+
+class HedgePolicy:
+    """Per-provider latency histograms, the adaptive hedge delay and hedge outcome counters."""
+
+    def __init__(
+        self,
+        enabled: bool = True,
+        quantile: float = 0.95,
+        min_samples: int = 20,
+        default_delay: float = 10.0,
+        min_delay: float = 1.0,
+        max_delay: float = 30.0,
+    ):
+        self.enabled = enabled
+        self.quantile = min(max(float(quantile), 0.5), 0.999)
+        self.min_samples = max(1, int(min_samples))
+        self.default_delay = float(default_delay)
+        self.min_delay = float(min_delay)
+        self.max_delay = max(float(max_delay), self.min_delay)
+        self._histograms: Dict[str, LatencyHistogram] = {}
+        self._lock = threading.Lock()
+        self._stats = {"queries": 0, "hedged": 0, "primary_wins": 0, "secondary_wins": 0, "both_failed": 0}
+
+    @classmethod
+    def from_env(cls) -> "HedgePolicy":
+        return cls(
+            enabled=os.getenv("LLM_HEDGE", "true").strip().lower() in {"1", "true", "yes", "on"},
+            quantile=float(os.getenv("LLM_HEDGE_QUANTILE", "0.95")),
+            min_samples=int(os.getenv("LLM_HEDGE_MIN_SAMPLES", "20")),
+            default_delay=float(os.getenv("LLM_HEDGE_DEFAULT_S", "10")),
+            min_delay=float(os.getenv("LLM_HEDGE_MIN_S", "1")),
+            max_delay=float(os.getenv("LLM_HEDGE_MAX_S", "30")),
+        )
+
+    def observe(self, provider: str, seconds: float) -> None:
+        with self._lock:
+            self._histograms.setdefault(provider, LatencyHistogram()).observe(seconds)
+
+    def delay(self, provider: str) -> float:
+        """How long to wait for ``provider`` before starting the secondary."""
+        with self._lock:
+            histogram = self._histograms.get(provider)
+            if histogram is None or histogram.observed < self.min_samples:
+                return self.default_delay
+            return min(self.max_delay, max(self.min_delay, histogram.quantile(self.quantile)))
+
+    def record(self, outcome: str) -> None:
+        with self._lock:
+            self._stats[outcome] += 1
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            histograms = {
+                name: {
+                    "samples": histogram.observed,
+                    "p50_seconds": round(histogram.quantile(0.5) or 0.0, 3),
+                    "p95_seconds": round(histogram.quantile(0.95) or 0.0, 3),
+                    "p99_seconds": round(histogram.quantile(0.99) or 0.0, 3),
+                }
+                for name, histogram in self._histograms.items()
+            }
+            stats = dict(self._stats)
+        delays = {name: round(self.delay(name), 3) for name in histograms}
+        return {
+            **stats,
+            "enabled": self.enabled,
+            "quantile": self.quantile,
+            "hedge_delay_seconds": delays,
+            "providers": histograms,
+        }
+
+
+llm_hedge_policy = HedgePolicy.from_env()
@@ -0,0 +1,192 @@
+"""
+VisionQA LLM HTTP Pool
+Long-lived, pooled HTTP transport shared by every ``LLMClient``.
+
+Each provider (Groq, Hugging Face, ...) gets its own ``httpx.AsyncClient`` with its own
+keep-alive connection pool, so consecutive LLM calls of a case-generation run reuse
+one TCP/TLS connection instead of paying DNS, TCP and TLS setup per call. HTTP/2 is
+used when the ``h2`` package is installed (``httpx[http2]``).
+
+httpx connections belong to the event loop that opened them, so clients are kept per
+running loop; the server's main loop gets one app-lifetime client per provider and is
+closed from the FastAPI lifespan. Short-lived loops (``asyncio.run``, the per-execution
+loop of the Playwright runner) register a small async-generator guard on first use,
+so their clients are closed by ``loop.shutdown_asyncgens()`` when the loop finishes
+instead of leaking sockets. Reuse is measured with httpcore trace events: a
+request that did not open a TCP connection rode on a pooled one.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import contextlib
+import os
+import threading
+import weakref
+from typing import Any, AsyncIterator, Awaitable, Callable, Dict, Tuple
+
+import httpx
+
+try:
+    import h2  # noqa: F401
+    HTTP2_AVAILABLE = True
+except ImportError:
+    HTTP2_AVAILABLE = False
+
+
+class LLMHttpPool:
+    """Per-provider pooled ``httpx.AsyncClient`` instances plus connection-reuse metrics."""
+
+    def __init__(
+        self,
+        max_connections: int = 20,
+        max_keepalive_connections: int = 10,
+        keepalive_expiry: float = 60.0,
+        http2: bool = True,
+        timeout: float = 60.0,
+    ):
+        self.limits = httpx.Limits(
+            max_connections=max(1, int(max_connections)),
+            max_keepalive_connections=max(0, int(max_keepalive_connections)),
+            keepalive_expiry=float(keepalive_expiry),
+        )
+        self.http2 = bool(http2) and HTTP2_AVAILABLE
+        self.timeout = float(timeout)
+        self._clients: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, Dict[str, httpx.AsyncClient]]" = (
+            weakref.WeakKeyDictionary()
+        )
+        self._guards: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, AsyncIterator[None]]" = (
+            weakref.WeakKeyDictionary()
+        )
+        self._lock = threading.Lock()
+        self._stats: Dict[str, Dict[str, Any]] = {}
+
+    @classmethod
+    def from_env(cls) -> "LLMHttpPool":
+        return cls(
+            max_connections=int(os.getenv("LLM_HTTP_MAX_CONNECTIONS", "20")),
+            max_keepalive_connections=int(os.getenv("LLM_HTTP_MAX_KEEPALIVE", "10")),
+            keepalive_expiry=float(os.getenv("LLM_HTTP_KEEPALIVE_EXPIRY_S", "60")),
+            http2=os.getenv("LLM_HTTP2", "true").strip().lower() in {"1", "true", "yes", "on"},
+            timeout=float(os.getenv("LLM_HTTP_TIMEOUT_S", "60")),
+        )
+
+    def _provider_stats(self, provider: str) -> Dict[str, Any]:
+        return self._stats.setdefault(
+            provider,
+            {"requests": 0, "new_connections": 0, "reused_connections": 0, "tls_handshakes": 0,
+             "errors": 0, "clients_opened": 0, "http_versions": {}},
+        )
+
+    def client(self, provider: str) -> httpx.AsyncClient:
+        """The pooled client for ``provider`` on the running event loop (created on first use)."""
+        loop = asyncio.get_running_loop()
+        with self._lock:
+            clients = self._clients.setdefault(loop, {})
+            client = clients.get(provider)
+            if client is None or client.is_closed:
+                client = httpx.AsyncClient(limits=self.limits, http2=self.http2, timeout=self.timeout)
+                clients[provider] = client
+                self._provider_stats(provider)["clients_opened"] += 1
+            return client
+
+    async def _close_with_loop(self) -> AsyncIterator[None]:
+        try:
+            yield
+        finally:
+            await self.aclose()
+
+    async def _guard_loop(self) -> None:
+        """Close this loop's clients when the loop shuts down its async generators."""
+        loop = asyncio.get_running_loop()
+        with self._lock:
+            if loop in self._guards:
+                return
+            guard = self._close_with_loop()
+            self._guards[loop] = guard
+        await guard.__anext__()
+
+    @staticmethod
+    def _tracer() -> Tuple[Dict[str, bool], Callable[[str, Dict[str, Any]], Awaitable[None]]]:
+        opened = {"tcp": False, "tls": False}
+
+        async def trace(event_name: str, info: Dict[str, Any]) -> None:
+            if event_name == "connection.connect_tcp.complete":
+                opened["tcp"] = True
+            elif event_name == "connection.start_tls.complete":
+                opened["tls"] = True
+
+        return opened, trace
+
+    def _record(self, provider: str, opened: Dict[str, bool], response: httpx.Response) -> None:
+        with self._lock:
+            stats = self._provider_stats(provider)
+            stats["requests"] += 1
+            stats["new_connections" if opened["tcp"] else "reused_connections"] += 1
+            stats["tls_handshakes"] += int(opened["tls"])
+            versions = stats["http_versions"]
+            versions[response.http_version] = versions.get(response.http_version, 0) + 1
+
+    def _record_error(self, provider: str) -> None:
+        with self._lock:
+            self._provider_stats(provider)["errors"] += 1
+
+    async def post(self, provider: str, url: str, **kwargs: Any) -> httpx.Response:
+        """POST over the provider's pool; connection reuse and HTTP version are recorded."""
+        await self._guard_loop()
+        opened, trace = self._tracer()
+        extensions = {**kwargs.pop("extensions", {}), "trace": trace}
+        try:
+            response = await self.client(provider).post(url, extensions=extensions, **kwargs)
+        except Exception:
+            self._record_error(provider)
+            raise
+        self._record(provider, opened, response)
+        return response
+
+    @contextlib.asynccontextmanager
+    async def stream(self, provider: str, url: str, **kwargs: Any) -> AsyncIterator[httpx.Response]:
+        """Streaming POST (e.g. server-sent completions) over the same pool and metrics as ``post``."""
+        await self._guard_loop()
+        opened, trace = self._tracer()
+        extensions = {**kwargs.pop("extensions", {}), "trace": trace}
+        try:
+            async with self.client(provider).stream("POST", url, extensions=extensions, **kwargs) as response:
+                self._record(provider, opened, response)
+                yield response
+        except httpx.HTTPError:
+            self._record_error(provider)
+            raise
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            providers = {
+                name: {
+                    **stats,
+                    "http_versions": dict(stats["http_versions"]),
+                    "reuse_rate": round(stats["reused_connections"] / stats["requests"], 3) if stats["requests"] else 0.0,
+                }
+                for name, stats in self._stats.items()
+            }
+            open_clients = sum(
+                1 for clients in self._clients.values() for client in clients.values() if not client.is_closed
+            )
+        return {
+            "http2": self.http2,
+            "max_connections": self.limits.max_connections,
+            "max_keepalive_connections": self.limits.max_keepalive_connections,
+            "keepalive_expiry": self.limits.keepalive_expiry,
+            "open_clients": open_clients,
+            "providers": providers,
+        }
+
+    async def aclose(self) -> None:
+        """Close the clients of the running loop (app shutdown, or the loop's own shutdown)."""
+        loop = asyncio.get_running_loop()
+        with self._lock:
+            clients = self._clients.pop(loop, {})
+        for client in clients.values():
+            await client.aclose()
+
+
+llm_http_pool = LLMHttpPool.from_env()
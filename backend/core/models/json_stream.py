@@ -0,0 +1,99 @@
+"""
+VisionQA Incremental Case Parser
+Pulls test cases out of a streamed LLM JSON answer as soon as each one is complete.
+
+The test-generation answer is one object of category arrays::
+
+    {"page_analysis_summary": "...", "happy_path": [{...}, {...}], "negative_path": [{...}]}
+
+Instead of waiting for the whole completion, ``IncrementalCaseParser.feed`` scans every
+chunk with a small bracket/string state machine and returns ``(category, case)`` pairs
+for each object that closes directly inside a top-level array. Text before the root
+``{`` (markdown fences, chatter) is skipped. Objects that fail to decode are dropped;
+``text`` keeps the full answer for the regular ``_parse_json_response`` fallback.
+"""
+
+from __future__ import annotations
+
+import json
+from typing import Any, Dict, List, Optional, Tuple
+
+
+class IncrementalCaseParser:
+    """Feed text chunks; get back the cases completed by each chunk."""
+
+    def __init__(self):
+        self._chunks: List[str] = []
+        self._stack: List[str] = []
+        self._started = False
+        self._done = False
+        self._in_string = False
+        self._escaped = False
+        self._string: List[str] = []
+        self._last_key: Optional[str] = None
+        self._array_key: Optional[str] = None
+        self._capture: Optional[List[str]] = None
+        self.cases_emitted = 0
+
+    @property
+    def text(self) -> str:
+        return "".join(self._chunks)
+
+    def feed(self, chunk: str) -> List[Tuple[str, Dict[str, Any]]]:
+        self._chunks.append(chunk)
+        completed: List[Tuple[str, Dict[str, Any]]] = []
+        for char in chunk:
+            if self._done:
+                break
+            if not self._started:
+                if char == "{":
+                    self._started = True
+                    self._stack.append("{")
+                continue
+
+            capture = self._capture
+            if capture is not None:
+                capture.append(char)
+
+            if self._in_string:
+                if char == "\\" and not self._escaped:
+                    self._escaped = True
+                    continue
+                if char == '"' and not self._escaped:
+                    self._in_string = False
+                    if self._stack == ["{"]:
+                        self._last_key = "".join(self._string)
+                elif self._stack == ["{"]:
+                    self._string.append(char)
+                self._escaped = False
+                continue
+
+            if char == '"':
+                self._in_string = True
+                self._string = []
+            elif char in "{[":
+                if char == "{" and self._stack == ["{", "["]:
+                    self._capture = ["{"]
+                elif char == "[" and self._stack == ["{"]:
+                    self._array_key = self._last_key
+                self._stack.append(char)
+            elif char in "}]":
+                if self._stack:
+                    self._stack.pop()
+                if char == "}" and capture is not None and self._stack == ["{", "["]:
+                    self._capture = None
+                    case = self._decode("".join(capture))
+                    if case is not None:
+                        completed.append((self._array_key or "", case))
+                elif not self._stack:
+                    self._done = True
+        self.cases_emitted += len(completed)
+        return completed
+
+    @staticmethod
+    def _decode(raw: str) -> Optional[Dict[str, Any]]:
+        try:
+            value = json.loads(raw)
+        except json.JSONDecodeError:
+            return None
+        return value if isinstance(value, dict) else None
@@ -0,0 +1,168 @@
+"""
+VisionQA LLM Response Cache
+Persistent SQLite cache for LLM completions.
+
+``identify_page_purpose`` and ``generate_test_cases`` are asked the same question every
+time cases are regenerated for an unchanged page. Responses are stored under a SHA-256
+of provider, model, system prompt, temperature and the *normalized* user prompt, so a
+repeat returns from disk in milliseconds instead of a multi-second provider round-trip.
+
+Normalization makes near-identical world views share a key: whitespace is collapsed
+and decimals are coarsened (pixel coordinates to whole pixels, confidences to one
+decimal), so sub-pixel box jitter or a score moving from 0.81 to 0.84 between two
+captures of the same page usually does not miss the cache.
+
+    LLM_CACHE_PATH=./llm_cache.sqlite3   # empty (default) disables the cache
+    LLM_CACHE_TTL_S=86400                # entries older than this are ignored and dropped
+    LLM_CACHE_MAX_ENTRIES=2000           # least recently used entries are evicted beyond this
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import re
+import sqlite3
+import threading
+import time
+from typing import Any, Dict, Optional
+
+
+_WHITESPACE = re.compile(r"\s+")
+_DECIMAL = re.compile(r"-?\d+\.\d+")
+
+
+def _coarsen(match: "re.Match[str]") -> str:
+    value = float(match.group(0))
+    return str(round(value, 1)) if abs(value) < 10 else str(int(round(value)))
+
+
+def normalize_prompt(prompt: str) -> str:
+    return _DECIMAL.sub(_coarsen, _WHITESPACE.sub(" ", prompt or "").strip())
+
+
+def llm_cache_key(provider: str, model: str, system_prompt: str, temperature: float, prompt: str) -> str:
+    encoded = json.dumps(
+        [provider, model, system_prompt or "", round(float(temperature), 4), normalize_prompt(prompt)],
+        ensure_ascii=False,
+    )
+    return hashlib.sha256(encoded.encode("utf-8")).hexdigest()
+
+
+class LLMResponseCache:
+    """SQLite-backed response store with a TTL and an LRU size cap."""
+
+    def __init__(self, path: Optional[str], ttl_seconds: float = 86400, max_entries: int = 2000):
+        self.path = path or None
+        self.ttl_seconds = float(ttl_seconds)
+        self.max_entries = max(0, int(max_entries))
+        self._lock = threading.Lock()
+        self._connection: Optional[sqlite3.Connection] = None
+        self._stats = {"hits": 0, "misses": 0, "stores": 0, "expired": 0, "evictions": 0}
+
+    @classmethod
+    def from_env(cls) -> "LLMResponseCache":
+        return cls(
+            path=os.getenv("LLM_CACHE_PATH", "").strip() or None,
+            ttl_seconds=float(os.getenv("LLM_CACHE_TTL_S", "86400")),
+            max_entries=int(os.getenv("LLM_CACHE_MAX_ENTRIES", "2000")),
+        )
+
+    @property
+    def enabled(self) -> bool:
+        return bool(self.path) and self.max_entries > 0
+
+    def _db(self) -> sqlite3.Connection:
+        if self._connection is None:
+            os.makedirs(os.path.dirname(os.path.abspath(self.path)), exist_ok=True)
+            self._connection = sqlite3.connect(self.path, check_same_thread=False)
+            self._connection.execute("PRAGMA journal_mode=WAL")
+            self._connection.execute(
+                "CREATE TABLE IF NOT EXISTS llm_responses ("
+                " key TEXT PRIMARY KEY, provider TEXT, model TEXT, response TEXT NOT NULL,"
+                " created_at REAL NOT NULL, last_used REAL NOT NULL)"
+            )
+            self._connection.execute("CREATE INDEX IF NOT EXISTS llm_responses_last_used ON llm_responses (last_used)")
+            self._connection.commit()
+        return self._connection
+
+    def get(self, key: str) -> Optional[str]:
+        if not self.enabled:
+            return None
+        now = time.time()
+        try:
+            with self._lock:
+                db = self._db()
+                row = db.execute("SELECT response, created_at FROM llm_responses WHERE key = ?", (key,)).fetchone()
+                if row is not None and now - row[1] > self.ttl_seconds:
+                    db.execute("DELETE FROM llm_responses WHERE key = ?", (key,))
+                    db.commit()
+                    self._stats["expired"] += 1
+                    row = None
+                if row is None:
+                    self._stats["misses"] += 1
+                    return None
+                db.execute("UPDATE llm_responses SET last_used = ? WHERE key = ?", (now, key))
+                db.commit()
+                self._stats["hits"] += 1
+                return row[0]
+        except sqlite3.Error as exc:
+            print(f"⚠️ [LLM Cache] Okuma hatası: {exc}")
+            return None
+
+    def set(self, key: str, response: str, provider: str = "", model: str = "") -> None:
+        if not self.enabled or not response:
+            return
+        now = time.time()
+        try:
+            with self._lock:
+                db = self._db()
+                db.execute(
+                    "INSERT OR REPLACE INTO llm_responses (key, provider, model, response, created_at, last_used)"
+                    " VALUES (?, ?, ?, ?, ?, ?)",
+                    (key, provider, model, response, now, now),
+                )
+                self._stats["stores"] += 1
+                excess = db.execute("SELECT COUNT(*) FROM llm_responses").fetchone()[0] - self.max_entries
+                if excess > 0:
+                    db.execute(
+                        "DELETE FROM llm_responses WHERE key IN"
+                        " (SELECT key FROM llm_responses ORDER BY last_used ASC LIMIT ?)",
+                        (excess,),
+                    )
+                    self._stats["evictions"] += excess
+                db.commit()
+        except sqlite3.Error as exc:
+            print(f"⚠️ [LLM Cache] Yazma hatası: {exc}")
+
+    def clear(self) -> None:
+        if not self.enabled:
+            return
+        with self._lock:
+            self._db().execute("DELETE FROM llm_responses")
+            self._db().commit()
+            for name in self._stats:
+                self._stats[name] = 0
+
+    def stats(self) -> Dict[str, Any]:
+        entries = 0
+        if self.enabled:
+            try:
+                with self._lock:
+                    entries = self._db().execute("SELECT COUNT(*) FROM llm_responses").fetchone()[0]
+            except sqlite3.Error:
+                pass
+        with self._lock:
+            lookups = self._stats["hits"] + self._stats["misses"]
+            return {
+                **self._stats,
+                "enabled": self.enabled,
+                "entries": entries,
+                "max_entries": self.max_entries,
+                "ttl_seconds": self.ttl_seconds,
+                "hit_rate": round(self._stats["hits"] / lookups, 3) if lookups else 0.0,
+            }
+
+
+llm_response_cache = LLMResponseCache.from_env()
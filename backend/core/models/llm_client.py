@@ -1,10 +1,17 @@
 
+import asyncio
 import os
 import json
 import re
-from typing import List, Dict, Any, Optional
+from typing import List, Dict, Any, AsyncIterator, Optional, Tuple
 from dotenv import load_dotenv
 
+from core.models.hedging import HedgeClock, llm_hedge_policy
+from core.models.http_pool import llm_http_pool
+from core.models.json_stream import IncrementalCaseParser
+from core.models.llm_cache import llm_cache_key, llm_response_cache
+from core.models.rate_limiter import estimate_tokens, llm_rate_limiter
+
 load_dotenv()
 
 
@@ -71,17 +78,33 @@ Your approach:
 
 You output precise, actionable analysis in JSON format."""
 
-    def __init__(self, api_key: Optional[str] = None):
+    def __init__(self, api_key: Optional[str] = None, use_cache: bool = True):
         # Groq (Primary)
         self.groq_api_key = api_key or os.getenv("GROQ_API_KEY")
         self.groq_model = os.getenv("GROQ_MODEL", "llama-3.3-70b-versatile")
-        self.groq_url = "https://api.groq.com/openai/v1/chat/completions"
+        # GROQ_API_URL ile OpenAI uyumlu başka bir uca (örn. core.models.llm_stub) yönlendirilebilir
+        self.groq_url = os.getenv("GROQ_API_URL", "https://api.groq.com/openai/v1/chat/completions")
 
         # Hugging Face (Fallback)
         self.hf_api_key = os.getenv("HF_API_TOKEN")
         self.hf_model_id = os.getenv("LLM_MODEL_ID", "HuggingFaceH4/zephyr-7b-beta")
         self.hf_url = f"https://api-inference.huggingface.co/models/{self.hf_model_id}"
 
+        # Paylaşılan, uygulama ömürlü HTTP havuzu (provider başına keep-alive bağlantılar)
+        self.http = llm_http_pool
+        self.temperature = 0.3
+
+        # Kalıcı yanıt önbelleği (LLM_CACHE_PATH); use_cache=False ile istek bazında kapatılır
+        self.cache = llm_response_cache
+        self.use_cache = use_cache
+
+        # Provider başına RPM/TPM bütçesi (GROQ_RPM, GROQ_TPM, HF_RPM, HF_TPM); 429'da Retry-After kadar beklenir
+        self.limiter = llm_rate_limiter
+        self.rate_limit_retries = int(os.getenv("LLM_RATE_LIMIT_RETRIES", "2"))
+
+        # Gecikme histogramına (p95) göre Groq yavaşsa HuggingFace paralel başlatılır (LLM_HEDGE)
+        self.hedge = llm_hedge_policy
+
         # Hangi provider kullanılacak?
         self.provider = "groq" if self.groq_api_key else "huggingface"
         print(f"🤖 [LLM] Provider: {self.provider.upper()} | Model: {self.groq_model if self.provider == 'groq' else self.hf_model_id}")
@@ -90,57 +113,134 @@ You output precise, actionable analysis in JSON format."""
     #  API TRANSPORT LAYER
     # ═══════════════════════════════════════════════════════════════
 
-    async def _query_groq(self, prompt: str, system_prompt: str = None) -> str:
-        """Groq API'ye özelleştirilmiş system prompt ile istek gönderir."""
+    @staticmethod
+    def _retry_after(response) -> float:
         try:
-            import httpx
-            headers = {
-                "Authorization": f"Bearer {self.groq_api_key}",
-                "Content-Type": "application/json"
-            }
-            payload = {
-                "model": self.groq_model,
-                "messages": [
-                    {
-                        "role": "system",
-                        "content": system_prompt or self.TESTGEN_SYSTEM_PROMPT
-                    },
-                    {
-                        "role": "user",
-                        "content": prompt
-                    }
-                ],
-                "temperature": 0.3,
-                "max_tokens": 4096,
-                "response_format": {"type": "json_object"}
-            }
+            return min(60.0, max(0.0, float(response.headers.get("retry-after", "1"))))
+        except ValueError:
+            return 1.0
+
+    async def _post_limited(
+        self, provider: str, url: str, estimated_tokens: int, clock: Optional[HedgeClock] = None, **kwargs
+    ):
+        """
+        Bütçe izin verince gönderir; 429 gelirse provider'ı durdurup sınırlı sayıda yeniden dener.
+        ``clock`` limiter isteği geçirdiği anda başlatılır; iptal edilen çağrının bütçesi iade edilir.
+        """
+        limiter = self.limiter.provider(provider)
+        for attempt in range(self.rate_limit_retries + 1):
+            try:
+                await limiter.acquire(estimated_tokens)
+                if clock is not None:
+                    clock.start()
+                response = await self.http.post(provider, url, **kwargs)
+            except asyncio.CancelledError:
+                # Hedge'i kaybeden (ya da iptal edilen) çağrı yanıt almadı: ayrılan bütçe geri verilir
+                limiter.release(estimated_tokens)
+                raise
+            if response.status_code != 429:
+                return response
+            retry_after = self._retry_after(response)
+            limiter.record_rate_limited(retry_after)
+            if clock is not None:
+                clock.reset()
+            if attempt < self.rate_limit_retries:
+                print(f"⏳ [LLM] {provider} 429 döndü, {retry_after:.1f} sn sonra tekrar denenecek...")
+        return response
+
+    def _groq_request(self, prompt: str, system_prompt: str = None) -> Tuple[Dict[str, str], Dict[str, Any]]:
+        headers = {
+            "Authorization": f"Bearer {self.groq_api_key}",
+            "Content-Type": "application/json"
+        }
+        payload = {
+            "model": self.groq_model,
+            "messages": [
+                {
+                    "role": "system",
+                    "content": system_prompt or self.TESTGEN_SYSTEM_PROMPT
+                },
+                {
+                    "role": "user",
+                    "content": prompt
+                }
+            ],
+            "temperature": self.temperature,
+            "max_tokens": 4096,
+            "response_format": {"type": "json_object"}
+        }
+        return headers, payload
 
-            async with httpx.AsyncClient() as client:
-                response = await client.post(
-                    self.groq_url,
-                    headers=headers,
-                    json=payload,
-                    timeout=60.0
-                )
+    async def _query_groq(self, prompt: str, system_prompt: str = None, clock: Optional[HedgeClock] = None) -> str:
+        """Groq API'ye özelleştirilmiş system prompt ile istek gönderir."""
+        try:
+            headers, payload = self._groq_request(prompt, system_prompt)
+            estimated = estimate_tokens(payload["messages"][0]["content"], prompt)
+            response = await self._post_limited(
+                "groq",
+                self.groq_url,
+                estimated,
+                clock=clock,
+                headers=headers,
+                json=payload,
+            )
 
-                if response.status_code != 200:
-                    print(f"❌ [Groq] API Hatası ({response.status_code}): {response.text}")
-                    return ""
+            if response.status_code != 200:
+                print(f"❌ [Groq] API Hatası ({response.status_code}): {response.text}")
+                return ""
 
-                result = response.json()
-                return result["choices"][0]["message"]["content"].strip()
+            result = response.json()
+            # TPM kovası gerçek kullanım (prompt + completion) ile düzeltilir
+            self.limiter.provider("groq").record_usage(estimated, (result.get("usage") or {}).get("total_tokens"))
+            return result["choices"][0]["message"]["content"].strip()
 
         except Exception as e:
             print(f"❌ [Groq] Bağlantı Hatası: {str(e)}")
             return ""
 
-    async def _query_hf(self, prompt: str, system_prompt: str = None) -> str:
+    async def _stream_groq(self, prompt: str, system_prompt: str = None) -> AsyncIterator[str]:
+        """Groq yanıtını server-sent event parçaları (delta) halinde okur."""
+        headers, payload = self._groq_request(prompt, system_prompt)
+        # Groq JSON modu stream ile birlikte kullanılamıyor; JSON'u prompt zaten şart koşuyor.
+        payload.pop("response_format", None)
+        payload["stream"] = True
+        estimated = estimate_tokens(payload["messages"][0]["content"], prompt)
+        limiter = self.limiter.provider("groq")
+        await limiter.acquire(estimated)
+
+        try:
+            async with self.http.stream("groq", self.groq_url, headers=headers, json=payload) as response:
+                if response.status_code != 200:
+                    body = (await response.aread()).decode("utf-8", "replace")
+                    if response.status_code == 429:
+                        limiter.record_rate_limited(self._retry_after(response))
+                    print(f"❌ [Groq] Stream Hatası ({response.status_code}): {body}")
+                    return
+
+                async for line in response.aiter_lines():
+                    if not line.startswith("data:"):
+                        continue
+                    data = line[len("data:"):].strip()
+                    if data == "[DONE]":
+                        break
+                    chunk = json.loads(data)
+                    usage = (chunk.get("x_groq") or {}).get("usage") or chunk.get("usage")
+                    if usage:
+                        limiter.record_usage(estimated, usage.get("total_tokens"))
+                    choices = chunk.get("choices") or []
+                    delta = (choices[0].get("delta") or {}).get("content") if choices else None
+                    if delta:
+                        yield delta
+
+        except Exception as e:
+            print(f"❌ [Groq] Stream Bağlantı Hatası: {str(e)}")
+
+    async def _query_hf(self, prompt: str, system_prompt: str = None, clock: Optional[HedgeClock] = None) -> str:
         """Hugging Face API'ye fallback istek gönderir."""
         if not self.hf_api_key:
             return '{"error": "No API key found. Please set GROQ_API_KEY or HF_API_TOKEN in .env"}'
 
         try:
-            import httpx
             headers = {"Authorization": f"Bearer {self.hf_api_key}"}
 
             # System prompt'u user prompt'a dahil et (HF bunu desteklemez)
@@ -152,35 +252,201 @@ You output precise, actionable analysis in JSON format."""
                 "inputs": f"<s>[INST] {full_prompt} [/INST]",
                 "parameters": {
                     "max_new_tokens": 2048,
-                    "temperature": 0.3,
+                    "temperature": self.temperature,
                     "return_full_text": False
                 }
             }
 
-            async with httpx.AsyncClient() as client:
-                response = await client.post(self.hf_url, headers=headers, json=payload, timeout=60.0)
-                if response.status_code != 200:
-                    print(f"❌ [HF] API Hatası ({response.status_code}): {response.text}")
-                    return ""
-
-                result = response.json()
-                if isinstance(result, list) and len(result) > 0:
-                    return result[0].get("generated_text", "").strip()
+            estimated = estimate_tokens(full_prompt)
+            response = await self._post_limited(
+                "huggingface", self.hf_url, estimated, clock=clock, headers=headers, json=payload
+            )
+            if response.status_code != 200:
+                print(f"❌ [HF] API Hatası ({response.status_code}): {response.text}")
                 return ""
 
+            result = response.json()
+            if isinstance(result, list) and len(result) > 0:
+                text = result[0].get("generated_text", "").strip()
+                self.limiter.provider("huggingface").record_usage(estimated, estimated + estimate_tokens(text))
+                return text
+            return ""
+
         except Exception as e:
             print(f"❌ [HF] Bağlantı Hatası: {str(e)}")
             return ""
 
     async def _query(self, prompt: str, system_prompt: str = None) -> str:
-        """Provider'a göre doğru API'yi, doğru system prompt ile çağırır."""
+        """Provider'a göre doğru API'yi, doğru system prompt ile çağırır; yanıtlar önbelleğe alınır."""
+        model = self.groq_model if self.provider == "groq" else self.hf_model_id
+        cache_key = llm_cache_key(
+            self.provider, model, system_prompt or self.TESTGEN_SYSTEM_PROMPT, self.temperature, prompt
+        )
+        use_cache = self.use_cache and self.cache.enabled
+        if use_cache:
+            cached = self.cache.get(cache_key)
+            if cached is not None:
+                print("⚡ [LLM] Önbellekten yanıt döndü.")
+                return cached
+
+        async def fetch() -> str:
+            result, answered_by = await self._query_provider(prompt, system_prompt)
+            # Yalnızca geçerli JSON döndüren bir provider'ın yanıtı saklanır;
+            # hata metinleri (örn. API anahtarı yok) önbelleğe girmez.
+            if use_cache and answered_by:
+                self.cache.set(cache_key, result, provider=self.provider, model=model)
+            return result
+
+        # Aynı prompt zaten uçuştaysa ikinci bir istek gönderilmez, o yanıt paylaşılır.
+        return await self.limiter.coalesce(self.provider, cache_key, fetch)
+
+    async def _query_provider(self, prompt: str, system_prompt: str = None) -> Tuple[str, Optional[str]]:
+        """Yanıt metni ve onu geçerli JSON olarak üreten provider (yoksa None)."""
+        if self.provider == "groq" and self.hedge.enabled and self.hf_api_key:
+            return await self._query_hedged(prompt, system_prompt)
+
         if self.provider == "groq":
-            result = await self._query_groq(prompt, system_prompt)
+            result = await self._timed_query("groq", prompt, system_prompt)
             if result:
-                return result
+                return result, "groq" if self._is_answer("groq", result) else None
             print("⚠️ [LLM] Groq başarısız, HuggingFace'e fallback yapılıyor...")
 
-        return await self._query_hf(prompt, system_prompt)
+        result = await self._timed_query("huggingface", prompt, system_prompt)
+        return result, "huggingface" if self._is_answer("huggingface", result) else None
+
+    def _is_answer(self, provider: str, result: str) -> bool:
+        """Provider gerçekten yanıt verdi mi? (anahtarı var ve dönen metin geçerli JSON)"""
+        if provider == "huggingface" and not self.hf_api_key:
+            return False
+        return self._parse_json_response(result) is not None
+
+    async def _timed_query(
+        self, provider: str, prompt: str, system_prompt: str = None, clock: Optional[HedgeClock] = None
+    ) -> str:
+        """Provider çağrısı; geçerli yanıtların süresi (limiter kabulünden itibaren) histograma işlenir."""
+        query = self._query_groq if provider == "groq" else self._query_hf
+        clock = clock or HedgeClock()
+        try:
+            result = await query(prompt, system_prompt, clock=clock)
+        except asyncio.CancelledError:
+            # Hedge'i kaybeden çağrı: gönderilmişse geçen süre alt sınır olarak yine de kaydedilir
+            elapsed = clock.elapsed()
+            if elapsed is not None:
+                self.hedge.observe(provider, elapsed)
+            raise
+        elapsed = clock.elapsed()
+        if elapsed is not None and self._is_answer(provider, result):
+            self.hedge.observe(provider, elapsed)
+        return result
+
+    async def _query_hedged(self, prompt: str, system_prompt: str = None) -> Tuple[str, Optional[str]]:
+        """
+        Groq'a gönderir; limiter kabulünden sonra p95 tabanlı süre içinde yanıt yoksa
+        HuggingFace'i paralel başlatır, geçerli JSON'u ilk getiren kazanır ve diğeri iptal edilir.
+        """
+        self.hedge.record("queries")
+        clock = HedgeClock()
+        primary = asyncio.create_task(self._timed_query("groq", prompt, system_prompt, clock=clock))
+        delay = self.hedge.delay("groq")
+
+        if await self._primary_within(primary, clock, delay):
+            result = primary.result()
+            if self._is_answer("groq", result):
+                self.hedge.record("primary_wins")
+                return result, "groq"
+            print("⚠️ [LLM] Groq başarısız, HuggingFace'e fallback yapılıyor...")
+            fallback = await self._timed_query("huggingface", prompt, system_prompt)
+            if self._is_answer("huggingface", fallback):
+                self.hedge.record("secondary_wins")
+                return fallback, "huggingface"
+            self.hedge.record("both_failed")
+            return fallback or result, None
+
+        print(f"⏱️ [LLM] Groq {delay:.1f} sn içinde yanıt vermedi, HuggingFace paralel başlatılıyor (hedge)...")
+        self.hedge.record("hedged")
+        secondary = asyncio.create_task(self._timed_query("huggingface", prompt, system_prompt))
+        providers = {primary: "groq", secondary: "huggingface"}
+        pending = {primary, secondary}
+        first_text = ""
+        try:
+            while pending:
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    result = task.result()
+                    if self._is_answer(providers[task], result):
+                        self.hedge.record("primary_wins" if task is primary else "secondary_wins")
+                        return result, providers[task]
+                    first_text = first_text or result
+        finally:
+            for task in pending:
+                task.cancel()
+            # Kaybedenin iptal işleyicileri (bütçe iadesi, gecikme örneği) dönmeden önce çalışsın
+            await asyncio.gather(*pending, return_exceptions=True)
+
+        self.hedge.record("both_failed")
+        return first_text, None
+
+    @staticmethod
+    async def _primary_within(primary: asyncio.Task, clock: HedgeClock, delay: float) -> bool:
+        """
+        Primary hedge süresi içinde bitti mi? Süre limiter kabulünden sayılır: bütçe
+        kuyruğu ve 429 sonrası Retry-After beklemesi hedge saatine eklenmez.
+        """
+        while not primary.done():
+            if not clock.admitted.is_set():
+                admitted = asyncio.create_task(clock.admitted.wait())
+                try:
+                    await asyncio.wait({primary, admitted}, return_when=asyncio.FIRST_COMPLETED)
+                finally:
+                    admitted.cancel()
+                continue
+            remaining = delay - clock.elapsed()
+            if remaining <= 0:
+                return False
+            await asyncio.wait({primary}, timeout=remaining)
+        return True
+
+    async def _query_stream(self, prompt: str, system_prompt: str = None) -> AsyncIterator[str]:
+        """
+        ``_query``'nin stream eden hali: Groq'ta yanıt parça parça gelir.
+        Önbellekteki yanıt tek parça döner; HuggingFace (veya hiç parça gelmeyen Groq
+        denemesi) tek parçalık klasik istekle karşılanır. Stream'ler birleştirilmez.
+        """
+        model = self.groq_model if self.provider == "groq" else self.hf_model_id
+        cache_key = llm_cache_key(
+            self.provider, model, system_prompt or self.TESTGEN_SYSTEM_PROMPT, self.temperature, prompt
+        )
+        use_cache = self.use_cache and self.cache.enabled
+        if use_cache:
+            cached = self.cache.get(cache_key)
+            if cached is not None:
+                print("⚡ [LLM] Önbellekten yanıt döndü.")
+                yield cached
+                return
+
+        parts: List[str] = []
+        answered_by = None
+        if self.provider == "groq":
+            async for delta in self._stream_groq(prompt, system_prompt):
+                parts.append(delta)
+                yield delta
+            if parts:
+                answered_by = "groq"
+            else:
+                print("⚠️ [LLM] Groq stream başarısız, HuggingFace'e fallback yapılıyor...")
+
+        if not parts:
+            text = await self._query_hf(prompt, system_prompt)
+            if text:
+                parts.append(text)
+                answered_by = "huggingface"
+                yield text
+
+        result = "".join(parts)
+        # Yarıda kesilen stream'ler ve hata metinleri önbelleğe girmesin:
+        # yalnızca yanıt veren provider'ın parse edilebilen çıktısı saklanır.
+        if use_cache and answered_by and self._is_answer(answered_by, result):
+            self.cache.set(cache_key, result, provider=self.provider, model=model)
 
     def _parse_json_response(self, response_text: str) -> Optional[Dict]:
         """LLM yanıtından JSON bloğunu güvenli şekilde çıkarır."""
@@ -360,27 +626,14 @@ Find as many business rules as the page's complexity demands — there is no lim
     #  (Logical Coverage — Dynamic Test Generation)
     # ═══════════════════════════════════════════════════════════════
 
-    async def generate_test_cases(
+    def _build_testgen_prompt(
         self,
         url: str,
         page_context: str,
         page_identity: Dict[str, Any] = None,
         platform: str = "web"
-    ) -> Dict[str, Any]:
-        """
-        🎯 Mantıksal Kapsama Odaklı Dinamik Test Üretimi.
-
-        Test sayısı SABIT DEĞİLDİR. Sayfanın iş kuralı sayısı ve
-        mantıksal derinliği ne kadar test gerektiriyorsa o kadar üretilir.
-
-        Strateji:
-          - Her business rule için 1 pozitif + 1 negatif test
-          - Risk seviyesi critical olan kurallar önce
-          - Semantik selector kullanımı (kırılgan ID'ler yerine)
-          - Sayfa tipine özel edge case ve security testleri
-        """
-        print(f"🤖 [LLM] Dinamik test senaryoları üretiliyor: {url} ({platform})")
-
+    ) -> str:
+        """Test üretim prompt'u (identity raporu + kapsama stratejisi + çıktı şeması)."""
         # ── Identity raporunu prompt'a enjekte et ──
         identity_block = ""
         if page_identity and page_identity.get("page_type") != "unknown":
@@ -538,6 +791,30 @@ Return a JSON object with these categories:
 - Steps must be in logical execution order — a robot will run them top to bottom
 - Return ONLY valid JSON, no explanation text before or after"""
 
+        return prompt
+
+    async def generate_test_cases(
+        self,
+        url: str,
+        page_context: str,
+        page_identity: Dict[str, Any] = None,
+        platform: str = "web"
+    ) -> Dict[str, Any]:
+        """
+        🎯 Mantıksal Kapsama Odaklı Dinamik Test Üretimi.
+
+        Test sayısı SABIT DEĞİLDİR. Sayfanın iş kuralı sayısı ve
+        mantıksal derinliği ne kadar test gerektiriyorsa o kadar üretilir.
+
+        Strateji:
+          - Her business rule için 1 pozitif + 1 negatif test
+          - Risk seviyesi critical olan kurallar önce
+          - Semantik selector kullanımı (kırılgan ID'ler yerine)
+          - Sayfa tipine özel edge case ve security testleri
+        """
+        print(f"🤖 [LLM] Dinamik test senaryoları üretiliyor: {url} ({platform})")
+
+        prompt = self._build_testgen_prompt(url, page_context, page_identity, platform)
         response_text = await self._query(prompt, system_prompt=self.TESTGEN_SYSTEM_PROMPT)
         parsed = self._parse_json_response(response_text)
 
@@ -557,6 +834,40 @@ Return a JSON object with these categories:
         print("⚠️ [TestGen] Parse edilemedi, fallback kullanılıyor.")
         return self._get_fallback_cases(url, platform)
 
+    async def stream_test_cases(
+        self,
+        url: str,
+        page_context: str,
+        page_identity: Dict[str, Any] = None,
+        platform: str = "web"
+    ) -> AsyncIterator[Tuple[str, Dict[str, Any]]]:
+        """
+        ``generate_test_cases``'in stream eden hali: her senaryo, JSON nesnesi
+        tamamlanır tamamlanmaz ``(kategori, senaryo)`` olarak döner. Hiç senaryo
+        çıkmazsa tam metin klasik parse'a, o da olmazsa fallback case'lere düşer.
+        """
+        print(f"🤖 [LLM] Dinamik test senaryoları stream ediliyor: {url} ({platform})")
+        prompt = self._build_testgen_prompt(url, page_context, page_identity, platform)
+
+        parser = IncrementalCaseParser()
+        async for delta in self._query_stream(prompt, system_prompt=self.TESTGEN_SYSTEM_PROMPT):
+            for category, case in parser.feed(delta):
+                yield category, case
+
+        if parser.cases_emitted:
+            print(f"✅ [TestGen] Toplam {parser.cases_emitted} senaryo stream edildi (Mantıksal Kapsama)")
+            return
+
+        parsed = self._parse_json_response(parser.text)
+        if not parsed:
+            print("⚠️ [TestGen] Parse edilemedi, fallback kullanılıyor.")
+            parsed = self._get_fallback_cases(url, platform)
+        for category, cases in parsed.items():
+            if isinstance(cases, list):
+                for case in cases:
+                    if isinstance(case, dict):
+                        yield category, case
+
     # ═══════════════════════════════════════════════════════════════
     #  GERİYE DÖNÜK UYUMLULUK
     # ═══════════════════════════════════════════════════════════════
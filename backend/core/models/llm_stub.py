@@ -0,0 +1,173 @@
+"""
+VisionQA Stub LLM Server
+Local, OpenAI-compatible chat-completions endpoint for developing and testing the
+LLM layer without a Groq key or network access.
+
+Run it and point ``LLMClient`` at it:
+    python -m core.models.llm_stub --port 8790 --delay-ms 40
+    GROQ_API_KEY=stub GROQ_API_URL=http://127.0.0.1:8790/openai/v1/chat/completions
+
+Test-generation prompts (the ones asking for ``happy_path``) get a canned case set;
+every other prompt gets a canned page identity. ``"stream": true`` requests are
+answered as server-sent events, ``chunk_chars`` characters per event with
+``delay_ms`` between events, followed by a usage chunk and ``data: [DONE]`` — slow
+enough to measure time-to-first-case against time-to-last-case.
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Dict, List, Optional
+
+
+STUB_IDENTITY: Dict[str, Any] = {
+    "page_type": "login",
+    "page_archetype": "Authentication Form",
+    "domain": "e-commerce",
+    "confidence": 0.9,
+    "business_rules": [
+        {"rule": "Email must be valid", "type": "validation", "risk_level": "high"},
+        {"rule": "Password is required", "type": "validation", "risk_level": "high"},
+    ],
+    "element_relationships": [],
+    "critical_flows": ["Login"],
+    "risk_areas": ["Credential handling"],
+    "interaction_patterns": [],
+}
+
+
+def _case(title: str, target: str, value: str, expected: str, risk: str) -> Dict[str, Any]:
+    return {
+        "title": title,
+        "covers_rule": "Email must be valid",
+        "risk_level": risk,
+        "steps": [
+            {"action": "navigate", "target": "https://example.com/login", "value": "", "expected": "Page loads"},
+            {"action": "type", "target": target, "value": value, "expected": "Value entered"},
+            {"action": "click", "target": "button[type='submit']", "value": "", "expected": "Form submitted"},
+        ],
+        "expected_outcome": expected,
+    }
+
+
+STUB_CASES: Dict[str, Any] = {
+    "page_analysis_summary": "Login form with email and password",
+    "total_rules_covered": 2,
+    "happy_path": [
+        _case("Login with valid credentials", "input[type='email']", "user@example.com", "Dashboard opens", "critical"),
+    ],
+    "negative_path": [
+        _case("Reject malformed email", "input[type='email']", "not-an-email", "Error is shown", "high"),
+        _case("Reject empty password", "input[type='password']", "", "Password error is shown", "high"),
+    ],
+    "edge_cases": [
+        _case("Overlong email is handled", "input[type='email']", "a" * 300 + "@example.com", "Input is rejected", "medium"),
+    ],
+    "security_checks": [
+        _case("SQL payload in email", "input[type='email']", "' OR 1=1 --", "Login is refused", "critical"),
+    ],
+}
+
+
+class StubLLMServer:
+    """Threaded HTTP server answering chat completions with canned JSON."""
+
+    def __init__(self, host: str = "127.0.0.1", port: int = 0, delay_ms: float = 20, chunk_chars: int = 24):
+        self.delay = max(0.0, float(delay_ms)) / 1000.0
+        self.chunk_chars = max(1, int(chunk_chars))
+        self.requests: List[Dict[str, Any]] = []
+        self._httpd = ThreadingHTTPServer((host, port), self._handler())
+        self._httpd.daemon_threads = True
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def url(self) -> str:
+        host, port = self._httpd.server_address[:2]
+        return f"http://{host}:{port}/openai/v1/chat/completions"
+
+    def answer(self, payload: Dict[str, Any]) -> str:
+        prompt = " ".join(str(message.get("content", "")) for message in payload.get("messages", []) if message.get("role") == "user")
+        return json.dumps(STUB_CASES if "happy_path" in prompt else STUB_IDENTITY, ensure_ascii=False)
+
+    def _handler(self):
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def log_message(self, format: str, *args: Any) -> None:
+                pass
+
+            def do_POST(self) -> None:
+                payload = json.loads(self.rfile.read(int(self.headers.get("Content-Length", 0))) or b"{}")
+                server.requests.append(payload)
+                content = server.answer(payload)
+                usage = {"prompt_tokens": 100, "completion_tokens": len(content) // 4, "total_tokens": 100 + len(content) // 4}
+                if payload.get("stream"):
+                    self._stream(content, usage)
+                    return
+                body = json.dumps({"choices": [{"message": {"role": "assistant", "content": content}}], "usage": usage}).encode()
+                self.send_response(200)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def _stream(self, content: str, usage: Dict[str, int]) -> None:
+                self.send_response(200)
+                self.send_header("Content-Type", "text/event-stream")
+                self.send_header("Transfer-Encoding", "chunked")
+                self.end_headers()
+                for start in range(0, len(content), server.chunk_chars):
+                    delta = content[start:start + server.chunk_chars]
+                    self._event({"choices": [{"index": 0, "delta": {"content": delta}}]})
+                    time.sleep(server.delay)
+                self._event({"choices": [{"index": 0, "delta": {}, "finish_reason": "stop"}], "x_groq": {"usage": usage}})
+                self._write(b"data: [DONE]\n\n")
+                self._write(b"")
+
+            def _event(self, data: Dict[str, Any]) -> None:
+                self._write(f"data: {json.dumps(data)}\n\n".encode())
+
+            def _write(self, data: bytes) -> None:
+                self.wfile.write(f"{len(data):x}\r\n".encode() + data + b"\r\n")
+                self.wfile.flush()
+
+        return Handler
+
+    def start(self) -> "StubLLMServer":
+        self._thread = threading.Thread(target=self._httpd.serve_forever, name="llm-stub", daemon=True)
+        self._thread.start()
+        return self
+
+    def serve_forever(self) -> None:
+        self._httpd.serve_forever()
+
+    def close(self) -> None:
+        if self._thread is not None:
+            self._httpd.shutdown()
+        self._httpd.server_close()
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description="VisionQA stub LLM server (OpenAI-compatible)")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8790)
+    parser.add_argument("--delay-ms", type=float, default=40)
+    parser.add_argument("--chunk-chars", type=int, default=24)
+    args = parser.parse_args(argv)
+
+    server = StubLLMServer(args.host, args.port, args.delay_ms, args.chunk_chars)
+    print(f"🧪 [LLM Stub] Dinliyor: {server.url}", flush=True)
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        server.close()
+
+
+if __name__ == "__main__":
+    main()
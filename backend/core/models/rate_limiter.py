@@ -0,0 +1,185 @@
+"""
+VisionQA LLM Rate Limiter
+Client-side request and token budgets for the LLM providers.
+
+Every provider gets two token buckets: requests per minute and tokens per minute.
+Callers reserve one request plus the estimated prompt tokens before sending and wait
+for the larger deficit, so concurrent case generations queue up in arrival order
+instead of all hitting the provider and collecting 429s. After a response the actual
+usage is settled against the token bucket (the bucket may go into debt, which delays
+the next callers). A 429 pauses the provider for its ``Retry-After``. A call that is
+dropped before it gets an answer (e.g. the losing side of a hedge) gives its
+reservation back with ``release``.
+
+    GROQ_RPM=30        GROQ_TPM=12000
+    HF_RPM=60          HF_TPM=0          # 0 disables that budget
+
+Identical prompts that are already in flight are coalesced: later callers await the
+first caller's request instead of spending budget on a duplicate. Queue waits, throttle
+events, 429s and coalesced prompts are reported by ``stats()``.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import os
+import threading
+import time
+import weakref
+from typing import Any, Awaitable, Callable, Dict, Optional
+
+
+def estimate_tokens(*texts: Optional[str]) -> int:
+    """Rough prompt size (≈4 characters per token), good enough for budgeting."""
+    return sum(len(text or "") for text in texts) // 4 + 1
+
+
+class TokenBucket:
+    """Bucket refilled continuously at ``per_minute / 60`` per second; reservations may go into debt."""
+
+    def __init__(self, per_minute: float, capacity: Optional[float] = None):
+        self.rate = float(per_minute) / 60.0
+        self.capacity = float(capacity or per_minute)
+        self.tokens = self.capacity
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def _refill(self, now: float) -> None:
+        self.tokens = min(self.capacity, self.tokens + (now - self._updated) * self.rate)
+        self._updated = now
+
+    def reserve(self, amount: float) -> float:
+        """Debit ``amount`` now and return how long the caller must wait for it to be covered."""
+        with self._lock:
+            self._refill(time.monotonic())
+            self.tokens -= min(float(amount), self.capacity)
+            return max(0.0, -self.tokens / self.rate)
+
+    def settle(self, amount: float) -> None:
+        """Adjust by the difference between actual and reserved usage (negative refunds)."""
+        with self._lock:
+            self._refill(time.monotonic())
+            self.tokens = min(self.capacity, self.tokens - float(amount))
+
+
+class ProviderRateLimiter:
+    """RPM + TPM budgets of one provider plus its throttle metrics."""
+
+    def __init__(self, requests_per_minute: float = 0, tokens_per_minute: float = 0):
+        self.requests = TokenBucket(requests_per_minute) if requests_per_minute > 0 else None
+        self.tokens = TokenBucket(tokens_per_minute) if tokens_per_minute > 0 else None
+        self.requests_per_minute = requests_per_minute
+        self.tokens_per_minute = tokens_per_minute
+        self._paused_until = 0.0
+        self._lock = threading.Lock()
+        self._stats = {
+            "requests": 0,
+            "throttled": 0,
+            "queue_wait_seconds": 0.0,
+            "max_queue_wait_seconds": 0.0,
+            "rate_limited_responses": 0,
+            "coalesced": 0,
+            "released": 0,
+        }
+
+    async def acquire(self, estimated_tokens: int) -> float:
+        """Wait until one request and ``estimated_tokens`` fit the budgets; returns the wait."""
+        waits = [max(0.0, self._paused_until - time.monotonic())]
+        if self.requests is not None:
+            waits.append(self.requests.reserve(1))
+        if self.tokens is not None:
+            waits.append(self.tokens.reserve(estimated_tokens))
+        wait = max(waits)
+
+        with self._lock:
+            self._stats["requests"] += 1
+            if wait > 0:
+                self._stats["throttled"] += 1
+                self._stats["queue_wait_seconds"] += wait
+                self._stats["max_queue_wait_seconds"] = max(self._stats["max_queue_wait_seconds"], wait)
+        if wait > 0:
+            await asyncio.sleep(wait)
+        return wait
+
+    def record_usage(self, estimated_tokens: int, actual_tokens: Optional[int]) -> None:
+        if self.tokens is not None and actual_tokens is not None:
+            self.tokens.settle(actual_tokens - estimated_tokens)
+
+    def release(self, estimated_tokens: int) -> None:
+        """Refund the request and tokens reserved by a call that was cancelled before answering."""
+        if self.requests is not None:
+            self.requests.settle(-1)
+        if self.tokens is not None:
+            self.tokens.settle(-estimated_tokens)
+        with self._lock:
+            self._stats["released"] += 1
+
+    def record_rate_limited(self, retry_after: float) -> None:
+        """Provider answered 429: hold every caller back for ``retry_after`` seconds."""
+        with self._lock:
+            self._stats["rate_limited_responses"] += 1
+            self._paused_until = max(self._paused_until, time.monotonic() + max(0.0, retry_after))
+
+    def record_coalesced(self) -> None:
+        with self._lock:
+            self._stats["coalesced"] += 1
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            stats = dict(self._stats)
+        stats["queue_wait_seconds"] = round(stats["queue_wait_seconds"], 3)
+        stats["max_queue_wait_seconds"] = round(stats["max_queue_wait_seconds"], 3)
+        stats["average_queue_wait_seconds"] = (
+            round(stats["queue_wait_seconds"] / stats["requests"], 3) if stats["requests"] else 0.0
+        )
+        return {**stats, "rpm": self.requests_per_minute, "tpm": self.tokens_per_minute}
+
+
+class LLMRateLimiter:
+    """Registry of per-provider limiters plus the in-flight prompt table."""
+
+    def __init__(self, limits: Optional[Dict[str, Dict[str, float]]] = None):
+        self.providers: Dict[str, ProviderRateLimiter] = {
+            name: ProviderRateLimiter(limit.get("rpm", 0), limit.get("tpm", 0))
+            for name, limit in (limits or {}).items()
+        }
+        # Tasks belong to the loop that created them, so the table is kept per loop.
+        self._inflight: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, Dict[str, asyncio.Task]]" = (
+            weakref.WeakKeyDictionary()
+        )
+        self._lock = threading.Lock()
+
+    @classmethod
+    def from_env(cls) -> "LLMRateLimiter":
+        return cls({
+            "groq": {"rpm": float(os.getenv("GROQ_RPM", "30")), "tpm": float(os.getenv("GROQ_TPM", "12000"))},
+            "huggingface": {"rpm": float(os.getenv("HF_RPM", "60")), "tpm": float(os.getenv("HF_TPM", "0"))},
+        })
+
+    def provider(self, name: str) -> ProviderRateLimiter:
+        with self._lock:
+            if name not in self.providers:
+                self.providers[name] = ProviderRateLimiter()
+            return self.providers[name]
+
+    async def coalesce(self, provider: str, key: str, factory: Callable[[], Awaitable[str]]) -> str:
+        """Run ``factory`` once per ``key`` at a time; concurrent callers share its result."""
+        loop = asyncio.get_running_loop()
+        with self._lock:
+            inflight = self._inflight.setdefault(loop, {})
+            task = inflight.get(key)
+            leader = task is None
+            if leader:
+                task = loop.create_task(factory())
+                inflight[key] = task
+                task.add_done_callback(lambda done: inflight.pop(key, None) if inflight.get(key) is done else None)
+        if not leader:
+            self.provider(provider).record_coalesced()
+        # A cancelled caller must not cancel the request the others are waiting on.
+        return await asyncio.shield(task)
+
+    def stats(self) -> Dict[str, Any]:
+        return {name: limiter.stats() for name, limiter in self.providers.items()}
+
+
+llm_rate_limiter = LLMRateLimiter.from_env()
@@ -0,0 +1,240 @@
+"""
+VisionQA OCR Worker Pool
+Long-lived OCR workers shared by the screenshot analyzers.
+
+Each worker thread keeps its own tesseract handle for the life of the process. With
+``tesserocr`` installed that is a persistent in-process ``PyTessBaseAPI``, so no
+tesseract process is started and no temp file is written per call. Without it the pool
+falls back to ``pytesseract`` on the same threads. Results are cached by the pixel hash
+of the submitted image or region, so a repeated region (headers, nav bars, re-audits)
+is recognized once.
+
+The fallback is much slower: ``pytesseract`` starts a new ``tesseract`` process and
+writes a temp image for every call. That costs tens of milliseconds of process start-up
+and model load per region, which the pool's threads only spread out. The Docker image
+installs ``tesserocr`` against the system libtesseract. Local installs need
+``libtesseract-dev``, ``libleptonica-dev`` and ``pkg-config`` (or a prebuilt wheel),
+followed by ``pip install tesserocr``. ``/stats/ocr-pool`` reports which backend is active.
+"""
+
+from __future__ import annotations
+
+import copy
+import os
+import threading
+from collections import OrderedDict
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Any, Dict, List, Optional
+
+from PIL import Image
+
+from core.analysis_cache import image_pixel_digest
+
+try:
+    from tesserocr import PSM, RIL, PyTessBaseAPI, iterate_level
+    TESSEROCR_AVAILABLE = True
+except ImportError:
+    TESSEROCR_AVAILABLE = False
+
+try:
+    import pytesseract
+    from pytesseract import Output
+    PYTESSERACT_AVAILABLE = True
+except ImportError:
+    PYTESSERACT_AVAILABLE = False
+
+
+OCR_DATA_KEYS = ("text", "conf", "left", "top", "width", "height", "block_num", "par_num", "line_num")
+DEFAULT_PSM = 6
+
+
+def _empty_ocr_data() -> Dict[str, List[Any]]:
+    return {key: [] for key in OCR_DATA_KEYS}
+
+
+class OcrWorkerPool:
+    """Bounded thread pool with per-thread tesseract handles and a region-level LRU cache."""
+
+    def __init__(self, max_workers: Optional[int] = None, cache_entries: int = 512, psm: int = DEFAULT_PSM):
+        self.max_workers = max(1, int(max_workers or os.cpu_count() or 1))
+        self.cache_entries = max(0, int(cache_entries))
+        self.psm = int(psm)
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._executor_lock = threading.Lock()
+        self._local = threading.local()
+        self._apis: List[Any] = []
+        self._cache: "OrderedDict[str, Dict[str, List[Any]]]" = OrderedDict()
+        self._cache_lock = threading.Lock()
+        self._tesseract_command: Optional[str] = None
+        self._backend: Optional[str] = None
+        self._stats = {"submitted": 0, "recognized": 0, "cache_hits": 0, "failures": 0}
+
+    @classmethod
+    def from_env(cls) -> "OcrWorkerPool":
+        workers = os.getenv("OCR_POOL_WORKERS", "").strip()
+        return cls(
+            max_workers=int(workers) if workers else None,
+            cache_entries=int(os.getenv("OCR_CACHE_MAX_ENTRIES", "512")),
+        )
+
+    @property
+    def backend(self) -> Optional[str]:
+        """"tesserocr", "pytesseract" veya OCR kullanilamiyorsa None."""
+        if self._backend is None:
+            from core.accessibility.engine import _resolve_tesseract_command
+
+            if TESSEROCR_AVAILABLE:
+                self._backend = "tesserocr"
+            elif PYTESSERACT_AVAILABLE:
+                self._tesseract_command = _resolve_tesseract_command()
+                self._backend = "pytesseract" if self._tesseract_command else ""
+                if self._backend:
+                    print("⚠️ [OCR] tesserocr bulunamadi: pytesseract her cagrida ayri bir tesseract sureci baslatir.")
+            else:
+                self._backend = ""
+        return self._backend or None
+
+    @property
+    def available(self) -> bool:
+        return self.backend is not None
+
+    def _get_executor(self) -> ThreadPoolExecutor:
+        with self._executor_lock:
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix="ocr-worker")
+            return self._executor
+
+    def _cache_key(self, image: Image.Image) -> str:
+        return f"{self.psm}:{image_pixel_digest(image)}"
+
+    def _cache_get(self, key: str) -> Optional[Dict[str, List[Any]]]:
+        with self._cache_lock:
+            data = self._cache.get(key)
+            if data is None:
+                return None
+            self._cache.move_to_end(key)
+            self._stats["cache_hits"] += 1
+            return copy.deepcopy(data)
+
+    def _cache_set(self, key: str, data: Dict[str, List[Any]]) -> None:
+        if self.cache_entries <= 0:
+            return
+        with self._cache_lock:
+            self._cache[key] = copy.deepcopy(data)
+            self._cache.move_to_end(key)
+            while len(self._cache) > self.cache_entries:
+                self._cache.popitem(last=False)
+
+    def _thread_api(self):
+        api = getattr(self._local, "api", None)
+        if api is None:
+            api = PyTessBaseAPI(psm=PSM(self.psm))
+            self._local.api = api
+            with self._executor_lock:
+                self._apis.append(api)
+        return api
+
+    def _recognize_with_tesserocr(self, image: Image.Image) -> Dict[str, List[Any]]:
+        api = self._thread_api()
+        api.SetImage(image)
+        api.Recognize()
+
+        data = _empty_ocr_data()
+        block_num = par_num = line_num = 0
+        iterator = api.GetIterator()
+        if iterator is None:
+            return data
+        for word in iterate_level(iterator, RIL.WORD):
+            if word.IsAtBeginningOf(RIL.BLOCK):
+                block_num, par_num, line_num = block_num + 1, 0, 0
+            if word.IsAtBeginningOf(RIL.PARA):
+                par_num, line_num = par_num + 1, 0
+            if word.IsAtBeginningOf(RIL.TEXTLINE):
+                line_num += 1
+            bounds = word.BoundingBox(RIL.WORD)
+            if not bounds:
+                continue
+            left, top, right, bottom = bounds
+            data["text"].append(word.GetUTF8Text(RIL.WORD) or "")
+            data["conf"].append(word.Confidence(RIL.WORD))
+            data["left"].append(left)
+            data["top"].append(top)
+            data["width"].append(right - left)
+            data["height"].append(bottom - top)
+            data["block_num"].append(block_num)
+            data["par_num"].append(par_num)
+            data["line_num"].append(line_num)
+        return data
+
+    def _recognize_with_pytesseract(self, image: Image.Image) -> Dict[str, List[Any]]:
+        pytesseract.pytesseract.tesseract_cmd = self._tesseract_command
+        raw = pytesseract.image_to_data(image, output_type=Output.DICT, config=f"--psm {self.psm}")
+        return {key: list(raw.get(key, [])) for key in OCR_DATA_KEYS}
+
+    def _recognize(self, image: Image.Image, key: str) -> Optional[Dict[str, List[Any]]]:
+        try:
+            if self.backend == "tesserocr":
+                data = self._recognize_with_tesserocr(image)
+            else:
+                data = self._recognize_with_pytesseract(image)
+        except Exception as exc:
+            with self._cache_lock:
+                self._stats["failures"] += 1
+            print(f"⚠️ OCR worker failed: {exc}")
+            return None
+
+        with self._cache_lock:
+            self._stats["recognized"] += 1
+        self._cache_set(key, data)
+        return data
+
+    def submit(self, image: Image.Image) -> "Future[Optional[Dict[str, List[Any]]]]":
+        """OCR'i havuza gonderir; sonuc pytesseract ``Output.DICT`` formatindadir (OCR yoksa None)."""
+        with self._cache_lock:
+            self._stats["submitted"] += 1
+
+        future: Future = Future()
+        if not self.available:
+            future.set_result(None)
+            return future
+
+        image = image if image.mode == "RGB" else image.convert("RGB")
+        key = self._cache_key(image)
+        cached = self._cache_get(key)
+        if cached is not None:
+            future.set_result(cached)
+            return future
+        return self._get_executor().submit(self._recognize, image, key)
+
+    def image_to_data(self, image: Image.Image) -> Optional[Dict[str, List[Any]]]:
+        return self.submit(image).result()
+
+    def stats(self) -> Dict[str, Any]:
+        with self._cache_lock:
+            return {
+                **self._stats,
+                "backend": self.backend,
+                "max_workers": self.max_workers,
+                "cache_entries": len(self._cache),
+                "cache_max_entries": self.cache_entries,
+            }
+
+    def clear_cache(self) -> None:
+        with self._cache_lock:
+            self._cache.clear()
+
+    def shutdown(self) -> None:
+        with self._executor_lock:
+            executor, self._executor = self._executor, None
+            apis, self._apis = self._apis, []
+        if executor is not None:
+            executor.shutdown(wait=True)
+        for api in apis:
+            try:
+                api.End()
+            except Exception:
+                pass
+        self._local = threading.local()
+
+
+ocr_pool = OcrWorkerPool.from_env()
@@ -33,11 +33,13 @@ class PerformanceEngine:
         db_query: Optional[str] = None,
         sample_api_runs: int = 5,
         platform: str = "web",
+        web_metrics: Optional[Dict[str, Any]] = None,
     ) -> Dict[str, Any]:
         findings: List[Dict[str, Any]] = []
         correlations: List[Dict[str, Any]] = []
 
-        web_metrics = await self._collect_web_metrics(url) if url else None
+        if web_metrics is None and url:
+            web_metrics = await self._collect_web_metrics(url)
         api_metrics = await self._collect_api_metrics(api_url, api_method, sample_api_runs) if api_url else None
         db_metrics = self._collect_db_metrics(db_connection_string, db_query) if db_connection_string and db_query else None
 
@@ -111,9 +113,9 @@ class PerformanceEngine:
             "correlations": correlations,
         }
 
-    async def _collect_web_metrics(self, url: str) -> Dict[str, Any]:
-        executor = WebExecutor(headless=True)
-        metrics: Dict[str, Any] = {
+    @staticmethod
+    def _empty_web_metrics() -> Dict[str, Any]:
+        return {
             "page_load_ms": 0.0,
             "dom_content_loaded_ms": 0.0,
             "fcp_ms": 0.0,
@@ -122,59 +124,72 @@ class PerformanceEngine:
             "cls": 0.0,
             "transfer_kb": 0.0,
         }
+
+    async def evaluate_navigation_metrics(self, page: Any) -> Dict[str, Any]:
+        """Navigation/paint timing'i zaten acilmis bir sayfadan okur (ikinci navigasyon yapmaz)."""
+        metrics = self._empty_web_metrics()
+        perf = await page.evaluate(
+            """
+            async () => {
+              const nav = performance.getEntriesByType('navigation')[0];
+              const paints = performance.getEntriesByType('paint');
+              let fcp = 0;
+              for (const entry of paints) {
+                if (entry.name === 'first-contentful-paint') {
+                  fcp = entry.startTime;
+                }
+              }
+              let cls = 0;
+              try {
+                cls = window.__visionqa_cls || 0;
+              } catch (e) {}
+              return {
+                page_load_ms: nav ? nav.loadEventEnd : 0,
+                dom_content_loaded_ms: nav ? nav.domContentLoadedEventEnd : 0,
+                fcp_ms: fcp || 0,
+                lcp_ms: nav ? Math.max(nav.domContentLoadedEventEnd || 0, fcp || 0) : 0,
+                tti_ms: nav ? nav.domInteractive : 0,
+                cls: cls || 0,
+                transfer_kb: nav && nav.transferSize ? nav.transferSize / 1024 : 0
+              };
+            }
+            """
+        )
+        metrics.update({k: round(float(v or 0), 2) for k, v in perf.items()})
+        return metrics
+
+    async def collect_http_metrics(self, url: str) -> Dict[str, Any]:
+        """Tarayici olmadan tek bir HTTP GET suresinden yaklasik web metrikleri uretir."""
+        metrics = self._empty_web_metrics()
+        try:
+            async with httpx.AsyncClient(timeout=20.0, follow_redirects=True) as client:
+                started = time.perf_counter()
+                response = await client.get(url)
+                elapsed = (time.perf_counter() - started) * 1000
+                metrics["page_load_ms"] = round(elapsed, 2)
+                metrics["dom_content_loaded_ms"] = round(elapsed * 0.72, 2)
+                metrics["fcp_ms"] = round(elapsed * 0.55, 2)
+                metrics["lcp_ms"] = round(elapsed * 0.83, 2)
+                metrics["tti_ms"] = round(elapsed * 0.9, 2)
+                metrics["cls"] = 0.0
+                metrics["transfer_kb"] = round(len(response.text.encode("utf-8")) / 1024, 2)
+        except Exception:
+            pass
+        return metrics
+
+    async def _collect_web_metrics(self, url: str) -> Dict[str, Any]:
+        executor = WebExecutor(headless=True)
         try:
             await executor.start()
             await executor.navigate(url)
-            page = executor.page
-            perf = await page.evaluate(
-                """
-                async () => {
-                  const nav = performance.getEntriesByType('navigation')[0];
-                  const paints = performance.getEntriesByType('paint');
-                  let fcp = 0;
-                  for (const entry of paints) {
-                    if (entry.name === 'first-contentful-paint') {
-                      fcp = entry.startTime;
-                    }
-                  }
-                  let cls = 0;
-                  try {
-                    cls = window.__visionqa_cls || 0;
-                  } catch (e) {}
-                  return {
-                    page_load_ms: nav ? nav.loadEventEnd : 0,
-                    dom_content_loaded_ms: nav ? nav.domContentLoadedEventEnd : 0,
-                    fcp_ms: fcp || 0,
-                    lcp_ms: nav ? Math.max(nav.domContentLoadedEventEnd || 0, fcp || 0) : 0,
-                    tti_ms: nav ? nav.domInteractive : 0,
-                    cls: cls || 0,
-                    transfer_kb: nav && nav.transferSize ? nav.transferSize / 1024 : 0
-                  };
-                }
-                """
-            )
-            metrics.update({k: round(float(v or 0), 2) for k, v in perf.items()})
+            return await self.evaluate_navigation_metrics(executor.page)
         except Exception:
-            try:
-                async with httpx.AsyncClient(timeout=20.0, follow_redirects=True) as client:
-                    started = time.perf_counter()
-                    response = await client.get(url)
-                    elapsed = (time.perf_counter() - started) * 1000
-                    metrics["page_load_ms"] = round(elapsed, 2)
-                    metrics["dom_content_loaded_ms"] = round(elapsed * 0.72, 2)
-                    metrics["fcp_ms"] = round(elapsed * 0.55, 2)
-                    metrics["lcp_ms"] = round(elapsed * 0.83, 2)
-                    metrics["tti_ms"] = round(elapsed * 0.9, 2)
-                    metrics["cls"] = 0.0
-                    metrics["transfer_kb"] = round(len(response.text.encode("utf-8")) / 1024, 2)
-            except Exception:
-                pass
+            return await self.collect_http_metrics(url)
         finally:
             try:
                 await executor.stop()
             except Exception:
                 pass
-        return metrics
 
     async def _collect_api_metrics(self, api_url: str, method: str, sample_count: int) -> Dict[str, Any]:
         durations: List[float] = []
@@ -1,17 +1,14 @@
 from __future__ import annotations
 
-import io
 import re
 from typing import Dict, List, Optional
 
 from PIL import Image, ImageDraw
 
-from core.accessibility.engine import (
-    _crop_to_base64,
-    _detect_text_regions,
-    _image_to_base64,
-    _normalize_base64_image,
-)
+from core.analysis_cache import AnalysisResultCache
+from core.analysis_context import ImageAnalysisContext
+from core.accessibility.engine import _crop_to_base64
+from core.artifact_store import ArtifactStore, artifact_session, register_artifact_renderer, render_artifact, source_artifact
 
 
 PII_PATTERNS = [
@@ -150,34 +147,102 @@ def _score_from_counts(high_count: int, medium_count: int, low_count: int, floor
 
 
 def _build_overlay(image: Image.Image, findings: List[Dict]) -> str:
+    return render_artifact(
+        image,
+        "security-overlay",
+        {
+            "findings": [
+                [
+                    int(finding["bounding_box"]["x"]),
+                    int(finding["bounding_box"]["y"]),
+                    int(finding["bounding_box"]["width"]),
+                    int(finding["bounding_box"]["height"]),
+                    finding["severity"],
+                    finding["id"],
+                ]
+                for finding in findings[:8]
+            ]
+        },
+    )
+
+
+@register_artifact_renderer("security-overlay")
+def _draw_overlay(image: Image.Image, args: Dict) -> Image.Image:
     overlay = image.convert("RGBA")
     draw = ImageDraw.Draw(overlay, "RGBA")
-    for finding in findings[:8]:
-        box = finding["bounding_box"]
-        x1 = box["x"]
-        y1 = box["y"]
-        x2 = x1 + box["width"]
-        y2 = y1 + box["height"]
-        color = (248, 113, 113, 220) if finding["severity"] == "high" else (251, 191, 36, 220) if finding["severity"] == "medium" else (56, 189, 248, 220)
+    for x1, y1, width, height, severity, finding_id in args.get("findings", []):
+        x2 = x1 + width
+        y2 = y1 + height
+        color = (248, 113, 113, 220) if severity == "high" else (251, 191, 36, 220) if severity == "medium" else (56, 189, 248, 220)
         draw.rectangle((x1, y1, x2, y2), outline=color, width=3)
         draw.rounded_rectangle((x1, max(0, y1 - 24), x1 + 34, max(0, y1) + 4), radius=8, fill=color)
-        draw.text((x1 + 11, max(0, y1 - 18)), str(finding["id"]), fill=(15, 23, 42, 255))
-    return _image_to_base64(overlay)
+        draw.text((x1 + 11, max(0, y1 - 18)), str(finding_id), fill=(15, 23, 42, 255))
+    return overlay
 
 
 class SecurityEngine:
+    ENGINE_NAME = "security"
+    # Bump whenever the analysis output changes so cached results are invalidated.
+    ENGINE_VERSION = "1.0"
+
+    def __init__(self, cache: Optional[AnalysisResultCache] = None, artifacts: Optional[ArtifactStore] = None):
+        self.cache = cache
+        self.artifacts = artifacts
+
     def analyze_image(
         self,
-        image_base64: str,
+        image_base64: str = "",
         *,
         platform: str = "web",
         response_text: str = "",
         response_headers: Optional[Dict[str, str]] = None,
         url: Optional[str] = None,
+        context: Optional[ImageAnalysisContext] = None,
     ) -> Dict:
-        image_bytes = _normalize_base64_image(image_base64)
-        image = Image.open(io.BytesIO(image_bytes)).convert("RGB")
-        text_regions = _detect_text_regions(image)
+        if context is None:
+            context = ImageAnalysisContext.from_base64(image_base64)
+        with artifact_session(self.artifacts, context) as session:
+            result = self._analyze(
+                context,
+                platform=platform,
+                response_text=response_text,
+                response_headers=response_headers,
+                url=url,
+            )
+        return session.finalize(result) if session is not None else result
+
+    def _analyze(
+        self,
+        context: ImageAnalysisContext,
+        *,
+        platform: str,
+        response_text: str,
+        response_headers: Optional[Dict[str, str]],
+        url: Optional[str],
+    ) -> Dict:
+        image = context.image
+
+        cache_key = None
+        if self.cache is not None:
+            cache_key = self.cache.key_for(
+                self.ENGINE_NAME,
+                self.ENGINE_VERSION,
+                image,
+                {
+                    "platform": platform,
+                    "response_text": response_text,
+                    "response_headers": response_headers or {},
+                    "url": url,
+                    "artifact_store": self.artifacts.root_dir if self.artifacts is not None else None,
+                    **context.cache_params,
+                },
+                pixel_digest=context.pixel_digest,
+            )
+            cached = self.cache.get(cache_key)
+            if cached is not None:
+                return cached
+
+        text_regions = context.text_regions
         all_text = " ".join(str(region.get("text", "")) for region in text_regions)
         combined_text = f"{all_text}\n{response_text or ''}".strip()
         contexts = _infer_contexts(combined_text, url)
@@ -506,7 +571,7 @@ class SecurityEngine:
 
         unique_recommendations = list(dict.fromkeys([item["recommendation"] for item in findings] + [item["recommended_test"] for item in attack_hypotheses] + [step for chain in attack_chains for step in chain["remediation_path"]] + [step for cause in root_causes for step in cause["recommendations"]]))
 
-        return {
+        result = {
             "platform": platform,
             "image": {"width": image.width, "height": image.height},
             "overall_score": overall_score,
@@ -521,7 +586,7 @@ class SecurityEngine:
             "attack_hypotheses": attack_hypotheses[:6],
             "attack_chains": attack_chains[:4],
             "root_causes": root_causes[:4],
-            "artifacts": {"overlay_image_base64": _build_overlay(image, findings), "source_image_base64": _image_to_base64(image)},
+            "artifacts": {"overlay_image_base64": _build_overlay(image, findings), "source_image_base64": source_artifact(context, lambda: context.png_base64)},
             "header_summary": {"checked": len(header_checks), "missing": len([item for item in surface_findings if item["category"] == "header-hardening"])},
             "layer_summary": layer_summary,
             "context_profile": {
@@ -531,4 +596,8 @@ class SecurityEngine:
             },
             "cross_module_hints": cross_module_hints,
             "recommendations": unique_recommendations or ["Response header sertlestirmesini, auth hata dili ve exception sanitization katmanini tekrar kontrol et."],
+            "tiling": context.tiling_report,
         }
+        if cache_key is not None:
+            self.cache.set(cache_key, result)
+        return result
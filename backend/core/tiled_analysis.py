@@ -0,0 +1,325 @@
+"""
+VisionQA Tiled Analysis
+Banded analysis context for very tall full-page captures.
+
+A 1280x20000 capture analyzed in one piece materializes several full-page arrays
+(NumPy RGB, luminance, label maps, OCR/DINO inputs). The banded context runs the heavy
+per-pixel passes on overlapping horizontal bands, one band at a time, maps their boxes
+back into page coordinates and merges detections duplicated or cut at band seams. Band
+height is derived from a per-analysis memory ceiling; the decoded source image itself
+is the only full-page buffer that stays resident.
+"""
+
+from __future__ import annotations
+
+import dataclasses
+import math
+import os
+from typing import IO, Any, Callable, Dict, List, Optional, Tuple
+
+from PIL import Image
+
+from core.analysis_context import ImageAnalysisContext
+
+
+BAND_OVERLAP = 160
+MIN_BAND_HEIGHT = 480
+SEAM_TOLERANCE = 2
+# Rough peak working set per band pixel: RGB + gray + float32 luminance + argpartition
+# indices + int32 labels + OCR/DINO input copies.
+WORKING_BYTES_PER_PIXEL = 32
+
+Box = Tuple[int, int, int, int]
+
+
+def default_memory_ceiling_mb() -> int:
+    return int(os.getenv("ANALYSIS_MEMORY_CEILING_MB", "256"))
+
+
+def tiled_min_height() -> int:
+    return int(os.getenv("TILED_ANALYSIS_MIN_HEIGHT", "4096"))
+
+
+def band_height_for_ceiling(width: int, memory_ceiling_mb: int) -> int:
+    budget = max(1, int(memory_ceiling_mb)) * 1024 * 1024
+    return max(MIN_BAND_HEIGHT, budget // max(1, width * WORKING_BYTES_PER_PIXEL))
+
+
+def plan_bands(height: int, band_height: int, overlap: int) -> List[Tuple[int, int]]:
+    bands: List[Tuple[int, int]] = []
+    top = 0
+    while True:
+        bottom = min(height, top + band_height)
+        bands.append((top, bottom))
+        if bottom >= height:
+            return bands
+        top = bottom - overlap
+
+
+def _overlap_area(a: Box, b: Box) -> int:
+    width = min(a[2], b[2]) - max(a[0], b[0])
+    height = min(a[3], b[3]) - max(a[1], b[1])
+    return max(0, width) * max(0, height)
+
+
+def _area(box: Box) -> int:
+    return max(1, box[2] - box[0]) * max(1, box[3] - box[1])
+
+
+def merge_band_items(
+    banded: List[Tuple[int, Any]],
+    bands: List[Tuple[int, int]],
+    box_of: Callable[[Any], Box],
+    union: Callable[[List[Any], Box], Any],
+) -> List[Any]:
+    """Merge page-space detections from overlapping bands.
+
+    Detections fully inside a band are deduplicated across the overlap, preferring the
+    band whose own (seam-to-seam) range contains the box center. Detections cut by an
+    interior band edge are dropped when a whole copy exists, otherwise the pieces on
+    either side of the seam are unioned into one box.
+    """
+    seams = [0] + [(bands[index][0] + bands[index - 1][1]) // 2 for index in range(1, len(bands))] + [bands[-1][1]]
+    last = len(bands) - 1
+
+    whole: List[Tuple[bool, int, Any, Box]] = []
+    cut: List[Tuple[int, Any, Box]] = []
+    for band_index, item in banded:
+        box = box_of(item)
+        top, bottom = bands[band_index]
+        touches_top = band_index > 0 and box[1] <= top + SEAM_TOLERANCE
+        touches_bottom = band_index < last and box[3] >= bottom - SEAM_TOLERANCE
+        if touches_top or touches_bottom:
+            cut.append((band_index, item, box))
+            continue
+        center_y = (box[1] + box[3]) / 2
+        owned = seams[band_index] <= center_y < seams[band_index + 1]
+        whole.append((owned, band_index, item, box))
+
+    kept: List[Tuple[int, Any, Box]] = []
+    for owned, band_index, item, box in sorted(whole, key=lambda entry: not entry[0]):
+        duplicate = any(
+            other_band != band_index and _overlap_area(box, other_box) >= 0.5 * min(_area(box), _area(other_box))
+            for other_band, _, other_box in kept
+        )
+        if not duplicate:
+            kept.append((band_index, item, box))
+
+    groups: List[Tuple[Box, List[Any]]] = []
+    for band_index, item, box in sorted(cut, key=lambda entry: entry[2][1]):
+        if any(_overlap_area(box, kept_box) >= 0.5 * _area(box) for _, _, kept_box in kept):
+            continue
+        for group_index, (group_box, members) in enumerate(groups):
+            horizontal = min(box[2], group_box[2]) - max(box[0], group_box[0])
+            narrower = min(box[2] - box[0], group_box[2] - group_box[0])
+            if horizontal >= 0.5 * max(1, narrower) and box[1] <= group_box[3] + SEAM_TOLERANCE:
+                merged_box = (
+                    min(box[0], group_box[0]),
+                    min(box[1], group_box[1]),
+                    max(box[2], group_box[2]),
+                    max(box[3], group_box[3]),
+                )
+                groups[group_index] = (merged_box, members + [item])
+                break
+        else:
+            groups.append((box, [item]))
+
+    merged = [item for _, item, _ in kept]
+    for group_box, members in groups:
+        merged.append(members[0] if len(members) == 1 else union(members, group_box))
+    return merged
+
+
+def _region_box(region: Dict) -> Box:
+    x1, y1, x2, y2 = [int(round(value)) for value in region["box"]]
+    return x1, y1, x2, y2
+
+
+def _offset_region(region: Dict, top: int) -> Dict:
+    box = list(region.get("box") or [])
+    if len(box) != 4:
+        return region
+    return {**region, "box": [box[0], box[1] + top, box[2], box[3] + top]}
+
+
+def _union_regions(regions: List[Dict], box: Box) -> Dict:
+    largest = max(regions, key=lambda region: _area(_region_box(region)))
+    return {**largest, "box": list(box)}
+
+
+class TiledImageAnalysisContext(ImageAnalysisContext):
+    """Image context whose OCR, DINO and component passes run band by band."""
+
+    def __init__(
+        self,
+        image: Image.Image,
+        source_base64: Optional[str] = None,
+        band_height: Optional[int] = None,
+        overlap: int = BAND_OVERLAP,
+        memory_ceiling_mb: Optional[int] = None,
+        source_file: Optional[IO[bytes]] = None,
+    ):
+        super().__init__(image, source_base64=source_base64, source_file=source_file)
+        self.memory_ceiling_mb = int(memory_ceiling_mb or default_memory_ceiling_mb())
+        self.band_height = int(band_height or band_height_for_ceiling(self.width, self.memory_ceiling_mb))
+        self.overlap = max(0, min(int(overlap), self.band_height // 3))
+        self.bands = plan_bands(self.height, self.band_height, self.overlap)
+
+    def _banded(self, detect: Callable[[Image.Image], List[Any]], offset: Callable[[Any, int], Any]) -> List[Tuple[int, Any]]:
+        banded: List[Tuple[int, Any]] = []
+        for index, (top, bottom) in enumerate(self.bands):
+            band = self.image.crop((0, top, self.width, bottom))
+            banded.extend((index, offset(item, top)) for item in detect(band))
+            del band
+        return banded
+
+    def pixel_rows(self, top: int, bottom: int):
+        import numpy as np
+
+        from core.accessibility.engine import _linear_luminance
+
+        rgb = np.asarray(self.image.crop((0, top, self.width, bottom)), dtype=np.uint8)
+        return rgb, _linear_luminance(rgb)
+
+    @property
+    def text_regions(self) -> List[Dict]:
+        from core.accessibility import engine as accessibility_engine
+
+        def detect() -> List[Dict]:
+            band_reports: List[Dict[str, Any]] = []
+
+            def detect_band(band: Image.Image) -> List[Dict]:
+                report: Dict[str, Any] = {}
+                regions = accessibility_engine._detect_text_regions(band, report=report)
+                band_reports.append({**report, "_pixels": band.width * band.height})
+                return regions
+
+            regions = merge_band_items(self._banded(detect_band, _offset_region), self.bands, _region_box, _union_regions)
+            self._artifacts["ocr_report"] = self._combine_ocr_reports(band_reports)
+            return regions
+
+        return self._memo("text_regions", detect)
+
+    @staticmethod
+    def _combine_ocr_reports(band_reports: List[Dict[str, Any]]) -> Dict[str, Any]:
+        if not band_reports:
+            return {}
+        total_pixels = sum(report["_pixels"] for report in band_reports) or 1
+        combined: Dict[str, Any] = {
+            "mode": band_reports[0].get("mode"),
+            "bands": len(band_reports),
+            "band_modes": sorted({str(report.get("mode")) for report in band_reports}),
+            "pixel_coverage": round(
+                sum(float(report.get("pixel_coverage", 0.0)) * report["_pixels"] for report in band_reports) / total_pixels,
+                4,
+            ),
+        }
+        for key in ("roi_count", "roi_ocr_ms", "full_ocr_ms", "estimated_time_saved_ms"):
+            values = [report[key] for report in band_reports if key in report]
+            if values:
+                combined[key] = round(sum(values), 1) if isinstance(values[0], float) else sum(values)
+        return combined
+
+    @property
+    def dino_elements(self) -> List[Dict]:
+        from core.accessibility import engine as accessibility_engine
+
+        return self._memo(
+            "dino_elements",
+            lambda: merge_band_items(
+                self._banded(accessibility_engine._detect_elements_with_dino, _offset_region),
+                self.bands,
+                _region_box,
+                _union_regions,
+            ),
+        )
+
+    @property
+    def raw_component_candidates(self) -> List[Any]:
+        from core.accessibility import engine as accessibility_engine
+
+        def union(candidates: List[Any], box: Box) -> Any:
+            return accessibility_engine._build_candidate(
+                image=self.image,
+                x=box[0],
+                y=box[1],
+                width=box[2] - box[0],
+                height=box[3] - box[1],
+                foreground_pixels=sum(max(1, int(c.pixel_density * c.width * c.height)) for c in candidates),
+                cluster_size=sum(c.cluster_size for c in candidates),
+            )
+
+        return self._memo(
+            "raw_component_candidates",
+            lambda: merge_band_items(
+                self._banded(
+                    accessibility_engine._raw_component_candidates,
+                    lambda candidate, top: dataclasses.replace(candidate, y=candidate.y + top),
+                ),
+                self.bands,
+                lambda c: (c.x, c.y, c.x + c.width, c.y + c.height),
+                union,
+            ),
+        )
+
+    @property
+    def palette(self) -> List[Dict]:
+        from core.accessibility import engine as accessibility_engine
+
+        factor = max(1, math.ceil(math.sqrt(len(self.bands))))
+        return self._memo("palette", lambda: accessibility_engine._palette_summary(self.image.reduce(factor)))
+
+    @property
+    def cache_params(self) -> Dict[str, Any]:
+        return {**super().cache_params, "band_height": self.band_height, "band_overlap": self.overlap}
+
+    @property
+    def overlay_scale(self) -> float:
+        return min(1.0, math.sqrt(2 * self.band_height / max(self.height, 1)))
+
+    @property
+    def tiling_report(self) -> Dict[str, Any]:
+        return {
+            "bands": len(self.bands),
+            "band_height": self.band_height,
+            "band_overlap": self.overlap,
+            "memory_ceiling_mb": self.memory_ceiling_mb,
+            "estimated_band_working_mb": round(self.width * self.band_height * WORKING_BYTES_PER_PIXEL / (1024 * 1024), 1),
+        }
+
+
+def _with_tiling(
+    context: ImageAnalysisContext,
+    tiled: Optional[bool],
+    memory_ceiling_mb: Optional[int],
+) -> ImageAnalysisContext:
+    if tiled is None:
+        tiled = context.height > tiled_min_height()
+    if not tiled:
+        return context
+    return TiledImageAnalysisContext(
+        context.image,
+        source_base64=context._source_base64,
+        source_file=context._source_file,
+        memory_ceiling_mb=memory_ceiling_mb,
+    )
+
+
+def build_analysis_context(
+    image_base64: str,
+    *,
+    tiled: Optional[bool] = None,
+    memory_ceiling_mb: Optional[int] = None,
+) -> ImageAnalysisContext:
+    """Decode a capture and switch to banded analysis for tall images (or when ``tiled`` is forced)."""
+    return _with_tiling(ImageAnalysisContext.from_base64(image_base64), tiled, memory_ceiling_mb)
+
+
+def build_file_analysis_context(
+    image_file: IO[bytes],
+    *,
+    tiled: Optional[bool] = None,
+    memory_ceiling_mb: Optional[int] = None,
+) -> ImageAnalysisContext:
+    """Same as :func:`build_analysis_context` for a binary upload decoded straight from its spooled file."""
+    return _with_tiling(ImageAnalysisContext.from_file(image_file), tiled, memory_ceiling_mb)
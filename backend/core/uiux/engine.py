@@ -1,20 +1,20 @@
 from __future__ import annotations
 
-import io
 from dataclasses import dataclass
 from statistics import median
 from typing import Dict, List, Optional
 
 from PIL import Image, ImageDraw
 
+from core.analysis_cache import AnalysisResultCache
+from core.analysis_context import ImageAnalysisContext
 from core.accessibility.engine import (
     ComponentCandidate,
     _component_display_name,
     _crop_to_base64,
     _detect_component_candidates,
-    _image_to_base64,
-    _normalize_base64_image,
 )
+from core.artifact_store import ArtifactStore, artifact_session, register_artifact_renderer, render_artifact, source_artifact
 
 
 @dataclass
@@ -113,9 +113,13 @@ def _cluster_by_row(candidates: List[ComponentCandidate], threshold: int) -> Lis
     return [sorted(group, key=lambda item: item.x) for group in groups if len(group) >= 2]
 
 
-def _meaningful_candidates(image: Image.Image) -> List[ComponentCandidate]:
+def _meaningful_candidates(
+    image: Image.Image,
+    candidates: Optional[List[ComponentCandidate]] = None,
+) -> List[ComponentCandidate]:
     width, height = image.size
-    candidates = _detect_component_candidates(image)
+    if candidates is None:
+        candidates = _detect_component_candidates(image)
     filtered: List[ComponentCandidate] = []
     for candidate in candidates:
         if candidate.width < max(42, int(width * 0.1)):
@@ -687,38 +691,60 @@ def _find_persona_issue(candidates: List[ComponentCandidate], image_width: int,
 
 
 def _render_overlay(image: Image.Image, issues: List[UiuxIssue]) -> str:
+    return render_artifact(
+        image,
+        "uiux-overlay",
+        {
+            "issues": [
+                [
+                    int(issue.candidate.x),
+                    int(issue.candidate.y),
+                    int(issue.candidate.width),
+                    int(issue.candidate.height),
+                    issue.severity,
+                ]
+                for issue in issues
+            ]
+        },
+    )
+
+
+@register_artifact_renderer("uiux-overlay")
+def _draw_overlay(image: Image.Image, args: Dict) -> Image.Image:
     overlay = image.convert("RGBA")
     draw = ImageDraw.Draw(overlay, "RGBA")
 
-    for index, issue in enumerate(issues, start=1):
-        color = SEVERITY_BORDER.get(issue.severity, SEVERITY_BORDER["low"])
-        candidate = issue.candidate
-        region = (
-            candidate.x,
-            candidate.y,
-            candidate.x + candidate.width,
-            candidate.y + candidate.height,
-        )
-        draw.rectangle(region, outline=color, width=3)
-        badge_region = (candidate.x, max(0, candidate.y - 22), candidate.x + 26, max(0, candidate.y) + 4)
+    for index, (x, y, width, height, severity) in enumerate(args.get("issues", []), start=1):
+        color = SEVERITY_BORDER.get(severity, SEVERITY_BORDER["low"])
+        draw.rectangle((x, y, x + width, y + height), outline=color, width=3)
+        badge_region = (x, max(0, y - 22), x + 26, max(0, y) + 4)
         draw.rounded_rectangle(badge_region, radius=8, fill=color)
-        draw.text((candidate.x + 8, max(0, candidate.y - 18)), str(index), fill=(15, 23, 42, 255))
+        draw.text((x + 8, max(0, y - 18)), str(index), fill=(15, 23, 42, 255))
 
-    return _image_to_base64(overlay)
+    return overlay
 
 
 def _render_attention_overlay(image: Image.Image, candidates: List[ComponentCandidate]) -> str:
+    ranked = sorted(candidates, key=lambda item: item.width * item.height, reverse=True)[:4]
+    return render_artifact(
+        image,
+        "uiux-attention-overlay",
+        {"candidates": [[int(item.x), int(item.y), int(item.width), int(item.height)] for item in ranked]},
+    )
+
+
+@register_artifact_renderer("uiux-attention-overlay")
+def _draw_attention_overlay(image: Image.Image, args: Dict) -> Image.Image:
     overlay = image.convert("RGBA")
     draw = ImageDraw.Draw(overlay, "RGBA")
 
-    ranked = sorted(candidates, key=lambda item: item.width * item.height, reverse=True)[:4]
     centers = []
-    for index, candidate in enumerate(ranked, start=1):
-        center_x = int(candidate.x + candidate.width / 2)
-        center_y = int(candidate.y + candidate.height / 2)
+    for index, (x, y, width, height) in enumerate(args.get("candidates", []), start=1):
+        center_x = int(x + width / 2)
+        center_y = int(y + height / 2)
         centers.append((center_x, center_y))
 
-        glow_radius = max(26, min(84, int(max(candidate.width, candidate.height) * 0.38)))
+        glow_radius = max(26, min(84, int(max(width, height) * 0.38)))
         draw.ellipse(
             (
                 center_x - glow_radius,
@@ -767,7 +793,7 @@ def _render_attention_overlay(image: Image.Image, candidates: List[ComponentCand
             width=2,
         )
 
-    return _image_to_base64(overlay)
+    return overlay
 
 
 def _ai_critic_for(issue: UiuxIssue) -> str:
@@ -832,11 +858,48 @@ def _primary_focus_label(candidates: List[ComponentCandidate], image_width: int,
 
 
 class UiuxEngine:
-    def analyze_image(self, image_base64: str, platform: str = "web") -> Dict:
-        image_bytes = _normalize_base64_image(image_base64)
-        image = Image.open(io.BytesIO(image_bytes)).convert("RGB")
+    ENGINE_NAME = "uiux"
+    # Bump whenever the analysis output changes so cached results are invalidated.
+    ENGINE_VERSION = "1.0"
+
+    def __init__(self, cache: Optional[AnalysisResultCache] = None, artifacts: Optional[ArtifactStore] = None):
+        self.cache = cache
+        self.artifacts = artifacts
+
+    def analyze_image(
+        self,
+        image_base64: str = "",
+        platform: str = "web",
+        context: Optional[ImageAnalysisContext] = None,
+    ) -> Dict:
+        if context is None:
+            context = ImageAnalysisContext.from_base64(image_base64)
+        with artifact_session(self.artifacts, context) as session:
+            result = self._analyze(context, platform=platform)
+        return session.finalize(result) if session is not None else result
+
+    def _analyze(self, context: ImageAnalysisContext, *, platform: str) -> Dict:
+        image = context.image
         image_width, image_height = image.size
-        candidates = _meaningful_candidates(image)
+
+        cache_key = None
+        if self.cache is not None:
+            cache_key = self.cache.key_for(
+                self.ENGINE_NAME,
+                self.ENGINE_VERSION,
+                image,
+                {
+                    "platform": platform,
+                    "artifact_store": self.artifacts.root_dir if self.artifacts is not None else None,
+                    **context.cache_params,
+                },
+                pixel_digest=context.pixel_digest,
+            )
+            cached = self.cache.get(cache_key)
+            if cached is not None:
+                return cached
+
+        candidates = _meaningful_candidates(image, context.component_candidates)
 
         issues = []
         for resolver in (
@@ -925,7 +988,7 @@ class UiuxEngine:
         ranked_candidates = sorted(candidates, key=lambda item: item.width * item.height, reverse=True)[:4]
         attention_path = [_role_name(candidate, image_width, image_height) for candidate in ranked_candidates]
 
-        return {
+        result = {
             "platform": platform,
             "image": {
                 "width": image_width,
@@ -962,7 +1025,10 @@ class UiuxEngine:
             "artifacts": {
                 "annotated_image_base64": _render_overlay(image, issues),
                 "attention_overlay_image_base64": _render_attention_overlay(image, candidates),
-                "source_image_base64": _image_to_base64(image),
+                "source_image_base64": source_artifact(context, lambda: context.png_base64),
             },
             "recommendations": recommendations,
         }
+        if cache_key is not None:
+            self.cache.set(cache_key, result)
+        return result
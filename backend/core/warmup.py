@@ -0,0 +1,164 @@
+"""
+VisionQA Model Warm-up
+Background loading of the heavy analysis components at server start.
+
+Without warm-up, the first request that touches Grounding DINO pays the full
+``from_pretrained`` load (tens of seconds on CPU). With ``MODEL_WARMUP`` set, the
+server loads the listed components on a background thread right after start-up and
+``/health`` reports each component's state. ``/health/ready`` answers 503 until every
+listed component is warm, so a load balancer can hold analysis traffic back from cold
+nodes.
+
+A component that fails (e.g. the DINO service container is still starting) is retried
+with exponential backoff; only after ``MODEL_WARMUP_ATTEMPTS`` tries is it marked
+``failed`` for good.
+
+    MODEL_WARMUP=dino,ocr   # empty (default) disables warm-up
+    MODEL_WARMUP_ATTEMPTS=6  MODEL_WARMUP_RETRY_DELAY_S=2  MODEL_WARMUP_MAX_RETRY_DELAY_S=30
+"""
+
+from __future__ import annotations
+
+import os
+import threading
+import time
+from typing import Any, Callable, Dict, List, Optional
+
+from PIL import Image
+
+
+WARMUP_COMPONENTS = ("dino", "ocr")
+
+
+def _warm_dino() -> Dict[str, Any]:
+    from core.models.dino_service import DinoServiceClient, get_dino_client
+
+    client = get_dino_client()
+    if isinstance(client, DinoServiceClient):
+        # Model servis surecinde; burada sadece servisin ayakta oldugu dogrulanir.
+        import asyncio
+
+        ping = asyncio.run(client.ping())
+        return {"mode": "service", "address": client.address, "backend": ping.get("backend")}
+
+    # Kucuk bir tespit ilk forward pass'in maliyetini (kernel secimi, prompt cache) de oder.
+    client.detect_elements_sync(Image.new("RGB", (64, 64), "#ffffff"))
+    return {"mode": "in-process", "backend": client.backend, "device": client.device}
+
+
+def _warm_ocr() -> Dict[str, Any]:
+    from core.ocr_pool import ocr_pool
+
+    if not ocr_pool.available:
+        raise RuntimeError("OCR backend (tesserocr / pytesseract + tesseract) bulunamadi")
+    # Her worker kendi tesseract handle'ini acsin diye worker sayisi kadar farkli gorsel.
+    futures = [
+        ocr_pool.submit(Image.new("RGB", (64 + index, 32), "#ffffff"))
+        for index in range(ocr_pool.max_workers)
+    ]
+    for future in futures:
+        future.result()
+    return {"backend": ocr_pool.backend, "workers": ocr_pool.max_workers}
+
+
+_WARMERS: Dict[str, Callable[[], Dict[str, Any]]] = {"dino": _warm_dino, "ocr": _warm_ocr}
+
+
+class ModelWarmup:
+    """Listed components are loaded one after another on a daemon thread."""
+
+    def __init__(
+        self,
+        components: Optional[List[str]] = None,
+        warmers: Optional[Dict[str, Callable]] = None,
+        max_attempts: int = 6,
+        retry_delay: float = 2.0,
+        max_retry_delay: float = 30.0,
+    ):
+        self.warmers = warmers or _WARMERS
+        self.components = [name for name in (components or []) if name in self.warmers]
+        self.max_attempts = max(1, int(max_attempts))
+        self.retry_delay = max(0.0, float(retry_delay))
+        self.max_retry_delay = max(self.retry_delay, float(max_retry_delay))
+        self._lock = threading.Lock()
+        self._thread: Optional[threading.Thread] = None
+        self._state: Dict[str, Dict[str, Any]] = {name: {"status": "pending"} for name in self.components}
+
+    @classmethod
+    def from_env(cls) -> "ModelWarmup":
+        raw = os.getenv("MODEL_WARMUP", "")
+        components = [name.strip().lower() for name in raw.split(",") if name.strip()]
+        unknown = [name for name in components if name not in WARMUP_COMPONENTS]
+        if unknown:
+            print(f"⚠️ [Warm-up] Bilinmeyen bilesen(ler) yok sayildi: {', '.join(unknown)}")
+        return cls(
+            components,
+            max_attempts=int(os.getenv("MODEL_WARMUP_ATTEMPTS", "6")),
+            retry_delay=float(os.getenv("MODEL_WARMUP_RETRY_DELAY_S", "2")),
+            max_retry_delay=float(os.getenv("MODEL_WARMUP_MAX_RETRY_DELAY_S", "30")),
+        )
+
+    @property
+    def enabled(self) -> bool:
+        return bool(self.components)
+
+    def start(self) -> None:
+        if not self.enabled or self._thread is not None:
+            return
+        self._thread = threading.Thread(target=self._run, name="model-warmup", daemon=True)
+        self._thread.start()
+
+    def join(self, timeout: Optional[float] = None) -> None:
+        if self._thread is not None:
+            self._thread.join(timeout)
+
+    def _set(self, name: str, **state: Any) -> None:
+        with self._lock:
+            self._state[name] = state
+
+    def _warm(self, name: str, attempt: int) -> Optional[str]:
+        """Runs one warmer; returns the error text on failure (None once ready)."""
+        print(f"🔥 [Warm-up] {name} yukleniyor (deneme {attempt}/{self.max_attempts})...")
+        self._set(name, status="loading", attempts=attempt, started_at=time.time())
+        start = time.perf_counter()
+        try:
+            details = self.warmers[name]() or {}
+        except Exception as exc:
+            print(f"❌ [Warm-up] {name} yuklenemedi: {exc}")
+            self._set(name, status="failed", error=str(exc), attempts=attempt, seconds=round(time.perf_counter() - start, 2))
+            return str(exc)
+        seconds = round(time.perf_counter() - start, 2)
+        print(f"✅ [Warm-up] {name} hazir ({seconds} saniye)")
+        self._set(name, status="ready", seconds=seconds, attempts=attempt, **details)
+        return None
+
+    def _run(self) -> None:
+        pending = list(self.components)
+        for attempt in range(1, self.max_attempts + 1):
+            errors = {name: self._warm(name, attempt) for name in pending}
+            pending = [name for name, error in errors.items() if error is not None]
+            if not pending or attempt == self.max_attempts:
+                break
+            # Gec ayaga kalkan bagimliliklar (DINO servis konteyneri vb.) icin artan bekleme
+            delay = min(self.max_retry_delay, self.retry_delay * 2 ** (attempt - 1))
+            for name in pending:
+                self._set(name, status="retrying", error=errors[name], attempts=attempt, retry_in_seconds=round(delay, 2))
+            print(f"⏳ [Warm-up] {', '.join(pending)} {delay:.1f} saniye sonra tekrar denenecek")
+            time.sleep(delay)
+
+    def readiness(self) -> Dict[str, Any]:
+        """``ready`` is true once every listed component is warm (always true when warm-up is off)."""
+        with self._lock:
+            components = {name: dict(state) for name, state in self._state.items()}
+        for state in components.values():
+            started_at = state.pop("started_at", None)
+            if started_at is not None:
+                state["elapsed_seconds"] = round(time.time() - started_at, 1)
+        return {
+            "ready": all(state["status"] == "ready" for state in components.values()),
+            "warmup_enabled": self.enabled,
+            "components": components,
+        }
+
+
+model_warmup = ModelWarmup.from_env()
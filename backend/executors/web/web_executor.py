@@ -34,7 +34,10 @@ class WebExecutor:
         print("✅ [WebExecutor] Tarayıcı hazır!")
 
     async def navigate(self, url: str):
-        """Web sayfasını açar — Daha esnek yükleme stratejisi ile."""
+        """Web sayfasını açar — Daha esnek yükleme stratejisi ile.
+
+        Returns: Ana belge için Playwright Response (header/body okumak için) veya None
+        """
         if not self.page:
             raise Exception("Tarayıcı başlatılmadı!")
         
@@ -43,9 +46,9 @@ class WebExecutor:
         last_error: Optional[Exception] = None
         for attempt in range(1, self.nav_retries + 2):
             try:
-                await self.page.goto(url, wait_until="domcontentloaded", timeout=60000)
+                response = await self.page.goto(url, wait_until="domcontentloaded", timeout=60000)
                 print(f"✅ [WebExecutor] Sayfa yüklendi: {url}")
-                return
+                return response
             except Exception as exc:
                 last_error = exc
                 if attempt <= self.nav_retries:
@@ -277,7 +280,7 @@ class WebExecutor:
             
             try:
                 from core.models.llm_client import LLMClient
-                llm = LLMClient()
+                llm = LLMClient(use_cache=False)
                 
                 # 1. Mevcut ekranın görüntüsünü al
                 screenshot = await self.screenshot()
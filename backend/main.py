@@ -2,8 +2,10 @@
 import sys
 import asyncio
 import schemas
+from contextlib import asynccontextmanager
 from typing import List
 from fastapi import FastAPI, Depends, HTTPException
+from fastapi.responses import JSONResponse
 from fastapi.middleware.cors import CORSMiddleware
 from sqlalchemy.orm import Session
 
@@ -13,6 +15,9 @@ if sys.platform == "win32":
 
 from database import check_database_connection, get_db, engine, Base
 from database.models import Project as ProjectModel
+from core.analysis_cache import analysis_cache
+from core.models.http_pool import llm_http_pool
+from core.warmup import model_warmup
 from routers import (
     projects_router, 
     execution_router, 
@@ -28,13 +33,28 @@ from routers import (
     performance_router,
     dataset_router,
     mobile_router,
+    audit_router,
+    artifacts_router,
 )
 
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # 🔥 Opt-in warm-up (MODEL_WARMUP=dino,ocr): modeller arka planda yüklenir,
+    # sunucu beklemeden istek kabul etmeye başlar; durum /health'te görünür.
+    model_warmup.start()
+    # Opt-in (ANALYSIS_CACHE_STALE_VERSION_DAYS): uzun süredir yazılmayan eski engine sürümü dizinleri silinir
+    await asyncio.to_thread(analysis_cache.prune_stale_versions)
+    yield
+    # Uygulama ömürlü LLM HTTP bağlantılarını kapat
+    await llm_http_pool.aclose()
+
+
 # FastAPI uygulaması oluştur
 app = FastAPI(
     title="VisionQA API",
     description="AI-Powered Universal Software Quality & Testing Platform",
-    version="1.0.0"
+    version="1.0.0",
+    lifespan=lifespan,
 )
 
 # 🛠️ Veritabanı Tablonlarını Oluştur
@@ -67,9 +87,16 @@ def health_check():
         "service": "visionqa-backend",
         "database": db_status,
         "database_type": "PostgreSQL",
-        "port": 8000
+        "port": 8000,
+        "readiness": model_warmup.readiness(),
     }
 
+@app.get("/health/ready")
+def readiness_check():
+    """Readiness probe - modeller ısınana kadar 503 (load balancer analiz trafiğini bekletir)"""
+    readiness = model_warmup.readiness()
+    return JSONResponse(readiness, status_code=200 if readiness["ready"] else 503)
+
 # Router Bağlantıları
 app.include_router(projects_router.router)
 app.include_router(execution_router.router)
@@ -85,3 +112,5 @@ app.include_router(security_router.router)
 app.include_router(performance_router.router)
 app.include_router(dataset_router.router)
 app.include_router(mobile_router.router)
+app.include_router(audit_router.router)
+app.include_router(artifacts_router.router)
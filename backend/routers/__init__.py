@@ -13,3 +13,5 @@ from . import security_router
 from . import performance_router
 from . import dataset_router
 from . import mobile_router
+from . import audit_router
+from . import artifacts_router
@@ -1,19 +1,23 @@
 import base64
 import io
 
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Request
 from PIL import Image
 from sqlalchemy.orm import Session
 
 import schemas
 from database import get_db
 from database.models import AccessibilityAnalysisRecord
+from core.analysis_cache import analysis_cache
+from core.artifact_store import artifact_store, resolve_artifact_base64
 from core.accessibility.engine import AccessibilityEngine
+from core.image_upload import UploadRejected, read_image_upload
+from core.tiled_analysis import build_analysis_context, build_file_analysis_context
 from executors.web.web_executor import WebExecutor
 
 
 router = APIRouter(prefix="/accessibility", tags=["accessibility"])
-engine = AccessibilityEngine()
+engine = AccessibilityEngine(cache=analysis_cache, artifacts=artifact_store)
 
 
 def _record_meta(record: AccessibilityAnalysisRecord) -> dict:
@@ -37,6 +41,25 @@ def _build_thumbnail_base64(source_image_base64: str, max_size: tuple[int, int]
         return None
 
 
+def _build_accessibility_record(
+    result: dict,
+    *,
+    source_type: str,
+    source_label: str | None = None,
+    source_url: str | None = None,
+) -> AccessibilityAnalysisRecord:
+    return AccessibilityAnalysisRecord(
+        platform=result.get("platform", "web"),
+        source_type=source_type,
+        source_label=source_label,
+        source_url=source_url,
+        overall_score=int(result.get("overall_score") or 0),
+        findings_count=len(result.get("findings") or []),
+        overview=result.get("overview") or "",
+        analysis_payload=result,
+    )
+
+
 def _save_accessibility_record(
     db: Session,
     result: dict,
@@ -46,17 +69,7 @@ def _save_accessibility_record(
     source_url: str | None = None,
 ) -> None:
     try:
-        record = AccessibilityAnalysisRecord(
-            platform=result.get("platform", "web"),
-            source_type=source_type,
-            source_label=source_label,
-            source_url=source_url,
-            overall_score=int(result.get("overall_score") or 0),
-            findings_count=len(result.get("findings") or []),
-            overview=result.get("overview") or "",
-            analysis_payload=result,
-        )
-        db.add(record)
+        db.add(_build_accessibility_record(result, source_type=source_type, source_label=source_label, source_url=source_url))
         db.commit()
     except Exception as exc:
         db.rollback()
@@ -66,7 +79,7 @@ def _save_accessibility_record(
 def _history_item_schema(record: AccessibilityAnalysisRecord) -> schemas.AccessibilityHistoryItem:
     payload = record.analysis_payload or {}
     meta = (payload.get("_history_meta") or {})
-    source_image_base64 = ((payload.get("artifacts") or {}).get("source_image_base64")) or None
+    source_image_base64 = resolve_artifact_base64(payload.get("artifacts") or {}, "source")
     return schemas.AccessibilityHistoryItem(
         id=record.id,
         platform=record.platform,
@@ -90,9 +103,9 @@ async def analyze_accessibility_image(
     """Analyze a screenshot with a visual-first accessibility engine."""
     try:
         result = engine.analyze_image(
-            image_base64=request.image_base64,
             platform=request.platform,
             element_metadata=[item.model_dump() for item in request.element_metadata],
+            context=build_analysis_context(request.image_base64),
         )
         _save_accessibility_record(
             db,
@@ -108,6 +121,50 @@ async def analyze_accessibility_image(
         ) from exc
 
 
+@router.post("/analyze-upload", response_model=schemas.AccessibilityAnalysisResponse)
+async def analyze_accessibility_upload(request: Request, db: Session = Depends(get_db)):
+    """Screenshot'i base64 yerine ham binary govde (veya multipart ``image`` alani) olarak analiz eder.
+
+    Secenekler query string'den (multipart'ta form alanlarindan) okunur: ``platform``,
+    ``element_metadata`` (JSON), ``tiled`` ve ``memory_ceiling_mb``.
+    """
+    try:
+        upload = await read_image_upload(request)
+    except UploadRejected as exc:
+        raise HTTPException(status_code=exc.status_code, detail=str(exc)) from exc
+
+    try:
+        element_metadata = [
+            schemas.AccessibilityElementMetadata.model_validate(item).model_dump()
+            for item in upload.json_field("element_metadata", [])
+        ]
+        result = engine.analyze_image(
+            platform=upload.field("platform", "web"),
+            element_metadata=element_metadata,
+            context=build_file_analysis_context(
+                upload.file,
+                tiled=upload.bool_field("tiled"),
+                memory_ceiling_mb=upload.int_field("memory_ceiling_mb"),
+            ),
+        )
+        _save_accessibility_record(
+            db,
+            result,
+            source_type="upload",
+            source_label="Manuel screenshot analizi",
+        )
+        return result
+    except UploadRejected as exc:
+        raise HTTPException(status_code=exc.status_code, detail=str(exc)) from exc
+    except Exception as exc:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Accessibility analysis failed: {exc}",
+        ) from exc
+    finally:
+        upload.close()
+
+
 @router.post("/analyze-url", response_model=schemas.AccessibilityAnalysisResponse)
 async def analyze_accessibility_url(
     request: schemas.AccessibilityUrlAnalysisRequest,
@@ -129,9 +186,13 @@ async def analyze_accessibility_url(
         image_base64 = base64.b64encode(screenshot_bytes).decode("utf-8")
 
         result = engine.analyze_image(
-            image_base64=image_base64,
             platform="web",
             element_metadata=element_metadata,
+            context=build_analysis_context(
+                image_base64,
+                tiled=request.tiled,
+                memory_ceiling_mb=request.memory_ceiling_mb,
+            ),
         )
         _save_accessibility_record(
             db,
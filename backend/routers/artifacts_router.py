@@ -0,0 +1,26 @@
+from fastapi import APIRouter, HTTPException
+from fastapi.responses import Response
+
+from core.artifact_store import artifact_store
+
+
+router = APIRouter(prefix="/artifacts", tags=["artifacts"])
+
+# Artifact ID'leri icerik hash'i oldugu icin icerik asla degismez.
+IMMUTABLE_CACHE_CONTROL = "public, max-age=31536000, immutable"
+
+
+@router.get("/{artifact_id}")
+def get_artifact(artifact_id: str):
+    """Kaynak goruntu, crop veya overlay'i ID ile dondurur; crop/overlay'ler ilk istekte render edilir."""
+    if artifact_store is None:
+        raise HTTPException(status_code=404, detail="Artifact store is disabled.")
+    artifact = artifact_store.get(artifact_id)
+    if artifact is None:
+        raise HTTPException(status_code=404, detail="Artifact not found.")
+    data, media_type = artifact
+    return Response(
+        content=data,
+        media_type=media_type,
+        headers={"Cache-Control": IMMUTABLE_CACHE_CONTROL, "ETag": f'"{artifact_id}"'},
+    )
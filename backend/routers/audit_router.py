@@ -0,0 +1,321 @@
+import asyncio
+import base64
+import time
+
+from fastapi import APIRouter, Depends, HTTPException, Request
+from sqlalchemy.orm import Session
+
+import schemas
+from core.accessibility.engine import AccessibilityEngine
+from core.analysis_cache import analysis_cache
+from core.analysis_context import ImageAnalysisContext
+from core.artifact_store import artifact_store
+from core.performance.engine import PerformanceEngine
+from core.security.engine import SecurityEngine
+from core.image_upload import UploadRejected, read_image_upload
+from core.tiled_analysis import build_analysis_context, build_file_analysis_context
+from core.uiux.engine import UiuxEngine
+from database import get_db
+from executors.web.web_executor import WebExecutor
+from routers.accessibility_router import _build_accessibility_record
+from routers.security_router import _build_security_record
+from routers.uiux_router import _build_uiux_record
+
+
+router = APIRouter(prefix="/audit", tags=["audit"])
+accessibility_engine = AccessibilityEngine(cache=analysis_cache, artifacts=artifact_store)
+uiux_engine = UiuxEngine(cache=analysis_cache, artifacts=artifact_store)
+security_engine = SecurityEngine(cache=analysis_cache, artifacts=artifact_store)
+performance_engine = PerformanceEngine()
+
+RESPONSE_TEXT_LIMIT = 5000
+
+
+async def _response_snapshot(response) -> tuple[dict[str, str], str]:
+    """Navigasyon cevabindan header ve (metin tipliyse) govdeyi okur; ikinci bir HTTP istegi atmaz."""
+    if response is None:
+        return {}, ""
+    try:
+        headers = dict(await response.all_headers())
+    except Exception:
+        headers = dict(getattr(response, "headers", None) or {})
+    content_type = headers.get("content-type", "")
+    if not any(token in content_type for token in ("text", "json", "html")):
+        return headers, ""
+    try:
+        return headers, (await response.text())[:RESPONSE_TEXT_LIMIT]
+    except Exception:
+        return headers, ""
+
+
+async def _capture_page(url: str, *, headless: bool, full_page: bool, stage_timings: dict[str, float]) -> dict:
+    """Sayfayi tek bir tarayici oturumunda acar ve tum modullerin ihtiyac duydugu girdileri toplar."""
+    started = time.perf_counter()
+    executor = WebExecutor(headless=headless)
+    try:
+        await executor.start()
+        response = await executor.navigate(url)
+        response_headers, response_text = await _response_snapshot(response)
+        try:
+            web_metrics = await performance_engine.evaluate_navigation_metrics(executor.page)
+        except Exception:
+            web_metrics = None
+        screenshot_bytes = await executor.screenshot(full_page=full_page)
+        element_metadata = await executor.extract_accessibility_metadata()
+    finally:
+        try:
+            await executor.stop()
+        except Exception:
+            pass
+
+    if web_metrics is None:
+        web_metrics = await performance_engine.collect_http_metrics(url)
+    stage_timings["capture"] = round((time.perf_counter() - started) * 1000, 2)
+    return {
+        "image_base64": base64.b64encode(screenshot_bytes).decode("utf-8"),
+        "element_metadata": element_metadata,
+        "response_headers": response_headers,
+        "response_text": response_text,
+        "web_metrics": web_metrics,
+    }
+
+
+async def _run_module(name: str, stage_timings: dict[str, float], func, *args, **kwargs):
+    started = time.perf_counter()
+    try:
+        if asyncio.iscoroutinefunction(func):
+            return await func(*args, **kwargs)
+        return await asyncio.to_thread(func, *args, **kwargs)
+    finally:
+        stage_timings[name] = round((time.perf_counter() - started) * 1000, 2)
+
+
+async def _run_audit(
+    context: ImageAnalysisContext,
+    *,
+    platform: str,
+    element_metadata: list[dict] | None,
+    url: str | None = None,
+    response_headers: dict[str, str] | None = None,
+    response_text: str = "",
+    web_metrics: dict | None = None,
+    stage_timings: dict[str, float],
+) -> tuple[dict[str, dict], dict[str, str]]:
+    """Ayni capture context'ini paylasan modulleri paralel calistirir; bir modulun hatasi digerlerini durdurmaz."""
+    jobs = {
+        "accessibility": _run_module(
+            "accessibility",
+            stage_timings,
+            accessibility_engine.analyze_image,
+            platform=platform,
+            element_metadata=element_metadata,
+            context=context,
+        ),
+        "uiux": _run_module("uiux", stage_timings, uiux_engine.analyze_image, platform=platform, context=context),
+        "security": _run_module(
+            "security",
+            stage_timings,
+            security_engine.analyze_image,
+            platform=platform,
+            response_text=response_text,
+            response_headers=response_headers,
+            url=url,
+            context=context,
+        ),
+    }
+    if web_metrics is not None:
+        jobs["performance"] = _run_module(
+            "performance",
+            stage_timings,
+            performance_engine.analyze,
+            platform=platform,
+            web_metrics=web_metrics,
+        )
+
+    outcomes = await asyncio.gather(*jobs.values(), return_exceptions=True)
+    results: dict[str, dict] = {}
+    errors: dict[str, str] = {}
+    for name, outcome in zip(jobs, outcomes):
+        if isinstance(outcome, Exception):
+            errors[name] = str(outcome)
+        else:
+            results[name] = outcome
+    return results, errors
+
+
+def _save_audit_records(
+    db: Session,
+    results: dict[str, dict],
+    *,
+    source_type: str,
+    source_label: str,
+    source_url: str | None = None,
+) -> dict[str, int]:
+    """Tum modul gecmis kayitlarini tek transaction'da yazar; biri basarisiz olursa hicbiri yazilmaz."""
+    records = {}
+    if "accessibility" in results:
+        records["accessibility"] = _build_accessibility_record(
+            results["accessibility"], source_type=source_type, source_label=source_label, source_url=source_url
+        )
+    if "uiux" in results:
+        records["uiux"] = _build_uiux_record(results["uiux"], source_type=source_type, source_label=source_label)
+    if "security" in results:
+        records["security"] = _build_security_record(
+            results["security"], source_type=source_type, source_label=source_label, source_url=source_url
+        )
+    if not records:
+        return {}
+
+    try:
+        db.add_all(records.values())
+        db.commit()
+    except Exception as exc:
+        db.rollback()
+        print(f"⚠️ Audit history save failed: {exc}")
+        return {}
+    return {name: record.id for name, record in records.items()}
+
+
+def _audit_response(
+    results: dict[str, dict],
+    errors: dict[str, str],
+    history_ids: dict[str, int],
+    stage_timings: dict[str, float],
+    *,
+    platform: str,
+    source_type: str,
+    source_url: str | None = None,
+) -> dict:
+    return {
+        "platform": platform,
+        "source_type": source_type,
+        "source_url": source_url,
+        **results,
+        "module_errors": errors,
+        "history_ids": history_ids,
+        "stage_timings_ms": stage_timings,
+    }
+
+
+@router.post("/image", response_model=schemas.AuditResponse)
+async def audit_image(request: schemas.AuditImageRequest, db: Session = Depends(get_db)):
+    """Tek screenshot'i accessibility, UI/UX ve security modullerinde tek decode ile analiz eder."""
+    started = time.perf_counter()
+    stage_timings: dict[str, float] = {}
+    try:
+        context = build_analysis_context(
+            request.image_base64,
+            tiled=request.tiled,
+            memory_ceiling_mb=request.memory_ceiling_mb,
+        )
+    except Exception as exc:
+        raise HTTPException(status_code=400, detail=f"Audit image decode failed: {exc}") from exc
+
+    results, errors = await _run_audit(
+        context,
+        platform=request.platform,
+        element_metadata=[item.model_dump() for item in request.element_metadata],
+        stage_timings=stage_timings,
+    )
+    if not results:
+        raise HTTPException(status_code=400, detail=f"Audit failed: {errors}")
+
+    history_ids = _save_audit_records(db, results, source_type="upload", source_label="Toplu audit screenshot analizi")
+    stage_timings["total"] = round((time.perf_counter() - started) * 1000, 2)
+    return _audit_response(results, errors, history_ids, stage_timings, platform=request.platform, source_type="upload")
+
+
+@router.post("/upload", response_model=schemas.AuditResponse)
+async def audit_upload(request: Request, db: Session = Depends(get_db)):
+    """``/audit/image`` ile ayni; screenshot ham binary govde (veya multipart ``image`` alani) olarak gelir."""
+    started = time.perf_counter()
+    stage_timings: dict[str, float] = {}
+    try:
+        upload = await read_image_upload(request)
+    except UploadRejected as exc:
+        raise HTTPException(status_code=exc.status_code, detail=str(exc)) from exc
+
+    try:
+        platform = upload.field("platform", "web")
+        element_metadata = [
+            schemas.AccessibilityElementMetadata.model_validate(item).model_dump()
+            for item in upload.json_field("element_metadata", [])
+        ]
+        context = build_file_analysis_context(
+            upload.file,
+            tiled=upload.bool_field("tiled"),
+            memory_ceiling_mb=upload.int_field("memory_ceiling_mb"),
+        )
+        results, errors = await _run_audit(
+            context,
+            platform=platform,
+            element_metadata=element_metadata,
+            stage_timings=stage_timings,
+        )
+    except UploadRejected as exc:
+        raise HTTPException(status_code=exc.status_code, detail=str(exc)) from exc
+    except Exception as exc:
+        raise HTTPException(status_code=400, detail=f"Audit upload decode failed: {exc}") from exc
+    finally:
+        upload.close()
+    if not results:
+        raise HTTPException(status_code=400, detail=f"Audit failed: {errors}")
+
+    history_ids = _save_audit_records(db, results, source_type="upload", source_label="Toplu audit screenshot analizi")
+    stage_timings["total"] = round((time.perf_counter() - started) * 1000, 2)
+    return _audit_response(results, errors, history_ids, stage_timings, platform=platform, source_type="upload")
+
+
+@router.post("/url", response_model=schemas.AuditResponse)
+async def audit_url(request: schemas.AuditUrlRequest, db: Session = Depends(get_db)):
+    """Sayfayi bir kez yakalar ve tum modulleri ayni capture uzerinde paralel calistirir."""
+    if request.platform != "web":
+        raise HTTPException(status_code=400, detail="URL-based audit is currently supported only for web.")
+
+    started = time.perf_counter()
+    stage_timings: dict[str, float] = {}
+    try:
+        capture = await _capture_page(
+            request.url,
+            headless=request.headless,
+            full_page=request.full_page,
+            stage_timings=stage_timings,
+        )
+        context = build_analysis_context(
+            capture["image_base64"],
+            tiled=request.tiled,
+            memory_ceiling_mb=request.memory_ceiling_mb,
+        )
+    except Exception as exc:
+        raise HTTPException(status_code=400, detail=f"Audit URL capture failed: {exc}") from exc
+
+    results, errors = await _run_audit(
+        context,
+        platform="web",
+        element_metadata=capture["element_metadata"],
+        url=request.url,
+        response_headers=capture["response_headers"],
+        response_text=capture["response_text"],
+        web_metrics=capture["web_metrics"],
+        stage_timings=stage_timings,
+    )
+    if not results:
+        raise HTTPException(status_code=400, detail=f"Audit failed: {errors}")
+
+    history_ids = _save_audit_records(
+        db,
+        results,
+        source_type="url",
+        source_label="Canli URL audit analizi",
+        source_url=request.url,
+    )
+    stage_timings["total"] = round((time.perf_counter() - started) * 1000, 2)
+    return _audit_response(
+        results,
+        errors,
+        history_ids,
+        stage_timings,
+        platform="web",
+        source_type="url",
+        source_url=request.url,
+    )
@@ -1,11 +1,13 @@
 
-from fastapi import APIRouter, Depends, HTTPException, BackgroundTasks
+from fastapi import APIRouter, Depends, HTTPException, BackgroundTasks, Request
+from fastapi.responses import StreamingResponse
 from sqlalchemy.orm import Session
 from pydantic import BaseModel
-from typing import List, Dict, Any, Optional
+from typing import List, Dict, Any, AsyncIterator, Optional
+from collections import Counter
 import json
 
-from database import get_db
+from database import get_db, SessionLocal
 from database.models import TestCase, TestStep, Project
 
 router = APIRouter(prefix="/cases", tags=["Test Cases - AI Generation"])
@@ -23,6 +25,8 @@ class GenerateCasesRequest(BaseModel):
     use_screenshot: bool = True   # True → Playwright ile gerçek analiz (yavaş ama doğru)
     strict_visual: bool = True    # True → Görsel analiz başarısızsa fallback'e düşme
     require_live_show: bool = True  # True → Desktop Bridge çalışmazsa hata ver
+    use_llm_cache: bool = True    # False → LLM yanıt önbelleğini atla, yeniden üret
+    stream: bool = False          # True → case'ler üretildikçe NDJSON / SSE olarak gönderilir
 
 class TestStepResponse(BaseModel):
     order: int
@@ -49,6 +53,106 @@ class GenerateCasesResponse(BaseModel):
     saved_to_db: bool
 
 
+def _save_case(db: Session, request: GenerateCasesRequest, case_data: Dict[str, Any]) -> int:
+    """Case'i ve adımlarını oturuma ekler (commit çağırana ait), DB ID'sini döndürür."""
+    db_case = TestCase(
+        project_id=request.project_id,
+        page_id=request.page_id,
+        title=case_data["title"],
+        description=case_data.get("description", ""),
+        category=case_data.get("category", "happy_path"),
+        status="draft",
+        priority=case_data.get("priority", "medium"),
+        platform=request.platform
+    )
+    db.add(db_case)
+    db.flush()  # ID almak için
+
+    # Adımları kaydet
+    for step_data in case_data.get("steps", []):
+        db_step = TestStep(
+            test_case_id=db_case.id,
+            order=step_data.get("order", 1),
+            action=step_data.get("action", "interact"),
+            target=step_data.get("target", ""),
+            expected_result=step_data.get("expected", ""),
+            value=step_data.get("value", None)
+        )
+        db.add(db_step)
+    return db_case.id
+
+
+def _category_summary(category_counts: Counter) -> Dict[str, int]:
+    return {
+        "happy_path": category_counts.get("happy_path", 0),
+        "negative_path": category_counts.get("negative_path", 0),
+        "edge_case": category_counts.get("edge_case", 0),
+        "security": category_counts.get("security", 0),
+    }
+
+
+def _case_response(case_data: Dict[str, Any], url: str, case_id: Optional[int] = None) -> TestCaseResponse:
+    return TestCaseResponse(
+        id=case_id,
+        title=case_data["title"],
+        description=case_data.get("description", ""),
+        category=case_data["category"],
+        priority=case_data.get("priority", "medium"),
+        source_url=case_data.get("source_url", url),
+        steps=case_data.get("steps", [])
+    )
+
+
+async def _stream_generated_cases(generator, request: GenerateCasesRequest, url: str, sse: bool) -> AsyncIterator[str]:
+    """
+    Case'leri LLM çıktısında tamamlandıkça gönderir: her case bir ``case`` olayı,
+    sonunda ``summary`` (ya da ``error``) olayı. project_id verildiyse her case,
+    olayı gönderilmeden önce commit edilir; olaydaki ``id`` kalıcı bir DB kaydını
+    gösterir ve stream yarıda kesilse bile gönderilmiş case'ler kaybolmaz.
+    """
+    def event(kind: str, data: Dict[str, Any]) -> str:
+        if sse:
+            return f"event: {kind}\ndata: {json.dumps(data, ensure_ascii=False)}\n\n"
+        return json.dumps({"type": kind, **data}, ensure_ascii=False) + "\n"
+
+    # İstek bağımlılığındaki oturum yanıt gönderilirken kapanabilir; stream kendi oturumunu açar.
+    db = SessionLocal() if request.project_id else None
+    category_counts: Counter = Counter()
+    saved = 0
+    try:
+        async for case_data in generator.stream_cases_from_url(
+            url=url,
+            platform=request.platform,
+            use_screenshot=request.use_screenshot,
+            strict_visual=request.strict_visual,
+            require_live_show=request.require_live_show
+        ):
+            case_id = None
+            if db is not None:
+                case_id = _save_case(db, request, case_data)
+                db.commit()
+                saved += 1
+            category_counts[case_data["category"]] += 1
+            yield event("case", {"case": _case_response(case_data, request.url, case_id).model_dump()})
+
+        total = sum(category_counts.values())
+        yield event("summary", {
+            "success": total > 0,
+            "url": request.url,
+            "total_cases": total,
+            "saved_cases": saved,
+            "summary": _category_summary(category_counts),
+            "saved_to_db": db is not None,
+        })
+    except Exception as e:
+        if db is not None:
+            db.rollback()
+        yield event("error", {"detail": f"Beklenmeyen hata: {str(e)}", "saved_cases": saved})
+    finally:
+        if db is not None:
+            db.close()
+
+
 # ─────────────────────────────────────────────
 # Endpoint: AI ile Test Case Üret
 # ─────────────────────────────────────────────
@@ -56,6 +160,7 @@ class GenerateCasesResponse(BaseModel):
 @router.post("/generate", response_model=GenerateCasesResponse)
 async def generate_test_cases(
     request: GenerateCasesRequest,
+    http_request: Request,
     db: Session = Depends(get_db)
 ):
     """
@@ -68,6 +173,10 @@ async def generate_test_cases(
     - **use_screenshot**: True = Gerçek browser screenshot analizi (yavaş), False = URL'den hızlı tahmin
     - **strict_visual**: True = Görsel analiz/algılama başarısızsa fallback yapma, hata dön
     - **require_live_show**: True = Desktop Bridge canlı şovu zorunlu kıl
+    - **use_llm_cache**: False = LLM yanıt önbelleğini atla (değişmemiş sayfa için de yeniden üret)
+    - **stream**: True = Case'ler LLM çıktısında tamamlandıkça gönderilir; `Accept: text/event-stream`
+      ise SSE, değilse NDJSON (`{"type": "case" | "summary" | "error", ...}` satırları).
+      project_id verildiyse her case olayı gönderilmeden önce commit edilir.
     """
     try:
         print(
@@ -88,7 +197,17 @@ async def generate_test_cases(
             )
 
         from core.agents.case_generator import AICaseGenerator
-        generator = AICaseGenerator()
+        generator = AICaseGenerator(use_llm_cache=request.use_llm_cache)
+
+        if request.stream:
+            if request.project_id and not db.query(Project).filter(Project.id == request.project_id).first():
+                raise HTTPException(status_code=404, detail=f"Proje bulunamadı: {request.project_id}")
+            sse = "text/event-stream" in http_request.headers.get("accept", "")
+            return StreamingResponse(
+                _stream_generated_cases(generator, request, url_to_check, sse),
+                media_type="text/event-stream" if sse else "application/x-ndjson",
+                headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+            )
 
         # AI ile senaryolar üret
         cases_data = await generator.generate_cases_from_url(
@@ -103,7 +222,6 @@ async def generate_test_cases(
             raise HTTPException(status_code=500, detail="AI senaryo üretemedi.")
 
         # Özet istatistikleri hesapla
-        from collections import Counter
         category_counts = Counter(c["category"] for c in cases_data)
 
         # Eğer project_id verildiyse DB'ye kaydet
@@ -119,34 +237,9 @@ async def generate_test_cases(
 
             # Her case'i DB'ye kaydet
             for case_data in cases_data:
-                db_case = TestCase(
-                    project_id=request.project_id,
-                    page_id=request.page_id,
-                    title=case_data["title"],
-                    description=case_data.get("description", ""),
-                    category=case_data.get("category", "happy_path"),
-                    status="draft",
-                    priority=case_data.get("priority", "medium"),
-                    platform=request.platform
-                )
-                db.add(db_case)
-                db.flush()  # ID almak için
-                saved_cases += 1
-
                 # Gerçek DB ID'sini kaydet
-                saved_cases_map[case_data["title"]] = db_case.id
-
-                # Adımları kaydet
-                for step_data in case_data.get("steps", []):
-                    db_step = TestStep(
-                        test_case_id=db_case.id,
-                        order=step_data.get("order", 1),
-                        action=step_data.get("action", "interact"),
-                        target=step_data.get("target", ""),
-                        expected_result=step_data.get("expected", ""),
-                        value=step_data.get("value", None)
-                    )
-                    db.add(db_step)
+                saved_cases_map[case_data["title"]] = _save_case(db, request, case_data)
+                saved_cases += 1
 
             db.commit()
             saved_to_db = True
@@ -156,22 +249,10 @@ async def generate_test_cases(
             url=request.url,
             total_cases=len(cases_data),
             saved_cases=saved_cases,
-            summary={
-                "happy_path": category_counts.get("happy_path", 0),
-                "negative_path": category_counts.get("negative_path", 0),
-                "edge_case": category_counts.get("edge_case", 0),
-                "security": category_counts.get("security", 0),
-            },
+            summary=_category_summary(category_counts),
             cases=[
-                TestCaseResponse(
-                    id=saved_cases_map.get(c["title"]),  # Gerçek DB ID veya None
-                    title=c["title"],
-                    description=c.get("description", ""),
-                    category=c["category"],
-                    priority=c.get("priority", "medium"),
-                    source_url=c.get("source_url", request.url),
-                    steps=c.get("steps", [])
-                ) for c in cases_data
+                _case_response(c, request.url, saved_cases_map.get(c["title"]))  # Gerçek DB ID veya None
+                for c in cases_data
             ],
             saved_to_db=saved_to_db
         )
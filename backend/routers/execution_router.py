@@ -472,6 +472,8 @@ async def run_test_case_live(case_id: int, db: Session = Depends(get_db)):
         try:
             return loop.run_until_complete(_execute_steps(steps))
         finally:
+            # LLM havuzunun bu loop'ta açtığı client'lar burada kapanır
+            loop.run_until_complete(loop.shutdown_asyncgens())
             loop.close()
 
     loop = asyncio.get_event_loop()
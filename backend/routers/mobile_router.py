@@ -1,7 +1,8 @@
-from fastapi import APIRouter, HTTPException
+from fastapi import APIRouter, HTTPException, Request
 
+from core.image_upload import UploadRejected, read_image_upload
 from core.mobile.engine import MobileAnalysisEngine
-from schemas import MobileAnalysisRequest, MobileAnalysisResponse
+from schemas import MobileAnalysisRequest, MobileAnalysisResponse, MobileElementMetadata
 
 router = APIRouter(prefix="/mobile", tags=["mobile"])
 
@@ -21,3 +22,38 @@ def analyze_mobile(request: MobileAnalysisRequest):
         image_base64=request.image_base64,
         element_metadata=[item.model_dump() for item in request.element_metadata],
     )
+
+
+@router.post("/analyze-upload", response_model=MobileAnalysisResponse)
+async def analyze_mobile_upload(request: Request):
+    """Screenshot'i ham binary govde (veya multipart ``image`` alani) olarak alir.
+
+    Mobil analiz sadece goruntu boyutunu kullandigi icin goruntu tam decode edilmez;
+    ``platform``, ``screen_name`` ve ``element_metadata`` (JSON) query'den okunur.
+    """
+    try:
+        upload = await read_image_upload(request)
+    except UploadRejected as exc:
+        raise HTTPException(status_code=exc.status_code, detail=str(exc)) from exc
+
+    try:
+        image_size = upload.image_size()
+        element_metadata = [
+            MobileElementMetadata.model_validate(item).model_dump()
+            for item in upload.json_field("element_metadata", [])
+        ]
+    except UploadRejected as exc:
+        raise HTTPException(status_code=exc.status_code, detail=str(exc)) from exc
+    except Exception as exc:
+        raise HTTPException(status_code=400, detail=f"Mobil analiz girdisi okunamadi: {exc}") from exc
+    finally:
+        upload.close()
+
+    engine = MobileAnalysisEngine()
+    return engine.analyze(
+        platform=upload.field("platform", "android"),
+        screen_name=upload.field("screen_name"),
+        image_base64=None,
+        element_metadata=element_metadata,
+        image_size=image_size,
+    )
@@ -78,10 +78,12 @@ def delete_page(page_id: int, db: Session = Depends(get_db)):
 @router.post("/pages/{page_id}/generate-cases")
 async def generate_cases_for_page(
     page_id: int, 
+    use_llm_cache: bool = True,
     db: Session = Depends(get_db)
 ):
     """
     Belirli bir SAYFA (URL) için AI kullanarak otomatik test case üretir.
+    `use_llm_cache=false` ile LLM yanıt önbelleği atlanır.
     """
     # 1. Sayfayı Bul
     page = db.query(Page).filter(Page.id == page_id).first()
@@ -93,7 +95,7 @@ async def generate_cases_for_page(
     try:
         # 2. AI ile Üret
         print(f"🤖 AI Case Generation başladı (Sayfa: {page.name}): {target_url}")
-        generator = AICaseGenerator()
+        generator = AICaseGenerator(use_llm_cache=use_llm_cache)
         generated_cases = await generator.generate_cases_from_url(
             target_url,
             platform="web",
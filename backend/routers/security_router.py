@@ -4,19 +4,23 @@ import re
 from urllib.parse import parse_qsl, urlencode, urlsplit, urlunsplit
 
 import httpx
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Request
 from PIL import Image
 from sqlalchemy.orm import Session
 
 import schemas
+from core.analysis_cache import analysis_cache
+from core.artifact_store import artifact_store, resolve_artifact_base64
 from core.security.engine import SecurityEngine
+from core.image_upload import UploadRejected, read_image_upload
+from core.tiled_analysis import build_analysis_context, build_file_analysis_context
 from database import get_db
 from database.models import SecurityAnalysisRecord
 from executors.web.web_executor import WebExecutor
 
 
 router = APIRouter(prefix="/security", tags=["security"])
-engine = SecurityEngine()
+engine = SecurityEngine(cache=analysis_cache, artifacts=artifact_store)
 
 
 def _inject_query(url: str, key: str, value: str) -> str:
@@ -47,19 +51,22 @@ def _build_thumbnail_base64(source_image_base64: str, max_size: tuple[int, int]
         return None
 
 
+def _build_security_record(result: dict, *, source_type: str, source_label: str | None = None, source_url: str | None = None) -> SecurityAnalysisRecord:
+    return SecurityAnalysisRecord(
+        platform=result.get("platform", "web"),
+        source_type=source_type,
+        source_label=source_label,
+        source_url=source_url,
+        overall_score=int(result.get("overall_score") or 0),
+        findings_count=len(result.get("findings") or []),
+        overview=result.get("overview") or "",
+        analysis_payload=result,
+    )
+
+
 def _save_security_record(db: Session, result: dict, *, source_type: str, source_label: str | None = None, source_url: str | None = None) -> None:
     try:
-        record = SecurityAnalysisRecord(
-            platform=result.get("platform", "web"),
-            source_type=source_type,
-            source_label=source_label,
-            source_url=source_url,
-            overall_score=int(result.get("overall_score") or 0),
-            findings_count=len(result.get("findings") or []),
-            overview=result.get("overview") or "",
-            analysis_payload=result,
-        )
-        db.add(record)
+        db.add(_build_security_record(result, source_type=source_type, source_label=source_label, source_url=source_url))
         db.commit()
     except Exception as exc:
         db.rollback()
@@ -69,7 +76,7 @@ def _save_security_record(db: Session, result: dict, *, source_type: str, source
 def _history_item_schema(record: SecurityAnalysisRecord) -> schemas.SecurityHistoryItem:
     payload = record.analysis_payload or {}
     meta = (payload.get("_history_meta") or {})
-    source_image_base64 = ((payload.get("artifacts") or {}).get("source_image_base64")) or None
+    source_image_base64 = resolve_artifact_base64(payload.get("artifacts") or {}, "source")
     return schemas.SecurityHistoryItem(
         id=record.id,
         platform=record.platform,
@@ -89,13 +96,40 @@ def _history_item_schema(record: SecurityAnalysisRecord) -> schemas.SecurityHist
 async def analyze_security_image(request: schemas.SecurityAnalysisRequest, db: Session = Depends(get_db)):
     try:
         result = engine.analyze_image(
-            image_base64=request.image_base64,
             platform=request.platform,
+            context=build_analysis_context(request.image_base64),
+        )
+        _save_security_record(db, result, source_type="upload", source_label="Manuel security screenshot analizi")
+        return result
+    except Exception as exc:
+        raise HTTPException(status_code=400, detail=f"Security image analysis failed: {exc}") from exc
+
+
+@router.post("/analyze-upload", response_model=schemas.SecurityAnalysisResponse)
+async def analyze_security_upload(request: Request, db: Session = Depends(get_db)):
+    """Screenshot'i ham binary govde (veya multipart ``image`` alani) olarak alir; ``platform`` query'den okunur."""
+    try:
+        upload = await read_image_upload(request)
+    except UploadRejected as exc:
+        raise HTTPException(status_code=exc.status_code, detail=str(exc)) from exc
+
+    try:
+        result = engine.analyze_image(
+            platform=upload.field("platform", "web"),
+            context=build_file_analysis_context(
+                upload.file,
+                tiled=upload.bool_field("tiled"),
+                memory_ceiling_mb=upload.int_field("memory_ceiling_mb"),
+            ),
         )
         _save_security_record(db, result, source_type="upload", source_label="Manuel security screenshot analizi")
         return result
+    except UploadRejected as exc:
+        raise HTTPException(status_code=exc.status_code, detail=str(exc)) from exc
     except Exception as exc:
         raise HTTPException(status_code=400, detail=f"Security image analysis failed: {exc}") from exc
+    finally:
+        upload.close()
 
 
 @router.post("/analyze-url", response_model=schemas.SecurityAnalysisResponse)
@@ -122,11 +156,15 @@ async def analyze_security_url(request: schemas.SecurityUrlAnalysisRequest, db:
         screenshot_bytes = await executor.screenshot(full_page=request.full_page)
         image_base64 = base64.b64encode(screenshot_bytes).decode("utf-8")
         result = engine.analyze_image(
-            image_base64=image_base64,
             platform="web",
             response_text=response_text,
             response_headers=response_headers,
             url=request.url,
+            context=build_analysis_context(
+                image_base64,
+                tiled=request.tiled,
+                memory_ceiling_mb=request.memory_ceiling_mb,
+            ),
         )
         _save_security_record(db, result, source_type="url", source_label="Canli security URL analizi", source_url=request.url)
         return result
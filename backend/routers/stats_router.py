@@ -4,6 +4,13 @@ from sqlalchemy import func, case
 from datetime import datetime, timedelta
 from typing import Dict, Any
 
+from core.analysis_cache import analysis_cache
+from core.artifact_store import artifact_store
+from core.models.hedging import llm_hedge_policy
+from core.models.http_pool import llm_http_pool
+from core.models.llm_cache import llm_response_cache
+from core.models.rate_limiter import llm_rate_limiter
+from core.ocr_pool import ocr_pool
 from database import get_db
 from database.models import Project, TestCase, TestRun, TestStatus
 
@@ -320,3 +327,47 @@ def get_platform_stats(db: Session = Depends(get_db)) -> Dict[str, Any]:
         "platforms": platforms,
         "total_platforms_active": len(platforms)
     }
+
+
+@router.get("/analysis-cache")
+def get_analysis_cache_stats() -> Dict[str, Any]:
+    """Screenshot analiz sonuc cache'inin hit/miss istatistikleri."""
+    return analysis_cache.stats()
+
+
+@router.get("/ocr-pool")
+def get_ocr_pool_stats() -> Dict[str, Any]:
+    """OCR worker havuzunun backend, worker sayisi ve bolge cache istatistikleri."""
+    return ocr_pool.stats()
+
+
+@router.get("/artifact-store")
+def get_artifact_store_stats() -> Dict[str, Any]:
+    """Artifact store yazma, dedupe ve lazy render istatistikleri."""
+    if artifact_store is None:
+        return {"enabled": False}
+    return {"enabled": True, **artifact_store.stats()}
+
+
+@router.get("/llm-http")
+def get_llm_http_stats() -> Dict[str, Any]:
+    """LLM HTTP havuzu: provider bazında istek, yeni/yeniden kullanılan bağlantı ve HTTP sürümü."""
+    return llm_http_pool.stats()
+
+
+@router.get("/llm-cache")
+def get_llm_cache_stats() -> Dict[str, Any]:
+    """LLM yanıt önbelleği: isabet, yazma, TTL ile düşen ve LRU ile atılan kayıtlar."""
+    return llm_response_cache.stats()
+
+
+@router.get("/llm-rate-limit")
+def get_llm_rate_limit_stats() -> Dict[str, Any]:
+    """Provider bazında RPM/TPM bütçesi: kuyruk bekleme süreleri, throttle, 429 ve birleştirilen istekler."""
+    return llm_rate_limiter.stats()
+
+
+@router.get("/llm-hedging")
+def get_llm_hedging_stats() -> Dict[str, Any]:
+    """Provider gecikme histogramları (p50/p95/p99), güncel hedge eşiği ve hangi provider'ın kazandığı."""
+    return llm_hedge_policy.stats()
@@ -1,18 +1,22 @@
 import base64
 import io
 
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Request
 from PIL import Image
 from sqlalchemy.orm import Session
 
 import schemas
 from database import get_db
 from database.models import UiuxAnalysisRecord
+from core.analysis_cache import analysis_cache
+from core.artifact_store import artifact_store, resolve_artifact_base64
+from core.analysis_context import ImageAnalysisContext
+from core.image_upload import UploadRejected, read_image_upload
 from core.uiux.engine import UiuxEngine
 
 
 router = APIRouter(prefix="/uiux", tags=["uiux"])
-engine = UiuxEngine()
+engine = UiuxEngine(cache=analysis_cache, artifacts=artifact_store)
 
 
 def _record_meta(record: UiuxAnalysisRecord) -> dict:
@@ -36,18 +40,21 @@ def _build_thumbnail_base64(source_image_base64: str, max_size: tuple[int, int]
         return None
 
 
+def _build_uiux_record(result: dict, *, source_type: str = "upload", source_label: str | None = None) -> UiuxAnalysisRecord:
+    return UiuxAnalysisRecord(
+        platform=result.get("platform", "web"),
+        source_type=source_type,
+        source_label=source_label,
+        overall_score=int(result.get("overall_score") or 0),
+        findings_count=len(result.get("findings") or []),
+        overview=result.get("overview") or "",
+        analysis_payload=result,
+    )
+
+
 def _save_uiux_record(db: Session, result: dict, *, source_label: str | None = None) -> None:
     try:
-        record = UiuxAnalysisRecord(
-            platform=result.get("platform", "web"),
-            source_type="upload",
-            source_label=source_label,
-            overall_score=int(result.get("overall_score") or 0),
-            findings_count=len(result.get("findings") or []),
-            overview=result.get("overview") or "",
-            analysis_payload=result,
-        )
-        db.add(record)
+        db.add(_build_uiux_record(result, source_label=source_label))
         db.commit()
     except Exception as exc:
         db.rollback()
@@ -98,7 +105,7 @@ def _normalize_uiux_payload(payload: dict) -> dict:
 def _history_item_schema(record: UiuxAnalysisRecord) -> schemas.UiuxHistoryItem:
     payload = record.analysis_payload or {}
     meta = (payload.get("_history_meta") or {})
-    source_image_base64 = ((payload.get("artifacts") or {}).get("source_image_base64")) or None
+    source_image_base64 = resolve_artifact_base64(payload.get("artifacts") or {}, "source")
     return schemas.UiuxHistoryItem(
         id=record.id,
         platform=record.platform,
@@ -129,6 +136,29 @@ async def analyze_uiux_image(
         raise HTTPException(status_code=400, detail=f"UI/UX analysis failed: {exc}") from exc
 
 
+@router.post("/analyze-upload", response_model=schemas.UiuxAnalysisResponse)
+async def analyze_uiux_upload(request: Request, db: Session = Depends(get_db)):
+    """Screenshot'i ham binary govde (veya multipart ``image`` alani) olarak alir; ``platform`` query'den okunur."""
+    try:
+        upload = await read_image_upload(request)
+    except UploadRejected as exc:
+        raise HTTPException(status_code=exc.status_code, detail=str(exc)) from exc
+
+    try:
+        result = engine.analyze_image(
+            platform=upload.field("platform", "web"),
+            context=ImageAnalysisContext.from_file(upload.file),
+        )
+        _save_uiux_record(db, result, source_label="Manuel screenshot analizi")
+        return result
+    except UploadRejected as exc:
+        raise HTTPException(status_code=exc.status_code, detail=str(exc)) from exc
+    except Exception as exc:
+        raise HTTPException(status_code=400, detail=f"UI/UX analysis failed: {exc}") from exc
+    finally:
+        upload.close()
+
+
 @router.get("/history", response_model=list[schemas.UiuxHistoryItem])
 def get_uiux_history(
     limit: int = 10,
@@ -163,7 +163,8 @@ class AccessibilityFinding(BaseModel):
     dominant_dark: str
     dominant_light: str
     bounding_box: BoundingBox
-    crop_image_base64: str
+    crop_image_base64: str = ""
+    crop_artifact_id: Optional[str] = None
     recommendation: str
 
 
@@ -202,8 +203,10 @@ class AccessibilityComponentSummary(BaseModel):
 
 
 class AccessibilityArtifacts(BaseModel):
-    overlay_image_base64: str
-    source_image_base64: str
+    overlay_image_base64: str = ""
+    overlay_artifact_id: Optional[str] = None
+    source_image_base64: str = ""
+    source_artifact_id: Optional[str] = None
 
 
 class AccessibilityElementMetadata(BaseModel):
@@ -236,6 +239,8 @@ class AccessibilityUrlAnalysisRequest(BaseModel):
     platform: str = "web"
     headless: bool = True
     full_page: bool = True
+    tiled: Optional[bool] = None
+    memory_ceiling_mb: Optional[int] = None
 
 
 class AccessibilityAnalysisResponse(BaseModel):
@@ -251,6 +256,9 @@ class AccessibilityAnalysisResponse(BaseModel):
     heatmap: List[AccessibilityHeatmapRegion]
     artifacts: AccessibilityArtifacts
     recommendations: List[str]
+    ocr_report: Dict[str, Any] = {}
+    tiling: Dict[str, Any] = {}
+    stage_timings_ms: Dict[str, float] = {}
 
 
 class AccessibilityHistoryItem(BaseModel):
@@ -297,7 +305,8 @@ class UiuxFinding(BaseModel):
     ai_critic: str
     why_this_matters: str
     bounding_box: BoundingBox
-    crop_image_base64: str
+    crop_image_base64: str = ""
+    crop_artifact_id: Optional[str] = None
     recommendation: str
 
 
@@ -319,9 +328,12 @@ class UiuxAttentionPrediction(BaseModel):
 
 
 class UiuxArtifacts(BaseModel):
-    annotated_image_base64: str
-    attention_overlay_image_base64: str
-    source_image_base64: str
+    annotated_image_base64: str = ""
+    annotated_artifact_id: Optional[str] = None
+    attention_overlay_image_base64: str = ""
+    attention_overlay_artifact_id: Optional[str] = None
+    source_image_base64: str = ""
+    source_artifact_id: Optional[str] = None
 
 
 class UiuxAnalysisRequest(BaseModel):
@@ -391,14 +403,17 @@ class SecurityFinding(BaseModel):
     category: str
     description: str
     bounding_box: BoundingBox
-    crop_image_base64: str
+    crop_image_base64: str = ""
+    crop_artifact_id: Optional[str] = None
     recommendation: str
     evidence: Optional[str] = None
 
 
 class SecurityArtifacts(BaseModel):
-    overlay_image_base64: str
-    source_image_base64: str
+    overlay_image_base64: str = ""
+    overlay_artifact_id: Optional[str] = None
+    source_image_base64: str = ""
+    source_artifact_id: Optional[str] = None
 
 
 class SecurityHeaderSummary(BaseModel):
@@ -506,6 +521,8 @@ class SecurityUrlAnalysisRequest(BaseModel):
     platform: str = "web"
     headless: bool = True
     full_page: bool = True
+    tiled: Optional[bool] = None
+    memory_ceiling_mb: Optional[int] = None
 
 
 class SecurityAnalysisResponse(BaseModel):
@@ -529,6 +546,7 @@ class SecurityAnalysisResponse(BaseModel):
     context_profile: SecurityContextProfile
     cross_module_hints: List[SecurityCrossModuleHint]
     recommendations: List[str]
+    tiling: Dict[str, Any] = {}
 
 
 class SecurityHistoryItem(BaseModel):
@@ -959,3 +977,33 @@ class MobileAnalysisResponse(BaseModel):
     supported_now: List[MobileCapabilityItem]
     next_phase: List[MobileCapabilityItem]
     recommendations: List[str]
+
+
+class AuditImageRequest(BaseModel):
+    platform: str = "web"
+    image_base64: str
+    element_metadata: List[AccessibilityElementMetadata] = []
+    tiled: Optional[bool] = None
+    memory_ceiling_mb: Optional[int] = None
+
+
+class AuditUrlRequest(BaseModel):
+    url: str
+    platform: str = "web"
+    headless: bool = True
+    full_page: bool = True
+    tiled: Optional[bool] = None
+    memory_ceiling_mb: Optional[int] = None
+
+
+class AuditResponse(BaseModel):
+    platform: str
+    source_type: str
+    source_url: Optional[str] = None
+    accessibility: Optional[AccessibilityAnalysisResponse] = None
+    uiux: Optional[UiuxAnalysisResponse] = None
+    security: Optional[SecurityAnalysisResponse] = None
+    performance: Optional[PerformanceAnalysisResponse] = None
+    module_errors: Dict[str, str] = {}
+    history_ids: Dict[str, int] = {}
+    stage_timings_ms: Dict[str, float] = {}
@@ -1,8 +1,11 @@
 import base64
 import io
 import os
+import random
 import sys
+import time
 
+import pytest
 from PIL import Image, ImageDraw
 from fastapi.testclient import TestClient
 
@@ -10,16 +13,22 @@ sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
 
 from core.accessibility.engine import (
     AccessibilityEngine,
+    _BoxIndex,
     _build_dino_candidates,
     ComponentCandidate,
     _apply_metadata_hints,
     _apply_detected_labels,
     _apply_text_hints,
+    _analyze_tile_grid,
     _build_text_region_candidates,
     _crop_to_base64,
     _classify_component,
+    _detect_component_candidates,
+    _foreground_components_python,
+    _foreground_components_vectorized,
     _component_display_name,
     _group_ocr_word_regions,
+    _merge_candidate_clusters,
     _prune_fragment_icon_candidates,
     _prune_container_candidates,
     contrast_ratio,
@@ -579,6 +588,21 @@ def test_dino_candidates_can_combine_multiple_ocr_regions():
     assert "Username or email" in candidates[0].text_hint
 
 
+def test_dino_candidates_scan_text_regions_once(monkeypatch):
+    import core.accessibility.engine as engine_module
+
+    calls = []
+    original = engine_module._valid_region_boxes
+    monkeypatch.setattr(engine_module, "_valid_region_boxes", lambda regions: calls.append(1) or original(regions))
+
+    elements = [{"label": "button", "score": 0.9, "box": [20 + i * 40, 20, 56 + i * 40, 44]} for i in range(8)]
+    regions = [{"box": [24 + i * 40, 24, 50 + i * 40, 40], "text": f"B{i}", "score": 0.9} for i in range(8)]
+    candidates = _build_dino_candidates(Image.new("RGB", (400, 80), "#ffffff"), elements, regions)
+
+    assert len(candidates) == 8
+    assert len(calls) == 1
+
+
 def test_fragment_icon_candidates_are_pruned_inside_semantic_boxes():
     icon_fragment = ComponentCandidate(
         x=120,
@@ -762,3 +786,140 @@ def test_metadata_hints_can_create_unmatched_input_candidate():
     assert relabeled
     assert relabeled[0].label == "input-row"
     assert relabeled[0].text_hint == "Username or email"
+
+
+def test_vectorized_foreground_components_match_flood_fill():
+    pytest.importorskip("cv2")
+    image = Image.new("RGB", (160, 120), "#ffffff")
+    draw = ImageDraw.Draw(image)
+    draw.rectangle((4, 4, 40, 18), fill="#111827")
+    draw.rectangle((60, 10, 62, 90), fill="#6c44db")
+    draw.rectangle((60, 88, 140, 92), fill="#6c44db")
+    draw.ellipse((90, 20, 130, 60), fill="#ffb08a")
+    draw.point((150, 110), fill="#000000")
+    draw.text((10, 100), "Devam et", fill="#333333")
+
+    expected = _foreground_components_python(image, (255, 255, 255), 28)
+    actual = _foreground_components_vectorized(image, (255, 255, 255), 28)
+
+    assert actual == expected
+
+
+def test_vectorized_component_candidates_match_flood_fill(monkeypatch):
+    pytest.importorskip("cv2")
+    image = Image.open(io.BytesIO(base64.b64decode(_form_panel_image_base64()))).convert("RGB")
+
+    vectorized = _detect_component_candidates(image)
+    monkeypatch.setattr("core.accessibility.engine._foreground_components_vectorized", lambda *args: None)
+    flood_fill = _detect_component_candidates(image)
+
+    assert vectorized == flood_fill
+
+
+def test_tile_grid_matches_palette_extremes_on_two_tone_tiles(monkeypatch):
+    pytest.importorskip("numpy")
+    image = Image.new("RGB", (203, 157), "#f5f5f5")
+    draw = ImageDraw.Draw(image)
+    draw.rectangle((10, 10, 60, 40), fill="#111827")
+    draw.rectangle((110, 20, 190, 60), fill="#d0d0d0")
+    draw.rectangle((30, 100, 150, 140), fill="#ffb08a")
+
+    vectorized = _analyze_tile_grid(image, 3, 4)
+    monkeypatch.setattr("core.accessibility.engine._tile_grid_extremes_vectorized", lambda *args: None)
+    palette = _analyze_tile_grid(image, 3, 4)
+
+    assert [(tile.x, tile.y, tile.width, tile.height) for tile in vectorized] == [
+        (tile.x, tile.y, tile.width, tile.height) for tile in palette
+    ]
+    assert [tile.contrast_ratio for tile in vectorized] == [tile.contrast_ratio for tile in palette]
+    assert [tile.severity for tile in vectorized] == [tile.severity for tile in palette]
+
+
+def test_accessibility_engine_supports_fine_tile_grids():
+    engine = AccessibilityEngine()
+    result = engine.analyze_image(_sample_image_base64(), min_tile_size=4, max_grid=32)
+
+    assert len(result["heatmap"]) == 32 * 32
+    assert sum(result["wcag_summary"].values()) == 32 * 32
+    assert sum(region["width"] for region in result["heatmap"][:32]) == 240
+    assert sum(region["height"] for region in result["heatmap"][::32]) == 140
+
+
+def _random_candidates(count: int, seed: int) -> list:
+    rng = random.Random(seed)
+    candidates = []
+    for _ in range(count):
+        width = rng.randint(8, 160)
+        height = rng.randint(6, 60)
+        candidates.append(
+            ComponentCandidate(
+                x=rng.randint(0, 1280 - width),
+                y=rng.randint(0, 2400 - height),
+                width=width,
+                height=height,
+                label=rng.choice(["content-block", "icon-or-badge", "text-line", "action-button"]),
+                confidence=0.5,
+                contrast_ratio=3.2,
+                dominant_dark="#333333",
+                dominant_light="#f5f5f5",
+                severity="medium",
+                description="",
+                pixel_density=0.4,
+            )
+        )
+    return candidates
+
+
+def test_box_index_lookups_match_full_scan(monkeypatch):
+    image = Image.new("RGB", (1280, 2400), "#f5f5f5")
+    candidates = _random_candidates(160, seed=7)
+    text_regions = [
+        {"box": [c.x + 2, c.y + 1, c.x + c.width - 2, c.y + c.height - 1], "text": f"Line {index}", "score": 0.8}
+        for index, c in enumerate(_random_candidates(120, seed=11))
+    ]
+    dino_elements = [
+        {"label": label, "score": 0.6, "box": [c.x, c.y, c.x + c.width, c.y + c.height]}
+        for label, c in zip(["button", "icon", "input field", "form"] * 30, _random_candidates(120, seed=13))
+    ]
+
+    def run_pipeline():
+        merged = _merge_candidate_clusters(image, candidates)
+        hinted = _apply_text_hints(candidates, text_regions)
+        labeled = _apply_detected_labels(hinted, dino_elements)
+        dino_candidates = _build_dino_candidates(image, dino_elements[:20], text_regions)
+        pruned = _prune_fragment_icon_candidates(labeled, text_regions, dino_elements)
+        return merged, hinted, labeled, dino_candidates, pruned
+
+    indexed = run_pipeline()
+    monkeypatch.setattr(_BoxIndex, "query", lambda self, box, margin_x=0.0, margin_y=0.0: list(range(len(self))))
+    full_scan = run_pipeline()
+
+    assert indexed == full_scan
+    assert indexed[0]
+
+
+def test_analyze_image_runs_independent_stages_concurrently(monkeypatch):
+    def slow_ocr(image, report=None):
+        time.sleep(0.3)
+        return []
+
+    def slow_dino(image):
+        time.sleep(0.3)
+        return []
+
+    monkeypatch.setattr("core.accessibility.engine._detect_text_regions", slow_ocr)
+    monkeypatch.setattr("core.accessibility.engine._detect_elements_with_dino", slow_dino)
+
+    result = AccessibilityEngine(max_workers=4).analyze_image(_sample_image_base64())
+    timings = result["stage_timings_ms"]
+
+    assert {"decode", "tile_grid", "ocr", "dino", "components", "candidate_fusion", "report", "total"} <= set(timings)
+    assert timings["ocr"] >= 300
+    assert timings["dino"] >= 300
+    assert timings["total"] < timings["ocr"] + timings["dino"]
+
+
+def test_analyze_image_sequential_mode_reports_timings():
+    result = AccessibilityEngine(max_workers=1).analyze_image(_sample_image_base64())
+
+    assert result["stage_timings_ms"]["total"] >= result["stage_timings_ms"]["components"]
@@ -0,0 +1,149 @@
+import base64
+import io
+import os
+import sys
+
+from fastapi.testclient import TestClient
+from PIL import Image, ImageDraw
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+import main
+from core.accessibility.engine import AccessibilityEngine
+from core.analysis_cache import AnalysisResultCache
+from core.uiux.engine import UiuxEngine
+
+
+def _image_base64(fill: str = "#111827", image_format: str = "PNG") -> str:
+    image = Image.new("RGB", (200, 120), "#f8fafc")
+    draw = ImageDraw.Draw(image)
+    draw.rectangle((20, 20, 180, 60), fill=fill)
+    buffer = io.BytesIO()
+    image.save(buffer, format=image_format)
+    return base64.b64encode(buffer.getvalue()).decode("utf-8")
+
+
+def test_cache_hits_pixel_identical_captures_with_different_encoding(monkeypatch):
+    cache = AnalysisResultCache(max_entries=4)
+    engine = UiuxEngine(cache=cache)
+    calls = []
+
+    first = engine.analyze_image(_image_base64(image_format="PNG"))
+    monkeypatch.setattr("core.uiux.engine._meaningful_candidates", lambda image, *args: calls.append(image) or [])
+    second = engine.analyze_image(_image_base64(image_format="BMP"))
+
+    assert not calls
+    assert second["findings"] == first["findings"]
+    assert cache.stats()["hits"] == 1
+    assert cache.stats()["misses"] == 1
+
+
+def test_cache_key_includes_parameters_and_engine_version():
+    cache = AnalysisResultCache(max_entries=8)
+    image = Image.new("RGB", (10, 10), "#ffffff")
+
+    base = cache.key_for("accessibility", "1.0", image, {"platform": "web"})
+    assert base == cache.key_for("accessibility", "1.0", image, {"platform": "web"})
+    assert base != cache.key_for("accessibility", "1.0", image, {"platform": "mobile"})
+    assert base != cache.key_for("accessibility", "1.1", image, {"platform": "web"})
+    assert base != cache.key_for("uiux", "1.0", image, {"platform": "web"})
+
+
+def test_memory_tier_is_bounded_lru():
+    cache = AnalysisResultCache(max_entries=2)
+    keys = [cache.key_for("uiux", "1.0", Image.new("RGB", (4, 4), color), {}) for color in ("red", "green", "blue")]
+
+    cache.set(keys[0], {"value": 0})
+    cache.set(keys[1], {"value": 1})
+    assert cache.get(keys[0]) == {"value": 0}
+    cache.set(keys[2], {"value": 2})
+
+    assert cache.get(keys[1]) is None
+    assert cache.get(keys[0]) == {"value": 0}
+    assert cache.stats()["evictions"] == 1
+    assert cache.stats()["entries"] == 2
+
+
+def test_memory_tier_is_bounded_by_payload_bytes():
+    cache = AnalysisResultCache(max_entries=64, max_bytes=2500)
+    keys = [cache.key_for("uiux", "1.0", Image.new("RGB", (4, 4), (i, 0, 0)), {}) for i in range(4)]
+
+    for index, key in enumerate(keys[:3]):
+        cache.set(key, {"overlay_base64": "A" * 1000, "index": index})
+    assert cache.get(keys[0]) is None
+    assert cache.get(keys[2])["index"] == 2
+    assert cache.stats()["bytes"] <= 2500
+
+    cache.set(keys[3], {"overlay_base64": "A" * 5000})
+    assert cache.get(keys[3]) is None
+    assert cache.stats()["entries"] == 2
+
+
+def test_disk_tier_survives_restart_and_keeps_other_versions(tmp_path):
+    image = Image.new("RGB", (4, 4), "white")
+    writer = AnalysisResultCache(max_entries=2, disk_dir=str(tmp_path))
+    old_key = writer.key_for("security", "1.0", image, {})
+    writer.set(old_key, {"overall_score": 80})
+
+    reader = AnalysisResultCache(max_entries=2, disk_dir=str(tmp_path))
+    assert reader.get(old_key) == {"overall_score": 80}
+    assert reader.stats()["disk_hits"] == 1
+
+    # Another process on a newer ENGINE_VERSION must not wipe the old version's entries.
+    new_key = reader.key_for("security", "2.0", image, {})
+    reader.set(new_key, {"overall_score": 70})
+    assert AnalysisResultCache(max_entries=2, disk_dir=str(tmp_path)).get(old_key) == {"overall_score": 80}
+    assert reader.prune_stale_versions() == 0
+
+
+def test_prune_removes_only_versions_idle_past_the_ttl(tmp_path):
+    image = Image.new("RGB", (4, 4), "white")
+    cache = AnalysisResultCache(max_entries=2, disk_dir=str(tmp_path), stale_version_days=7)
+    old_key = cache.key_for("security", "1.0", image, {})
+    new_key = cache.key_for("security", "2.0", image, {})
+    cache.set(old_key, {"overall_score": 80})
+    cache.set(new_key, {"overall_score": 70})
+
+    old_dir = tmp_path / "security" / "1.0"
+    idle = os.path.getmtime(old_dir) - 8 * 86400
+    for path in [old_dir, *old_dir.iterdir()]:
+        os.utime(path, (idle, idle))
+
+    assert cache.prune_stale_versions() == 1
+    assert not old_dir.exists()
+    assert (tmp_path / "security" / "2.0").exists()
+    assert cache.stats()["pruned_versions"] == 1
+
+
+def test_accessibility_engine_reports_cache_hit_timings():
+    engine = AccessibilityEngine(cache=AnalysisResultCache(max_entries=2))
+    first = engine.analyze_image(_image_base64(fill="#d0d0d0"))
+    second = engine.analyze_image(_image_base64(fill="#d0d0d0"))
+
+    assert "ocr" in first["stage_timings_ms"]
+    assert "ocr" not in second["stage_timings_ms"]
+    assert "cache_lookup" in second["stage_timings_ms"]
+    assert second["findings"] == first["findings"]
+
+
+def test_cache_key_follows_ocr_mode_and_dino_backend(tmp_path, monkeypatch):
+    monkeypatch.setenv("OCR_MODE", "full")
+    monkeypatch.setenv("DINO_BACKEND", "torch")
+    engine = AccessibilityEngine(cache=AnalysisResultCache(max_entries=8, disk_dir=str(tmp_path)))
+    engine.analyze_image(_image_base64(fill="#d0d0d0"))
+
+    monkeypatch.setenv("OCR_MODE", "roi")
+    roi = engine.analyze_image(_image_base64(fill="#d0d0d0"))
+    assert "cache_lookup" in roi["stage_timings_ms"] and "ocr" in roi["stage_timings_ms"]
+
+    monkeypatch.setenv("DINO_BACKEND", "onnx")
+    engine.analyze_image(_image_base64(fill="#d0d0d0"))
+    assert engine.cache.stats()["misses"] == 3 and engine.cache.stats()["hits"] == 0
+
+
+def test_analysis_cache_stats_endpoint():
+    client = TestClient(main.app)
+    response = client.get("/stats/analysis-cache")
+
+    assert response.status_code == 200
+    assert {"hits", "misses", "entries", "hit_rate"} <= set(response.json())
@@ -0,0 +1,78 @@
+import base64
+import io
+import os
+import sys
+
+from PIL import Image, ImageDraw
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from core.accessibility.engine import AccessibilityEngine
+from core.analysis_context import ImageAnalysisContext
+from core.security.engine import SecurityEngine
+from core.uiux.engine import UiuxEngine
+
+
+def _sample_image_base64() -> str:
+    image = Image.new("RGB", (360, 220), "#f8fafc")
+    draw = ImageDraw.Draw(image)
+    draw.rounded_rectangle((30, 30, 200, 80), radius=12, fill="#111827")
+    draw.rectangle((30, 110, 330, 150), fill="#ffefe8")
+    draw.text((40, 120), "admin@example.com", fill="#ffb08a")
+    buffer = io.BytesIO()
+    image.save(buffer, format="PNG")
+    return base64.b64encode(buffer.getvalue()).decode("utf-8")
+
+
+def test_context_decodes_once_and_shares_artifacts_across_engines(monkeypatch):
+    calls = {"ocr": 0, "dino": 0, "components": 0}
+
+    def fake_ocr(image, report=None):
+        calls["ocr"] += 1
+        return [{"box": [40, 120, 160, 132], "text": "admin@example.com", "score": 0.9, "source": "ocr"}]
+
+    def fake_dino(image):
+        calls["dino"] += 1
+        return []
+
+    from core.accessibility import engine as accessibility_engine
+
+    original_components = accessibility_engine._raw_component_candidates
+
+    def counting_components(image):
+        calls["components"] += 1
+        return original_components(image)
+
+    monkeypatch.setattr("core.accessibility.engine._detect_text_regions", fake_ocr)
+    monkeypatch.setattr("core.accessibility.engine._detect_elements_with_dino", fake_dino)
+    monkeypatch.setattr("core.accessibility.engine._raw_component_candidates", counting_components)
+
+    context = ImageAnalysisContext.from_base64(_sample_image_base64())
+    accessibility = AccessibilityEngine().analyze_image(context=context)
+    uiux = UiuxEngine().analyze_image(context=context)
+    security = SecurityEngine().analyze_image(context=context)
+
+    assert calls == {"ocr": 1, "dino": 1, "components": 1}
+    assert accessibility["image"] == {"width": 360, "height": 220}
+    assert uiux["image"] == {"width": 360, "height": 220}
+    assert "email-exposure" in {item["category"] for item in security["findings"]}
+
+
+def test_context_results_match_standalone_engine_runs():
+    image_base64 = _sample_image_base64()
+    context = ImageAnalysisContext.from_base64(image_base64)
+
+    shared = UiuxEngine().analyze_image(context=context)
+    standalone = UiuxEngine().analyze_image(image_base64)
+
+    assert shared["findings"] == standalone["findings"]
+    assert shared["overall_score"] == standalone["overall_score"]
+    assert AccessibilityEngine().analyze_image(context=context)["artifacts"]["source_image_base64"] == image_base64
+
+
+def test_context_keeps_data_url_payload_without_prefix():
+    image_base64 = _sample_image_base64()
+    context = ImageAnalysisContext.from_base64(f"data:image/png;base64,{image_base64}")
+
+    assert context.source_base64 == image_base64
+    assert context.pixel_digest == ImageAnalysisContext.from_base64(image_base64).pixel_digest
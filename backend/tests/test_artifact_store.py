@@ -0,0 +1,104 @@
+import base64
+import io
+import json
+import os
+import sys
+
+from fastapi.testclient import TestClient
+from PIL import Image, ImageDraw
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+import main
+from core.accessibility.engine import AccessibilityEngine, _crop_to_base64
+from core.analysis_context import ImageAnalysisContext
+from core.artifact_store import ArtifactStore, artifact_session
+from core.security.engine import SecurityEngine
+from core.uiux.engine import UiuxEngine
+
+
+def _sample_png() -> bytes:
+    image = Image.new("RGB", (320, 220), "#ffffff")
+    draw = ImageDraw.Draw(image)
+    draw.rectangle((20, 20, 140, 60), fill="#d0d0d0")
+    draw.rectangle((20, 100, 300, 140), fill="#1f2937")
+    draw.text((30, 110), "Continue", fill="#374151")
+    buffer = io.BytesIO()
+    image.save(buffer, format="PNG")
+    return buffer.getvalue()
+
+
+def _sample_base64() -> str:
+    return base64.b64encode(_sample_png()).decode("utf-8")
+
+
+def test_store_dedupes_identical_content(tmp_path):
+    store = ArtifactStore(str(tmp_path))
+
+    first = store.put_bytes(_sample_png())
+    second = store.put_bytes(_sample_png())
+
+    assert first == second
+    assert store.get(first) == (_sample_png(), "image/png")
+    assert store.stats()["blobs_written"] == 1
+    assert store.stats()["dedupe_hits"] == 1
+    assert store.get("../../etc/passwd") is None
+
+
+def test_crops_are_recipes_rendered_on_first_fetch(tmp_path):
+    store = ArtifactStore(str(tmp_path))
+    context = ImageAnalysisContext.from_base64(_sample_base64())
+    inline = _crop_to_base64(context.image, 20, 20, 120, 40)
+
+    with artifact_session(store, context):
+        reference = _crop_to_base64(context.image, 20, 20, 120, 40)
+        assert _crop_to_base64(context.image, 20, 20, 120, 40) == reference
+
+    artifact_id = reference.split(":", 1)[1]
+    assert store.stats()["lazy_renders"] == 0
+
+    data, media_type = store.get(artifact_id)
+    assert media_type == "image/png"
+    assert base64.b64encode(data).decode("utf-8") == inline
+    assert store.stats()["lazy_renders"] == 1
+
+    store.get(artifact_id)
+    assert store.stats()["lazy_renders"] == 1
+
+
+def test_engines_return_artifact_ids_instead_of_base64(tmp_path):
+    store = ArtifactStore(str(tmp_path))
+    context = ImageAnalysisContext.from_base64(_sample_base64())
+
+    inline = AccessibilityEngine(max_workers=1).analyze_image(context=context)
+    stored = AccessibilityEngine(max_workers=1, artifacts=store).analyze_image(context=context)
+    uiux = UiuxEngine(artifacts=store).analyze_image(context=context)
+    security = SecurityEngine(artifacts=store).analyze_image(context=context)
+
+    assert stored["artifacts"]["overlay_image_base64"] == ""
+    assert stored["artifacts"]["source_artifact_id"] == uiux["artifacts"]["source_artifact_id"]
+    assert security["artifacts"]["source_artifact_id"] == uiux["artifacts"]["source_artifact_id"]
+    assert all(finding["crop_artifact_id"] and not finding["crop_image_base64"] for finding in stored["findings"])
+    assert uiux["artifacts"]["attention_overlay_artifact_id"]
+    assert len(json.dumps(stored)) < len(json.dumps(inline)) / 2
+
+    overlay, _ = store.get(stored["artifacts"]["overlay_artifact_id"])
+    assert overlay == base64.b64decode(inline["artifacts"]["overlay_image_base64"])
+
+
+def test_artifact_endpoint_serves_lazy_crop(tmp_path, monkeypatch):
+    store = ArtifactStore(str(tmp_path))
+    monkeypatch.setattr("routers.artifacts_router.artifact_store", store)
+    context = ImageAnalysisContext.from_base64(_sample_base64())
+    with artifact_session(store, context):
+        artifact_id = _crop_to_base64(context.image, 20, 100, 280, 40).split(":", 1)[1]
+
+    client = TestClient(main.app)
+    response = client.get(f"/artifacts/{artifact_id}")
+    missing = client.get(f"/artifacts/{'0' * 64}")
+
+    assert response.status_code == 200
+    assert response.headers["content-type"] == "image/png"
+    assert "immutable" in response.headers["cache-control"]
+    assert Image.open(io.BytesIO(response.content)).size == (312, 72)
+    assert missing.status_code == 404
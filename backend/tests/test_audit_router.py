@@ -0,0 +1,102 @@
+import base64
+import io
+import os
+import sys
+
+from fastapi.testclient import TestClient
+from PIL import Image, ImageDraw
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+import main
+from database import SessionLocal
+from database.models import AccessibilityAnalysisRecord, SecurityAnalysisRecord, UiuxAnalysisRecord
+
+
+def _sample_png() -> bytes:
+    image = Image.new("RGB", (320, 200), "#ffffff")
+    draw = ImageDraw.Draw(image)
+    draw.rectangle((20, 20, 140, 60), fill="#d0d0d0")
+    draw.rectangle((20, 100, 300, 140), fill="#1f2937")
+    buffer = io.BytesIO()
+    image.save(buffer, format="PNG")
+    return buffer.getvalue()
+
+
+def _fake_executor_class(calls: dict):
+    class FakeResponse:
+        async def all_headers(self):
+            return {"content-type": "text/html", "server": "nginx/1.18.0"}
+
+        async def text(self):
+            return "<html><body>password=hunter2</body></html>"
+
+    class FakePage:
+        async def evaluate(self, script):
+            calls["evaluate"] += 1
+            return {"page_load_ms": 3200, "dom_content_loaded_ms": 1800, "fcp_ms": 2000, "lcp_ms": 3000, "tti_ms": 3400, "cls": 0.2, "transfer_kb": 512}
+
+    class FakeWebExecutor:
+        def __init__(self, headless=True):
+            self.page = FakePage()
+
+        async def start(self):
+            calls["start"] += 1
+
+        async def navigate(self, url: str):
+            calls["navigate"] += 1
+            return FakeResponse()
+
+        async def screenshot(self, full_page: bool = True):
+            return _sample_png()
+
+        async def extract_accessibility_metadata(self):
+            return [{"element_type": "image", "x": 20, "y": 20, "width": 60, "height": 60, "alt_text": ""}]
+
+        async def stop(self):
+            calls["stop"] += 1
+
+    return FakeWebExecutor
+
+
+def test_audit_url_captures_once_and_returns_every_module(monkeypatch):
+    calls = {"start": 0, "navigate": 0, "evaluate": 0, "stop": 0}
+    monkeypatch.setattr("routers.audit_router.WebExecutor", _fake_executor_class(calls))
+
+    client = TestClient(main.app)
+    response = client.post("/audit/url", json={"url": "https://example.com"})
+
+    assert response.status_code == 200
+    payload = response.json()
+    assert calls == {"start": 1, "navigate": 1, "evaluate": 1, "stop": 1}
+    assert {"accessibility", "uiux", "security", "performance"} <= {key for key, value in payload.items() if value}
+    assert payload["performance"]["web_metrics"]["page_load_ms"] == 3200
+    assert "alt-text" in {item["category"] for item in payload["accessibility"]["findings"]}
+    assert payload["module_errors"] == {}
+    assert set(payload["history_ids"]) == {"accessibility", "uiux", "security"}
+    assert {"capture", "accessibility", "uiux", "security", "performance", "total"} <= set(payload["stage_timings_ms"])
+
+    db = SessionLocal()
+    try:
+        assert db.get(AccessibilityAnalysisRecord, payload["history_ids"]["accessibility"]).source_url == "https://example.com"
+        assert db.get(UiuxAnalysisRecord, payload["history_ids"]["uiux"]).source_type == "url"
+        assert db.get(SecurityAnalysisRecord, payload["history_ids"]["security"]).source_type == "url"
+    finally:
+        db.close()
+
+
+def test_audit_image_isolates_module_failures(monkeypatch):
+    def broken_analyze(*args, **kwargs):
+        raise RuntimeError("uiux exploded")
+
+    monkeypatch.setattr("routers.audit_router.uiux_engine.analyze_image", broken_analyze)
+
+    client = TestClient(main.app)
+    response = client.post("/audit/image", json={"image_base64": base64.b64encode(_sample_png()).decode("utf-8")})
+
+    assert response.status_code == 200
+    payload = response.json()
+    assert payload["uiux"] is None
+    assert payload["performance"] is None
+    assert payload["module_errors"] == {"uiux": "uiux exploded"}
+    assert set(payload["history_ids"]) == {"accessibility", "security"}
@@ -0,0 +1,128 @@
+import asyncio
+import io
+import os
+import subprocess
+import sys
+import threading
+import time
+
+import numpy as np
+from PIL import Image
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from core.models.dino_service import DinoInferenceServer, DinoServiceClient, StubBackend, get_dino_client
+from core.models.dinox_client import DINOXClient
+
+BACKEND_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+
+
+class _ServerThread:
+    """Runs a stub DINO service on its own event loop, like a separate process would."""
+
+    def __init__(self, backend):
+        self.server = DinoInferenceServer(backend, "127.0.0.1:0")
+        self.loop = asyncio.new_event_loop()
+        self.ready = threading.Event()
+        self.thread = threading.Thread(target=self._run, daemon=True)
+
+    def _run(self):
+        asyncio.set_event_loop(self.loop)
+        self.address = self.loop.run_until_complete(self.server.start())
+        self.ready.set()
+        self.loop.run_forever()
+
+    def __enter__(self):
+        self.thread.start()
+        self.ready.wait(5)
+        return self
+
+    def __exit__(self, *exc):
+        asyncio.run_coroutine_threadsafe(self.server.close(), self.loop).result(5)
+        self.loop.call_soon_threadsafe(self.loop.stop)
+        self.thread.join(5)
+
+
+def _png(size=(80, 60)) -> bytes:
+    buffer = io.BytesIO()
+    Image.new("RGB", size, "#ffffff").save(buffer, format="PNG")
+    return buffer.getvalue()
+
+
+def test_service_client_round_trips_every_image_kind():
+    with _ServerThread(StubBackend()) as service:
+        client = DinoServiceClient(service.address, timeout=5)
+        image = Image.new("RGB", (80, 60), "#ffffff")
+
+        from_pil = asyncio.run(client.detect_elements(image, prompt="button . input field"))
+        from_array = client.detect_elements_sync(np.asarray(image), prompt="button . input field")
+        from_bytes = client.detect_elements_sync(_png(), prompt="button . input field")
+        batch = asyncio.run(client.detect_elements_batch([image, _png((40, 40))], prompt="button"))
+        views = asyncio.run(client.detect_views(image, {"elements": ("button", 0.25, 0.2), "obstacles": ("popup", 0.3, 0.25)}))
+        ping = asyncio.run(client.ping())
+
+    assert from_pil == from_array == from_bytes
+    assert [element["label"] for element in from_pil] == ["button", "input field"]
+    assert from_pil[1]["box"] == [0.0, 30.0, 80.0, 60.0]
+    assert [len(elements) for elements in batch] == [1, 1]
+    assert {name: [element["label"] for element in items] for name, items in views.items()} == {
+        "elements": ["button"],
+        "obstacles": ["popup"],
+    }
+    assert ping["backend"] == "stub" and ping["stats"]["requests"] == 7
+
+
+def test_service_client_degrades_to_empty_when_unreachable():
+    client = DinoServiceClient("127.0.0.1:1", timeout=1)
+
+    assert client.detect_elements_sync(_png()) == []
+    assert asyncio.run(client.detect_elements(_png())) == []
+
+
+def test_get_dino_client_follows_service_address(monkeypatch):
+    monkeypatch.setenv("DINO_SERVICE_ADDRESS", "unix:/tmp/visionqa-dino.sock")
+    client = get_dino_client()
+    assert isinstance(client, DinoServiceClient) and client.address == "unix:/tmp/visionqa-dino.sock"
+
+    monkeypatch.delenv("DINO_SERVICE_ADDRESS")
+    monkeypatch.setattr(DINOXClient, "__init__", lambda self: None)
+    assert isinstance(get_dino_client(), DINOXClient)
+
+
+def test_out_of_process_inference_keeps_the_event_loop_free():
+    env = {**os.environ, "DINO_STUB_DELAY_MS": "300", "PYTHONUNBUFFERED": "1"}
+    process = subprocess.Popen(
+        [sys.executable, "-m", "core.models.dino_service", "--backend", "stub", "--address", "127.0.0.1:0"],
+        cwd=BACKEND_DIR,
+        env=env,
+        stdout=subprocess.PIPE,
+        text=True,
+    )
+    try:
+        address = process.stdout.readline().rsplit(" ", 1)[-1].strip()
+        client = DinoServiceClient(address, timeout=10)
+
+        async def run():
+            ticks = 0
+
+            async def heartbeat():
+                nonlocal ticks
+                while True:
+                    await asyncio.sleep(0.01)
+                    ticks += 1
+
+            beat = asyncio.create_task(heartbeat())
+            started = time.perf_counter()
+            results = await client.detect_elements_batch([_png(), _png()], prompt="button")
+            elapsed = time.perf_counter() - started
+            beat.cancel()
+            return results, elapsed, ticks
+
+        results, elapsed, ticks = asyncio.run(run())
+    finally:
+        process.terminate()
+        process.wait(5)
+
+    assert results == [[{"label": "button", "score": 0.9, "box": [0.0, 0.0, 80.0, 60.0]}]] * 2
+    assert elapsed >= 0.3
+    assert ticks >= 10
@@ -0,0 +1,349 @@
+import asyncio
+import io
+import os
+import sys
+import threading
+import time
+
+import numpy as np
+import pytest
+from PIL import Image
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from core.accessibility import engine as accessibility_engine
+from core.models.dino_runtime import compare_detections, dino_backend_from_env, summarize_parity
+from core.analysis_cache import AnalysisResultCache
+from core.models.dinox_client import DetectionBatcher, DetectionRequest, DINOXClient
+
+
+class _RecordingRunner:
+    def __init__(self, delay: float = 0.0):
+        self.batches = []
+        self.delay = delay
+        self.lock = threading.Lock()
+
+    def __call__(self, requests):
+        with self.lock:
+            self.batches.append([request.image for request in requests])
+        time.sleep(self.delay)
+        return [[{"label": "button", "score": 0.9, "box": [0, 0, 1, 1], "image": request.image}] for request in requests]
+
+
+def _submit_concurrently(batcher, items):
+    futures = [None] * len(items)
+
+    def submit(index, image, prompt):
+        futures[index] = batcher.submit(image, prompt, 0.25, 0.2)
+
+    threads = [threading.Thread(target=submit, args=(index, image, prompt)) for index, (image, prompt) in enumerate(items)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    return [future.result(timeout=5) for future in futures]
+
+
+def test_concurrent_requests_share_one_forward_pass():
+    runner = _RecordingRunner()
+    batcher = DetectionBatcher(runner, max_batch_size=8, window_ms=200)
+
+    results = _submit_concurrently(batcher, [(f"image-{index}", "button.") for index in range(4)])
+
+    assert [result[0]["image"] for result in results] == [f"image-{index}" for index in range(4)]
+    assert len(runner.batches) == 1
+    assert sorted(runner.batches[0]) == [f"image-{index}" for index in range(4)]
+    assert batcher.stats()["largest_batch"] == 4
+
+
+def test_batches_respect_max_size_and_group_by_prompt():
+    runner = _RecordingRunner()
+    batcher = DetectionBatcher(runner, max_batch_size=3, window_ms=200)
+
+    items = [("a", "button."), ("b", "popup."), ("c", "button."), ("d", "button."), ("e", "button.")]
+    results = _submit_concurrently(batcher, items)
+
+    assert [result[0]["image"] for result in results] == ["a", "b", "c", "d", "e"]
+    assert all(len(batch) <= 3 for batch in runner.batches)
+    assert sum(len(batch) for batch in runner.batches) == 5
+    assert ["b"] in runner.batches
+
+
+def test_batch_failure_is_reported_to_every_request():
+    def broken(requests):
+        raise RuntimeError("model exploded")
+
+    batcher = DetectionBatcher(broken, max_batch_size=4, window_ms=50)
+    futures = [batcher.submit(name, "button.", 0.25, 0.2) for name in ("a", "b")]
+
+    for future in futures:
+        with pytest.raises(RuntimeError, match="model exploded"):
+            future.result(timeout=5)
+
+
+def test_cancelled_request_does_not_strand_its_batch():
+    runner = _RecordingRunner(delay=0.05)
+    batcher = DetectionBatcher(runner, max_batch_size=4, window_ms=100)
+
+    async def run():
+        first = asyncio.ensure_future(asyncio.wrap_future(batcher.submit("a", "button.", 0.25, 0.2)))
+        second = asyncio.wrap_future(batcher.submit("b", "button.", 0.25, 0.2))
+        await asyncio.sleep(0.01)
+        first.cancel()
+        return await asyncio.wait_for(second, timeout=5)
+
+    assert asyncio.run(run())[0]["image"] == "b"
+    assert runner.batches == [["b"]]
+    # The worker survived and keeps serving later requests.
+    assert batcher.submit("c", "button.", 0.25, 0.2).result(timeout=5)[0]["image"] == "c"
+
+
+def test_worker_survives_a_runner_returning_garbage():
+    calls = []
+
+    def flaky(requests):
+        calls.append(len(requests))
+        if len(calls) == 1:
+            return None
+        return [[{"image": request.image}] for request in requests]
+
+    batcher = DetectionBatcher(flaky, max_batch_size=4, window_ms=10)
+    with pytest.raises(TypeError):
+        batcher.submit("a", "button.", 0.25, 0.2).result(timeout=5)
+    assert batcher.submit("b", "button.", 0.25, 0.2).result(timeout=5) == [{"image": "b"}]
+
+
+def test_detect_elements_sync_gives_up_after_timeout():
+    client = DINOXClient.__new__(DINOXClient)
+    client.sync_timeout = 0.05
+    client.batcher = DetectionBatcher(_RecordingRunner(delay=1.0), window_ms=0)
+    client._load_image = lambda image: image
+
+    start = time.perf_counter()
+    assert client.detect_elements_sync("slow") == []
+    assert time.perf_counter() - start < 0.5
+
+
+def test_client_accepts_in_memory_images(tmp_path):
+    image = Image.new("RGBA", (40, 30), (10, 20, 30, 255))
+    buffer = io.BytesIO()
+    image.save(buffer, format="PNG")
+    path = tmp_path / "capture.png"
+    path.write_bytes(buffer.getvalue())
+
+    sources = [image, np.zeros((30, 40, 3), dtype=np.uint8), buffer.getvalue(), str(path)]
+    loaded = [DINOXClient._load_image(source) for source in sources]
+
+    assert all(item.mode == "RGB" and item.size == (40, 30) for item in loaded)
+
+
+def test_accessibility_dino_passes_the_image_without_a_temp_file(monkeypatch):
+    received = []
+
+    class FakeClient:
+        def detect_elements_sync(self, image, prompt=None):
+            received.append(image)
+            return [{"label": "button", "score": 0.8, "box": [1, 2, 3, 4]}]
+
+    def no_temp_files(*args, **kwargs):
+        raise AssertionError("DINO inference path must not write temp files")
+
+    monkeypatch.setattr("core.models.dino_service.get_dino_client", FakeClient)
+    monkeypatch.setattr("tempfile.NamedTemporaryFile", no_temp_files)
+    image = Image.new("RGB", (64, 48), "#ffffff")
+
+    assert accessibility_engine._detect_elements_with_dino(image) == [{"label": "button", "score": 0.8, "box": [1, 2, 3, 4]}]
+    assert received == [image]
+
+
+def test_backend_parity_matches_by_label_and_iou():
+    reference = [
+        {"label": "button", "score": 0.8, "box": [0, 0, 100, 40]},
+        {"label": "input field", "score": 0.6, "box": [0, 60, 200, 100]},
+    ]
+    candidate = [
+        {"label": "button", "score": 0.75, "box": [2, 0, 100, 42]},
+        {"label": "link", "score": 0.5, "box": [0, 60, 200, 100]},
+    ]
+
+    parity = compare_detections(reference, candidate)
+    summary = summarize_parity([parity, compare_detections(reference, reference)])
+
+    assert parity["matched"] == 1
+    assert parity["recall"] == 0.5 and parity["precision"] == 0.5
+    assert parity["max_score_delta"] == 0.05
+    assert summary["matched"] == 3 and summary["recall"] == 0.75
+
+
+def test_backend_selection_rejects_unknown_values(monkeypatch):
+    monkeypatch.setenv("DINO_BACKEND", "INT8")
+    assert dino_backend_from_env() == "int8"
+
+    monkeypatch.setenv("DINO_BACKEND", "tensorrt")
+    with pytest.raises(RuntimeError):
+        dino_backend_from_env()
+
+
+class _WordTokenizer:
+    """Word-level stand-in for the BERT tokenizer: [CLS]=0, '.'=1, words hashed to ids."""
+
+    def __init__(self):
+        self.calls = 0
+
+    def _ids(self, text):
+        return [1 if word == "." else 10 + sum(map(ord, word)) for word in text.replace(".", " . ").split()]
+
+    def encode(self, text, add_special_tokens=True):
+        self.calls += 1
+        return self._ids(text)
+
+    def __call__(self, text, **kwargs):
+        self.calls += 1
+
+        class _Encoding:
+            input_ids = [0] + self._ids(text)
+
+        return _Encoding()
+
+
+def _client_with_tokenizer(tokenizer):
+    client = DINOXClient.__new__(DINOXClient)
+    client.processor = type("Processor", (), {"tokenizer": tokenizer})()
+    DINOXClient._prompt_cache.clear()
+    return client
+
+
+def test_label_positions_are_computed_once_per_prompt():
+    tokenizer = _WordTokenizer()
+    client = _client_with_tokenizer(tokenizer)
+
+    labels, positions = client._label_positions("button. input field. button.")
+    calls = tokenizer.calls
+    assert client._label_positions("button. input field. button.") == (labels, positions)
+
+    assert labels == ["button", "input field"]
+    assert positions == [[1], [3, 4]]
+    assert tokenizer.calls == calls
+
+
+def test_vectorized_label_scoring_matches_per_label_means():
+    torch = pytest.importorskip("torch")
+    client = _client_with_tokenizer(_WordTokenizer())
+    prompt = "button. input field. link."
+    generator = torch.Generator().manual_seed(3)
+    logits = torch.randn((1, 30, 12), generator=generator)
+    boxes = torch.rand((1, 30, 4), generator=generator) * 0.5 + 0.25
+    outputs = type("Outputs", (), {"logits": logits, "pred_boxes": boxes})()
+
+    elements = client._post_process(outputs, None, Image.new("RGB", (200, 100)), prompt, 0.3, 0.35)
+
+    labels, positions = client._label_positions(prompt)
+    scores = logits.sigmoid()[0]
+    expected = []
+    for query in range(scores.shape[0]):
+        if scores[query].max().item() <= 0.3:
+            continue
+        best_label, best_score = "unknown", 0
+        for label, label_positions in zip(labels, positions):
+            average = scores[query][label_positions].mean().item()
+            if average > best_score and average > 0.35:
+                best_label, best_score = label, average
+        expected.append((round(scores[query].max().item(), 3), best_label))
+
+    assert sorted((element["score"], element["label"]) for element in elements) == sorted(expected)
+
+
+def _cached_client(tmp_path, raw):
+    client = DINOXClient.__new__(DINOXClient)
+    client.model_id = "IDEA-Research/grounding-dino-base"
+    client.backend = "torch"
+    client.max_batch_size = 4
+    client.cache_box_floor = 0.15
+    client.detection_cache = AnalysisResultCache(max_entries=8, disk_dir=str(tmp_path))
+    client.forward_passes = []
+    client._infer_batch = lambda images, prompts: client.forward_passes.append(len(images)) or (None, None)
+    client._raw_detections = lambda outputs, image, prompt, floor, index=0: [
+        detection for detection in raw if detection["score"] > floor
+    ]
+    return client
+
+
+def test_detection_cache_answers_stricter_thresholds_by_filtering(tmp_path):
+    raw = [
+        {"label": "button", "label_score": 0.5, "score": 0.82, "box": [0, 0, 10, 10]},
+        {"label": "link", "label_score": 0.3, "score": 0.4, "box": [0, 20, 10, 30]},
+        {"label": "icon", "label_score": 0.6, "score": 0.2, "box": [0, 40, 10, 50]},
+    ]
+    client = _cached_client(tmp_path, raw)
+    image = Image.new("RGB", (64, 64), "#ffffff")
+
+    default = client._run_requests([DetectionRequest(image, "Button. Link.", 0.25, 0.20)])[0]
+    strict = client._run_requests([DetectionRequest(image.copy(), "button. link.", 0.30, 0.35)])[0]
+    loose = client._run_requests([DetectionRequest(image, "button. link.", 0.10, 0.20)])[0]
+
+    assert default == [
+        {"label": "button", "score": 0.82, "box": [0, 0, 10, 10]},
+        {"label": "link", "score": 0.4, "box": [0, 20, 10, 30]},
+    ]
+    assert strict == [
+        {"label": "button", "score": 0.82, "box": [0, 0, 10, 10]},
+        {"label": "unknown", "score": 0.4, "box": [0, 20, 10, 30]},
+    ]
+    assert [element["label"] for element in loose] == ["button", "link", "icon"]
+    assert client.forward_passes == [1, 1]
+
+    restarted = _cached_client(tmp_path, raw)
+    assert restarted._run_requests([DetectionRequest(image, "button. link.", 0.5, 0.2)])[0] == default[:1]
+    assert restarted.forward_passes == []
+    assert restarted.detection_cache.stats()["disk_hits"] == 1
+
+
+def test_element_and_obstacle_views_share_one_forward_pass(tmp_path):
+    raw = [
+        {"label": "button", "label_score": 0.6, "score": 0.7, "box": [0, 0, 10, 10]},
+        {"label": "close button", "label_score": 0.5, "score": 0.35, "box": [90, 0, 100, 10]},
+        {"label": "cookie banner", "label_score": 0.22, "score": 0.27, "box": [0, 80, 100, 100]},
+    ]
+    client = _cached_client(tmp_path, raw)
+    client.processor = type("Processor", (), {"tokenizer": _WordTokenizer()})()
+    client.batcher = DetectionBatcher(client._run_requests, max_batch_size=4, window_ms=0)
+    DINOXClient._prompt_cache.clear()
+
+    views = asyncio.run(client.detect_elements_and_obstacles(Image.new("RGB", (100, 100))))
+
+    assert client.forward_passes == [1]
+    assert views["elements"] == [{"label": "button", "score": 0.7, "box": [0, 0, 10, 10]}]
+    assert views["obstacles"] == [{"label": "close button", "score": 0.35, "box": [90, 0, 100, 10]}]
+    assert client.merged_prompt(["button. link.", "link. popup."]) == "button. link. popup."
+
+    client.MAX_TEXT_TOKENS = 4
+    assert client.merged_prompt([DINOXClient.DEFAULT_PROMPT, DINOXClient.OBSTACLES_PROMPT]) is None
+
+
+def test_onnx_export_binds_inputs_by_name(tmp_path):
+    torch = pytest.importorskip("torch")
+    pytest.importorskip("onnx")
+    from core.models.dino_runtime import ONNX_INPUT_NAMES, export_onnx
+
+    class ForwardOrder(torch.nn.Module):
+        # GroundingDinoForObjectDetection.forward ile ayni parametre sirasi
+        def forward(self, pixel_values, input_ids, token_type_ids=None, attention_mask=None, pixel_mask=None):
+            logits = pixel_values.mean(dim=(1, 2, 3))[:, None, None] + input_ids[:, None, :].float()
+            return {"logits": logits, "pred_boxes": pixel_mask.float().mean(dim=(1, 2))[:, None, None].repeat(1, 1, 4)}
+
+    def processor(images, text, return_tensors):
+        return {
+            "pixel_values": torch.ones(1, 3, 8, 8),
+            "input_ids": torch.tensor([[101, 7, 102]]),
+            "token_type_ids": torch.zeros(1, 3, dtype=torch.long),
+            "attention_mask": torch.ones(1, 3, dtype=torch.long),
+            "pixel_mask": torch.ones(1, 8, 8, dtype=torch.long),
+        }
+
+    import onnx
+
+    path = export_onnx(ForwardOrder(), processor, str(tmp_path / "order.onnx"))
+    graph = onnx.load(path).graph
+    shapes = {node.name: len(node.type.tensor_type.shape.dim) for node in graph.input}
+    assert shapes["pixel_values"] == 4 and shapes["input_ids"] == 2
+    assert set(shapes) <= set(ONNX_INPUT_NAMES)
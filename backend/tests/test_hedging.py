@@ -0,0 +1,130 @@
+import asyncio
+import os
+import sys
+import time
+
+import httpx
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from core.models.hedging import HedgePolicy, LatencyHistogram
+from core.models.llm_client import LLMClient
+from core.models.rate_limiter import LLMRateLimiter
+
+
+def test_histogram_quantiles_follow_observed_latency():
+    histogram = LatencyHistogram(max_samples=1000)
+    for index in range(100):
+        histogram.observe(0.5 if index < 90 else 4.0)
+
+    assert 0.5 <= histogram.quantile(0.5) < 0.6
+    assert 4.0 <= histogram.quantile(0.95) < 4.8
+
+
+def test_hedge_delay_adapts_once_enough_samples_exist():
+    policy = HedgePolicy(min_samples=5, default_delay=10, min_delay=0.5, max_delay=30)
+    assert policy.delay("groq") == 10
+    for _ in range(5):
+        policy.observe("groq", 2.0)
+    assert 2.0 <= policy.delay("groq") < 2.4
+    for _ in range(200):
+        policy.observe("groq", 0.06)
+    assert policy.delay("groq") == 0.5
+
+
+def _client(monkeypatch, groq_delay, groq_answer, hf_delay, hf_answer, policy):
+    async def fake_groq(self, prompt, system_prompt=None, clock=None):
+        clock.start()
+        await asyncio.sleep(groq_delay)
+        return groq_answer
+
+    async def fake_hf(self, prompt, system_prompt=None, clock=None):
+        clock.start()
+        await asyncio.sleep(hf_delay)
+        return hf_answer
+
+    monkeypatch.setattr(LLMClient, "_query_groq", fake_groq)
+    monkeypatch.setattr(LLMClient, "_query_hf", fake_hf)
+    client = LLMClient(api_key="test-key", use_cache=False)
+    client.hf_api_key = "hf-test"
+    client.hedge = policy
+    return client
+
+
+def test_slow_primary_is_hedged_and_secondary_wins(monkeypatch):
+    policy = HedgePolicy(default_delay=0.05)
+    client = _client(monkeypatch, 2.0, '{"from": "groq"}', 0.05, '{"from": "hf"}', policy)
+
+    start = time.perf_counter()
+    result = asyncio.run(client._query_provider("prompt", "system"))
+
+    assert result == ('{"from": "hf"}', "huggingface")
+    assert time.perf_counter() - start < 1.0
+    stats = policy.stats()
+    assert stats["hedged"] == 1 and stats["secondary_wins"] == 1
+    # The cancelled primary still contributes its elapsed time as a lower bound.
+    assert stats["providers"]["groq"]["samples"] == 1
+
+
+def test_fast_primary_is_not_hedged_and_invalid_answers_fall_through(monkeypatch):
+    policy = HedgePolicy(default_delay=1.0)
+    client = _client(monkeypatch, 0.01, '{"from": "groq"}', 0.01, '{"from": "hf"}', policy)
+    assert asyncio.run(client._query_provider("prompt", "system")) == ('{"from": "groq"}', "groq")
+    assert policy.stats()["hedged"] == 0 and policy.stats()["primary_wins"] == 1
+
+    policy = HedgePolicy(default_delay=0.05)
+    client = _client(monkeypatch, 0.2, "not json", 0.3, '{"from": "hf"}', policy)
+    assert asyncio.run(client._query_provider("prompt", "system")) == ('{"from": "hf"}', "huggingface")
+    assert policy.stats()["secondary_wins"] == 1
+
+
+class _SlowGroqPool:
+    def __init__(self, seconds):
+        self.seconds = seconds
+
+    async def post(self, provider, url, **kwargs):
+        await asyncio.sleep(self.seconds)
+        return httpx.Response(200, json={"choices": [{"message": {"content": '{"from": "groq"}'}}]})
+
+
+def _limited_client(monkeypatch, limiter, policy, groq_seconds):
+    async def fast_hf(self, prompt, system_prompt=None, clock=None):
+        clock.start()
+        return '{"from": "hf"}'
+
+    monkeypatch.setattr("core.models.llm_client.llm_rate_limiter", limiter)
+    monkeypatch.setattr(LLMClient, "_query_hf", fast_hf)
+    client = LLMClient(api_key="test-key", use_cache=False)
+    client.hf_api_key = "hf-test"
+    client.http = _SlowGroqPool(groq_seconds)
+    client.hedge = policy
+    return client
+
+
+def test_hedge_clock_starts_when_the_limiter_admits_the_request(monkeypatch):
+    limiter = LLMRateLimiter({"groq": {"rpm": 0, "tpm": 0}})
+    # Groq 429 sonrası Retry-After ile beklemede: bu süre hedge'i tetiklememeli
+    limiter.provider("groq").record_rate_limited(0.3)
+    policy = HedgePolicy(default_delay=0.2)
+    client = _limited_client(monkeypatch, limiter, policy, groq_seconds=0.05)
+
+    assert asyncio.run(client._query_provider("prompt", "system")) == ('{"from": "groq"}', "groq")
+    stats = policy.stats()
+    assert stats["hedged"] == 0 and stats["primary_wins"] == 1
+    assert stats["providers"]["groq"]["p95_seconds"] < 0.2
+
+
+def test_hedge_cancelled_groq_call_refunds_its_budget(monkeypatch):
+    limiter = LLMRateLimiter({"groq": {"rpm": 60, "tpm": 6000}})
+    policy = HedgePolicy(default_delay=0.05)
+    client = _limited_client(monkeypatch, limiter, policy, groq_seconds=2.0)
+
+    groq = limiter.provider("groq")
+
+    async def run():
+        result = await client._query_provider("prompt", "system")
+        # Checked before asyncio.run gets a chance to drain leftover tasks.
+        return result, groq.stats()["released"], policy.stats()["providers"]["groq"]["samples"]
+
+    assert asyncio.run(run()) == (('{"from": "hf"}', "huggingface"), 1, 1)
+    assert groq.requests.tokens > 59.9 and groq.tokens.tokens > 5999
@@ -0,0 +1,112 @@
+import asyncio
+import json
+import os
+import sys
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from core.models.http_pool import LLMHttpPool
+from core.models.llm_client import LLMClient
+
+
+class _ChatHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    connections = set()
+
+    def do_POST(self):
+        _ChatHandler.connections.add(self.client_address)
+        self.rfile.read(int(self.headers.get("content-length", "0")))
+        body = json.dumps({"choices": [{"message": {"content": '{"ok": true}'}}]}).encode("utf-8")
+        self.send_response(200)
+        self.send_header("content-type", "application/json")
+        self.send_header("content-length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+def test_llm_calls_reuse_one_pooled_connection(monkeypatch):
+    server = ThreadingHTTPServer(("127.0.0.1", 0), _ChatHandler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    _ChatHandler.connections = set()
+    pool = LLMHttpPool(http2=False)
+    monkeypatch.setattr("core.models.llm_client.llm_http_pool", pool)
+
+    client = LLMClient(api_key="test-key")
+    client.groq_url = f"http://127.0.0.1:{server.server_address[1]}/v1/chat/completions"
+
+    async def run():
+        results = [await client._query("prompt", system_prompt="system") for _ in range(4)]
+        await pool.aclose()
+        return results
+
+    try:
+        results = asyncio.run(run())
+    finally:
+        server.shutdown()
+
+    stats = pool.stats()["providers"]["groq"]
+    assert results == ['{"ok": true}'] * 4
+    assert len(_ChatHandler.connections) == 1
+    assert stats["requests"] == 4
+    assert stats["new_connections"] == 1 and stats["reused_connections"] == 3
+    assert stats["clients_opened"] == 1
+    assert stats["http_versions"] == {"HTTP/1.1": 4}
+    assert pool.stats()["open_clients"] == 0
+
+
+def test_pool_keeps_separate_clients_per_provider_and_loop():
+    pool = LLMHttpPool()
+
+    async def clients():
+        return pool.client("groq"), pool.client("groq"), pool.client("huggingface")
+
+    first_groq, same_groq, hf = asyncio.run(clients())
+    other_loop_groq, _, _ = asyncio.run(clients())
+
+    assert first_groq is same_groq
+    assert first_groq is not hf
+    assert other_loop_groq is not first_groq
+
+
+def test_short_lived_loop_clients_are_closed_when_the_loop_shuts_down(monkeypatch):
+    server = ThreadingHTTPServer(("127.0.0.1", 0), _ChatHandler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    pool = LLMHttpPool(http2=False, timeout=7.5)
+    monkeypatch.setattr("core.models.llm_client.llm_http_pool", pool)
+
+    client = LLMClient(api_key="test-key", use_cache=False)
+    client.groq_url = f"http://127.0.0.1:{server.server_address[1]}/v1/chat/completions"
+    call_kwargs = []
+    pooled_post = pool.post
+
+    async def post(provider, url, **kwargs):
+        call_kwargs.append(kwargs)
+        return await pooled_post(provider, url, **kwargs)
+
+    pool.post = post
+
+    async def run():
+        return await client._query_groq("prompt", system_prompt="system")
+
+    try:
+        # asyncio.run ve execution_router'daki gibi elle yönetilen loop
+        assert asyncio.run(run()) == '{"ok": true}'
+        loop = asyncio.new_event_loop()
+        try:
+            assert loop.run_until_complete(run()) == '{"ok": true}'
+            assert pool.stats()["open_clients"] == 1
+        finally:
+            loop.run_until_complete(loop.shutdown_asyncgens())
+            loop.close()
+    finally:
+        server.shutdown()
+
+    assert pool.stats()["open_clients"] == 0
+    assert pool.stats()["providers"]["groq"]["clients_opened"] == 2
+    # LLM_HTTP_TIMEOUT_S (havuz timeout'u) çağrı başına ezilmez
+    assert call_kwargs and all("timeout" not in kwargs for kwargs in call_kwargs)
@@ -0,0 +1,100 @@
+import io
+import json
+import os
+import sys
+
+import pytest
+from fastapi.testclient import TestClient
+from PIL import Image, ImageDraw
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+import main
+from core.analysis_context import ImageAnalysisContext
+from core.image_upload import UploadRejected, open_checked_image
+
+
+def _sample_png(size=(320, 200)) -> bytes:
+    image = Image.new("RGB", size, "#ffffff")
+    draw = ImageDraw.Draw(image)
+    draw.rectangle((20, 20, 140, 60), fill="#d0d0d0")
+    draw.rectangle((20, 100, 300, 140), fill="#1f2937")
+    buffer = io.BytesIO()
+    image.save(buffer, format="PNG")
+    return buffer.getvalue()
+
+
+def test_pixel_limit_is_checked_from_header():
+    with pytest.raises(UploadRejected) as excinfo:
+        open_checked_image(io.BytesIO(_sample_png()), max_pixels=1000)
+
+    assert excinfo.value.status_code == 413
+    assert open_checked_image(io.BytesIO(_sample_png()), max_pixels=64000).size == (320, 200)
+
+
+def test_file_context_keeps_original_bytes():
+    upload = io.BytesIO(_sample_png())
+    context = ImageAnalysisContext.from_file(upload)
+
+    assert (context.width, context.height) == (320, 200)
+    assert context.source_bytes == _sample_png()
+
+
+@pytest.mark.parametrize("path", ["/accessibility/analyze-upload", "/uiux/analyze-upload", "/security/analyze-upload"])
+def test_raw_binary_upload_endpoints(path):
+    client = TestClient(main.app)
+    response = client.post(f"{path}?platform=web", content=_sample_png(), headers={"content-type": "image/png"})
+
+    assert response.status_code == 200
+    payload = response.json()
+    assert payload["platform"] == "web"
+    assert "findings" in payload
+
+
+def test_accessibility_upload_reads_metadata_from_query():
+    metadata = [{"element_type": "image", "x": 20, "y": 20, "width": 60, "height": 60, "alt_text": ""}]
+    client = TestClient(main.app)
+    response = client.post(
+        "/accessibility/analyze-upload",
+        params={"element_metadata": json.dumps(metadata)},
+        content=_sample_png(),
+        headers={"content-type": "application/octet-stream"},
+    )
+
+    assert response.status_code == 200
+    assert "alt-text" in {item["category"] for item in response.json()["findings"]}
+
+
+def test_mobile_upload_uses_header_size_only():
+    client = TestClient(main.app)
+    response = client.post("/mobile/analyze-upload?platform=ios", content=_sample_png((390, 844)))
+
+    assert response.status_code == 200
+    assert response.json()["platform"] == "ios"
+
+
+def test_upload_rejects_oversized_and_empty_bodies(monkeypatch):
+    monkeypatch.setenv("ANALYSIS_MAX_IMAGE_PIXELS", "1000")
+    client = TestClient(main.app)
+
+    too_many_pixels = client.post("/security/analyze-upload", content=_sample_png())
+    empty = client.post("/uiux/analyze-upload", content=b"")
+
+    assert too_many_pixels.status_code == 413
+    assert empty.status_code == 400
+
+
+def test_multipart_upload_uses_image_field():
+    client = TestClient(main.app)
+    response = client.post(
+        "/security/analyze-upload",
+        files={"image": ("capture.png", _sample_png(), "image/png")},
+        data={"platform": "web"},
+    )
+
+    try:
+        import python_multipart  # noqa: F401
+    except ImportError:
+        assert response.status_code == 415
+        return
+    assert response.status_code == 200
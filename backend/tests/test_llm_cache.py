@@ -0,0 +1,92 @@
+import asyncio
+import os
+import sys
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from core.models import llm_cache as llm_cache_module
+from core.models.llm_cache import LLMResponseCache, llm_cache_key, normalize_prompt
+from core.models.llm_client import LLMClient
+
+
+def test_near_identical_world_views_share_a_key():
+    first = "1. [button] at [100.2, 40.4, 220.7, 80.1] (confidence: 0.84)\n\n2. [link]"
+    second = "1. [button]  at [99.8, 40.1, 221.2, 79.9] (confidence: 0.82)\n2. [link]"
+
+    assert normalize_prompt(first) == normalize_prompt(second)
+    assert llm_cache_key("groq", "llama", "sys", 0.3, first) == llm_cache_key("groq", "llama", "sys", 0.3, second)
+    assert llm_cache_key("groq", "llama", "sys", 0.3, first) != llm_cache_key("groq", "llama", "sys", 0.7, first)
+    assert llm_cache_key("groq", "llama", "sys", 0.3, first) != llm_cache_key("huggingface", "llama", "sys", 0.3, first)
+
+
+def test_cache_persists_expires_and_evicts(tmp_path, monkeypatch):
+    path = str(tmp_path / "llm.sqlite3")
+    now = [1000.0]
+    monkeypatch.setattr(llm_cache_module.time, "time", lambda: now[0])
+
+    cache = LLMResponseCache(path, ttl_seconds=60, max_entries=2)
+    cache.set("a", '{"a": 1}')
+    now[0] += 1
+    cache.set("b", '{"b": 1}')
+    now[0] += 1
+    assert cache.get("a") == '{"a": 1}'
+    now[0] += 1
+    cache.set("c", '{"c": 1}')
+
+    reopened = LLMResponseCache(path, ttl_seconds=60, max_entries=2)
+    assert reopened.get("b") is None
+    assert reopened.get("a") == '{"a": 1}'
+    now[0] += 120
+    assert reopened.get("c") is None
+    assert reopened.stats()["expired"] == 1 and cache.stats()["evictions"] == 1
+
+
+def test_llm_client_answers_repeats_from_cache_unless_opted_out(tmp_path, monkeypatch):
+    cache = LLMResponseCache(str(tmp_path / "llm.sqlite3"))
+    monkeypatch.setattr("core.models.llm_client.llm_response_cache", cache)
+    calls = []
+
+    async def fake_provider(self, prompt, system_prompt=None):
+        calls.append(prompt)
+        return '{"page_type": "login"}', "groq"
+
+    monkeypatch.setattr(LLMClient, "_query_provider", fake_provider)
+
+    async def run():
+        cached = LLMClient(api_key="test-key")
+        fresh = LLMClient(api_key="test-key", use_cache=False)
+        return [
+            await cached._query("page at [10.2, 20.0]", system_prompt="identity"),
+            await cached._query("page  at [10.4, 20.1]", system_prompt="identity"),
+            await fresh._query("page at [10.2, 20.0]", system_prompt="identity"),
+        ]
+
+    assert asyncio.run(run()) == ['{"page_type": "login"}'] * 3
+    assert len(calls) == 2
+    assert cache.stats()["hits"] == 1 and cache.stats()["stores"] == 1
+
+
+def test_error_payloads_are_never_cached(tmp_path, monkeypatch):
+    cache = LLMResponseCache(str(tmp_path / "llm.sqlite3"))
+    monkeypatch.setattr("core.models.llm_client.llm_response_cache", cache)
+    monkeypatch.delenv("GROQ_API_KEY", raising=False)
+    monkeypatch.delenv("HF_API_TOKEN", raising=False)
+
+    async def failing_groq(self, prompt, system_prompt=None, clock=None):
+        return ""
+
+    monkeypatch.setattr(LLMClient, "_query_groq", failing_groq)
+
+    async def run():
+        # Anahtar yok: HF hata JSON'u döner; Groq boş döner ve HF'e düşülür
+        no_key = LLMClient()
+        groq_down = LLMClient(api_key="test-key")
+        return [
+            await no_key._query("page", system_prompt="identity"),
+            await no_key._query("page", system_prompt="identity"),
+            await groq_down._query("page", system_prompt="identity"),
+        ]
+
+    results = asyncio.run(run())
+    assert all('"error"' in result for result in results)
+    assert cache.stats()["stores"] == 0 and cache.stats()["hits"] == 0
@@ -0,0 +1,133 @@
+import asyncio
+import json
+import os
+import random
+import sys
+import time
+
+from fastapi.testclient import TestClient
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from core.models.json_stream import IncrementalCaseParser
+from core.models.llm_client import LLMClient
+from core.models.llm_stub import STUB_CASES, StubLLMServer
+from core.models.rate_limiter import LLMRateLimiter
+
+
+def test_parser_emits_each_case_once_regardless_of_chunking():
+    document = {
+        "page_analysis_summary": 'A "quoted" {summary} with [brackets]',
+        "happy_path": [{"title": "Login", "steps": [{"target": "button:has-text('}')"}]}],
+        "negative_path": [{"title": 'Bad \\"email\\"'}, {"title": "Empty"}],
+        "edge_cases": [],
+    }
+    text = "Here you go:\n```json\n" + json.dumps(document) + "\n```"
+    expected = [("happy_path", "Login"), ("negative_path", 'Bad \\"email\\"'), ("negative_path", "Empty")]
+
+    rng = random.Random(7)
+    for _ in range(50):
+        parser, found, index = IncrementalCaseParser(), [], 0
+        while index < len(text):
+            size = rng.randint(1, 9)
+            found += [(category, case["title"]) for category, case in parser.feed(text[index:index + size])]
+            index += size
+        assert found == expected
+        assert parser.text == text
+
+
+def test_stream_test_cases_yields_first_case_before_the_answer_completes(monkeypatch):
+    monkeypatch.setattr("core.models.llm_client.llm_rate_limiter", LLMRateLimiter({}))
+    server = StubLLMServer(delay_ms=15, chunk_chars=24).start()
+
+    async def run():
+        client = LLMClient(api_key="stub", use_cache=False)
+        client.groq_url = server.url
+        start, arrivals = time.perf_counter(), []
+        async for category, case in client.stream_test_cases("https://example.com/login", "login form"):
+            arrivals.append((time.perf_counter() - start, category, case["title"]))
+        return arrivals, time.perf_counter() - start
+
+    try:
+        arrivals, total = asyncio.run(run())
+    finally:
+        server.close()
+
+    expected = [(category, case["title"]) for category, cases in STUB_CASES.items() if isinstance(cases, list) for case in cases]
+    assert [(category, title) for _, category, title in arrivals] == expected
+    assert arrivals[0][0] < total / 2
+    assert server.requests[-1]["stream"] is True and "response_format" not in server.requests[-1]
+
+
+def test_generate_endpoint_streams_ndjson_and_sse(monkeypatch):
+    monkeypatch.setattr("core.models.llm_client.llm_rate_limiter", LLMRateLimiter({}))
+    server = StubLLMServer(delay_ms=1).start()
+    monkeypatch.setenv("GROQ_API_KEY", "stub")
+    monkeypatch.setenv("GROQ_API_URL", server.url)
+
+    import main
+
+    body = {"url": "https://example.com/login", "use_screenshot": False, "use_llm_cache": False, "stream": True}
+    try:
+        client = TestClient(main.app)
+        ndjson = client.post("/cases/generate", json=body)
+        sse = client.post("/cases/generate", json=body, headers={"Accept": "text/event-stream"})
+    finally:
+        server.close()
+
+    assert ndjson.status_code == 200 and ndjson.headers["content-type"].startswith("application/x-ndjson")
+    events = [json.loads(line) for line in ndjson.text.splitlines() if line]
+    assert [event["type"] for event in events] == ["case"] * 5 + ["summary"]
+    assert events[0]["case"]["category"] == "happy_path"
+    assert events[-1]["total_cases"] == 5 and events[-1]["summary"]["negative_path"] == 2
+
+    assert sse.headers["content-type"].startswith("text/event-stream")
+    assert sse.text.count("event: case\n") == 5 and "event: summary\n" in sse.text
+
+
+def test_streamed_case_ids_are_committed_before_their_event():
+    from database import SessionLocal
+    from database.models import Project, TestCase
+    from routers.cases_router import GenerateCasesRequest, _stream_generated_cases
+
+    db = SessionLocal()
+    project = Project(name="stream-commit", platforms=["web"])
+    db.add(project)
+    db.commit()
+    project_id = project.id
+    db.close()
+
+    class FailingGenerator:
+        async def stream_cases_from_url(self, **kwargs):
+            for title in ("First", "Second"):
+                yield {"title": title, "category": "happy_path", "steps": []}
+            raise RuntimeError("LLM bağlantısı koptu")
+
+    async def run():
+        request = GenerateCasesRequest(url="https://example.com", project_id=project_id)
+        events = []
+        async for line in _stream_generated_cases(FailingGenerator(), request, request.url, sse=False):
+            event = json.loads(line)
+            if event["type"] == "case":
+                # Olay gönderildiği anda kayıt başka bir oturumdan görünür olmalı
+                check = SessionLocal()
+                try:
+                    assert check.get(TestCase, event["case"]["id"]) is not None
+                finally:
+                    check.close()
+            events.append(event)
+        return events
+
+    events = asyncio.run(run())
+    assert [event["type"] for event in events] == ["case", "case", "error"]
+    assert events[-1]["saved_cases"] == 2
+
+    db = SessionLocal()
+    try:
+        titles = sorted(case.title for case in db.query(TestCase).filter(TestCase.project_id == project_id))
+        assert titles == ["First", "Second"]
+    finally:
+        db.query(TestCase).filter(TestCase.project_id == project_id).delete()
+        db.query(Project).filter(Project.id == project_id).delete()
+        db.commit()
+        db.close()
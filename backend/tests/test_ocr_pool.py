@@ -0,0 +1,169 @@
+import os
+import sys
+import threading
+import time
+from concurrent.futures import Future
+
+from fastapi.testclient import TestClient
+from PIL import Image, ImageDraw
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+import main
+from core.ocr_pool import OcrWorkerPool
+
+
+def _fake_pool(monkeypatch, **kwargs):
+    pool = OcrWorkerPool(**kwargs)
+    calls = []
+
+    def fake_recognize(image):
+        calls.append(threading.current_thread().name)
+        time.sleep(0.02)
+        return {
+            "text": ["Sign", "in"],
+            "conf": [91, 88],
+            "left": [10, 52],
+            "top": [10, 10],
+            "width": [38, 20],
+            "height": [14, 14],
+            "block_num": [1, 1],
+            "par_num": [1, 1],
+            "line_num": [1, 1],
+        }
+
+    pool._backend = "pytesseract"
+    monkeypatch.setattr(pool, "_recognize_with_pytesseract", fake_recognize)
+    return pool, calls
+
+
+def _region(color: str) -> Image.Image:
+    image = Image.new("RGB", (120, 40), "#ffffff")
+    ImageDraw.Draw(image).rectangle((8, 8, 90, 30), fill=color)
+    return image
+
+
+def test_pool_caches_results_by_region_pixels(monkeypatch):
+    pool, calls = _fake_pool(monkeypatch, max_workers=2)
+
+    first = pool.image_to_data(_region("#111827"))
+    second = pool.image_to_data(_region("#111827"))
+    pool.image_to_data(_region("#ff0000"))
+
+    assert first == second
+    assert len(calls) == 2
+    assert pool.stats()["cache_hits"] == 1
+    assert pool.stats()["recognized"] == 2
+    pool.shutdown()
+
+
+def test_pool_runs_regions_on_long_lived_worker_threads(monkeypatch):
+    pool, calls = _fake_pool(monkeypatch, max_workers=4, cache_entries=0)
+
+    futures = [pool.submit(_region(f"#{index:02x}0000")) for index in range(12)]
+    assert all(future.result() for future in futures)
+
+    assert len(calls) == 12
+    assert 1 < len(set(calls)) <= 4
+    assert all(name.startswith("ocr-worker") for name in calls)
+    pool.shutdown()
+
+
+def test_unavailable_backend_returns_no_data():
+    pool = OcrWorkerPool(max_workers=1)
+    pool._backend = ""
+
+    assert pool.image_to_data(_region("#111827")) is None
+
+
+def test_accessibility_ocr_goes_through_shared_pool(monkeypatch):
+    pool, calls = _fake_pool(monkeypatch, max_workers=1)
+    monkeypatch.setattr("core.accessibility.engine.ocr_pool", pool)
+
+    from core.accessibility.engine import _detect_text_regions
+
+    regions = _detect_text_regions(_region("#111827"))
+
+    assert len(calls) == 1
+    assert regions[0]["text"] == "Sign in"
+    assert regions[0]["source"] == "ocr"
+    pool.shutdown()
+
+
+class _CropEchoPool:
+    """Recognizes one word filling each submitted crop; full-page calls are recorded separately."""
+
+    available = True
+
+    def __init__(self, page_size, recognize_crops=True):
+        self.page_size = page_size
+        self.recognize_crops = recognize_crops
+        self.crop_sizes = []
+        self.full_page_calls = 0
+
+    def submit(self, image):
+        future = Future()
+        if image.size == self.page_size:
+            self.full_page_calls += 1
+            future.set_result(None)
+            return future
+        self.crop_sizes.append(image.size)
+        width, height = image.size
+        words = {"text": ["word"], "conf": [90], "left": [2], "top": [2], "width": [width - 4], "height": [height - 4],
+                 "block_num": [1], "par_num": [1], "line_num": [1]}
+        future.set_result(words if self.recognize_crops else None)
+        return future
+
+    def image_to_data(self, image):
+        return self.submit(image).result()
+
+
+def _tall_capture() -> Image.Image:
+    image = Image.new("RGB", (400, 1600), "#ffffff")
+    draw = ImageDraw.Draw(image)
+    for top in range(40, 1600, 200):
+        draw.rectangle((30, top, 230, top + 14), fill="#111827")
+    return image
+
+
+def test_roi_ocr_only_reads_text_candidates(monkeypatch):
+    from core.accessibility.engine import _detect_text_regions
+
+    image = _tall_capture()
+    pool = _CropEchoPool(image.size)
+    monkeypatch.setattr("core.accessibility.engine.ocr_pool", pool)
+    monkeypatch.setenv("OCR_MODE", "roi")
+
+    report = {}
+    regions = _detect_text_regions(image, report=report)
+
+    assert pool.full_page_calls == 0
+    assert len(pool.crop_sizes) == report["roi_count"] == 8
+    assert report["mode"] == "roi"
+    assert report["pixel_coverage"] < 0.1
+    assert report["estimated_time_saved_ms"] >= 0
+    assert len(regions) == 8
+    assert all(region["source"] == "ocr" and region["box"][1] >= 30 for region in regions)
+
+
+def test_roi_ocr_falls_back_to_full_page_on_low_coverage(monkeypatch):
+    from core.accessibility.engine import _detect_text_regions
+
+    image = _tall_capture()
+    pool = _CropEchoPool(image.size, recognize_crops=False)
+    monkeypatch.setattr("core.accessibility.engine.ocr_pool", pool)
+    monkeypatch.setenv("OCR_MODE", "roi")
+
+    report = {}
+    _detect_text_regions(image, report=report)
+
+    assert pool.full_page_calls == 1
+    assert report["mode"] == "roi-fallback-full"
+    assert report["fallback_reason"] == "low-roi-coverage"
+
+
+def test_ocr_pool_stats_endpoint():
+    response = TestClient(main.app).get("/stats/ocr-pool")
+
+    assert response.status_code == 200
+    assert {"backend", "max_workers", "cache_hits"} <= set(response.json())
@@ -0,0 +1,94 @@
+import asyncio
+import os
+import sys
+
+import httpx
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from core.models import rate_limiter as rate_limiter_module
+from core.models.llm_client import LLMClient
+from core.models.rate_limiter import LLMRateLimiter, ProviderRateLimiter, TokenBucket
+
+
+def test_token_bucket_queues_beyond_capacity_and_settles_debt(monkeypatch):
+    now = [100.0]
+    monkeypatch.setattr(rate_limiter_module.time, "monotonic", lambda: now[0])
+
+    bucket = TokenBucket(per_minute=60, capacity=2)
+    assert bucket.reserve(1) == 0.0
+    assert bucket.reserve(1) == 0.0
+    assert bucket.reserve(1) == 1.0
+    now[0] += 1
+    bucket.settle(3)
+    assert bucket.reserve(1) == 4.0
+
+
+def test_provider_limiter_reports_throttle_and_queue_wait():
+    limiter = ProviderRateLimiter(requests_per_minute=600, tokens_per_minute=0)
+    limiter.requests.capacity = limiter.requests.tokens = 1
+
+    async def run():
+        return await asyncio.gather(limiter.acquire(10), limiter.acquire(10))
+
+    waits = asyncio.run(run())
+    stats = limiter.stats()
+    assert waits[0] == 0.0 and 0.05 < waits[1] <= 0.1
+    assert stats["requests"] == 2 and stats["throttled"] == 1
+    assert stats["max_queue_wait_seconds"] > 0.05
+
+
+def test_identical_in_flight_prompts_are_sent_once(monkeypatch):
+    limiter = LLMRateLimiter({"groq": {"rpm": 0, "tpm": 0}})
+    monkeypatch.setattr("core.models.llm_client.llm_rate_limiter", limiter)
+    calls = []
+
+    async def fake_provider(self, prompt, system_prompt=None):
+        calls.append(prompt)
+        await asyncio.sleep(0.05)
+        return '{"prompt": "%s"}' % prompt, "groq"
+
+    monkeypatch.setattr(LLMClient, "_query_provider", fake_provider)
+
+    async def run():
+        client = LLMClient(api_key="test-key", use_cache=False)
+        return await asyncio.gather(
+            client._query("login page", system_prompt="identity"),
+            client._query("login  page", system_prompt="identity"),
+            client._query("login page", system_prompt="identity"),
+            client._query("checkout page", system_prompt="identity"),
+        )
+
+    results = asyncio.run(run())
+    assert results[:3] == ['{"prompt": "login page"}'] * 3
+    assert sorted(calls) == ["checkout page", "login page"]
+    assert limiter.stats()["groq"]["coalesced"] == 2
+
+
+def test_groq_429_pauses_and_retries_instead_of_falling_back(monkeypatch):
+    limiter = LLMRateLimiter({"groq": {"rpm": 0, "tpm": 1000}})
+    monkeypatch.setattr("core.models.llm_client.llm_rate_limiter", limiter)
+    responses = [
+        httpx.Response(429, headers={"retry-after": "0.01"}, json={"error": "rate limited"}),
+        httpx.Response(200, json={"choices": [{"message": {"content": '{"ok": true}'}}], "usage": {"total_tokens": 600}}),
+    ]
+
+    class FakeHttp:
+        async def post(self, provider, url, **kwargs):
+            return responses.pop(0)
+
+    async def no_fallback(self, prompt, system_prompt=None, clock=None):
+        raise AssertionError("HuggingFace fallback should not be used")
+
+    monkeypatch.setattr(LLMClient, "_query_hf", no_fallback)
+
+    async def run():
+        client = LLMClient(api_key="test-key", use_cache=False)
+        client.http = FakeHttp()
+        return await client._query("short prompt", system_prompt="identity")
+
+    assert asyncio.run(run()) == '{"ok": true}'
+    stats = limiter.stats()["groq"]
+    assert stats["rate_limited_responses"] == 1 and stats["requests"] == 2
+    # Actual usage (600) replaced the small prompt estimate in the TPM bucket.
+    assert limiter.providers["groq"].tokens.tokens < 450
@@ -0,0 +1,105 @@
+import base64
+import io
+import os
+import sys
+
+from fastapi.testclient import TestClient
+from PIL import Image, ImageDraw
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+import main
+from core.accessibility.engine import AccessibilityEngine
+from core.tiled_analysis import (
+    TiledImageAnalysisContext,
+    band_height_for_ceiling,
+    build_analysis_context,
+    merge_band_items,
+    plan_bands,
+)
+
+
+def _tall_capture(height: int = 3000) -> Image.Image:
+    image = Image.new("RGB", (400, height), "#f8fafc")
+    draw = ImageDraw.Draw(image)
+    for top in range(60, height - 100, 300):
+        draw.rectangle((40, top, 200, top + 40), fill="#1f2937")
+    return image
+
+
+def _encode(image: Image.Image) -> str:
+    buffer = io.BytesIO()
+    image.save(buffer, format="PNG")
+    return base64.b64encode(buffer.getvalue()).decode("utf-8")
+
+
+def test_bands_cover_the_page_with_overlap():
+    bands = plan_bands(2000, 600, 100)
+
+    assert bands[0][0] == 0 and bands[-1][1] == 2000
+    assert all(previous[1] - current[0] == 100 for previous, current in zip(bands, bands[1:]))
+    assert all(bottom - top <= 600 for top, bottom in bands)
+    assert band_height_for_ceiling(1280, 64) < band_height_for_ceiling(1280, 256)
+
+
+def test_seam_merge_dedupes_overlap_and_unions_cut_boxes():
+    bands = [(0, 600), (500, 1100)]
+    box_of = lambda item: tuple(item["box"])
+    union = lambda items, box: {"box": list(box), "pieces": len(items)}
+    banded = [
+        (0, {"box": [10, 520, 60, 560]}),   # fully inside the overlap, seen by both bands
+        (1, {"box": [10, 520, 60, 560]}),
+        (0, {"box": [100, 400, 180, 600]}),  # cut by the first band's bottom edge
+        (1, {"box": [100, 500, 180, 700]}),  # cut by the second band's top edge
+        (1, {"box": [10, 900, 60, 940]}),
+    ]
+
+    merged = merge_band_items(banded, bands, box_of, union)
+
+    boxes = sorted(item["box"] for item in merged)
+    assert boxes == [[10, 520, 60, 560], [10, 900, 60, 940], [100, 400, 180, 700]]
+    assert next(item for item in merged if item["box"] == [100, 400, 180, 700])["pieces"] == 2
+
+
+def test_tiled_context_bounds_pixel_rows_and_keeps_components_in_page_space():
+    context = TiledImageAnalysisContext(_tall_capture(), band_height=600, overlap=120)
+    spans = []
+    original_rows = context.pixel_rows
+
+    def recording_rows(top, bottom):
+        spans.append(bottom - top)
+        return original_rows(top, bottom)
+
+    context.pixel_rows = recording_rows
+    result = AccessibilityEngine(max_workers=1).analyze_image(context=context)
+
+    assert len(context.bands) > 1
+    assert spans and max(spans) <= 600
+    assert result["tiling"]["bands"] == len(context.bands)
+    assert result["image"] == {"width": 400, "height": 3000}
+    assert max(tile["height"] for tile in result["heatmap"]) <= 600
+
+    boxes = [(c.y, c.height) for c in context.raw_component_candidates if c.width >= 150 and 30 <= c.height <= 50]
+    tops = sorted(top for top, _ in boxes)
+    assert len(tops) == len(set(tops))
+    assert any(top > 2000 for top in tops)
+
+
+def test_build_context_switches_to_bands_above_height_threshold(monkeypatch):
+    monkeypatch.setenv("TILED_ANALYSIS_MIN_HEIGHT", "2000")
+
+    assert isinstance(build_analysis_context(_encode(_tall_capture(3000))), TiledImageAnalysisContext)
+    assert not isinstance(build_analysis_context(_encode(_tall_capture(1500))), TiledImageAnalysisContext)
+    assert not isinstance(build_analysis_context(_encode(_tall_capture(3000)), tiled=False), TiledImageAnalysisContext)
+
+
+def test_accessibility_endpoint_reports_tiling_for_tall_uploads(monkeypatch):
+    monkeypatch.setenv("TILED_ANALYSIS_MIN_HEIGHT", "2000")
+
+    response = TestClient(main.app).post(
+        "/accessibility/analyze-image",
+        json={"platform": "web", "image_base64": _encode(_tall_capture(3000))},
+    )
+
+    assert response.status_code == 200
+    assert response.json()["tiling"]["bands"] >= 1
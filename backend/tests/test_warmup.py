@@ -0,0 +1,79 @@
+import os
+import sys
+import threading
+
+from fastapi.testclient import TestClient
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+import main
+from core.warmup import ModelWarmup
+
+
+def test_warmup_reports_loading_ready_and_failed_components():
+    release = threading.Event()
+
+    def slow_dino():
+        release.wait(5)
+        return {"backend": "torch"}
+
+    def broken_ocr():
+        raise RuntimeError("tesseract missing")
+
+    warmup = ModelWarmup(["dino", "ocr"], warmers={"dino": slow_dino, "ocr": broken_ocr}, max_attempts=2, retry_delay=0.01)
+    assert warmup.readiness()["components"] == {"dino": {"status": "pending"}, "ocr": {"status": "pending"}}
+
+    warmup.start()
+    loading = warmup.readiness()
+    release.set()
+    warmup.join(5)
+    done = warmup.readiness()
+
+    assert loading["ready"] is False
+    assert done["ready"] is False
+    assert done["components"]["dino"]["status"] == "ready" and done["components"]["dino"]["backend"] == "torch"
+    ocr = done["components"]["ocr"]
+    assert ocr == {"status": "failed", "error": "tesseract missing", "attempts": 2, "seconds": ocr["seconds"]}
+
+
+def test_failed_component_is_retried_until_it_comes_up():
+    calls = []
+
+    def late_service():
+        calls.append(1)
+        if len(calls) < 3:
+            raise ConnectionRefusedError("dino service not up yet")
+        return {"mode": "service"}
+
+    warmup = ModelWarmup(["dino"], warmers={"dino": late_service}, max_attempts=5, retry_delay=0.01)
+    warmup.start()
+    warmup.join(5)
+
+    readiness = warmup.readiness()
+    assert readiness["ready"] is True
+    assert readiness["components"]["dino"]["attempts"] == 3 and len(calls) == 3
+
+
+def test_warmup_is_opt_in(monkeypatch):
+    monkeypatch.delenv("MODEL_WARMUP", raising=False)
+    assert ModelWarmup.from_env().readiness() == {"ready": True, "warmup_enabled": False, "components": {}}
+
+    monkeypatch.setenv("MODEL_WARMUP", "dino, gpu")
+    assert ModelWarmup.from_env().components == ["dino"]
+
+
+def test_readiness_endpoint_gates_until_models_are_warm(monkeypatch):
+    release = threading.Event()
+    warmup = ModelWarmup(["dino"], warmers={"dino": lambda: release.wait(5) and {}})
+    monkeypatch.setattr(main, "model_warmup", warmup)
+
+    with TestClient(main.app) as client:
+        cold = client.get("/health/ready")
+        health = client.get("/health").json()
+        release.set()
+        warmup.join(5)
+        warm = client.get("/health/ready")
+
+    assert cold.status_code == 503 and cold.json()["components"]["dino"]["status"] in {"pending", "loading"}
+    assert health["readiness"]["ready"] is False
+    assert warm.status_code == 200 and warm.json()["ready"] is True
@@ -16,7 +16,7 @@ import {
     Trash2,
     X,
 } from 'lucide-react';
-import { api, AccessibilityAnalysisResponse, AccessibilityHistoryItem } from '../services/api';
+import { api, artifactImageSrc, AccessibilityAnalysisResponse, AccessibilityHistoryItem } from '../services/api';
 
 function severityBadge(severity: string) {
     if (severity === 'high') return 'border-red-400/40 bg-red-500/10 text-red-200';
@@ -145,9 +145,7 @@ export function AccessibilityPage() {
                 platform: 'web',
                 full_page: fullPageUrlCapture,
             });
-            const sourceImage = result.artifacts.source_image_base64
-                ? `data:image/png;base64,${result.artifacts.source_image_base64}`
-                : null;
+            const sourceImage = artifactImageSrc(result.artifacts.source_image_base64, result.artifacts.source_artifact_id);
 
             setPreview(sourceImage);
             setAnalysis(result);
@@ -167,9 +165,7 @@ export function AccessibilityPage() {
         setError(null);
         try {
             const detail = await api.getAccessibilityHistoryDetail(recordId);
-            const sourceImage = detail.analysis.artifacts.source_image_base64
-                ? `data:image/png;base64,${detail.analysis.artifacts.source_image_base64}`
-                : null;
+            const sourceImage = artifactImageSrc(detail.analysis.artifacts.source_image_base64, detail.analysis.artifacts.source_artifact_id);
 
             setPreview(sourceImage);
             setAnalysis(detail.analysis);
@@ -492,9 +488,9 @@ export function AccessibilityPage() {
 
                                 <div className="mt-4 grid gap-4 lg:grid-cols-[220px_minmax(0,1fr)]">
                                     <div className="overflow-hidden rounded-xl border border-slate-800 bg-slate-950">
-                                        {selectedFinding.crop_image_base64 ? (
+                                        {selectedFinding.crop_image_base64 || selectedFinding.crop_artifact_id ? (
                                             <img
-                                                src={`data:image/png;base64,${selectedFinding.crop_image_base64}`}
+                                                src={artifactImageSrc(selectedFinding.crop_image_base64, selectedFinding.crop_artifact_id) ?? undefined}
                                                 alt={`Secili bulgu ${selectedFinding.id}`}
                                                 className="block h-full max-h-40 w-full object-contain"
                                             />
@@ -628,7 +624,7 @@ export function AccessibilityPage() {
                                 </div>
                                 <div className="mt-4 overflow-hidden rounded-xl border border-slate-800 bg-slate-950">
                                     <img
-                                        src={`data:image/png;base64,${finding.crop_image_base64}`}
+                                        src={artifactImageSrc(finding.crop_image_base64, finding.crop_artifact_id) ?? undefined}
                                         alt={`Bulgu ${finding.id} onizlemesi`}
                                         className="block max-h-40 w-full object-contain"
                                     />
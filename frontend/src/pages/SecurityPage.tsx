@@ -19,6 +19,7 @@ import {
 
 import {
     api,
+    artifactImageSrc,
     SecurityAnalysisResponse,
     SecurityAttackChain,
     SecurityAttackHypothesis,
@@ -149,7 +150,7 @@ export function SecurityPage() {
                 platform: 'web',
                 full_page: true,
             });
-            const sourceImage = result.artifacts.source_image_base64 ? `data:image/png;base64,${result.artifacts.source_image_base64}` : null;
+            const sourceImage = artifactImageSrc(result.artifacts.source_image_base64, result.artifacts.source_artifact_id);
             setPreview(sourceImage);
             setAnalysis(result);
             setSimulation(null);
@@ -168,7 +169,7 @@ export function SecurityPage() {
         setError(null);
         try {
             const detail = await api.getSecurityHistoryDetail(recordId);
-            const sourceImage = detail.analysis.artifacts.source_image_base64 ? `data:image/png;base64,${detail.analysis.artifacts.source_image_base64}` : null;
+            const sourceImage = artifactImageSrc(detail.analysis.artifacts.source_image_base64, detail.analysis.artifacts.source_artifact_id);
             setPreview(sourceImage);
             setAnalysis(detail.analysis);
             setSimulation(null);
@@ -248,7 +249,9 @@ export function SecurityPage() {
     };
 
     const imageSource = analysis
-        ? `data:image/png;base64,${viewMode === 'overlay' ? analysis.artifacts.overlay_image_base64 : analysis.artifacts.source_image_base64}`
+        ? viewMode === 'overlay'
+            ? artifactImageSrc(analysis.artifacts.overlay_image_base64, analysis.artifacts.overlay_artifact_id)
+            : artifactImageSrc(analysis.artifacts.source_image_base64, analysis.artifacts.source_artifact_id)
         : preview;
 
     const layerItems = analysis
@@ -286,7 +289,7 @@ export function SecurityPage() {
             return (
                 <div className="mt-5">
                     <div className="overflow-hidden rounded-[1.5rem] border border-slate-800 bg-slate-900">
-                        <img src={`data:image/png;base64,${finding.crop_image_base64}`} alt={finding.title} className="h-56 w-full object-cover" />
+                        <img src={artifactImageSrc(finding.crop_image_base64, finding.crop_artifact_id) ?? undefined} alt={finding.title} className="h-56 w-full object-cover" />
                     </div>
                     <div className="mt-4 flex items-start justify-between gap-4">
                         <div>
@@ -15,7 +15,7 @@ import {
     X,
 } from 'lucide-react';
 
-import { api, UiuxAnalysisResponse, UiuxHistoryItem } from '../services/api';
+import { api, artifactImageSrc, UiuxAnalysisResponse, UiuxHistoryItem } from '../services/api';
 
 function severityBadge(severity: string) {
     if (severity === 'high') return 'border-red-400/40 bg-red-500/10 text-red-200';
@@ -110,9 +110,7 @@ export function UIUXPage() {
         setError(null);
         try {
             const detail = await api.getUiuxHistoryDetail(recordId);
-            const sourceImage = detail.analysis.artifacts.source_image_base64
-                ? `data:image/png;base64,${detail.analysis.artifacts.source_image_base64}`
-                : null;
+            const sourceImage = artifactImageSrc(detail.analysis.artifacts.source_image_base64, detail.analysis.artifacts.source_artifact_id);
             setPreview(sourceImage);
             setAnalysis(detail.analysis);
             setSelectedFindingId(detail.analysis.findings[0]?.id ?? null);
@@ -178,14 +176,16 @@ export function UIUXPage() {
         }
     };
 
+    const artifacts = analysis?.artifacts;
+    const annotatedSource = artifacts ? artifactImageSrc(artifacts.annotated_image_base64, artifacts.annotated_artifact_id) : null;
+    const attentionSource = artifacts ? artifactImageSrc(artifacts.attention_overlay_image_base64, artifacts.attention_overlay_artifact_id) : null;
+    const originalSource = artifacts ? artifactImageSrc(artifacts.source_image_base64, artifacts.source_artifact_id) : null;
     const imageSource = analysis
-        ? `data:image/png;base64,${
-            viewMode === 'annotated'
-                ? analysis.artifacts.annotated_image_base64
-                : viewMode === 'attention'
-                    ? (analysis.artifacts.attention_overlay_image_base64 || analysis.artifacts.annotated_image_base64 || analysis.artifacts.source_image_base64)
-                    : analysis.artifacts.source_image_base64
-        }`
+        ? viewMode === 'annotated'
+            ? annotatedSource
+            : viewMode === 'attention'
+                ? (attentionSource || annotatedSource || originalSource)
+                : originalSource
         : preview;
     const topFindings = analysis?.findings.slice(0, 5) ?? [];
     const selectedFinding = topFindings.find((finding) => finding.id === selectedFindingId) ?? topFindings[0] ?? null;
@@ -407,7 +407,7 @@ export function UIUXPage() {
                             <div className="mt-5">
                                 <div className="overflow-hidden rounded-[1.5rem] border border-slate-800 bg-slate-900">
                                     <img
-                                        src={`data:image/png;base64,${selectedFinding.crop_image_base64}`}
+                                        src={artifactImageSrc(selectedFinding.crop_image_base64, selectedFinding.crop_artifact_id) ?? undefined}
                                         alt={`Finding ${selectedFinding.id}`}
                                         className="h-56 w-full object-cover"
                                     />
@@ -17,6 +17,13 @@ apiClient.interceptors.response.use(
     }
 );
 
+// 🖼️ Analiz gorselleri inline base64 veya artifact store ID'si olarak gelebilir
+export const artifactImageSrc = (base64?: string | null, artifactId?: string | null): string | null => {
+    if (base64) return `data:image/png;base64,${base64}`;
+    if (artifactId) return `/api/artifacts/${artifactId}`;
+    return null;
+};
+
 // 📦 Veri Tipleri (Backend Modelim)
 
 export interface Page {
@@ -157,6 +164,7 @@ export interface AccessibilityFinding {
     dominant_light: string;
     bounding_box: AccessibilityBoundingBox;
     crop_image_base64: string;
+    crop_artifact_id?: string | null;
     recommendation: string;
 }
 
@@ -199,7 +207,9 @@ export interface AccessibilityAnalysisResponse {
     heatmap: AccessibilityHeatmapRegion[];
     artifacts: {
         overlay_image_base64: string;
+        overlay_artifact_id?: string | null;
         source_image_base64: string;
+        source_artifact_id?: string | null;
     };
     recommendations: string[];
 }
@@ -252,6 +262,7 @@ export interface UiuxFinding {
     why_this_matters: string;
     bounding_box: AccessibilityBoundingBox;
     crop_image_base64: string;
+    crop_artifact_id?: string | null;
     recommendation: string;
 }
 
@@ -295,8 +306,11 @@ export interface UiuxAnalysisResponse {
     findings: UiuxFinding[];
     artifacts: {
         annotated_image_base64: string;
+        annotated_artifact_id?: string | null;
         attention_overlay_image_base64: string;
+        attention_overlay_artifact_id?: string | null;
         source_image_base64: string;
+        source_artifact_id?: string | null;
     };
     recommendations: string[];
 }
@@ -338,6 +352,7 @@ export interface SecurityFinding {
     description: string;
     bounding_box: AccessibilityBoundingBox;
     crop_image_base64: string;
+    crop_artifact_id?: string | null;
     recommendation: string;
     evidence?: string;
 }
@@ -482,7 +497,9 @@ export interface SecurityAnalysisResponse {
     root_causes: SecurityRootCause[];
     artifacts: {
         overlay_image_base64: string;
+        overlay_artifact_id?: string | null;
         source_image_base64: string;
+        source_artifact_id?: string | null;
     };
     header_summary: {
         checked: number;
@@ -0,0 +1,111 @@
+"""
+VisionQA — Aday kutu indeksi benchmark'i
+========================================
+Erisilebilirlik motorundaki aday birlestirme, OCR metin eslestirme ve DINO etiket
+eslestirme adimlarini artan aday sayilariyla olcer. Ayni adimlar tam tarama
+(her aday icin her kutu) moduyla da kosulup sure farki raporlanir.
+
+Kullanim:
+    python scripts/benchmark_box_index.py --sizes 50 100 200 400 800
+"""
+import argparse
+import os
+import random
+import sys
+import time
+
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "backend"))
+
+from PIL import Image  # noqa: E402
+
+from core.accessibility import engine as accessibility_engine  # noqa: E402
+from core.accessibility.engine import (  # noqa: E402
+    ComponentCandidate,
+    _BoxIndex,
+    _apply_detected_labels,
+    _apply_text_hints,
+    _merge_candidate_clusters,
+    _prune_fragment_icon_candidates,
+)
+
+IMAGE_WIDTH = 1280
+IMAGE_HEIGHT = 6000
+
+
+def _random_boxes(count, seed):
+    rng = random.Random(seed)
+    boxes = []
+    for _ in range(count):
+        width = rng.randint(12, 180)
+        height = rng.randint(8, 48)
+        x = rng.randint(0, IMAGE_WIDTH - width)
+        y = rng.randint(0, IMAGE_HEIGHT - height)
+        boxes.append([x, y, x + width, y + height])
+    return boxes
+
+
+def _build_inputs(count):
+    candidates = [
+        ComponentCandidate(
+            x=x1,
+            y=y1,
+            width=x2 - x1,
+            height=y2 - y1,
+            label=random.Random(index).choice(["content-block", "icon-or-badge", "text-line"]),
+            confidence=0.5,
+            contrast_ratio=3.2,
+            dominant_dark="#333333",
+            dominant_light="#f5f5f5",
+            severity="medium",
+            description="",
+            pixel_density=0.4,
+        )
+        for index, (x1, y1, x2, y2) in enumerate(_random_boxes(count, seed=1))
+    ]
+    text_regions = [
+        {"box": box, "text": f"Satir {index}", "score": 0.8}
+        for index, box in enumerate(_random_boxes(count, seed=2))
+    ]
+    dino_elements = [
+        {"label": "button", "score": 0.6, "box": box}
+        for box in _random_boxes(count, seed=3)
+    ]
+    return candidates, text_regions, dino_elements
+
+
+def _run(image, candidates, text_regions, dino_elements):
+    start = time.perf_counter()
+    _merge_candidate_clusters(image, candidates)
+    hinted = _apply_text_hints(candidates, text_regions)
+    labeled = _apply_detected_labels(hinted, dino_elements)
+    _prune_fragment_icon_candidates(labeled, text_regions, dino_elements)
+    return (time.perf_counter() - start) * 1000
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Aday kutu indeksi olcekleme benchmark'i")
+    parser.add_argument("--sizes", nargs="+", type=int, default=[50, 100, 200, 400, 800])
+    args = parser.parse_args()
+
+    image = Image.new("RGB", (IMAGE_WIDTH, IMAGE_HEIGHT), "#f5f5f5")
+    indexed_query = _BoxIndex.query
+
+    def full_scan_query(self, box, margin_x=0.0, margin_y=0.0):
+        return list(range(len(self)))
+
+    print(f"{'aday':>6} {'indeksli (ms)':>15} {'tam tarama (ms)':>17} {'hizlanma':>10}")
+    for size in args.sizes:
+        candidates, text_regions, dino_elements = _build_inputs(size)
+
+        accessibility_engine._BoxIndex.query = indexed_query
+        indexed_ms = _run(image, candidates, text_regions, dino_elements)
+
+        accessibility_engine._BoxIndex.query = full_scan_query
+        full_scan_ms = _run(image, candidates, text_regions, dino_elements)
+
+        accessibility_engine._BoxIndex.query = indexed_query
+        print(f"{size:>6} {indexed_ms:>15.1f} {full_scan_ms:>17.1f} {full_scan_ms / max(indexed_ms, 0.001):>9.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,151 @@
+"""
+VisionQA — Grounding DINO backend benchmark'i ve parite raporu
+=============================================================
+fp32 PyTorch modelini (referans) int8 ve ONNX Runtime backend'leriyle ayni sabit
+ekran goruntusu seti uzerinde karsilastirir:
+
+  * parite: her backend'in tespitleri fp32 referansina karsi eslenir
+    (ayni etiket, IoU >= 0.5) — recall, precision, ortalama IoU, en buyuk skor farki
+  * gecikme: goruntu basina p50 / p95 (batch=1)
+  * verim: verilen batch boyutlarinda goruntu/saniye
+
+Goruntu seti ``--images`` klasorundeki PNG/JPEG dosyalaridir; verilmezse sabit
+tohumla cizilen sentetik ekranlar kullanilir. Rapor ``--json`` ile dosyaya da yazilir.
+
+Kullanim:
+    python scripts/benchmark_dino_backends.py --backends torch int8 onnx --images ./screens
+"""
+import argparse
+import json
+import os
+import random
+import statistics
+import sys
+import time
+
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "backend"))
+
+from PIL import Image, ImageDraw  # noqa: E402
+
+from core.models.dino_runtime import compare_detections, summarize_parity  # noqa: E402
+from core.models.dinox_client import DetectionRequest, DINOXClient  # noqa: E402
+
+
+def _synthetic_screens(count, seed=7):
+    rng = random.Random(seed)
+    screens = []
+    for index in range(count):
+        image = Image.new("RGB", (1280, 800), "#f8fafc")
+        draw = ImageDraw.Draw(image)
+        draw.rectangle((0, 0, 1280, 64), fill="#1e293b")
+        draw.text((24, 24), f"VisionQA demo {index}", fill="#ffffff")
+        for row in range(rng.randint(3, 6)):
+            top = 120 + row * 100
+            draw.text((80, top), "E-posta" if row % 2 else "Sifre", fill="#334155")
+            draw.rectangle((80, top + 24, 520, top + 64), outline="#94a3b8", fill="#ffffff")
+        button_left = rng.randint(80, 400)
+        draw.rectangle((button_left, 720, button_left + 180, 764), fill="#2563eb")
+        draw.text((button_left + 48, 734), "Giris yap", fill="#ffffff")
+        screens.append((f"synthetic-{index:02d}", image))
+    return screens
+
+
+def _load_screens(folder):
+    names = sorted(name for name in os.listdir(folder) if name.lower().endswith((".png", ".jpg", ".jpeg")))
+    return [(name, Image.open(os.path.join(folder, name)).convert("RGB")) for name in names]
+
+
+def _load_client(backend):
+    os.environ["DINO_BACKEND"] = backend
+    os.environ["DINO_CACHE_MAX_ENTRIES"] = "0"  # tekrarlar modelden gecsin
+    os.environ["DINO_CACHE_DIR"] = ""
+    DINOXClient._model = None
+    DINOXClient._processor = None
+    DINOXClient._batcher = None
+    DINOXClient._detection_cache = None
+    return DINOXClient()
+
+
+def _run(client, images, prompt):
+    requests = [DetectionRequest(image, prompt, 0.25, 0.20) for image in images]
+    return client._run_requests(requests)
+
+
+def _percentile(values, fraction):
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(round(fraction * (len(ordered) - 1))))]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Grounding DINO backend parite ve hiz benchmark'i")
+    parser.add_argument("--backends", nargs="+", default=["torch", "int8", "onnx"])
+    parser.add_argument("--images", default=None, help="Sabit ekran goruntusu klasoru")
+    parser.add_argument("--synthetic", type=int, default=8, help="--images yoksa uretilecek ekran sayisi")
+    parser.add_argument("--repeats", type=int, default=3)
+    parser.add_argument("--batch-sizes", nargs="+", type=int, default=[1, 4])
+    parser.add_argument("--prompt", default=DINOXClient.DEFAULT_PROMPT)
+    parser.add_argument("--json", default=None, help="Raporun yazilacagi dosya")
+    args = parser.parse_args()
+
+    screens = _load_screens(args.images) if args.images else _synthetic_screens(args.synthetic)
+    images = [image for _, image in screens]
+    prompt = args.prompt.lower()
+    backends = ["torch"] + [backend for backend in args.backends if backend != "torch"]
+    print(f"📸 {len(screens)} ekran, prompt: {prompt}")
+
+    report = {"screens": [name for name, _ in screens], "backends": {}}
+    reference = None
+    for backend in backends:
+        client = _load_client(backend)
+        _run(client, images[:1], prompt)  # isinma
+
+        latencies = []
+        detections = []
+        for _ in range(args.repeats):
+            detections = []
+            for image in images:
+                start = time.perf_counter()
+                detections.extend(_run(client, [image], prompt))
+                latencies.append((time.perf_counter() - start) * 1000)
+
+        throughput = {}
+        for batch_size in args.batch_sizes:
+            client.max_batch_size = batch_size
+            start = time.perf_counter()
+            _run(client, images, prompt)
+            throughput[batch_size] = round(len(images) / (time.perf_counter() - start), 3)
+
+        entry = {
+            "p50_ms": round(statistics.median(latencies), 1),
+            "p95_ms": round(_percentile(latencies, 0.95), 1),
+            "images_per_second": throughput,
+        }
+        if reference is None:
+            reference = detections
+        else:
+            entry["parity"] = summarize_parity(
+                [compare_detections(ref, cand) for ref, cand in zip(reference, detections)]
+            )
+        report["backends"][backend] = entry
+
+    base = report["backends"]["torch"]
+    print(f"\n{'backend':>8} {'p50 (ms)':>10} {'p95 (ms)':>10} {'hizlanma':>9} {'recall':>7} {'precision':>9} {'IoU':>6} {'skor farki':>10}")
+    for backend, entry in report["backends"].items():
+        parity = entry.get("parity") or {"recall": 1.0, "precision": 1.0, "mean_iou": 1.0, "max_score_delta": 0.0}
+        speedup = base["p50_ms"] / max(entry["p50_ms"], 0.001)
+        print(
+            f"{backend:>8} {entry['p50_ms']:>10.1f} {entry['p95_ms']:>10.1f} {speedup:>8.2f}x "
+            f"{parity['recall']:>7.3f} {parity['precision']:>9.3f} {parity['mean_iou'] or 0:>6.3f} {parity['max_score_delta']:>10.3f}"
+        )
+    for backend, entry in report["backends"].items():
+        rates = ", ".join(f"batch {size}: {rate} goruntu/s" for size, rate in entry["images_per_second"].items())
+        print(f"   {backend}: {rates}")
+
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as handle:
+            json.dump(report, handle, indent=2)
+        print(f"\n📝 Rapor yazildi: {args.json}")
+
+
+if __name__ == "__main__":
+    main()